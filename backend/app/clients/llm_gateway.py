@@ -0,0 +1,502 @@
+"""Process-wide gateway every OpenAI call goes through.
+
+The gateway owns the retry policy, caps concurrency globally and per feature,
+keeps a share of the global slots for interactive features so background
+pipelines cannot starve chat, shares one upstream request between identical
+concurrent callers, slows everyone down after a 429, and keeps per-feature
+token/latency/cost counters that are flushed to ``llm_usage_counter``.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import time
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass, field, fields
+from datetime import date
+from typing import Any
+
+from loguru import logger
+from openai import APIConnectionError, APITimeoutError, RateLimitError
+
+from app.core import telemetry
+from app.core.config import settings
+from app.utils.timezone import eastern_today
+
+
+MAX_RETRIES = 2
+RETRY_BASE_DELAY = 2.0  # seconds, doubles each attempt
+BACKOFF_CEILING = 60.0  # seconds
+
+DEFAULT_FEATURE = "default"
+
+
+@dataclass(frozen=True, slots=True)
+class FeaturePolicy:
+    max_concurrency: int
+    interactive: bool = False
+    # Overrides the gateway's retry count for this feature.
+    max_retries: int | None = None
+
+
+# Features not listed here fall back to the ``default`` policy.
+FEATURE_POLICIES: dict[str, FeaturePolicy] = {
+    "chat": FeaturePolicy(max_concurrency=6, interactive=True),
+    # A failed call aborts a whole backlog run, so iMessage keeps its four attempts.
+    "imessage": FeaturePolicy(max_concurrency=2, max_retries=3),
+    "journal": FeaturePolicy(max_concurrency=2),
+    "insights": FeaturePolicy(max_concurrency=2),
+    "news": FeaturePolicy(max_concurrency=3),
+    "digest": FeaturePolicy(max_concurrency=2),
+    DEFAULT_FEATURE: FeaturePolicy(max_concurrency=3),
+}
+
+# USD per million (input, output) tokens; matched by longest model-name prefix.
+MODEL_PRICING: dict[str, tuple[float, float]] = {
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5": (1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+}
+
+
+# Transient failures that reach us untyped: transport errors wrapped by the SDK,
+# proxies, and overload replies.
+_TRANSIENT_MARKERS = (
+    "rate limit",
+    "resource_exhausted",
+    "temporarily unavailable",
+    "service unavailable",
+    "unavailable",
+    "timeout",
+    "timed out",
+    "connection reset",
+    "connection aborted",
+    "connection refused",
+    "internal server error",
+    "bad gateway",
+    "gateway timeout",
+    "overloaded",
+)
+
+
+def is_retryable(exc: Exception) -> bool:
+    """Return True for transient errors worth retrying."""
+    if isinstance(exc, (APITimeoutError, APIConnectionError, RateLimitError, TimeoutError, ConnectionError)):
+        return True
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in {408, 409, 429} or status_code >= 500
+    message = str(exc).lower()
+    return any(marker in message for marker in _TRANSIENT_MARKERS)
+
+
+def estimate_cost(model_name: str, input_tokens: int, output_tokens: int) -> float:
+    matches = [prefix for prefix in MODEL_PRICING if model_name.startswith(prefix)]
+    if not matches:
+        return 0.0
+    input_price, output_price = MODEL_PRICING[max(matches, key=len)]
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+def usage_tokens(response: Any) -> tuple[int, int]:
+    """Return ``(input_tokens, output_tokens)`` from a Responses or embeddings result."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    input_tokens = getattr(usage, "input_tokens", None)
+    if not isinstance(input_tokens, int):
+        input_tokens = getattr(usage, "prompt_tokens", 0)
+    output_tokens = getattr(usage, "output_tokens", 0)
+    return (
+        input_tokens if isinstance(input_tokens, int) else 0,
+        output_tokens if isinstance(output_tokens, int) else 0,
+    )
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        value = headers.get("retry-after")
+    except AttributeError:
+        return None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    calls: int = 0
+    errors: int = 0
+    rate_limited: int = 0
+    coalesced: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    latency_ms_total: int = 0
+    cost_usd: float = 0.0
+
+    def merge(self, other: UsageTotals) -> None:
+        for item in fields(self):
+            setattr(self, item.name, getattr(self, item.name) + getattr(other, item.name))
+
+    def as_dict(self) -> dict[str, Any]:
+        return {item.name: getattr(self, item.name) for item in fields(self)}
+
+
+class AdaptiveBackoff:
+    """Shared cooldown that grows on 429s and decays on success."""
+
+    def __init__(self, *, base: float = RETRY_BASE_DELAY, ceiling: float = BACKOFF_CEILING) -> None:
+        self.base = base
+        self.ceiling = ceiling
+        self.delay = 0.0
+        self.until = 0.0
+
+    def on_rate_limited(self, retry_after: float | None = None) -> float:
+        self.delay = min(self.ceiling, max(self.base, self.delay * 2))
+        wait = max(self.delay, retry_after or 0.0)
+        self.until = max(self.until, time.monotonic() + wait)
+        return wait
+
+    def on_success(self) -> None:
+        self.delay = self.delay / 2 if self.delay > self.base else 0.0
+
+    def remaining(self) -> float:
+        return max(0.0, self.until - time.monotonic())
+
+
+@dataclass
+class _LoopState:
+    """Semaphores and in-flight futures are bound to the loop that created them."""
+
+    global_slots: asyncio.Semaphore
+    background_slots: asyncio.Semaphore
+    feature_slots: dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    inflight: dict[str, asyncio.Future] = field(default_factory=dict)
+
+
+class LLMGateway:
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        interactive_reserved: int | None = None,
+        policies: dict[str, FeaturePolicy] | None = None,
+        flush_interval_seconds: float | None = None,
+        session_factory: Callable[[], Any] | None = None,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency or settings.llm_max_concurrency)
+        reserved = settings.llm_interactive_reserved_slots if interactive_reserved is None else interactive_reserved
+        self.background_concurrency = max(1, self.max_concurrency - max(0, reserved))
+        self.policies = dict(policies or FEATURE_POLICIES)
+        self.flush_interval_seconds = (
+            settings.llm_usage_flush_seconds if flush_interval_seconds is None else flush_interval_seconds
+        )
+        self.max_retries = max_retries
+        self.backoff = AdaptiveBackoff()
+        self._session_factory = session_factory
+        self._states: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState] = weakref.WeakKeyDictionary()
+        self._totals: dict[tuple[str, str], UsageTotals] = {}
+        self._pending: dict[tuple[date, str, str], UsageTotals] = {}
+        self._last_flush = time.monotonic()
+        self._flush_task: asyncio.Task | None = None
+
+    def policy(self, feature: str) -> FeaturePolicy:
+        return self.policies.get(feature) or self.policies.get(DEFAULT_FEATURE) or FeaturePolicy(max_concurrency=1)
+
+    async def call(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        /,
+        *,
+        feature: str = DEFAULT_FEATURE,
+        coalesce: bool = True,
+        **kwargs: Any,
+    ) -> Any:
+        """Run ``fn(**kwargs)`` under the gateway's limits, retries and accounting.
+
+        With ``coalesce`` set, a call identical to one already in flight waits
+        for that call's result instead of issuing its own request.
+        """
+        model_name = str(kwargs.get("model") or "unknown")
+        if not coalesce:
+            return await self._call_with_retry(fn, feature=feature, model_name=model_name, **kwargs)
+
+        state = self._state()
+        key = self._coalesce_key(fn, kwargs)
+        existing = state.inflight.get(key)
+        if existing is not None:
+            self._record(feature, model_name, UsageTotals(coalesced=1))
+            try:
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not existing.cancelled() or (task is not None and task.cancelling()):
+                    raise
+            # The leader was cancelled, not this caller: issue the call again; the
+            # first follower to get here leads and the rest coalesce onto it.
+            return await self.call(fn, feature=feature, coalesce=True, **kwargs)
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        state.inflight[key] = future
+        try:
+            result = await self._call_with_retry(fn, feature=feature, model_name=model_name, **kwargs)
+        except Exception as exc:
+            future.set_exception(exc)
+            # Followers re-raise it; mark retrieved so a lone leader does not warn.
+            future.exception()
+            raise
+        except BaseException:
+            # Only the leader was cancelled; followers see a cancelled future and retry.
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            state.inflight.pop(key, None)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        /,
+        *,
+        feature: str = DEFAULT_FEATURE,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        """Open a streaming call and hold its slot until the ``async with`` block exits.
+
+        Only opening the stream is retried, and streams are never coalesced. The
+        stream is closed on exit, so an early stop does not leave the response open.
+        """
+        model_name = str(kwargs.get("model") or "unknown")
+        async with self._slot(feature):
+            stream = await self._call_with_retry(fn, feature=feature, model_name=model_name, slot_held=True, **kwargs)
+            try:
+                yield stream
+            finally:
+                # ``AsyncStream.close``; plain async generators only have ``aclose``.
+                close = getattr(stream, "close", None) or getattr(stream, "aclose", None)
+                if close is not None:
+                    await close()
+
+    def record_response_usage(self, feature: str, model_name: str, response: Any) -> None:
+        """Account tokens for responses that did not pass through ``call`` (e.g. finished streams)."""
+        input_tokens, output_tokens = usage_tokens(response)
+        self._record(
+            feature,
+            model_name,
+            UsageTotals(
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=estimate_cost(model_name, input_tokens, output_tokens),
+            ),
+        )
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Process-lifetime totals keyed by ``feature:model``."""
+        return {f"{feature}:{model}": totals.as_dict() for (feature, model), totals in self._totals.items()}
+
+    async def flush(self) -> int:
+        """Write pending counter deltas to the database; returns rows written."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        rows = [
+            {"usage_date": usage_date, "feature": feature, "model_name": model_name, **totals.as_dict()}
+            for (usage_date, feature, model_name), totals in pending.items()
+        ]
+        try:
+            from app.db.repositories.llm_usage_repository import LLMUsageRepository
+
+            session_factory = self._session_factory
+            if session_factory is None:
+                from app.db.session import AsyncSessionLocal
+
+                session_factory = AsyncSessionLocal
+            async with session_factory() as session:
+                await LLMUsageRepository(session).add_counters(rows)
+                await session.commit()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[llm-gateway] usage flush failed, keeping {} rows for next flush: {}", len(rows), exc)
+            for key, totals in pending.items():
+                self._pending.setdefault(key, UsageTotals()).merge(totals)
+            return 0
+        return len(rows)
+
+    async def _call_with_retry(
+        self,
+        fn: Callable[..., Awaitable[Any]],
+        *,
+        feature: str,
+        model_name: str,
+        slot_held: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        last_exc: Exception | None = None
+        max_retries = self.policy(feature).max_retries
+        if max_retries is None:
+            max_retries = self.max_retries
+        for attempt in range(max_retries + 1):
+            cooldown = self.backoff.remaining()
+            if cooldown > 0:
+                await asyncio.sleep(cooldown)
+            t0 = time.monotonic()
+            try:
+                async with nullcontext() if slot_held else self._slot(feature):
+                    t0 = time.monotonic()
+                    result = await fn(**kwargs)
+            except Exception as exc:
+                elapsed = time.monotonic() - t0
+                last_exc = exc
+                rate_limited = isinstance(exc, RateLimitError)
+                self._record(
+                    feature,
+                    model_name,
+                    UsageTotals(
+                        calls=1,
+                        errors=1,
+                        rate_limited=int(rate_limited),
+                        latency_ms_total=int(elapsed * 1000),
+                    ),
+                )
+                if not is_retryable(exc) or attempt >= max_retries:
+                    logger.warning(
+                        "[openai] {} call failed in {:.1f}s (attempt {}/{}, non-retryable={}): {}",
+                        feature, elapsed, attempt + 1, max_retries + 1, not is_retryable(exc), exc,
+                    )
+                    raise
+                if rate_limited:
+                    delay = self.backoff.on_rate_limited(_retry_after_seconds(exc))
+                else:
+                    delay = RETRY_BASE_DELAY * (2 ** attempt)
+                logger.info(
+                    "[openai] {} retryable error in {:.1f}s (attempt {}/{}), retrying in {:.0f}s: {}",
+                    feature, elapsed, attempt + 1, max_retries + 1, delay, exc,
+                )
+                if not rate_limited:
+                    await asyncio.sleep(delay)
+                continue
+
+            elapsed = time.monotonic() - t0
+            self.backoff.on_success()
+            input_tokens, output_tokens = usage_tokens(result)
+            self._record(
+                feature,
+                model_name,
+                UsageTotals(
+                    calls=1,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
+                    latency_ms_total=int(elapsed * 1000),
+                    cost_usd=estimate_cost(model_name, input_tokens, output_tokens),
+                ),
+            )
+            logger.debug("[openai] {} call succeeded in {:.1f}s (attempt {})", feature, elapsed, attempt + 1)
+            return result
+        raise last_exc  # unreachable but satisfies type checker
+
+    def _slot(self, feature: str) -> _Slot:
+        state = self._state()
+        policy = self.policy(feature)
+        feature_slots = state.feature_slots.get(feature)
+        if feature_slots is None:
+            feature_slots = asyncio.Semaphore(max(1, policy.max_concurrency))
+            state.feature_slots[feature] = feature_slots
+        semaphores = [feature_slots]
+        if not policy.interactive:
+            semaphores.append(state.background_slots)
+        semaphores.append(state.global_slots)
+        return _Slot(semaphores)
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None:
+            state = _LoopState(
+                global_slots=asyncio.Semaphore(self.max_concurrency),
+                background_slots=asyncio.Semaphore(self.background_concurrency),
+            )
+            self._states[loop] = state
+        return state
+
+    @staticmethod
+    def _coalesce_key(fn: Callable[..., Any], kwargs: dict[str, Any]) -> str:
+        # Bound methods of different clients must not share results.
+        owner = getattr(fn, "__self__", fn)
+        payload = json.dumps(kwargs, sort_keys=True, default=repr)
+        raw = f"{id(owner)}:{getattr(fn, '__qualname__', repr(fn))}:{payload}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _record(self, feature: str, model_name: str, delta: UsageTotals) -> None:
+        if delta.calls:
+            telemetry.record_llm_call(feature, model_name, delta.latency_ms_total / 1000, failed=bool(delta.errors))
+        telemetry.record_llm_tokens(feature, model_name, delta.input_tokens, delta.output_tokens)
+        self._totals.setdefault((feature, model_name), UsageTotals()).merge(delta)
+        self._pending.setdefault((eastern_today(), feature, model_name), UsageTotals()).merge(delta)
+        self._maybe_schedule_flush()
+
+    def _maybe_schedule_flush(self) -> None:
+        if self.flush_interval_seconds <= 0:
+            return
+        if time.monotonic() - self._last_flush < self.flush_interval_seconds:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._last_flush = time.monotonic()
+        self._flush_task = loop.create_task(self.flush())
+
+
+class _Slot:
+    """Acquire several semaphores in a fixed order, release in reverse."""
+
+    def __init__(self, semaphores: list[asyncio.Semaphore]) -> None:
+        self._semaphores = semaphores
+        self._acquired: list[asyncio.Semaphore] = []
+
+    async def __aenter__(self) -> None:
+        try:
+            for semaphore in self._semaphores:
+                await semaphore.acquire()
+                self._acquired.append(semaphore)
+        except BaseException:
+            self._release()
+            raise
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._release()
+
+    def _release(self) -> None:
+        while self._acquired:
+            self._acquired.pop().release()
+
+
+_gateway: LLMGateway | None = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    global _gateway  # noqa: PLW0603
+    if _gateway is None:
+        _gateway = LLMGateway()
+    return _gateway
@@ -1,34 +1,20 @@
 """Shared OpenAI Responses API client."""
 from __future__ import annotations
 
-import asyncio
-import time
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, AsyncIterator, Generic, TypeVar
 
 from loguru import logger
-from openai import AsyncOpenAI, APITimeoutError, APIConnectionError, RateLimitError, APIStatusError
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 
+from app.clients.llm_gateway import DEFAULT_FEATURE, get_llm_gateway
 from app.core.config import settings
 
 
 StructuredT = TypeVar("StructuredT", bound=BaseModel)
 
 _REQUEST_TIMEOUT = 120.0  # seconds
-_MAX_RETRIES = 2
-_RETRY_BASE_DELAY = 2.0  # seconds, doubles each attempt
-
-
-def _is_retryable(exc: Exception) -> bool:
-    """Return True for transient errors worth retrying."""
-    if isinstance(exc, (APITimeoutError, APIConnectionError)):
-        return True
-    if isinstance(exc, RateLimitError):
-        return True
-    if isinstance(exc, APIStatusError) and exc.status_code >= 500:
-        return True
-    return False
 
 
 def build_openai_client() -> AsyncOpenAI:
@@ -62,16 +48,21 @@ class StructuredGenerationResult(Generic[StructuredT]):
 
 
 class OpenAIResponsesClient:
-    """Thin wrapper around the OpenAI Responses API."""
+    """Thin wrapper around the OpenAI Responses API.
+
+    Calls go through the shared ``LLMGateway`` and are accounted under ``feature``.
+    """
 
     def __init__(
         self,
         *,
         client: AsyncOpenAI | None = None,
         model_name: str | None = None,
+        feature: str = DEFAULT_FEATURE,
     ) -> None:
-        self.client = client or build_openai_client()
+        self.client = client or get_shared_openai_client()
         self.model_name = model_name or settings.openai_model_name
+        self.feature = feature
 
     def _supports_temperature(self) -> bool:
         # GPT-5 models reject temperature in the Responses API.
@@ -118,6 +109,40 @@ class OpenAIResponsesClient:
             total_tokens=_total_tokens(response),
         )
 
+    async def stream_text(
+        self,
+        prompt: str,
+        *,
+        temperature: float = 0.2,
+        max_output_tokens: int | None = None,
+        instructions: str | None = None,
+    ) -> AsyncIterator[str]:
+        """Yield output text deltas as the Responses API streams them.
+
+        Only opening the stream is retried; once tokens have been yielded a
+        failure is raised to the caller, since replaying would duplicate text.
+        The gateway slot is held until the stream is exhausted or closed.
+        """
+        logger.debug("[openai] streaming text request model={} chars={}", self.model_name, len(prompt))
+        kwargs = self._base_request_kwargs(
+            prompt=prompt,
+            temperature=temperature,
+            max_output_tokens=max_output_tokens,
+            instructions=instructions,
+        )
+        gateway = get_llm_gateway()
+        async with gateway.stream(self.client.responses.create, feature=self.feature, **kwargs, stream=True) as stream:
+            async for event in stream:
+                event_type = getattr(event, "type", "")
+                if event_type == "response.output_text.delta":
+                    delta = getattr(event, "delta", "")
+                    if delta:
+                        yield delta
+                elif event_type == "response.completed":
+                    gateway.record_response_usage(self.feature, self.model_name, getattr(event, "response", None))
+                elif event_type in {"response.failed", "error"}:
+                    raise RuntimeError(f"OpenAI stream failed: {getattr(event, 'error', None) or event_type}")
+
     async def generate_json(
         self,
         prompt: str,
@@ -190,33 +215,9 @@ class OpenAIResponsesClient:
             total_tokens=_total_tokens(response),
         )
 
-    @staticmethod
-    async def _call_with_retry(fn, **kwargs) -> Any:
-        """Call an OpenAI API function with retry on transient errors."""
-        last_exc: Exception | None = None
-        for attempt in range(_MAX_RETRIES + 1):
-            t0 = time.monotonic()
-            try:
-                result = await fn(**kwargs)
-                elapsed = time.monotonic() - t0
-                logger.debug("[openai] call succeeded in {:.1f}s (attempt {})", elapsed, attempt + 1)
-                return result
-            except Exception as exc:
-                elapsed = time.monotonic() - t0
-                last_exc = exc
-                if not _is_retryable(exc) or attempt >= _MAX_RETRIES:
-                    logger.warning(
-                        "[openai] call failed in {:.1f}s (attempt {}/{}, non-retryable={}): {}",
-                        elapsed, attempt + 1, _MAX_RETRIES + 1, not _is_retryable(exc), exc,
-                    )
-                    raise
-                delay = _RETRY_BASE_DELAY * (2 ** attempt)
-                logger.info(
-                    "[openai] retryable error in {:.1f}s (attempt {}/{}), retrying in {:.0f}s: {}",
-                    elapsed, attempt + 1, _MAX_RETRIES + 1, delay, exc,
-                )
-                await asyncio.sleep(delay)
-        raise last_exc  # unreachable but satisfies type checker
+    async def _call_with_retry(self, fn, **kwargs) -> Any:
+        """Call an OpenAI API function through the gateway (limits, retries, accounting)."""
+        return await get_llm_gateway().call(fn, feature=self.feature, **kwargs)
 
 
 def _total_tokens(response: Any) -> int | None:
@@ -12,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.config import settings
+from app.core.session_cache import get_session_cache
 from app.db.models.entities import User, UserRole, UserSession
 from app.db.session import AsyncSessionLocal
 from app.utils.timezone import eastern_now
@@ -108,6 +109,7 @@ async def _load_session_from_token(
         return None
 
     if session_obj.expires_at <= now:
+        get_session_cache().revoke(token_hash)
         session_obj.revoked_at = now
         await session.commit()
         if required:
@@ -122,12 +124,18 @@ async def _resolve_session(
     *,
     required: bool,
 ) -> UserSession | None:
+    cache = get_session_cache()
+    if token:
+        cached = cache.get(_hash_token(token))
+        if cached is not None:
+            return cached
     async with AsyncSessionLocal() as session:
         session_obj = await _load_session_from_token(session, token, required=required)
         if session_obj is None:
             return None
         if session_obj.user is not None:
             session.expunge(session_obj.user)
+            cache.put(session_obj.token_hash, session_obj)
         session.expunge(session_obj)
         return session_obj
 
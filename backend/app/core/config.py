@@ -21,6 +21,22 @@ class Settings(BaseSettings):
     database_pool_pre_ping: bool = Field(True, env="DATABASE_POOL_PRE_PING")
     database_pool_recycle_seconds: int = Field(1800, env="DATABASE_POOL_RECYCLE_SECONDS")
     database_pool_use_lifo: bool = Field(True, env="DATABASE_POOL_USE_LIFO")
+    # Named pool sizes in app/db/session.py: web, worker or script
+    database_pool_profile: str = Field("web", env="DATABASE_POOL_PROFILE")
+    database_pool_size: int | None = Field(None, env="DATABASE_POOL_SIZE")
+    database_max_overflow: int | None = Field(None, env="DATABASE_MAX_OVERFLOW")
+    # Disable asyncpg prepared-statement caching for transaction-mode PgBouncer
+    database_pgbouncer: bool = Field(False, env="DATABASE_PGBOUNCER")
+    database_replica_url: str | None = Field(None, env="DATABASE_REPLICA_URL")
+    # Development-mode N+1 detection (app/core/query_budget.py)
+    query_budget_enabled: bool = Field(False, env="QUERY_BUDGET_ENABLED")
+    query_budget_max_statements: int = Field(50, env="QUERY_BUDGET_MAX_STATEMENTS")
+    query_budget_max_repeats: int = Field(10, env="QUERY_BUDGET_MAX_REPEATS")
+    query_budget_raise: bool = Field(False, env="QUERY_BUDGET_RAISE")
+
+    # Metrics response cache
+    metrics_cache_redis_url: str | None = Field(None, env="METRICS_CACHE_REDIS_URL")
+    metrics_cache_ttl_seconds: int = Field(3600, env="METRICS_CACHE_TTL_SECONDS")
 
     # Environment
     environment: str = Field("local", env="APP_ENV")
@@ -58,6 +74,8 @@ class Settings(BaseSettings):
     session_cookie_samesite: str = Field("lax", env="SESSION_COOKIE_SAMESITE")
     session_ttl_hours: int = Field(12, env="SESSION_TTL_HOURS")
     session_ttl_days: int = Field(30, env="SESSION_TTL_DAYS")
+    session_cache_ttl_seconds: int = Field(60, env="SESSION_CACHE_TTL_SECONDS")
+    session_cache_max_entries: int = Field(1024, env="SESSION_CACHE_MAX_ENTRIES")
     cors_origins: str = Field("", env="CORS_ORIGINS")
 
     # Garmin
@@ -78,6 +96,19 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str | None = Field(None, env="OPENAI_API_KEY")
     openai_model_name: str = Field("gpt-5-mini", env="OPENAI_MODEL_NAME")
+    llm_max_concurrency: int = Field(8, env="LLM_MAX_CONCURRENCY")
+    llm_interactive_reserved_slots: int = Field(2, env="LLM_INTERACTIVE_RESERVED_SLOTS")
+    llm_usage_flush_seconds: float = Field(60.0, env="LLM_USAGE_FLUSH_SECONDS")
+    nutrition_resolve_concurrency: int = Field(4, env="NUTRITION_RESOLVE_CONCURRENCY")
+
+    # Chat conversation memory (nutrition + Monet assistant)
+    conversation_cache_max_bytes: int = Field(4 * 1024 * 1024, env="CONVERSATION_CACHE_MAX_BYTES")
+    conversation_max_turns: int = Field(12, env="CONVERSATION_MAX_TURNS")
+    conversation_keep_recent_turns: int = Field(6, env="CONVERSATION_KEEP_RECENT_TURNS")
+    conversation_ttl_seconds: int = Field(3600, env="CONVERSATION_TTL_SECONDS")
+
+    # iMessage: compiled Contacts lookup shared by the sync service and scripts
+    imessage_contacts_index_dir: str = Field("~/.cache/life_dashboard", env="IMESSAGE_CONTACTS_INDEX_DIR")
 
     def _select_google_value(
         self,
@@ -0,0 +1,190 @@
+"""Development-mode N+1 detector and per-request SQL budget.
+
+With ``QUERY_BUDGET_ENABLED`` set, every request (``QueryBudgetMiddleware``)
+and background refresh job (``budget_scope``) counts the statements it runs
+and groups them by fingerprint: the SQL with literals and bind parameters
+replaced by ``?`` and ``IN`` lists collapsed, so the same query issued from a
+loop shows up as one fingerprint with a high count.
+
+A scope is over budget when it runs more than ``QUERY_BUDGET_MAX_STATEMENTS``
+statements or repeats one fingerprint more than ``QUERY_BUDGET_MAX_REPEATS``
+times. Over-budget scopes are logged with their most repeated statements;
+with ``QUERY_BUDGET_RAISE`` requests instead fail at the offending statement,
+so the traceback points at the loop. Jobs only ever log, since failing a
+refresh halfway would leave partial data behind.
+
+Tests use ``track_queries`` through the ``count_queries`` fixture in
+``tests/conftest.py``.
+"""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERALS = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERALS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAMETERS = re.compile(r"\$\d+|%\(\w+\)s|%s|:\w+")
+_VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint(statement: str) -> str:
+    """Statement shape with literals and parameters removed."""
+    shape = _STRING_LITERALS.sub("?", statement)
+    shape = _BIND_PARAMETERS.sub("?", shape)
+    shape = _NUMBER_LITERALS.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _VALUE_LISTS.sub("(?...)", shape)
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Raised at the statement that takes a raising scope over its budget."""
+
+
+@dataclass
+class QueryLog:
+    label: str
+    max_statements: int | None = None
+    max_repeats: int | None = None
+    raise_on_exceed: bool = False
+    statements: int = 0
+    fingerprints: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str) -> None:
+        shape = fingerprint(statement)
+        self.statements += 1
+        self.fingerprints[shape] += 1
+        if not self.raise_on_exceed:
+            return
+        if self.max_statements is not None and self.statements > self.max_statements:
+            raise QueryBudgetExceeded(
+                f"{self.label} ran more than {self.max_statements} SQL statements; last: {shape}"
+            )
+        if self.max_repeats is not None and self.fingerprints[shape] > self.max_repeats:
+            raise QueryBudgetExceeded(
+                f"{self.label} ran the same SQL statement more than {self.max_repeats} times "
+                f"(likely N+1): {shape}"
+            )
+
+    def count(self, pattern: str) -> int:
+        """Statements whose fingerprint contains ``pattern`` (case-insensitive)."""
+        needle = pattern.lower()
+        return sum(total for shape, total in self.fingerprints.items() if needle in shape.lower())
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """Fingerprints run at least ``threshold`` times, most frequent first."""
+        return [(shape, total) for shape, total in self.fingerprints.most_common() if total >= threshold]
+
+    @property
+    def over_budget(self) -> bool:
+        if self.max_statements is not None and self.statements > self.max_statements:
+            return True
+        if self.max_repeats is not None and self.fingerprints:
+            return self.fingerprints.most_common(1)[0][1] > self.max_repeats
+        return False
+
+
+_query_log: ContextVar[QueryLog | None] = ContextVar("query_budget_log", default=None)
+
+
+def current_query_log() -> QueryLog | None:
+    return _query_log.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    query_log = _query_log.get()
+    if query_log is not None:
+        query_log.record(statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Feed the statements ``engine`` runs to the active ``QueryLog``; idempotent."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def track_queries(
+    label: str,
+    *,
+    max_statements: int | None = None,
+    max_repeats: int | None = None,
+    raise_on_exceed: bool = False,
+) -> Iterator[QueryLog]:
+    """Collect the statements run inside the block (including its tasks) into a ``QueryLog``."""
+    query_log = QueryLog(
+        label=label, max_statements=max_statements, max_repeats=max_repeats, raise_on_exceed=raise_on_exceed
+    )
+    token = _query_log.set(query_log)
+    try:
+        yield query_log
+    finally:
+        _query_log.reset(token)
+
+
+def report(query_log: QueryLog) -> None:
+    if not query_log.over_budget:
+        return
+    worst = "; ".join(f"{total}x {shape[:200]}" for shape, total in query_log.repeated()[:3])
+    logger.warning(
+        "Query budget exceeded for {}: {} statements (budget {}, repeat budget {}). Most repeated: {}",
+        query_log.label,
+        query_log.statements,
+        query_log.max_statements,
+        query_log.max_repeats,
+        worst or "none",
+    )
+
+
+@contextmanager
+def budget_scope(label: str) -> Iterator[QueryLog | None]:
+    """Budget a background job when ``QUERY_BUDGET_ENABLED``; a no-op otherwise."""
+    if not settings.query_budget_enabled:
+        yield None
+        return
+    with track_queries(
+        label,
+        max_statements=settings.query_budget_max_statements,
+        max_repeats=settings.query_budget_max_repeats,
+    ) as query_log:
+        try:
+            yield query_log
+        finally:
+            report(query_log)
+
+
+class QueryBudgetMiddleware:
+    """ASGI middleware applying the query budget to each HTTP request."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_queries(
+            f"{scope['method']} {scope['path']}",
+            max_statements=settings.query_budget_max_statements,
+            max_repeats=settings.query_budget_max_repeats,
+            raise_on_exceed=settings.query_budget_raise,
+        ) as query_log:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route:
+                    query_log.label = f"{scope['method']} {route}"
+                report(query_log)
@@ -0,0 +1,122 @@
+"""Process-local cache of validated login sessions.
+
+``_resolve_session`` in ``core/auth.py`` runs on every authenticated request.
+A hit here returns a detached copy of the session and its user without
+checking out a connection. Entries are keyed by token hash and live for at
+most ``ttl_seconds`` (and never past the session's own expiry). Logout and
+login-time user updates evict them straight away.
+
+Like the metrics cache and conversation memory, the cache is per process: a
+logout handled by another worker is only seen here once the entry's TTL runs
+out.
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.db.models.entities import User, UserSession
+from app.utils.timezone import eastern_now
+
+
+def _column_values(obj: Any) -> dict[str, Any]:
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs}
+
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """Column values of a validated session and its user."""
+    session_values: dict[str, Any]
+    user_values: dict[str, Any]
+
+    @property
+    def user_id(self) -> int:
+        return self.user_values["id"]
+
+    @property
+    def expires_at(self) -> datetime:
+        return self.session_values["expires_at"]
+
+    @classmethod
+    def capture(cls, session_obj: UserSession) -> SessionSnapshot:
+        return cls(session_values=_column_values(session_obj), user_values=_column_values(session_obj.user))
+
+    def restore(self) -> UserSession:
+        """A fresh detached ``UserSession`` with ``user`` loaded, like an expunged query result."""
+        user = User(**self.user_values)
+        session_obj = UserSession(**self.session_values)
+        set_committed_value(session_obj, "user", user)
+        make_transient_to_detached(user)
+        make_transient_to_detached(session_obj)
+        return session_obj
+
+
+class SessionCache:
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: float = 60) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[SessionSnapshot, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token_hash: str) -> UserSession | None:
+        entry = self._entries.get(token_hash)
+        if entry is not None:
+            snapshot, cached_until = entry
+            if time.monotonic() < cached_until and snapshot.expires_at > eastern_now():
+                self._entries.move_to_end(token_hash)
+                self.hits += 1
+                return snapshot.restore()
+            # Expired sessions fall through to the database so they get marked revoked there.
+            del self._entries[token_hash]
+        self.misses += 1
+        return None
+
+    def put(self, token_hash: str, session_obj: UserSession) -> None:
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        self._entries[token_hash] = (SessionSnapshot.capture(session_obj), time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(token_hash)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def revoke(self, token_hash: str) -> None:
+        self._entries.pop(token_hash, None)
+
+    def revoke_user(self, user_id: int) -> None:
+        """Drop every cached session of ``user_id``, e.g. after its row changed."""
+        for token_hash in [key for key, (snapshot, _) in self._entries.items() if snapshot.user_id == user_id]:
+            del self._entries[token_hash]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, float | int]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_session_cache: SessionCache | None = None
+
+
+def get_session_cache() -> SessionCache:
+    global _session_cache  # noqa: PLW0603
+    if _session_cache is None:
+        _session_cache = SessionCache(
+            max_entries=settings.session_cache_max_entries,
+            ttl_seconds=settings.session_cache_ttl_seconds,
+        )
+    return _session_cache
@@ -0,0 +1,322 @@
+"""Prometheus-style performance telemetry served on ``/metrics``.
+
+A small in-process registry of counters and histograms, plus scrape-time
+collectors, rendered in the Prometheus text exposition format so no client
+library is needed.
+
+- ``TelemetryMiddleware`` times every HTTP request by route template and
+  counts the SQL statements it ran (through the cursor events that
+  ``instrument_engine`` installs).
+- ``LLMGateway`` reports call latency and tokens per feature.
+- The refresh controllers in ``app/workers/tasks.py`` report job durations.
+- Collectors registered with ``register_collector`` (DB pool, session cache)
+  are read at scrape time.
+
+Values are per process, like the other in-process caches. ``/metrics`` sits
+outside ``/api`` and so is not routed by the public Caddy site; scrape it on
+the internal network.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+# (metric name, "gauge" or "counter", help, labels, value) read at scrape time.
+Sample = tuple[str, str, str, dict[str, str], float]
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if value == float("inf"):
+        return "+Inf"
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, Any]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+
+@dataclass
+class _HistogramSeries:
+    bucket_counts: list[int]
+    total: float = 0.0
+    count: int = 0
+
+
+_INF_BUCKET = 'le="+Inf"'
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(bucket_counts=[0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series.bucket_counts[index] += 1
+            series.total += value
+            series.count += 1
+
+    def count(self, **labels: Any) -> int:
+        series = self._series.get(self._key(labels))
+        return series.count if series else 0
+
+    def total(self, **labels: Any) -> float:
+        series = self._series.get(self._key(labels))
+        return series.total if series else 0.0
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = [(key, list(series.bucket_counts), series.total, series.count) for key, series in self._series.items()]
+        lines: list[str] = []
+        for key, bucket_counts, total, count in items:
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, _INF_BUCKET)} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        *,
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets=buckets))
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        collected: dict[str, tuple[str, str, list[str]]] = {}
+        for collector in self._collectors:
+            for name, kind, documentation, labels, value in collector():
+                names = tuple(labels)
+                sample = f"{name}{_format_labels(names, tuple(labels[item] for item in names))} {_format_value(value)}"
+                collected.setdefault(name, (kind, documentation, []))[2].append(sample)
+        for name, (kind, documentation, samples) in collected.items():
+            lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} {kind}", *samples])
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Any) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+
+registry = Registry()
+
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+HTTP_REQUEST_DB_QUERIES = registry.histogram(
+    "http_request_db_queries", "SQL statements executed per HTTP request.", ("route",), buckets=QUERY_COUNT_BUCKETS
+)
+HTTP_REQUEST_DB_SECONDS = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request.", ("route",)
+)
+DB_QUERY_SECONDS = registry.histogram("db_query_duration_seconds", "SQL statement latency, all callers.")
+LLM_CALL_SECONDS = registry.histogram(
+    "llm_call_duration_seconds", "LLM call latency per attempt.", ("feature", "model", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+LLM_TOKENS = registry.counter("llm_tokens_total", "LLM tokens by feature.", ("feature", "model", "direction"))
+JOB_SECONDS = registry.histogram(
+    "background_job_duration_seconds", "Background refresh job duration.", ("job", "outcome"), buckets=JOB_BUCKETS
+)
+
+
+@dataclass
+class RequestDbStats:
+    queries: int = 0
+    seconds: float = 0.0
+
+
+_request_db: ContextVar[RequestDbStats | None] = ContextVar("telemetry_request_db", default=None)
+
+
+def current_request_db() -> RequestDbStats | None:
+    return _request_db.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    conn.info.setdefault("telemetry_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+    starts = conn.info.get("telemetry_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    DB_QUERY_SECONDS.observe(elapsed)
+    stats = _request_db.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context) -> None:  # noqa: ANN001
+    connection = exception_context.connection
+    starts = connection.info.get("telemetry_query_start") if connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time every statement ``engine`` runs; idempotent."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def record_llm_call(feature: str, model_name: str, seconds: float, *, failed: bool) -> None:
+    LLM_CALL_SECONDS.observe(seconds, feature=feature, model=model_name, outcome="error" if failed else "ok")
+
+
+def record_llm_tokens(feature: str, model_name: str, input_tokens: int, output_tokens: int) -> None:
+    if input_tokens:
+        LLM_TOKENS.inc(input_tokens, feature=feature, model=model_name, direction="input")
+    if output_tokens:
+        LLM_TOKENS.inc(output_tokens, feature=feature, model=model_name, direction="output")
+
+
+def record_job(job: str, seconds: float, *, failed: bool) -> None:
+    JOB_SECONDS.observe(seconds, job=job, outcome="error" if failed else "ok")
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]) -> None:
+    registry.register_collector(collector)
+
+
+def render() -> str:
+    return registry.render()
+
+
+class TelemetryMiddleware:
+    """ASGI middleware recording latency and SQL usage per route template."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status_code = 500
+        stats = RequestDbStats()
+        token = _request_db.set(stats)
+
+        async def send_with_status(message: dict[str, Any]) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _request_db.reset(token)
+            # The router stores the matched route on the shared scope; its path is the template.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - started, method=scope["method"], route=route, status=status_code
+            )
+            HTTP_REQUEST_DB_QUERIES.observe(stats.queries, route=route)
+            HTTP_REQUEST_DB_SECONDS.observe(stats.seconds, route=route)
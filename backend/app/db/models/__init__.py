@@ -1,3 +1,3 @@
 """Expose model modules for Alembic discovery."""
-from . import ai_digest, calendar, claude_code, entities, imessage, journal, nutrition, nutrition_suggestions, project, project_note, todo, workspace  # noqa: F401
+from . import ai_digest, calendar, claude_code, conversation, entities, imessage, journal, llm_usage, nutrition, nutrition_suggestions, project, project_note, todo, workspace  # noqa: F401
 from .base import Base  # noqa: F401
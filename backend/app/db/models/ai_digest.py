@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, String, Text
+from sqlalchemy import DateTime, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.models.base import Base
@@ -24,3 +24,17 @@ class DigestItem(Base):
     fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=eastern_now)
     content_hash: Mapped[str | None] = mapped_column(String(64))
     llm_summary: Mapped[str | None] = mapped_column(Text)
+
+
+class NewsLLMCacheEntry(Base):
+    """Persisted LLM output for a news item, keyed by a hash of the prompt inputs."""
+
+    __tablename__ = "news_llm_cache"
+    __table_args__ = (
+        UniqueConstraint("kind", "content_hash", name="uq_news_llm_cache_kind_hash"),
+    )
+
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    model_name: Mapped[str | None] = mapped_column(String(64))
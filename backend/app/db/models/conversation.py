@@ -0,0 +1,28 @@
+"""Persisted chat history for the nutrition and Monet assistants."""
+from __future__ import annotations
+
+from sqlalchemy import JSON, ForeignKey, Index, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.models.base import Base
+
+
+class ConversationSession(Base):
+    """One conversation: a rolling summary of compacted turns plus the recent turns verbatim."""
+
+    __tablename__ = "conversation_session"
+    __table_args__ = (
+        UniqueConstraint("namespace", "user_id", "session_key", name="uq_conversation_session_namespace_user_key"),
+        Index("ix_conversation_session_updated_at", "updated_at"),
+    )
+
+    # Which assistant owns the conversation ("nutrition", "assistant").
+    namespace: Mapped[str] = mapped_column(String(32), nullable=False)
+    session_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("user.id"), nullable=True)
+    summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # [{"role": "user" | "assistant", "content": str, "timestamp": float}, ...]
+    turns: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    summarized_turns: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Bumped on every save; writers update only the version they read.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -153,6 +153,24 @@ class DailyMetric(Base):
     readiness_insight: Mapped["ReadinessInsight"] = relationship(back_populates="daily_metric", lazy="joined")
 
 
+class MetricRollup(Base):
+    """Weekly/monthly min/max/avg of one daily metric, maintained by ingest."""
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", "period_start", "metric", name="uq_metricrollup_user_period_metric"),
+    )
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), index=True)
+    period: Mapped[str] = mapped_column(String(8))
+    period_start: Mapped[date]
+    metric: Mapped[str] = mapped_column(String(32))
+    sample_count: Mapped[int]
+    min_value: Mapped[float | None]
+    max_value: Mapped[float | None]
+    avg_value: Mapped[float | None]
+    sum_value: Mapped[float | None]
+
+
 class SleepSession(Base):
     __table_args__ = (
         UniqueConstraint("user_id", "metric_date", name="uq_sleepsession_user_date"),
@@ -175,6 +193,10 @@ class ReadinessInsight(Base):
     response_text: Mapped[str] = mapped_column(Text)
     tokens_used: Mapped[int | None]
     readiness_score: Mapped[int | None]
+    # Hashes of the biometric prompt and of the lifestyle-context block this
+    # response was generated from; see InsightService.refresh_daily_insight.
+    input_fingerprint: Mapped[str | None] = mapped_column(String(64))
+    context_fingerprint: Mapped[str | None] = mapped_column(String(64))
 
     daily_metric: Mapped[DailyMetric] = relationship(back_populates="readiness_insight", uselist=False)
 
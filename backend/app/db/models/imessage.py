@@ -9,10 +9,12 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -91,6 +93,15 @@ class IMessageMessage(Base):
     __tablename__ = "imessage_message"
     __table_args__ = (
         UniqueConstraint("user_id", "source_guid", name="uq_imessage_message_user_source_guid"),
+        # Covers the processing keyset (sent_at_utc, id) over only the rows still awaiting processing.
+        Index(
+            "ix_imessage_message_pending",
+            "user_id",
+            "sent_at_utc",
+            "id",
+            postgresql_where=text("processed_at_utc IS NULL"),
+            sqlite_where=text("processed_at_utc IS NULL"),
+        ),
     )
 
     user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False, index=True)
@@ -0,0 +1,30 @@
+"""Per-feature LLM usage accounting."""
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Float, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.models.base import Base
+
+
+class LLMUsageCounter(Base):
+    """Daily running totals of LLM calls per feature and model."""
+
+    __tablename__ = "llm_usage_counter"
+    __table_args__ = (
+        UniqueConstraint("usage_date", "feature", "model_name", name="uq_llm_usage_counter_day_feature_model"),
+    )
+
+    usage_date: Mapped[date] = mapped_column(Date, nullable=False)
+    feature: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    errors: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rate_limited: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    coalesced: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    input_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    latency_ms_total: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
@@ -12,6 +12,7 @@ from sqlalchemy import (
     Enum as SAEnum,
     Float,
     ForeignKey,
+    JSON,
     String,
     UniqueConstraint,
 )
@@ -316,6 +317,29 @@ class NutritionIngredientProfile(Base):
     ingredients: Mapped[list["NutritionIngredient"]] = relationship(back_populates="profile")
 
 
+class NutritionReferenceFood(Base):
+    """User-independent nutrient profile keyed by normalized food name and unit.
+
+    Filled by the USDA importer (``source="usda"``, per 100 g) and by LLM
+    nutrient lookups (``source="llm"``), so a food is researched once for
+    every user.
+    """
+
+    __tablename__ = "nutrition_reference_foods"
+    __table_args__ = (
+        UniqueConstraint("normalized_name", "unit", name="uq_nutrition_reference_food_name_unit"),
+    )
+
+    normalized_name: Mapped[str] = mapped_column(String(255), index=True)
+    unit: Mapped[str] = mapped_column(String(64))
+    display_name: Mapped[str] = mapped_column(String(255))
+    source: Mapped[str] = mapped_column(String(32))
+    source_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+
+    for definition in NUTRIENT_DEFINITIONS:
+        locals()[definition.column_name] = mapped_column(Float, nullable=True)
+
+
 class NutritionIngredientStatus(str, Enum):
     CONFIRMED = "confirmed"
     UNCONFIRMED = "unconfirmed"
@@ -363,6 +387,10 @@ class NutritionRecipe(Base):
     )
     source: Mapped[str | None] = mapped_column(String(64), nullable=True)
     owner_user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=False, default=1)
+    # Per-serving leaf ingredients and nutrient totals, materialized by
+    # ``nutrition_recipe_expander.materialize_recipes``. NULL means stale.
+    flat_components: Mapped[list | None] = mapped_column(JSON(none_as_null=True), nullable=True)
+    flat_nutrients: Mapped[dict | None] = mapped_column(JSON(none_as_null=True), nullable=True)
 
     components: Mapped[list["NutritionRecipeComponent"]] = relationship(
         back_populates="recipe", cascade="all, delete-orphan", foreign_keys="NutritionRecipeComponent.recipe_id"
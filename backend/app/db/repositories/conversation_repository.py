@@ -0,0 +1,99 @@
+"""Persistence for assistant conversation sessions."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.conversation import ConversationSession
+
+
+class ConversationRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get(self, namespace: str, session_key: str, *, user_id: int) -> ConversationSession | None:
+        """The user's session under ``session_key``; other users' sessions are never returned."""
+        stmt = (
+            select(ConversationSession)
+            .where(
+                ConversationSession.namespace == namespace,
+                ConversationSession.user_id == user_id,
+                ConversationSession.session_key == session_key,
+            )
+            # Re-reads after a conflict must see the other writer's row, not the identity map's copy.
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def create(
+        self,
+        namespace: str,
+        session_key: str,
+        *,
+        user_id: int,
+        summary: str | None,
+        turns: list[dict[str, Any]],
+        summarized_turns: int,
+    ) -> int | None:
+        """Insert a new session and return its version, or None if another writer created it first."""
+        row = ConversationSession(
+            namespace=namespace,
+            session_key=session_key,
+            user_id=user_id,
+            summary=summary,
+            turns=turns,
+            summarized_turns=summarized_turns,
+            version=1,
+        )
+        try:
+            async with self.session.begin_nested():
+                self.session.add(row)
+        except IntegrityError:
+            return None
+        return row.version
+
+    async def update(
+        self,
+        namespace: str,
+        session_key: str,
+        *,
+        expected_version: int,
+        user_id: int,
+        summary: str | None,
+        turns: list[dict[str, Any]],
+        summarized_turns: int,
+    ) -> int | None:
+        """Overwrite a session still at ``expected_version``; None when another writer got there first.
+
+        The write joins the caller's transaction and is persisted by its commit.
+        """
+        values: dict[str, Any] = {
+            "summary": summary,
+            "turns": turns,
+            "summarized_turns": summarized_turns,
+            "version": expected_version + 1,
+        }
+        stmt = (
+            update(ConversationSession)
+            .where(
+                ConversationSession.namespace == namespace,
+                ConversationSession.user_id == user_id,
+                ConversationSession.session_key == session_key,
+                ConversationSession.version == expected_version,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return expected_version + 1 if result.rowcount else None
+
+    async def delete_idle(self, before: datetime) -> int:
+        """Delete sessions last written before ``before``; returns the number removed."""
+        stmt = delete(ConversationSession).where(ConversationSession.updated_at < before)
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
@@ -0,0 +1,70 @@
+"""Persistence helpers for per-feature LLM usage counters."""
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.llm_usage import LLMUsageCounter
+from app.utils.timezone import eastern_now
+
+COUNTER_FIELDS = (
+    "calls",
+    "errors",
+    "rate_limited",
+    "coalesced",
+    "input_tokens",
+    "output_tokens",
+    "latency_ms_total",
+    "cost_usd",
+)
+
+
+class LLMUsageRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add_counters(self, rows: list[dict[str, Any]]) -> None:
+        """Add counter deltas onto the daily rows, creating them as needed.
+
+        Each row carries ``usage_date``, ``feature``, ``model_name`` and any of
+        ``COUNTER_FIELDS``; missing counters count as zero.
+        """
+        if not rows:
+            return
+        now = eastern_now()
+        values = [
+            {
+                "usage_date": row["usage_date"],
+                "feature": row["feature"],
+                "model_name": row["model_name"],
+                **{name: row.get(name, 0) for name in COUNTER_FIELDS},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for row in rows
+        ]
+        stmt = pg_insert(LLMUsageCounter).values(values)
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_llm_usage_counter_day_feature_model",
+                set_={
+                    **{
+                        name: getattr(LLMUsageCounter, name) + getattr(stmt.excluded, name)
+                        for name in COUNTER_FIELDS
+                    },
+                    "updated_at": now,
+                },
+            )
+        )
+
+    async def list_since(self, since: date) -> list[LLMUsageCounter]:
+        result = await self.session.execute(
+            select(LLMUsageCounter)
+            .where(LLMUsageCounter.usage_date >= since)
+            .order_by(LLMUsageCounter.usage_date.desc(), LLMUsageCounter.feature, LLMUsageCounter.model_name)
+        )
+        return list(result.scalars().all())
@@ -1,12 +1,17 @@
 """Daily metrics persistence helpers."""
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.models.entities import DailyMetric, ReadinessInsight
+from app.db.models.entities import DailyMetric, MetricRollup, ReadinessInsight
+from app.utils.metric_rollups import affected_periods, build_rollups, period_end, period_start
+from app.utils.timezone import eastern_now
 from loguru import logger
 
 
@@ -82,3 +87,58 @@ class MetricsRepository:
         )
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
+
+    async def summarize_range(self, user_id: int, start_date: date) -> tuple[int, float, float]:
+        """Return ``(day_count, training_volume_seconds_sum, training_load_sum)`` since ``start_date``."""
+        stmt = select(
+            func.count(),
+            func.coalesce(func.sum(DailyMetric.training_volume_seconds), 0),
+            func.coalesce(func.sum(DailyMetric.training_load), 0),
+        ).where(DailyMetric.user_id == user_id, DailyMetric.metric_date >= start_date)
+        row = (await self.session.execute(stmt)).one()
+        return int(row[0] or 0), float(row[1] or 0), float(row[2] or 0)
+
+    async def refresh_rollups(self, user_id: int, changed_dates: Iterable[date]) -> int:
+        """Recompute the weekly/monthly rollups containing ``changed_dates``."""
+        periods = affected_periods(changed_dates)
+        starts = [(start, period) for period, period_starts in periods.items() for start in period_starts]
+        if not starts:
+            return 0
+        window_start = min(start for start, _ in starts)
+        window_end = max(period_end(start, period) for start, period in starts)
+        rows = await self.list_metrics_between(user_id, window_start, window_end)
+        records = build_rollups(user_id, rows, periods)
+        now = eastern_now()
+        # SQLite runs the same upsert for the benchmark suite's stand-in database.
+        insert = pg_insert if self.session.get_bind().dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(MetricRollup).values(
+            [{**record, "created_at": now, "updated_at": now} for record in records]
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "period", "period_start", "metric"],
+                set_={
+                    "sample_count": stmt.excluded.sample_count,
+                    "min_value": stmt.excluded.min_value,
+                    "max_value": stmt.excluded.max_value,
+                    "avg_value": stmt.excluded.avg_value,
+                    "sum_value": stmt.excluded.sum_value,
+                    "updated_at": now,
+                },
+            )
+        )
+        return len(records)
+
+    async def list_rollups(self, user_id: int, period: str, start_date: date) -> list[MetricRollup]:
+        """Rollups whose period overlaps ``start_date`` onwards, oldest first."""
+        stmt = (
+            select(MetricRollup)
+            .where(
+                MetricRollup.user_id == user_id,
+                MetricRollup.period == period,
+                MetricRollup.period_start >= period_start(start_date, period),
+            )
+            .order_by(MetricRollup.period_start, MetricRollup.metric)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
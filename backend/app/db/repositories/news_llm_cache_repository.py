@@ -0,0 +1,53 @@
+"""Persistence helpers for cached news LLM outputs."""
+from __future__ import annotations
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.ai_digest import NewsLLMCacheEntry
+from app.utils.timezone import eastern_now
+
+
+class NewsLLMCacheRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_many(self, kind: str, content_hashes: list[str]) -> dict[str, str]:
+        """Return cached values for the given hashes; missing hashes are omitted."""
+        if not content_hashes:
+            return {}
+        result = await self.session.execute(
+            select(NewsLLMCacheEntry.content_hash, NewsLLMCacheEntry.value).where(
+                NewsLLMCacheEntry.kind == kind,
+                NewsLLMCacheEntry.content_hash.in_(content_hashes),
+            )
+        )
+        return {row.content_hash: row.value for row in result}
+
+    async def upsert_many(self, kind: str, values: dict[str, str], *, model_name: str | None) -> None:
+        """Insert or overwrite cached values for ``kind`` in one statement."""
+        if not values:
+            return
+        now = eastern_now()
+        stmt = pg_insert(NewsLLMCacheEntry).values([
+            {
+                "kind": kind,
+                "content_hash": content_hash,
+                "value": value,
+                "model_name": model_name,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for content_hash, value in values.items()
+        ])
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_news_llm_cache_kind_hash",
+                set_={
+                    "value": stmt.excluded.value,
+                    "model_name": stmt.excluded.model_name,
+                    "updated_at": now,
+                },
+            )
+        )
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import re
+from collections.abc import Iterable
 
 import sqlalchemy as sa
 from sqlalchemy import select
@@ -17,20 +17,50 @@ from app.db.models.nutrition import (
     NutritionRecipeComponent,
     NUTRIENT_DEFINITIONS,
 )
+from app.utils.trigram import TrigramIndex, trigrams
+
+
+async def _search_by_name_similarity(
+    session: AsyncSession,
+    model: type[NutritionIngredient] | type[NutritionRecipe],
+    owner_user_id: int,
+    query: str,
+    *,
+    limit: int,
+    min_score: float,
+    options: tuple,
+) -> list:
+    """Top ``limit`` rows of ``model`` owned by the user, ranked by trigram similarity of the name.
+
+    Postgres ranks in SQL with ``pg_trgm`` (``%`` uses the GIN index on
+    ``lower(name)``, so candidates at or above ``pg_trgm.similarity_threshold``
+    are found without a scan). Other dialects rank with an in-process
+    ``TrigramIndex`` over the user's names, which is equivalent but linear.
+    """
+    needle = query.lower().strip()
+    if not trigrams(needle):
+        return []
+    if session.get_bind().dialect.name == "postgresql":
+        lowered = sa.func.lower(model.name)
+        score = sa.func.similarity(lowered, needle)
+        stmt = (
+            select(model)
+            .where(model.owner_user_id == owner_user_id, lowered.op("%")(needle), score >= min_score)
+            .options(*options)
+            .order_by(score.desc(), model.name.asc())
+            .limit(limit)
+        )
+        result = await session.execute(stmt)
+        return list(result.scalars().all())
 
-
-_TOKEN_RE = re.compile(r"[a-z0-9]+")
-
-
-def _tokenize(text: str) -> set[str]:
-    return set(_TOKEN_RE.findall(text.lower()))
-
-
-def _token_overlap_score(query_tokens: set[str], name_tokens: set[str]) -> float:
-    if not query_tokens or not name_tokens:
-        return 0.0
-    overlap = len(query_tokens & name_tokens)
-    return overlap / max(len(query_tokens), len(name_tokens))
+    names = await session.execute(select(model.id, model.name).where(model.owner_user_id == owner_user_id))
+    ranked = TrigramIndex((row.id, row.name) for row in names).search(needle, limit=limit, min_score=min_score)
+    if not ranked:
+        return []
+    ids = [key for key, _ in ranked]
+    result = await session.execute(select(model).where(model.id.in_(ids)).options(*options))
+    by_id = {row.id: row for row in result.scalars().all()}
+    return [by_id[key] for key in ids if key in by_id]
 
 
 class NutritionIngredientsRepository:
@@ -88,32 +118,15 @@ class NutritionIngredientsRepository:
     async def search_ingredients_fuzzy(
         self, owner_user_id: int, query: str, *, limit: int = 5, min_score: float = 0.4
     ) -> list[NutritionIngredient]:
-        query_tokens = _tokenize(query)
-        if not query_tokens:
-            return []
-
-        # Pre-filter at the SQL level so we don't load the entire table
-        stmt = (
-            select(NutritionIngredient)
-            .where(NutritionIngredient.owner_user_id == owner_user_id)
-            .options(selectinload(NutritionIngredient.profile))
+        return await _search_by_name_similarity(
+            self.session,
+            NutritionIngredient,
+            owner_user_id,
+            query,
+            limit=limit,
+            min_score=min_score,
+            options=(selectinload(NutritionIngredient.profile),),
         )
-        token_filters = [
-            sa.func.lower(NutritionIngredient.name).like(f"%{token}%")
-            for token in query_tokens
-        ]
-        stmt = stmt.where(sa.or_(*token_filters))
-
-        result = await self.session.execute(stmt)
-        candidates = list(result.scalars().all())
-
-        scored = [
-            (_token_overlap_score(query_tokens, _tokenize(ing.name)), ing)
-            for ing in candidates
-        ]
-        scored = [(score, ing) for score, ing in scored if score >= min_score]
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [ing for _, ing in scored[:limit]]
 
     async def create_ingredient(
         self,
@@ -246,39 +259,22 @@ class NutritionRecipesRepository:
     async def search_recipes_fuzzy(
         self, owner_user_id: int, query: str, *, limit: int = 5, min_score: float = 0.3
     ) -> list[NutritionRecipe]:
-        query_tokens = _tokenize(query)
-        if not query_tokens:
-            return []
-
-        # Pre-filter at the SQL level so we don't load the entire table
-        stmt = (
-            select(NutritionRecipe)
-            .where(NutritionRecipe.owner_user_id == owner_user_id)
-            .options(
+        return await _search_by_name_similarity(
+            self.session,
+            NutritionRecipe,
+            owner_user_id,
+            query,
+            limit=limit,
+            min_score=min_score,
+            options=(
                 selectinload(NutritionRecipe.components)
                 .selectinload(NutritionRecipeComponent.ingredient)
                 .selectinload(NutritionIngredient.profile),
                 selectinload(NutritionRecipe.components).selectinload(
                     NutritionRecipeComponent.child_recipe
                 ),
-            )
+            ),
         )
-        token_filters = [
-            sa.func.lower(NutritionRecipe.name).like(f"%{token}%")
-            for token in query_tokens
-        ]
-        stmt = stmt.where(sa.or_(*token_filters))
-
-        result = await self.session.execute(stmt)
-        candidates = list(result.scalars().all())
-
-        scored = [
-            (_token_overlap_score(query_tokens, _tokenize(r.name)), r)
-            for r in candidates
-        ]
-        scored = [(score, r) for score, r in scored if score >= min_score]
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [r for _, r in scored[:limit]]
 
     async def create_recipe(
         self,
@@ -356,3 +352,54 @@ class NutritionRecipesRepository:
         if components is not None:
             await self.replace_components(recipe, components)
         return recipe
+
+    async def list_components(self, recipe_id: int) -> list[NutritionRecipeComponent]:
+        """Direct components with leaf profiles and child recipes (one level, no recursion)."""
+        stmt = (
+            select(NutritionRecipeComponent)
+            .where(NutritionRecipeComponent.recipe_id == recipe_id)
+            .options(
+                selectinload(NutritionRecipeComponent.ingredient).selectinload(NutritionIngredient.profile),
+                selectinload(NutritionRecipeComponent.child_recipe),
+            )
+            .order_by(NutritionRecipeComponent.position.asc(), NutritionRecipeComponent.id.asc())
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def invalidate_flattened(
+        self,
+        *,
+        recipe_ids: Iterable[int] = (),
+        ingredient_ids: Iterable[int] = (),
+    ) -> set[int]:
+        """Mark recipes stale along with every recipe that transitively contains them.
+
+        ``ingredient_ids`` invalidates each recipe using one of those ingredients
+        directly, and then its ancestors. Returns the invalidated recipe ids.
+        """
+        frontier = set(recipe_ids)
+        ingredient_ids = list(ingredient_ids)
+        if ingredient_ids:
+            result = await self.session.execute(
+                select(NutritionRecipeComponent.recipe_id).where(
+                    NutritionRecipeComponent.ingredient_id.in_(ingredient_ids)
+                )
+            )
+            frontier.update(result.scalars())
+        stale: set[int] = set()
+        while frontier:
+            stale |= frontier
+            result = await self.session.execute(
+                select(NutritionRecipeComponent.recipe_id).where(
+                    NutritionRecipeComponent.child_recipe_id.in_(frontier)
+                )
+            )
+            frontier = set(result.scalars()) - stale
+        if stale:
+            await self.session.execute(
+                sa.update(NutritionRecipe)
+                .where(NutritionRecipe.id.in_(stale))
+                .values(flat_components=None, flat_nutrients=None)
+            )
+        return stale
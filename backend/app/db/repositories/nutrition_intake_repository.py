@@ -3,12 +3,14 @@ from __future__ import annotations
 from datetime import date
 from typing import Sequence
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.db.models.nutrition import (
+    NUTRIENT_DEFINITIONS,
     NutritionIngredient,
+    NutritionIngredientProfile,
     NutritionIntake,
     NutritionIntakeSource,
     NutritionRecipe,
@@ -68,6 +70,36 @@ class NutritionIntakeRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def sum_nutrients_by_day(self, user_id: int, start: date, end: date) -> dict[date, dict[str, float]]:
+        """Per-day nutrient totals (``quantity * profile value``) summed in SQL.
+
+        One row per day that has intake; missing profile values are skipped
+        rather than nulling the day's total.
+        """
+        sums = [
+            func.coalesce(
+                func.sum(NutritionIntake.quantity * getattr(NutritionIngredientProfile, definition.column_name)),
+                0.0,
+            ).label(definition.slug)
+            for definition in NUTRIENT_DEFINITIONS
+        ]
+        stmt = (
+            select(NutritionIntake.day_date, *sums)
+            .join(NutritionIngredient, NutritionIntake.ingredient_id == NutritionIngredient.id)
+            .join(NutritionIngredientProfile, NutritionIngredient.profile_id == NutritionIngredientProfile.id)
+            .where(
+                NutritionIntake.user_id == user_id,
+                NutritionIntake.day_date >= start,
+                NutritionIntake.day_date <= end,
+            )
+            .group_by(NutritionIntake.day_date)
+        )
+        result = await self.session.execute(stmt)
+        return {
+            row.day_date: {definition.slug: float(getattr(row, definition.slug)) for definition in NUTRIENT_DEFINITIONS}
+            for row in result
+        }
+
     async def fetch_for_day_with_food(
         self, user_id: int, day: date
     ) -> list[NutritionIntake]:
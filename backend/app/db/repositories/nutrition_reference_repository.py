@@ -0,0 +1,90 @@
+"""Persistence helpers for the shared reference-food nutrient table."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.nutrition import NUTRIENT_DEFINITIONS, NutritionReferenceFood
+from app.utils.timezone import eastern_now
+from app.utils.trigram import TrigramIndex, trigrams
+
+_NUTRIENT_COLUMNS = tuple(definition.column_name for definition in NUTRIENT_DEFINITIONS)
+
+
+class NutritionReferenceRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def get_by_units(self, normalized_name: str, units: Iterable[str]) -> dict[str, NutritionReferenceFood]:
+        """Rows for ``normalized_name`` keyed by unit, limited to ``units``."""
+        units = list(units)
+        if not units:
+            return {}
+        result = await self.session.execute(
+            select(NutritionReferenceFood).where(
+                NutritionReferenceFood.normalized_name == normalized_name,
+                NutritionReferenceFood.unit.in_(units),
+            )
+        )
+        return {row.unit: row for row in result.scalars()}
+
+    async def search_names(
+        self, normalized_name: str, units: Iterable[str], *, limit: int, min_score: float
+    ) -> list[str]:
+        """Names that have a row in ``units``, ranked by trigram similarity to ``normalized_name``.
+
+        Postgres ranks with ``pg_trgm`` over the GIN index on ``normalized_name``;
+        other dialects rank with an in-process ``TrigramIndex``, which is
+        equivalent but linear.
+        """
+        units = list(units)
+        if not units or not trigrams(normalized_name):
+            return []
+        column = NutritionReferenceFood.normalized_name
+        if self.session.get_bind().dialect.name == "postgresql":
+            score = sa.func.similarity(column, normalized_name)
+            stmt = (
+                select(column, score.label("score"))
+                .where(NutritionReferenceFood.unit.in_(units), column.op("%")(normalized_name), score >= min_score)
+                .distinct()
+                .order_by(sa.desc("score"), column.asc())
+                .limit(limit)
+            )
+            result = await self.session.execute(stmt)
+            return [row.normalized_name for row in result]
+
+        names = await self.session.execute(select(column).where(NutritionReferenceFood.unit.in_(units)).distinct())
+        index = TrigramIndex((name, name) for name in names.scalars())
+        return [name for name, _ in index.search(normalized_name, limit=limit, min_score=min_score)]
+
+    async def upsert_many(self, rows: list[dict[str, Any]], *, overwrite: bool) -> None:
+        """Insert rows in one statement.
+
+        ``overwrite`` replaces existing (name, unit) rows (reference imports);
+        otherwise existing rows win (opportunistic LLM results).
+        """
+        if not rows:
+            return
+        now = eastern_now()
+        stmt = pg_insert(NutritionReferenceFood).values(
+            [{**row, "created_at": now, "updated_at": now} for row in rows]
+        )
+        if overwrite:
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_nutrition_reference_food_name_unit",
+                set_={
+                    "display_name": stmt.excluded.display_name,
+                    "source": stmt.excluded.source,
+                    "source_id": stmt.excluded.source_id,
+                    "updated_at": now,
+                    **{column: getattr(stmt.excluded, column) for column in _NUTRIENT_COLUMNS},
+                },
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(constraint="uq_nutrition_reference_food_name_unit")
+        await self.session.execute(stmt)
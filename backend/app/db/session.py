@@ -1,29 +1,175 @@
-"""Database session and engine management."""
+"""Database session and engine management.
+
+Pool sizes come from a named profile (``DATABASE_POOL_PROFILE``): ``web`` for
+the API process, which also runs the background refresh workers, ``worker``
+for long-running side processes such as the MCP server, and ``script`` for
+one-shot CLI jobs. ``DATABASE_POOL_SIZE`` / ``DATABASE_MAX_OVERFLOW`` override
+the profile.
+
+``DATABASE_REPLICA_URL`` adds a second engine for read-only endpoints
+(``get_read_session``); without it reads go to the primary.
+"""
 from __future__ import annotations
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,  # Turn off SQL logging for speed
-    future=True,
-    pool_size=5,  # Optimized for single user (was 20)
-    max_overflow=5,  # Less overflow needed (was 30)
-    pool_pre_ping=settings.database_pool_pre_ping,
-    pool_recycle=settings.database_pool_recycle_seconds,
-    pool_use_lifo=settings.database_pool_use_lifo,
-    connect_args={
+
+@dataclass(frozen=True)
+class PoolProfile:
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+
+
+POOL_PROFILES: dict[str, PoolProfile] = {
+    "web": PoolProfile(pool_size=10, max_overflow=10, pool_timeout=10),
+    "worker": PoolProfile(pool_size=4, max_overflow=4, pool_timeout=30),
+    "script": PoolProfile(pool_size=2, max_overflow=2, pool_timeout=60),
+}
+
+
+@dataclass
+class PoolCheckoutStats:
+    checkouts: int = 0
+    # Checkouts that found no idle connection and no overflow left, so had to queue.
+    waits: int = 0
+    checkout_seconds_total: float = 0.0
+    checkout_seconds_max: float = 0.0
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """``AsyncAdaptedQueuePool`` that records how long checkouts take."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolCheckoutStats()
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        if self.checkedin() == 0 and self._max_overflow > -1 and self.overflow() >= self._max_overflow:
+            self.stats.waits += 1
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stats.checkouts += 1
+            self.stats.checkout_seconds_total += elapsed
+            self.stats.checkout_seconds_max = max(self.stats.checkout_seconds_max, elapsed)
+
+    def recreate(self) -> InstrumentedAsyncQueuePool:
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def resolve_pool_profile() -> PoolProfile:
+    try:
+        profile = POOL_PROFILES[settings.database_pool_profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown DATABASE_POOL_PROFILE {settings.database_pool_profile!r}; "
+            f"expected one of {', '.join(POOL_PROFILES)}"
+        ) from None
+    return PoolProfile(
+        pool_size=settings.database_pool_size if settings.database_pool_size is not None else profile.pool_size,
+        max_overflow=(
+            settings.database_max_overflow if settings.database_max_overflow is not None else profile.max_overflow
+        ),
+        pool_timeout=profile.pool_timeout,
+    )
+
+
+def _connect_args(url: str) -> dict[str, Any]:
+    if "postgresql" not in url:
+        return {}
+    if settings.database_pgbouncer:
+        # Transaction-mode PgBouncer hands each transaction to any server
+        # connection, so named prepared statements cannot be cached or reused,
+        # and it rejects unknown startup parameters such as ``jit``.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            "command_timeout": 60,
+        }
+    return {
         "server_settings": {
             "jit": "off",  # Disable JIT for faster short queries
         },
         "command_timeout": 60,
-    } if "postgresql" in settings.database_url else {}
-)
+    }
+
+
+def _create_engine(url: str, profile: PoolProfile) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=False,  # Turn off SQL logging for speed
+        future=True,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=profile.pool_size,
+        max_overflow=profile.max_overflow,
+        pool_timeout=profile.pool_timeout,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_use_lifo=settings.database_pool_use_lifo,
+        connect_args=_connect_args(url),
+    )
+
+
+pool_profile = resolve_pool_profile()
+engine = _create_engine(settings.database_url, pool_profile)
+replica_engine = _create_engine(settings.database_replica_url, pool_profile) if settings.database_replica_url else None
 AsyncSessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+ReadSessionLocal = (
+    async_sessionmaker(bind=replica_engine, expire_on_commit=False, class_=AsyncSession)
+    if replica_engine is not None
+    else AsyncSessionLocal
+)
+
+
+def pool_status() -> dict[str, dict[str, Any]]:
+    """Live gauges and checkout counters for each engine's pool."""
+    engines = {"primary": engine}
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+    status: dict[str, dict[str, Any]] = {}
+    for name, item in engines.items():
+        pool = item.pool
+        stats = getattr(pool, "stats", PoolCheckoutStats())
+        status[name] = {
+            "profile": settings.database_pool_profile,
+            "size": pool.size(),
+            "max_overflow": pool_profile.max_overflow,
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "checkouts": stats.checkouts,
+            "waits": stats.waits,
+            "checkout_seconds_total": stats.checkout_seconds_total,
+            "checkout_seconds_max": stats.checkout_seconds_max,
+        }
+    return status
 
 
 async def get_session() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_session() -> AsyncSession:
+    """Session for read-only endpoints; uses the replica when one is configured.
+
+    Replica reads can trail the primary by its replay lag, so only use this
+    where briefly stale data is acceptable. The whole call path must be
+    read-only: a replica rejects writes, including lazy backfills.
+    """
+    async with ReadSessionLocal() as session:
+        yield session
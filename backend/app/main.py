@@ -5,9 +5,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import text
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
+from app.clients.llm_gateway import get_llm_gateway
+from app.core import query_budget, telemetry
 from app.core.config import settings
 from app.core.logging import configure_logging
-from app.db.session import engine
+from app.core.session_cache import get_session_cache
+from app.db.session import engine, pool_status, replica_engine
 
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -57,6 +60,58 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization"],
 )
+if settings.query_budget_enabled:
+    app.add_middleware(query_budget.QueryBudgetMiddleware)
+# Outermost, so the timings include the other middleware.
+app.add_middleware(telemetry.TelemetryMiddleware)
+
+
+def _pool_samples() -> list[telemetry.Sample]:
+    samples: list[telemetry.Sample] = []
+    for name, status in pool_status().items():
+        # QueuePool reports overflow as negative until the base pool has filled up.
+        connections = {
+            "checked_out": status["checked_out"],
+            "checked_in": status["checked_in"],
+            "overflow": max(status["overflow"], 0),
+        }
+        for state, value in connections.items():
+            samples.append(
+                ("db_pool_connections", "gauge", "Pool connections by state.", {"engine": name, "state": state}, value)
+            )
+        samples.append(("db_pool_checkouts_total", "counter", "Pool checkouts.", {"engine": name}, status["checkouts"]))
+        samples.append(
+            ("db_pool_waits_total", "counter", "Checkouts that queued for a connection.", {"engine": name}, status["waits"])
+        )
+        samples.append(
+            (
+                "db_pool_checkout_seconds_total",
+                "counter",
+                "Time spent acquiring pool connections.",
+                {"engine": name},
+                status["checkout_seconds_total"],
+            )
+        )
+    return samples
+
+
+def _session_cache_samples() -> list[telemetry.Sample]:
+    stats = get_session_cache().stats()
+    return [
+        ("session_cache_hits_total", "counter", "Login-session cache hits.", {}, stats["hits"]),
+        ("session_cache_misses_total", "counter", "Login-session cache misses.", {}, stats["misses"]),
+        ("session_cache_entries", "gauge", "Cached login sessions.", {}, stats["entries"]),
+    ]
+
+
+for _engine in (engine, replica_engine):
+    if _engine is None:
+        continue
+    telemetry.instrument_engine(_engine)
+    if settings.query_budget_enabled:
+        query_budget.instrument_engine(_engine)
+telemetry.register_collector(_pool_samples)
+telemetry.register_collector(_session_cache_samples)
 
 app.include_router(auth.router, prefix=settings.api_prefix)
 app.include_router(garmin.router, prefix=settings.api_prefix)
@@ -82,6 +137,11 @@ async def startup_event() -> None:
     await _init_database()
 
 
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await get_llm_gateway().flush()
+
+
 async def _init_database() -> None:
     # Schema changes are applied by Alembic in the container entrypoint.
     # Running DDL here can block startup indefinitely behind unrelated read locks.
@@ -106,3 +166,8 @@ async def _init_database() -> None:
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics() -> Response:
+    return Response(content=telemetry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
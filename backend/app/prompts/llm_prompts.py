@@ -814,6 +814,20 @@ RECIPE_SUGGESTION_PROMPT = (
     "Dish description: {description}"
 )
 
+CONVERSATION_SUMMARY_PROMPT = """
+Condense the earlier part of a chat between a user and their assistant so the assistant can keep helping.
+Merge the previous summary (if any) with the turns below into one summary of at most {max_words} words.
+Keep facts that later messages may refer back to: foods and quantities mentioned or logged, tasks created,
+names, dates, corrections the user made, and open questions. Drop greetings and filler.
+Return plain text only.
+
+Previous summary:
+{previous_summary}
+
+Turns:
+{turns}
+"""
+
 READINESS_PERSONA = (
     "You are Claude Monet reincarnated, a relaxed and calming presence. "
     "Speak with serene, impressionistic language that soothes the athlete while staying clear and actionable."
@@ -875,6 +889,13 @@ Return ONLY valid JSON (no backticks, no prose outside JSON) with the following
 - If journal entries reveal emotional context (stress, celebration, travel), reference it naturally.
 """
 
+READINESS_DELTA_INSTRUCTIONS = """
+The biometric inputs (HRV, resting HR, sleep, training load) are unchanged since the previous assessment below; only the lifestyle context has changed.
+- Copy "greeting", "hrv", "rhr", "sleep", and "training_load" from the previous assessment verbatim.
+- Re-evaluate "nutrition" and "productivity" against the updated lifestyle context.
+- Update "overall_readiness" only as far as the new context warrants; keep the same voice and keep the score close unless the context materially changes the picture.
+"""
+
 # ── Claude Code History Integration ─────────────────────────────────────
 
 CLAUDE_CODE_SESSION_SUMMARY_PROMPT = """\
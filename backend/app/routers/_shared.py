@@ -1,13 +1,21 @@
 """Shared helpers used across multiple router modules."""
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 
+from fastapi import Depends, Request
+
+from app.core.auth import get_current_user
+from app.db.models.entities import User
 from app.db.models.todo import TodoItem
 from app.db.session import AsyncSessionLocal
 from app.schemas.todos import TodoItemResponse
+from app.services.monet_context_service import invalidate_context
 from app.services.todo_project_suggestion_service import TodoProjectSuggestionService
 
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
 
 def build_todo_response(item: TodoItem, now_utc: datetime) -> TodoItemResponse:
     """Build a TodoItemResponse from a TodoItem, including all fields."""
@@ -35,3 +43,21 @@ async def run_project_suggestions(user_id: int, todo_ids: list[int]) -> None:
     async with AsyncSessionLocal() as session:
         service = TodoProjectSuggestionService(session)
         await service.process_todo_ids(user_id=user_id, todo_ids=todo_ids)
+
+
+def invalidates_monet_context(*sources: str) -> Callable[..., AsyncIterator[None]]:
+    """Build a router dependency that drops the caller's cached Monet context after a write.
+
+    Reads pass straight through; a mutating request that completes without
+    raising invalidates ``sources`` so the next chat turn sees the change.
+    """
+
+    async def _dependency(
+        request: Request,
+        current_user: User = Depends(get_current_user),
+    ) -> AsyncIterator[None]:
+        yield
+        if request.method not in _SAFE_METHODS:
+            invalidate_context(current_user.id, *sources)
+
+    return _dependency
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from datetime import timedelta
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.clients.llm_gateway import get_llm_gateway
 from app.core.auth import require_admin
-from app.db.session import get_session
+from app.core.session_cache import get_session_cache
+from app.db.session import get_session, pool_status
 from app.db.models.entities import User
-from app.schemas.admin import IngestionTriggerResponse
+from app.db.repositories.llm_usage_repository import LLMUsageRepository
+from app.schemas.admin import DatabasePoolStatus, IngestionTriggerResponse, LLMUsageRow, SessionCacheStats
 from app.services.insight_service import InsightService
 from app.services.metrics_service import MetricsService
-from app.utils.timezone import eastern_now
+from app.utils.timezone import eastern_now, eastern_today
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -29,3 +34,27 @@ async def trigger_ingestion(
         status="queued",
         message="Ingestion and insight refresh completed",
     )
+
+
+@router.get("/llm-usage", response_model=list[LLMUsageRow])
+async def llm_usage(
+    days: int = Query(default=7, ge=1, le=90),
+    _current_user: User = Depends(require_admin),
+    session: AsyncSession = Depends(get_session),
+) -> list[LLMUsageRow]:
+    """Per-feature LLM call, token, latency and cost totals per day."""
+    await get_llm_gateway().flush()
+    rows = await LLMUsageRepository(session).list_since(eastern_today() - timedelta(days=days - 1))
+    return [LLMUsageRow.model_validate(row, from_attributes=True) for row in rows]
+
+
+@router.get("/session-cache", response_model=SessionCacheStats)
+async def session_cache_stats(_current_user: User = Depends(require_admin)) -> SessionCacheStats:
+    """Size and hit rate of this process's login-session cache."""
+    return SessionCacheStats(**get_session_cache().stats())
+
+
+@router.get("/db-pool", response_model=dict[str, DatabasePoolStatus])
+async def db_pool(_current_user: User = Depends(require_admin)) -> dict[str, DatabasePoolStatus]:
+    """Connection pool gauges and checkout counters for the primary (and replica) engine."""
+    return {name: DatabasePoolStatus(**status) for name, status in pool_status().items()}
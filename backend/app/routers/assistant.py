@@ -1,17 +1,41 @@
 from __future__ import annotations
 
+import json
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.quotas import enforce_chat_quota
-from app.db.session import get_session
+from app.db.session import AsyncSessionLocal, get_session
 from app.db.models.entities import User
 from app.schemas.assistant import MonetMessageRequest, MonetMessageResponse
-from app.services.monet_assistant import MonetAssistantAgent
+from app.services.monet_assistant import AssistantResult, AssistantStreamEvent, MonetAssistantAgent
 
 router = APIRouter(prefix="/assistant", tags=["assistant"])
 
 
+def _to_response(result: AssistantResult) -> MonetMessageResponse:
+    return MonetMessageResponse(
+        session_id=result.session_id,
+        reply=result.reply,
+        nutrition_entries=result.nutrition_entries,
+        todo_items=result.todo_items,
+        tools_used=result.tools_used,
+        requires_confirmation=result.requires_confirmation,
+        proposed_actions=result.proposed_actions,
+        action_plan_id=result.action_plan_id,
+    )
+
+
+def _format_sse(event: AssistantStreamEvent) -> str:
+    data = event.data
+    if event.result is not None:
+        data = _to_response(event.result).model_dump(mode="json")
+    return f"event: {event.event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.post("/monet-message", response_model=MonetMessageResponse)
 async def monet_message(
     payload: MonetMessageRequest,
@@ -29,13 +53,40 @@ async def monet_message(
         execution_mode=payload.execution_mode,
         proposed_actions=payload.proposed_actions,
     )
-    return MonetMessageResponse(
-        session_id=result.session_id,
-        reply=result.reply,
-        nutrition_entries=result.nutrition_entries,
-        todo_items=result.todo_items,
-        tools_used=result.tools_used,
-        requires_confirmation=result.requires_confirmation,
-        proposed_actions=result.proposed_actions,
-        action_plan_id=result.action_plan_id,
+    return _to_response(result)
+
+
+@router.post("/monet-message/stream")
+async def monet_message_stream(
+    payload: MonetMessageRequest,
+    current_user: User = Depends(enforce_chat_quota),
+) -> StreamingResponse:
+    """Server-sent events version of ``/monet-message``.
+
+    Emits ``router``, ``tool_result`` and ``reply_delta`` events as the turn
+    progresses and finishes with a ``done`` event shaped like ``MonetMessageResponse``.
+    """
+    user_id = current_user.id
+
+    async def _events() -> AsyncIterator[str]:
+        # Request-scoped dependencies are torn down before the body streams,
+        # so the agent gets a session that lives as long as the generator.
+        async with AsyncSessionLocal() as session:
+            agent = MonetAssistantAgent(session)
+            async for event in agent.respond_stream(
+                user_id,
+                message=payload.message,
+                session_id=payload.session_id,
+                window_days=payload.window_days,
+                time_zone=payload.time_zone,
+                page_context=payload.page_context,
+                execution_mode=payload.execution_mode,
+                proposed_actions=payload.proposed_actions,
+            ):
+                yield _format_sse(event)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -26,6 +26,7 @@ from app.core.auth import (
     set_session_cookie,
 )
 from app.core.config import settings
+from app.core.session_cache import get_session_cache
 from app.db.models.entities import User, UserRole, UserSession
 from app.db.session import get_session
 from app.schemas.auth import AuthMeResponse, AuthUserResponse
@@ -208,6 +209,8 @@ async def _upsert_user(session: AsyncSession, payload: dict[str, Any]) -> User:
 
     await session.commit()
     await session.refresh(user)
+    # Cached sessions hold a copy of the user row; drop them so the new values show up.
+    get_session_cache().revoke_user(user.id)
     return user
 
 
@@ -292,6 +295,7 @@ async def logout(
         if session_obj:
             session_obj.revoked_at = eastern_now()
             await session.commit()
+        get_session_cache().revoke(token_hash)
     clear_session_cookie(response)
     response.status_code = status.HTTP_204_NO_CONTENT
     return response
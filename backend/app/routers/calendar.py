@@ -35,6 +35,7 @@ from app.services.google_calendar_connection_service import (
 )
 from app.services.google_calendar_event_service import GoogleCalendarEventService
 from app.services.google_calendar_sync_service import GoogleCalendarSyncService
+from app.services.monet_context_service import invalidate_context
 from app.utils.calendar_helpers import build_calendar_event_response, is_declined_attendee
 
 router = APIRouter(prefix="/calendar", tags=["calendar"])
@@ -215,6 +216,7 @@ async def update_calendar_selection(
     for calendar in calendars:
         calendar.selected = calendar.google_id in selected or calendar.is_life_dashboard
     await session.commit()
+    invalidate_context(current_user.id, "calendar")
     return CalendarListResponse(
         calendars=[
             CalendarSummary(
@@ -249,6 +251,7 @@ async def sync_calendar(
         window_end=window_end,
         force_full=False,
     )
+    invalidate_context(current_user.id, "calendar")
     return Response(status_code=202)
 
 
@@ -313,6 +316,7 @@ async def create_event(
         end_time=payload.end_time,
         is_all_day=payload.is_all_day,
     )
+    invalidate_context(current_user.id, "calendar")
     return build_calendar_event_response(event, calendar)
 
 
@@ -346,6 +350,7 @@ async def update_event(
         is_all_day=payload.is_all_day,
     )
     await session.refresh(event)
+    invalidate_context(current_user.id, "calendar")
     return build_calendar_event_response(event, calendar)
 
 
@@ -384,6 +389,7 @@ async def google_calendar_webhook(
         window_end=window_end,
         force_full=False,
     )
+    invalidate_context(calendar.user_id, "calendar")
     response.status_code = status.HTTP_200_OK
     return response
 
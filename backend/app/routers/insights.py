@@ -3,17 +3,18 @@ from __future__ import annotations
 import json
 from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi import APIRouter, Depends
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
 from app.core.config import settings
-from app.db.session import get_session, AsyncSessionLocal
+from app.db.session import get_session
 from app.db.models.entities import User
 from app.schemas.insights import InsightResponse
 from app.services.insight_service import InsightService
 from app.utils.timezone import EASTERN_TZ, eastern_now, eastern_today
+from app.workers.tasks import get_insight_refresh_controller
 
 router = APIRouter(prefix="/insights", tags=["insights"])
 
@@ -38,28 +39,19 @@ def _extract_pillar_from_narrative(narrative: str | None, pillar_name: str) -> t
     return score, note if isinstance(note, str) else None
 
 
-async def _background_refresh_insight(user_id: int) -> None:
-    """Refresh the daily insight in the background when stale."""
-    try:
-        async with AsyncSessionLocal() as session:
-            service = InsightService(session)
-            await service.refresh_daily_insight(user_id=user_id)
-    except Exception as exc:  # noqa: BLE001
-        logger.warning("Background insight refresh failed: {}", exc)
-
-
 @router.get("/daily", response_model=InsightResponse)
 async def latest_insight(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> InsightResponse:
     service = InsightService(session)
     metric = await service.fetch_latest_completed_metric(current_user.id)
 
+    # Stale reads share one in-flight refresh per (user, date); see InsightRefreshController.
+    refresher = get_insight_refresh_controller()
     if metric is None:
         now = eastern_now()
-        background_tasks.add_task(_background_refresh_insight, current_user.id)
+        await refresher.request_refresh(user_id=current_user.id)
         return InsightResponse(
             metric_date=now,
             readiness_score=None,
@@ -72,9 +64,10 @@ async def latest_insight(
 
     # Auto-trigger background refresh if insight is stale (older than today)
     today = eastern_today()
-    is_stale = metric.metric_date < today
-    if is_stale:
-        background_tasks.add_task(_background_refresh_insight, current_user.id)
+    refreshing = False
+    if metric.metric_date < today:
+        status = await refresher.request_refresh(user_id=current_user.id, metric_date=today)
+        refreshing = status.running
 
     insight = metric.readiness_insight
     source_model = insight.model_name if insight else settings.openai_model_name
@@ -99,7 +92,7 @@ async def latest_insight(
         narrative=narrative,
         source_model=source_model,
         last_updated=last_updated,
-        refreshing=is_stale,
+        refreshing=refreshing,
         greeting=metric.insight_greeting,
         hrv_value_ms=metric.insight_hrv_value,
         hrv_note=metric.insight_hrv_note,
@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
 from app.db.models.entities import User
-from app.db.session import AsyncSessionLocal, get_session
+from app.db.session import AsyncSessionLocal, get_read_session, get_session
 from app.schemas.journal import (
   JournalDayResponse,
   JournalDaySummaryResponse,
@@ -98,7 +98,7 @@ async def get_week(
   week_start: date,
   time_zone: str = Query("UTC"),
   current_user: User = Depends(get_current_user),
-  session: AsyncSession = Depends(get_session),
+  session: AsyncSession = Depends(get_read_session),
 ) -> JournalWeekResponse:
   week_end = week_start + timedelta(days=6)
   service = JournalService(session)
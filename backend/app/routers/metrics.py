@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-from collections import OrderedDict
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional
+import json
+from collections.abc import Awaitable, Callable
+from datetime import date, timedelta
+from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.auth import get_current_user
 from app.db.repositories.metrics_repository import MetricsRepository
 from app.db.session import get_session
-from app.db.models.entities import User
+from app.db.models.entities import MetricRollup, User
 from app.schemas.metrics import (
     DailyMetricResponse,
     MetricsOverviewResponse,
@@ -18,89 +20,163 @@ from app.schemas.metrics import (
     MetricDelta,
     TimeSeriesPoint,
 )
+from app.services.metrics_cache import etag_matches, get_metrics_cache
+from app.utils.downsampling import lttb_indices
+from app.utils.metric_rollups import PERIOD_MONTH, PERIOD_WEEK, ROLLUP_METRICS
 from app.utils.timezone import eastern_midnight, eastern_now, eastern_today
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
-# Simple bounded in-memory cache for personal use (LRU eviction at _CACHE_MAX_SIZE)
-_CACHE_MAX_SIZE = 64
-_cache: OrderedDict[str, tuple[Any, datetime]] = OrderedDict()
-CACHE_TTL = 300  # 5 minutes
+# Overview ranges longer than this are served from weekly rollups.
+ROLLUP_MIN_RANGE_DAYS = 90
+
+
+async def _cached_json(
+    request: Request,
+    *,
+    endpoint: str,
+    user_id: int,
+    params: dict[str, Any],
+    build: Callable[[], Awaitable[Any]],
+) -> Response:
+    """Serve ``build()`` through the versioned metrics cache with ETag revalidation.
+
+    Keys include the user's data version (bumped by ingest and insight refreshes)
+    and today's date, since the date windows below are relative to today.
+    """
+    cache = get_metrics_cache()
+    version = await cache.data_version(user_id)
+    if version is None:
+        return Response(content=json.dumps(jsonable_encoder(await build())), media_type="application/json")
+
+    key = cache.response_key(endpoint, user_id, version, {**params, "today": eastern_today().isoformat()})
+    headers = {"ETag": cache.etag(key), "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    body = await cache.get(key)
+    if body is None:
+        body = json.dumps(jsonable_encoder(await build()))
+        await cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.get("/overview", response_model=MetricsOverviewResponse)
 async def metrics_overview(
+    request: Request,
     range_days: int = Query(default=14, ge=1, le=365),
+    max_points: int | None = Query(
+        default=None,
+        ge=3,
+        le=1000,
+        description="Downsample each series to at most this many points",
+    ),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> MetricsOverviewResponse:
-    # Check cache first
-    cache_key = f"metrics_overview:{current_user.id}:{range_days}"
-    if cache_key in _cache:
-        cached_data, cached_time = _cache[cache_key]
-        if (datetime.now(timezone.utc) - cached_time).total_seconds() < CACHE_TTL:
-            _cache.move_to_end(cache_key)
-            return cached_data
-        else:
-            del _cache[cache_key]
+) -> Response:
+    return await _cached_json(
+        request,
+        endpoint="overview",
+        user_id=current_user.id,
+        params={"range_days": range_days, "max_points": max_points},
+        build=lambda: _build_overview(session, current_user.id, range_days, max_points),
+    )
 
+
+async def _build_overview(
+    session: AsyncSession,
+    user_id: int,
+    range_days: int,
+    max_points: int | None,
+) -> MetricsOverviewResponse:
     cutoff = eastern_today() - timedelta(days=range_days - 1)
     repo = MetricsRepository(session)
-    records = await repo.list_metrics_since(current_user.id, cutoff)
-    hrv_series = [
-        TimeSeriesPoint(timestamp=eastern_midnight(r.metric_date), value=r.hrv_avg_ms)
-        for r in records
-    ]
-    rhr_series = [
-        TimeSeriesPoint(timestamp=eastern_midnight(r.metric_date), value=r.rhr_bpm)
-        for r in records
-    ]
-    sleep_series = [
-        TimeSeriesPoint(
-            timestamp=eastern_midnight(r.metric_date),
-            value=(r.sleep_seconds / 3600 if r.sleep_seconds else None),
+    if range_days > ROLLUP_MIN_RANGE_DAYS:
+        # Long ranges: one point per week from the rollup table, totals from one aggregate query.
+        day_count, volume_seconds, load_sum = await repo.summarize_range(user_id, cutoff)
+        series = _rollup_series(await repo.list_rollups(user_id, PERIOD_WEEK, cutoff))
+        volume_hours_total = volume_seconds / 3600
+        training_load_avg = load_sum / day_count if day_count else None
+    else:
+        records = await repo.list_metrics_since(user_id, cutoff)
+        series = {
+            metric: [TimeSeriesPoint(timestamp=eastern_midnight(r.metric_date), value=extract(r)) for r in records]
+            for metric, extract in ROLLUP_METRICS.items()
+        }
+        volume_hours_total = sum((r.training_volume_seconds or 0) / 3600 for r in records)
+        training_load_avg = (
+            sum(r.training_load or 0 for r in records) / len(records)
+            if records
+            else None
         )
-        for r in records
-    ]
-    load_series = [
-        TimeSeriesPoint(timestamp=eastern_midnight(r.metric_date), value=r.training_load)
-        for r in records
-    ]
-    volume_hours_total = sum((r.training_volume_seconds or 0) / 3600 for r in records)
-    training_load_avg = (
-        sum(r.training_load or 0 for r in records) / len(records)
-        if records
-        else None
-    )
-    response = MetricsOverviewResponse(
+    if max_points is not None:
+        series = {metric: _downsample(points, max_points) for metric, points in series.items()}
+    return MetricsOverviewResponse(
         generated_at=eastern_now(),
         range_label=f"last {range_days} days",
         training_volume_hours=round(volume_hours_total, 2),
         training_volume_window_days=range_days,
         training_load_avg=training_load_avg,
-        training_load_trend=load_series,
-        hrv_trend_ms=hrv_series,
-        rhr_trend_bpm=rhr_series,
-        sleep_trend_hours=sleep_series,
+        training_load_trend=series["training_load"],
+        hrv_trend_ms=series["hrv_avg_ms"],
+        rhr_trend_bpm=series["rhr_bpm"],
+        sleep_trend_hours=series["sleep_hours"],
     )
 
-    # Cache the response (bounded LRU)
-    _cache[cache_key] = (response, datetime.now(timezone.utc))
-    _cache.move_to_end(cache_key)
-    while len(_cache) > _CACHE_MAX_SIZE:
-        _cache.popitem(last=False)
-    return response
+
+def _rollup_series(rollups: list[MetricRollup]) -> dict[str, list[TimeSeriesPoint]]:
+    series: dict[str, list[TimeSeriesPoint]] = {metric: [] for metric in ROLLUP_METRICS}
+    for rollup in rollups:
+        if rollup.metric in series:
+            series[rollup.metric].append(
+                TimeSeriesPoint(timestamp=eastern_midnight(rollup.period_start), value=rollup.avg_value)
+            )
+    return series
+
+
+def _downsample(points: list[TimeSeriesPoint], max_points: int) -> list[TimeSeriesPoint]:
+    """LTTB-downsample a series; gaps are dropped since they carry no shape."""
+    present = [point for point in points if point.value is not None]
+    if len(points) <= max_points:
+        return points
+    keep = lttb_indices([(point.timestamp.timestamp(), point.value) for point in present], max_points)
+    return [present[i] for i in keep]
 
 
 @router.get("/daily", response_model=list[DailyMetricResponse])
 async def daily_metrics(
+    request: Request,
     range_days: int = Query(default=30, ge=1, le=365),
+    max_points: int | None = Query(
+        default=None,
+        ge=1,
+        le=1000,
+        description="When the range has more days than this, return at most this many weekly or monthly rollup rows",
+    ),
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
+) -> Response:
+    return await _cached_json(
+        request,
+        endpoint="daily",
+        user_id=current_user.id,
+        params={"range_days": range_days, "max_points": max_points},
+        build=lambda: _build_daily(session, current_user.id, range_days, max_points),
+    )
+
+
+async def _build_daily(
+    session: AsyncSession,
+    user_id: int,
+    range_days: int,
+    max_points: int | None,
 ) -> list[DailyMetricResponse]:
     cutoff = eastern_today() - timedelta(days=range_days - 1)
     repo = MetricsRepository(session)
-    records = await repo.list_metrics_since(current_user.id, cutoff)
+    if max_points is not None and range_days > max_points:
+        period = PERIOD_WEEK if (range_days + 6) // 7 <= max_points else PERIOD_MONTH
+        # Monthly buckets can still outnumber a small max_points, so cap after bucketing.
+        return _thin_rows(_rollup_rows(await repo.list_rollups(user_id, period, cutoff)), max_points)
+    records = await repo.list_metrics_since(user_id, cutoff)
     return [
         DailyMetricResponse(
             date=r.metric_date,
@@ -117,6 +193,37 @@ async def daily_metrics(
     ]
 
 
+def _rollup_rows(rollups: list[MetricRollup]) -> list[DailyMetricResponse]:
+    """One row per period (dated at its first day) carrying each metric's average."""
+    by_start: dict[date, dict[str, float | None]] = {}
+    for rollup in rollups:
+        by_start.setdefault(rollup.period_start, {})[rollup.metric] = rollup.avg_value
+    return [
+        DailyMetricResponse(
+            date=start,
+            hrv_avg_ms=values.get("hrv_avg_ms"),
+            rhr_bpm=values.get("rhr_bpm"),
+            sleep_hours=values.get("sleep_hours"),
+            training_load=values.get("training_load"),
+            training_volume_hours=None,
+            readiness_score=None,
+            readiness_label=None,
+            readiness_narrative=None,
+        )
+        for start, values in sorted(by_start.items())
+    ]
+
+
+def _thin_rows(rows: list[DailyMetricResponse], max_points: int) -> list[DailyMetricResponse]:
+    """Evenly spaced subset of at most ``max_points`` rows that always keeps the latest."""
+    if len(rows) <= max_points:
+        return rows
+    if max_points == 1:
+        return rows[-1:]
+    step = (len(rows) - 1) / (max_points - 1)
+    return [rows[round(i * step)] for i in range(max_points)]
+
+
 def _average(values: list[float | None]) -> float | None:
     numeric = [v for v in values if v is not None]
     return sum(numeric) / len(numeric) if numeric else None
@@ -143,17 +250,28 @@ def _metric_delta(
 
 @router.get("/readiness-summary", response_model=ReadinessMetricsSummary)
 async def readiness_summary(
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
-) -> ReadinessMetricsSummary:
+) -> Response:
+    return await _cached_json(
+        request,
+        endpoint="readiness-summary",
+        user_id=current_user.id,
+        params={},
+        build=lambda: _build_readiness_summary(session, current_user.id),
+    )
+
+
+async def _build_readiness_summary(session: AsyncSession, user_id: int) -> ReadinessMetricsSummary:
     repo = MetricsRepository(session)
-    latest = await repo.get_latest_metric(current_user.id)
+    latest = await repo.get_latest_metric(user_id)
     if not latest:
         raise HTTPException(status_code=404, detail="No metrics available.")
 
     window_days = 14
     start = latest.metric_date - timedelta(days=window_days - 1)
-    history = await repo.list_metrics_between(current_user.id, start, latest.metric_date)
+    history = await repo.list_metrics_between(user_id, start, latest.metric_date)
 
     hrv_avg = _average([m.hrv_avg_ms for m in history])
     rhr_avg = _average([m.rhr_bpm for m in history])
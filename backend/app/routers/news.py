@@ -1,4 +1,4 @@
-"""News utilities — title shortening, article scoring, and annotations via LLM."""
+"""News utilities — title shortening, article scoring, and annotations via the shared news LLM service."""
 from __future__ import annotations
 
 import json
@@ -8,8 +8,10 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.core.auth import get_current_user
-from app.clients.openai_client import OpenAIResponsesClient
+from app.clients.llm_gateway import get_llm_gateway
+from app.clients.openai_client import get_shared_openai_client
 from app.db.models.entities import User
+from app.services.news_llm_service import NewsArticle, NewsLLMService, get_news_llm_service
 
 logger = logging.getLogger(__name__)
 
@@ -26,35 +28,17 @@ class ShortenResponse(BaseModel):
     short_titles: list[str]
 
 
-SHORTEN_PROMPT = """\
-You are a headline editor. For each title below, produce a punchy short version
-(max 50 characters) that preserves the core meaning. Return one short title per
-line, in the same order. No numbering, no quotes — just the shortened title.
-
-Titles:
-{titles}"""
-
-
 @router.post("/shorten-titles", response_model=ShortenResponse)
 async def shorten_titles(
     payload: ShortenRequest,
     _current_user: User = Depends(get_current_user),
+    news_llm: NewsLLMService = Depends(get_news_llm_service),
 ) -> ShortenResponse:
     if not payload.titles:
         return ShortenResponse(short_titles=[])
 
-    numbered = "\n".join(f"- {t}" for t in payload.titles)
-    prompt = SHORTEN_PROMPT.format(titles=numbered)
-
-    llm = OpenAIResponsesClient(model_name="gpt-4o-mini")
-    result = await llm.generate_text(prompt, temperature=0.3, max_output_tokens=1024)
-
-    lines = [line.strip() for line in result.text.strip().splitlines() if line.strip()]
-
-    short_titles = []
-    for i, original in enumerate(payload.titles):
-        short_titles.append(lines[i] if i < len(lines) else original)
-
+    # Cached per title; misses from concurrent requests share one model call.
+    short_titles = await news_llm.shorten_titles(payload.titles)
     return ShortenResponse(short_titles=short_titles)
 
 
@@ -90,6 +74,7 @@ Respond with JSON:
 async def summarize_profile(
     payload: ProfileSummarizeRequest,
     _current_user: User = Depends(get_current_user),
+    news_llm: NewsLLMService = Depends(get_news_llm_service),
 ) -> ProfileSummarizeResponse:
     prompt = PROFILE_PROMPT.format(
         projects=", ".join(payload.projects) or "none",
@@ -98,8 +83,7 @@ async def summarize_profile(
         reading=json.dumps(payload.reading_categories),
     )
 
-    llm = OpenAIResponsesClient(model_name="gpt-4o-mini")
-    result = await llm.generate_text(prompt, temperature=0.3, max_output_tokens=1024)
+    result = await news_llm.llm.generate_text(prompt, temperature=0.3, max_output_tokens=1024)
 
     try:
         data = json.loads(result.text.strip())
@@ -135,55 +119,24 @@ class ScoreResponse(BaseModel):
     scores: list[ArticleScore]
 
 
-SCORE_PROMPT = """\
-You are a news relevance scorer for a personal dashboard. Given the user profile
-and a list of articles, rate each article's relevance to this specific user on a
-scale of 1-10 (1=irrelevant, 10=perfectly matched to their interests).
-
-User profile:
-{profile}
-
-Articles (respond with a JSON array of {{"id": "...", "score": N}} for each):
-{articles}
-
-Respond ONLY with the JSON array, no other text."""
-
-
 @router.post("/score", response_model=ScoreResponse)
 async def score_articles(
     payload: ScoreRequest,
     _current_user: User = Depends(get_current_user),
+    news_llm: NewsLLMService = Depends(get_news_llm_service),
 ) -> ScoreResponse:
     if not payload.articles:
         return ScoreResponse(scores=[])
 
-    articles_text = "\n".join(
-        f'- id: {a.id} | title: "{a.title}" | category: {a.category} | summary: "{a.summary or ""}"'
-        for a in payload.articles
-    )
-    prompt = SCORE_PROMPT.format(
-        profile=payload.profile_narrative,
-        articles=articles_text,
+    scores = await news_llm.score_articles(
+        [NewsArticle(title=a.title, category=a.category, summary=a.summary) for a in payload.articles],
+        payload.profile_narrative,
     )
-
-    llm = OpenAIResponsesClient(model_name="gpt-4o-mini")
-    result = await llm.generate_text(prompt, temperature=0.2, max_output_tokens=4096)
-
-    try:
-        raw = result.text.strip()
-        # Handle markdown code blocks
-        if raw.startswith("```"):
-            raw = raw.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        data = json.loads(raw)
-        scores = [
-            ArticleScore(id=item["id"], score=max(1, min(10, float(item["score"]))))
-            for item in data
-            if "id" in item and "score" in item
-        ]
-        return ScoreResponse(scores=scores)
-    except (json.JSONDecodeError, KeyError, TypeError):
-        logger.warning("Failed to parse article scoring LLM response")
-        return ScoreResponse(scores=[])
+    return ScoreResponse(scores=[
+        ArticleScore(id=article.id, score=score)
+        for article, score in zip(payload.articles, scores)
+        if score is not None
+    ])
 
 
 # ── Personalized Annotations ─────────────────────────────────────────────
@@ -209,56 +162,24 @@ class AnnotateResponse(BaseModel):
     annotations: list[ArticleAnnotation]
 
 
-ANNOTATE_PROMPT = """\
-You are a personal news curator. For each article below, write a SHORT (max 15 words)
-annotation explaining why this specific user would care about it, based on their profile.
-
-User profile:
-{profile}
-
-Articles:
-{articles}
-
-Respond with a JSON array of {{"id": "...", "annotation": "..."}}.
-Keep annotations personal and specific — reference the user's projects, interests, or role.
-Examples: "Directly relevant to your wildfire prediction work" or "New tool for your ML pipeline"
-Respond ONLY with the JSON array."""
-
-
 @router.post("/annotate", response_model=AnnotateResponse)
 async def annotate_articles(
     payload: AnnotateRequest,
     _current_user: User = Depends(get_current_user),
+    news_llm: NewsLLMService = Depends(get_news_llm_service),
 ) -> AnnotateResponse:
     if not payload.articles:
         return AnnotateResponse(annotations=[])
 
-    articles_text = "\n".join(
-        f'- id: {a.id} | title: "{a.title}" | category: {a.category} | summary: "{a.summary or ""}"'
-        for a in payload.articles
-    )
-    prompt = ANNOTATE_PROMPT.format(
-        profile=payload.profile_narrative,
-        articles=articles_text,
+    annotations = await news_llm.annotate_articles(
+        [NewsArticle(title=a.title, category=a.category, summary=a.summary) for a in payload.articles],
+        payload.profile_narrative,
     )
-
-    llm = OpenAIResponsesClient(model_name="gpt-4o-mini")
-    result = await llm.generate_text(prompt, temperature=0.4, max_output_tokens=2048)
-
-    try:
-        raw = result.text.strip()
-        if raw.startswith("```"):
-            raw = raw.split("\n", 1)[1].rsplit("```", 1)[0].strip()
-        data = json.loads(raw)
-        annotations = [
-            ArticleAnnotation(id=item["id"], annotation=item["annotation"])
-            for item in data
-            if "id" in item and "annotation" in item
-        ]
-        return AnnotateResponse(annotations=annotations)
-    except (json.JSONDecodeError, KeyError, TypeError):
-        logger.warning("Failed to parse annotation LLM response")
-        return AnnotateResponse(annotations=[])
+    return AnnotateResponse(annotations=[
+        ArticleAnnotation(id=article.id, annotation=annotation)
+        for article, annotation in zip(payload.articles, annotations)
+        if annotation is not None
+    ])
 
 
 # ── Embeddings ───────────────────────────────────────────────────────────
@@ -280,10 +201,11 @@ async def embed_texts(
     if not payload.texts:
         return EmbedResponse(embeddings=[])
 
-    llm = OpenAIResponsesClient()
-    client = llm.client  # reuse the configured AsyncOpenAI client
+    client = get_shared_openai_client()  # reuse the pooled AsyncOpenAI client
 
-    resp = await client.embeddings.create(
+    resp = await get_llm_gateway().call(
+        client.embeddings.create,
+        feature="news",
         model="text-embedding-3-small",
         input=payload.texts,
     )
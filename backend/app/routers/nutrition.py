@@ -13,6 +13,7 @@ from app.db.models.nutrition import NUTRIENT_DEFINITIONS, NutritionIngredientSta
 from app.db.models.entities import User
 from app.db.repositories.nutrition_goals_repository import NutritionGoalsRepository
 from app.db.session import get_session
+from app.routers._shared import invalidates_monet_context
 from app.schemas.nutrition import (
     LogIntakeRequest,
     NutritionAssistantMessageRequest,
@@ -42,7 +43,11 @@ from app.services.nutrition_intake_service import NutritionIntakeService
 from app.utils.timezone import eastern_today
 
 
-router = APIRouter(prefix="/nutrition", tags=["nutrition"])
+router = APIRouter(
+    prefix="/nutrition",
+    tags=["nutrition"],
+    dependencies=[Depends(invalidates_monet_context("nutrition"))],
+)
 
 
 @router.get("/nutrients", response_model=list[NutrientDefinitionResponse])
@@ -340,6 +345,7 @@ async def daily_summary(
 async def history(
     days: int = 14,
     current_user: User = Depends(get_current_user),
+    # Primary, not the replica: goals are backfilled into a snapshot on first read.
     session: AsyncSession = Depends(get_session),
 ) -> NutritionHistoryResponse:
     service = NutritionIntakeService(session)
@@ -387,6 +393,7 @@ async def _assistant_message(
     session: AsyncSession = Depends(get_session),
 ) -> NutritionAssistantMessageResponse:
     agent = NutritionAssistantAgent(session)
+    # The id is returned for the client to send back, so the first turn is remembered under it too.
     session_id = payload.session_id or str(uuid4())
     response = await agent.respond(current_user.id, payload.message, session_id)
     return NutritionAssistantMessageResponse(
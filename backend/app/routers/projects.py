@@ -19,7 +19,7 @@ from app.db.repositories.todo_repository import TodoRepository
 from app.db.session import get_session
 from app.db.models.claude_code import ProjectActivity
 from app.db.models.project import Project
-from app.routers._shared import build_todo_response, run_project_suggestions
+from app.routers._shared import build_todo_response, invalidates_monet_context, run_project_suggestions
 from app.schemas.projects import (
   ProjectActivityResponse,
   ProjectBoardResponse,
@@ -32,7 +32,11 @@ from app.schemas.projects import (
 from app.schemas.todos import TodoCreateRequest, TodoItemResponse, TodoUpdateRequest
 
 
-router = APIRouter(prefix="/projects", tags=["projects"])
+router = APIRouter(
+  prefix="/projects",
+  tags=["projects"],
+  dependencies=[Depends(invalidates_monet_context("todos", "workspace"))],
+)
 
 
 @router.get("/board", response_model=ProjectBoardResponse)
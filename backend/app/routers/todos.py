@@ -11,7 +11,7 @@ from app.db.repositories.project_repository import ProjectRepository, TodoProjec
 from app.db.repositories.todo_repository import TodoRepository
 from app.db.session import get_session
 from app.db.models.entities import User
-from app.routers._shared import build_todo_response, run_project_suggestions
+from app.routers._shared import build_todo_response, invalidates_monet_context, run_project_suggestions
 from app.schemas.todos import (
   TodoCreateRequest,
   TodoAssistantMessageRequest,
@@ -25,7 +25,7 @@ from app.services.async_ai_service import AsyncAIService
 from app.utils.timezone import local_today, resolve_time_zone
 
 
-router = APIRouter(prefix="/todos", tags=["todos"])
+router = APIRouter(prefix="/todos", tags=["todos"], dependencies=[Depends(invalidates_monet_context("todos"))])
 
 
 @router.get("", response_model=list[TodoItemResponse])
@@ -13,12 +13,13 @@ from app.db.models.todo import VALID_TIME_HORIZONS
 from app.db.repositories.todo_repository import TodoRepository
 from app.db.session import get_session
 from app.db.models.entities import User
+from app.routers._shared import invalidates_monet_context
 from app.services.todo_calendar_link_service import TodoCalendarLinkService
 from app.services.async_ai_service import AsyncAIService
 from app.utils.timezone import resolve_time_zone
 
 
-router = APIRouter(prefix="/todos", tags=["todos"])
+router = APIRouter(prefix="/todos", tags=["todos"], dependencies=[Depends(invalidates_monet_context("todos"))])
 
 
 class BatchUpdateItem(BaseModel):
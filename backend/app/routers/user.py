@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_user
 from app.db.session import get_session
 from app.db.models.entities import User
+from app.routers._shared import invalidates_monet_context
 from app.schemas.nutrition import ScalingRuleListResponse
 from app.schemas.user_profile import (
     UserProfileResponse,
@@ -14,7 +15,11 @@ from app.schemas.user_profile import (
 from app.services.nutrition_goals_service import NutritionGoalsService
 from app.services.user_profile_service import UserProfileService
 
-router = APIRouter(prefix="/user", tags=["user"])
+router = APIRouter(
+    prefix="/user",
+    tags=["user"],
+    dependencies=[Depends(invalidates_monet_context("profile", "nutrition"))],
+)
 
 
 @router.get("/profile", response_model=UserProfileResponse)
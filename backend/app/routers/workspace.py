@@ -32,11 +32,15 @@ from app.schemas.workspace import (
     WorkspaceUpdateViewRequest,
     WorkspaceViewResponse,
 )
-from app.routers._shared import run_project_suggestions
+from app.routers._shared import invalidates_monet_context, run_project_suggestions
 from app.services.workspace_service import WorkspaceService
 
 
-router = APIRouter(prefix="/workspace", tags=["workspace"])
+router = APIRouter(
+    prefix="/workspace",
+    tags=["workspace"],
+    dependencies=[Depends(invalidates_monet_context("workspace"))],
+)
 ASSET_STORAGE_ROOT = Path("/tmp/life_dashboard_workspace_assets")
 MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB
 
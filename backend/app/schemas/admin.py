@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
 
 
@@ -8,3 +8,37 @@ class IngestionTriggerResponse(BaseModel):
     started_at: datetime
     status: str
     message: str
+
+
+class LLMUsageRow(BaseModel):
+    usage_date: date
+    feature: str
+    model_name: str
+    calls: int
+    errors: int
+    rate_limited: int
+    coalesced: int
+    input_tokens: int
+    output_tokens: int
+    latency_ms_total: int
+    cost_usd: float
+
+
+class SessionCacheStats(BaseModel):
+    entries: int
+    hits: int
+    misses: int
+    hit_rate: float
+
+
+class DatabasePoolStatus(BaseModel):
+    profile: str
+    size: int
+    max_overflow: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    waits: int
+    checkout_seconds_total: float
+    checkout_seconds_max: float
@@ -1,20 +1,11 @@
 """LLM-powered summarization for the AI Digest."""
 from __future__ import annotations
 
-import re
-
 from loguru import logger
 
-from app.clients.openai_client import OpenAIResponsesClient, get_shared_openai_client
+from app.clients.openai_client import OpenAIResponsesClient
 from app.db.models.ai_digest import DigestItem
-
-_SUMMARIZE_MODEL = "gpt-4o-mini"
-
-_SUMMARIZE_INSTRUCTIONS = (
-    "You are a concise technical news summarizer. For each item, write a 1-2 sentence "
-    "summary that captures the key takeaway for a software developer. Be specific about "
-    "what changed or what was announced. No hype, no filler."
-)
+from app.services.news_llm_service import NEWS_MODEL, get_news_llm_service
 
 _NARRATIVE_INSTRUCTIONS = (
     "You are a concise AI industry analyst writing a daily briefing for a software "
@@ -31,51 +22,28 @@ _NARRATIVE_INSTRUCTIONS = (
 class AIDigestLLMService:
 
     def __init__(self) -> None:
-        self._client = OpenAIResponsesClient(
-            client=get_shared_openai_client(),
-            model_name=_SUMMARIZE_MODEL,
-        )
+        self._client = OpenAIResponsesClient(model_name=NEWS_MODEL, feature="digest")
 
     async def summarize_items(self, items: list[DigestItem]) -> dict[int, str]:
         needs_summary = [item for item in items if not item.llm_summary and item.title]
         if not needs_summary:
             return {}
 
-        lines = []
-        for i, item in enumerate(needs_summary):
-            snippet = item.summary[:200] if item.summary else ""
-            lines.append(f"[{i+1}] {item.title}")
-            if snippet:
-                lines.append(f"    {snippet}")
-
-        prompt = (
-            "Summarize each numbered news item in 1-2 sentences. "
-            "Return ONLY numbered summaries matching the input numbers.\n\n"
-            + "\n".join(lines)
-        )
-
+        # Per-item summaries are cached by content hash in the shared news LLM
+        # service, so re-fetched or re-listed items never hit the model again.
         try:
-            result = await self._client.generate_text(
-                prompt,
-                temperature=0.2,
-                max_output_tokens=2000,
-                instructions=_SUMMARIZE_INSTRUCTIONS,
-            )
-            return self._parse_numbered_summaries(result.text, needs_summary)
+            summaries = await get_news_llm_service().summarize([
+                (item.title, item.summary[:200] if item.summary else "")
+                for item in needs_summary
+            ])
         except Exception as exc:
             logger.warning("LLM summarization failed, using RSS summaries: {}", exc)
             return {}
-
-    def _parse_numbered_summaries(self, text: str, items: list[DigestItem]) -> dict[int, str]:
-        summaries: dict[int, str] = {}
-        pattern = re.compile(r"^\s*\[?(\d+)\]?[.):]?\s*(.+)", re.MULTILINE)
-        for match in pattern.finditer(text):
-            idx = int(match.group(1)) - 1
-            if 0 <= idx < len(items):
-                summary = match.group(2).strip()
-                if summary:
-                    summaries[items[idx].id] = summary
-        return summaries
+        return {
+            item.id: summary
+            for item, summary in zip(needs_summary, summaries)
+            if summary
+        }
 
     async def generate_narrative(self, items: list[DigestItem]) -> str | None:
         if not items:
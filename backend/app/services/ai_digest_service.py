@@ -75,6 +75,9 @@ _TRACKING_PARAMS = frozenset({
 
 STALENESS_HOURS = 6
 
+# Postgres caps a statement at 32767 bind params; ~12 columns per row keeps this well under.
+INSERT_CHUNK_SIZE = 1000
+
 
 # ── URL Normalization ─────────────────────────────────────────────────
 
@@ -121,30 +124,55 @@ def _extract_significant_words(title: str) -> set[str]:
     return {w for w in words if len(w) >= 4 and w not in _STOPWORDS}
 
 
-def jaccard_title_similarity(title_a: str, title_b: str) -> float:
-    words_a = _extract_significant_words(title_a)
-    words_b = _extract_significant_words(title_b)
+def _jaccard(words_a: set[str], words_b: set[str]) -> float:
     if not words_a or not words_b:
         return 0.0
-    intersection = words_a & words_b
-    union = words_a | words_b
-    return len(intersection) / len(union)
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def jaccard_title_similarity(title_a: str, title_b: str) -> float:
+    return _jaccard(_extract_significant_words(title_a), _extract_significant_words(title_b))
 
 
 def deduplicate_by_title(items: list[dict]) -> list[dict]:
+    """Drop near-duplicate titles, keeping the copy from the highest-quality source.
+
+    Word sets are computed once per item, and candidates are found through an
+    inverted index of word -> kept slots, so each item is only compared against
+    kept items sharing at least one significant word (a prerequisite for any
+    non-zero Jaccard score). Candidates are checked in kept order, which keeps
+    the result identical to a full pairwise scan.
+    """
     kept: list[dict] = []
+    kept_words: list[set[str]] = []
+    index: dict[str, set[int]] = {}
     for item in items:
-        is_dup = False
-        for i, existing in enumerate(kept):
-            if jaccard_title_similarity(item["title"], existing["title"]) >= JACCARD_THRESHOLD:
-                item_quality = _SOURCE_QUALITY.get(item["source_name"], 0)
-                existing_quality = _SOURCE_QUALITY.get(existing["source_name"], 0)
-                if item_quality > existing_quality:
-                    kept[i] = item
-                is_dup = True
+        words = _extract_significant_words(item["title"])
+        candidates: set[int] = set()
+        for word in words:
+            candidates.update(index.get(word, ()))
+        match: int | None = None
+        for i in sorted(candidates):
+            if _jaccard(words, kept_words[i]) >= JACCARD_THRESHOLD:
+                match = i
                 break
-        if not is_dup:
+        if match is None:
+            for word in words:
+                index.setdefault(word, set()).add(len(kept))
             kept.append(item)
+            kept_words.append(words)
+            continue
+        existing = kept[match]
+        item_quality = _SOURCE_QUALITY.get(item["source_name"], 0)
+        existing_quality = _SOURCE_QUALITY.get(existing["source_name"], 0)
+        if item_quality > existing_quality:
+            # The slot now compares against the replacement's title, so re-point the index.
+            for word in kept_words[match] - words:
+                index[word].discard(match)
+            for word in words - kept_words[match]:
+                index.setdefault(word, set()).add(match)
+            kept[match] = item
+            kept_words[match] = words
     return kept
 
 
@@ -314,6 +342,25 @@ class AIDigestService:
             logger.warning("Narrative generation failed: {}", exc)
             return None
 
+    async def _insert_items(self, items: list[dict]) -> int:
+        """Insert items with multi-row ``INSERT ... ON CONFLICT DO NOTHING RETURNING id``.
+
+        Rows are sent in chunks so a large source list stays under the
+        Postgres bind-parameter limit. Returns the number of newly inserted rows.
+        """
+        new_count = 0
+        for start in range(0, len(items), INSERT_CHUNK_SIZE):
+            chunk = items[start:start + INSERT_CHUNK_SIZE]
+            stmt = (
+                pg_insert(DigestItem)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=["normalized_url"])
+                .returning(DigestItem.id)
+            )
+            result = await self._session.execute(stmt)
+            new_count += len(result.scalars().all())
+        return new_count
+
     async def run_pipeline(self) -> int:
         now = eastern_now()
         all_items: list[dict] = []
@@ -348,17 +395,9 @@ class AIDigestService:
         for item in unique_items:
             item["category"] = classify_topic(item["title"], item["source_name"])
 
-        new_count = 0
         for item in unique_items:
             item["fetched_at"] = now
-            stmt = (
-                pg_insert(DigestItem)
-                .values(**item)
-                .on_conflict_do_nothing(index_elements=["normalized_url"])
-            )
-            result = await self._session.execute(stmt)
-            if result.rowcount > 0:
-                new_count += 1
+        new_count = await self._insert_items(unique_items)
 
         await self._session.commit()
         logger.info("Digest pipeline complete: {} new items from {} total", new_count, len(unique_items))
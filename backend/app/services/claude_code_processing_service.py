@@ -44,7 +44,7 @@ class ClaudeCodeProcessingService:
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
-        self._openai = OpenAIResponsesClient()
+        self._openai = OpenAIResponsesClient(feature="claude_code")
 
     async def summarize_session(
         self,
@@ -5,8 +5,10 @@ from __future__ import annotations
 import asyncio
 import math
 import time
-from collections import OrderedDict
-from dataclasses import dataclass, field
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any
 from uuid import uuid4
 
@@ -14,6 +16,7 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.clients.openai_client import OpenAIResponsesClient
+from app.core.config import settings
 from app.prompts import (
     NUTRITION_FOOD_EXTRACTION_PROMPT,
     NUTRIENT_PROFILE_PROMPT,
@@ -40,7 +43,9 @@ from app.schemas.llm_outputs import (
     RecipeSuggestionOutput,
 )
 from app.core.exceptions import NotFoundException
-from app.services.nutrition_recipe_expander import expand_recipe_components
+from app.services.conversation_memory import Conversation, get_conversation_memory
+from app.services.nutrient_profile_cache import get_nutrient_profile_cache
+from app.services.nutrition_recipe_expander import expand_recipe_components, materialize_recipes
 from app.services.nutrition_units import NutritionUnitNormalizer
 from app.utils.timezone import eastern_today
 
@@ -55,52 +60,8 @@ _FUZZY_MATCH_PROMPT = (
 )
 
 
-@dataclass
-class _ConversationTurn:
-    role: str
-    content: str
-    timestamp: float = field(default_factory=time.time)
-
-
-class _ConversationMemory:
-    """In-memory LRU conversation store with TTL expiry (no DB migration needed)."""
-
-    MAX_SESSIONS = 64
-    MAX_TURNS_PER_SESSION = 20
-    TTL_SECONDS = 3600  # 1 hour
-
-    def __init__(self) -> None:
-        self._sessions: OrderedDict[str, list[_ConversationTurn]] = OrderedDict()
-
-    def get_history(self, session_id: str) -> list[_ConversationTurn]:
-        self._evict_expired()
-        turns = self._sessions.get(session_id, [])
-        self._sessions.move_to_end(session_id, last=True) if session_id in self._sessions else None
-        return turns
-
-    def add_turn(self, session_id: str, role: str, content: str) -> None:
-        self._evict_expired()
-        if session_id not in self._sessions:
-            if len(self._sessions) >= self.MAX_SESSIONS:
-                self._sessions.popitem(last=False)
-            self._sessions[session_id] = []
-        self._sessions[session_id].append(_ConversationTurn(role=role, content=content))
-        if len(self._sessions[session_id]) > self.MAX_TURNS_PER_SESSION:
-            self._sessions[session_id] = self._sessions[session_id][-self.MAX_TURNS_PER_SESSION:]
-        self._sessions.move_to_end(session_id, last=True)
-
-    def _evict_expired(self) -> None:
-        now = time.time()
-        expired = [
-            sid for sid, turns in self._sessions.items()
-            if turns and (now - turns[-1].timestamp) > self.TTL_SECONDS
-        ]
-        for sid in expired:
-            del self._sessions[sid]
-
-
-# Module-level singleton so memory persists across requests within the process
-_conversation_memory = _ConversationMemory()
+# Namespace of nutrition chats in the shared conversation memory.
+CONVERSATION_NAMESPACE = "nutrition"
 
 
 @dataclass
@@ -109,6 +70,28 @@ class NutritionAssistantResponse:
     logged_entries: list[dict[str, Any]]
 
 
+@dataclass
+class _RecipePlan:
+    """A suggested recipe resolved against the DB but not yet written."""
+
+    name: str
+    default_unit: str
+    servings: float
+    # name, unit, qty, ingredient (existing or None), nutrients + profile_cached (for missing ingredients)
+    rows: list[dict[str, Any]]
+    existing_recipe: NutritionRecipe | None = None
+
+
+@dataclass
+class _ResolvedFood:
+    name: str
+    quantity: float
+    unit: str
+    ingredient: NutritionIngredient | None = None
+    recipe: NutritionRecipe | None = None
+    plan: _RecipePlan | None = None
+
+
 class NutritionAssistantAgent:
     """Nutrition mentor that uses OpenAI for parsing and nutrient grounding."""
 
@@ -118,46 +101,156 @@ class NutritionAssistantAgent:
         self.recipes_repo = NutritionRecipesRepository(session)
         self.intake_repo = NutritionIntakeRepository(session)
         self.unit_normalizer = NutritionUnitNormalizer()
-        self.client = OpenAIResponsesClient()
-        self.memory = _conversation_memory
+        self.client = OpenAIResponsesClient(feature="chat")
+        self.memory = get_conversation_memory()
+        self.profile_cache = get_nutrient_profile_cache()
+        # The session is shared by concurrent resolutions; serialize its use.
+        self._db_lock = asyncio.Lock()
+        # Milliseconds per stage for the latest ``respond`` call. Stages that run
+        # concurrently ("lookup", "rerank", "suggest", "profile_cache",
+        # "nutrient_profile") are
+        # summed across tasks; "resolve" is the wall time of the whole fan-out.
+        self.last_timings: defaultdict[str, float] = defaultdict(float)
 
     async def respond(
         self, user_id: int, message: str, request_id: str | None = None
     ) -> NutritionAssistantResponse:
+        """Log the foods in ``message``.
+
+        Passing ``request_id`` (the chat session id) carries the conversation
+        across calls; one-off calls without it are not remembered.
+        """
+        remember = request_id is not None
         request_id = request_id or str(uuid4())
+        self.last_timings = defaultdict(float)
         logger.info(
             f"[nutrition] respond start id={request_id} user={user_id} text={message}"
         )
-        self.memory.add_turn(request_id, "user", message)
-        history = self.memory.get_history(request_id)
-        context_text = self._build_conversation_context(message, history)
-        parsed = await self._extract_food_mentions(context_text)
+        conversation = (
+            await self.memory.get(self.session, CONVERSATION_NAMESPACE, request_id, user_id=user_id)
+            if remember
+            else Conversation()
+        )
+        context_text = self._build_conversation_context(message, conversation)
+        with self._timed("extract"):
+            parsed = await self._extract_food_mentions(context_text)
         logger.info(
             f"[nutrition] parsed foods={parsed.get('foods')} summary={parsed.get('summary')}"
         )
         if not parsed["foods"]:
             logger.info(f"[nutrition] no foods detected for request id={request_id}")
-            return NutritionAssistantResponse(
-                reply="I couldn't recognize any foods. Try something like ‘I ate two eggs and a banana.’",
-                logged_entries=[],
+            reply = "I couldn't recognize any foods. Try something like ‘I ate two eggs and a banana.’"
+            if remember:
+                await self._remember_exchange(user_id, request_id, message, reply)
+                await self.session.commit()
+            return NutritionAssistantResponse(reply=reply, logged_entries=[])
+
+        # Resolve every food concurrently (lookups, re-ranks, web searches), then
+        # write all of them in one transaction below.
+        semaphore = asyncio.Semaphore(max(1, settings.nutrition_resolve_concurrency))
+        with self._timed("resolve"):
+            resolved = await asyncio.gather(
+                *(self._resolve_food(user_id, item, semaphore) for item in parsed["foods"])
             )
 
-        entries: list[dict[str, Any]] = []
-        for item in parsed["foods"]:
-            name = item.get("name", "").strip()
-            if not name:
-                continue
-            raw_quantity = self._safe_float(item.get("quantity"))
-            quantity = raw_quantity if raw_quantity and raw_quantity > 0 else 1.0
-            unit = (item.get("unit") or "serving").strip()
+        with self._timed("persist"):
+            entries = await self._persist_resolved(
+                user_id, request_id, [food for food in resolved if food is not None]
+            )
+            await self.session.flush()
+            suggestions_repo = NutritionSuggestionsRepository(self.session)
+            await suggestions_repo.mark_stale(user_id)
+            reply = parsed.get("summary") or self._build_summary(entries)
+            if any(
+                entry["status"] == NutritionIngredientStatus.UNCONFIRMED.value
+                for entry in entries
+            ):
+                reply += "\nNote: items marked unconfirmed still need a quick review."
+            if remember:
+                await self._remember_exchange(user_id, request_id, message, reply)
+            await self.session.commit()
+        logger.info(
+            f"[nutrition] logged {len(entries)} entries for request id={request_id}"
+        )
+        logger.info(
+            "[nutrition] stage timings id={} {}",
+            request_id,
+            {stage: round(ms, 1) for stage, ms in self.last_timings.items()},
+        )
+        logger.info(f"[nutrition] respond complete id={request_id} reply={reply}")
+        return NutritionAssistantResponse(reply=reply, logged_entries=entries)
+
+    def _build_conversation_context(self, current_message: str, conversation: Conversation) -> str:
+        """Build context-aware prompt text from the conversation so far."""
+        history = conversation.render()
+        if not history:
+            return current_message
+        context_lines = ["Previous conversation:", *(f"  {line}" for line in history)]
+        context_lines.append(f"\nCurrent message: {current_message}")
+        return "\n".join(context_lines)
 
-            ingredient = await self._find_matching_ingredient(user_id, name)
-            recipe = await self._find_matching_recipe(user_id, name) if ingredient is None else None
+    async def _remember_exchange(self, user_id: int, request_id: str, message: str, reply: str) -> None:
+        await self.memory.append(
+            self.session,
+            CONVERSATION_NAMESPACE,
+            request_id,
+            [("user", message), ("assistant", reply)],
+            user_id=user_id,
+        )
 
-            if ingredient:
+    @contextmanager
+    def _timed(self, stage: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.last_timings[stage] += (time.perf_counter() - started) * 1000
+
+    async def _resolve_food(
+        self, user_id: int, item: dict[str, Any], semaphore: asyncio.Semaphore
+    ) -> _ResolvedFood | None:
+        """Match one parsed food to an ingredient, a recipe, or a new recipe plan. No writes."""
+        name = (item.get("name") or "").strip()
+        if not name:
+            return None
+        raw_quantity = self._safe_float(item.get("quantity"))
+        quantity = raw_quantity if raw_quantity and raw_quantity > 0 else 1.0
+        unit = (item.get("unit") or "serving").strip()
+        food = _ResolvedFood(name=name, quantity=quantity, unit=unit)
+
+        async with semaphore:
+            food.ingredient = await self._find_matching_ingredient(user_id, name)
+            if food.ingredient is None:
+                food.recipe = await self._find_matching_recipe(user_id, name)
+            if food.ingredient is not None or food.recipe is not None:
+                return food
+
+            # Unknown dish: ask the recipe agent for its structure.
+            try:
+                suggestion = await self._suggest_recipe(name)
+                if suggestion is None:
+                    logger.info("[nutrition] no recipe suggestion for {}", name)
+                    return None
+                food.plan = await self._plan_recipe_from_suggestion(
+                    owner_user_id=user_id,
+                    suggestion=suggestion,
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("[nutrition] failed to resolve recipe for '{}': {}", name, exc)
+                return None
+        return food
+
+    async def _persist_resolved(
+        self, user_id: int, request_id: str, resolved: list[_ResolvedFood]
+    ) -> list[dict[str, Any]]:
+        """Create planned recipes and log intake for every resolved food, in order."""
+        entries: list[dict[str, Any]] = []
+        for food in resolved:
+            if food.ingredient:
+                ingredient = food.ingredient
                 normalized = self.unit_normalizer.normalize(
-                    quantity=quantity,
-                    unit=unit,
+                    quantity=food.quantity,
+                    unit=food.unit,
                     target_unit=ingredient.default_unit,
                 )
                 await self.intake_repo.log_intake(
@@ -186,33 +279,32 @@ class NutritionAssistantAgent:
                 )
                 continue
 
-            if recipe:
-                await self._log_recipe(recipe_id=recipe.id, servings=quantity, user_id=user_id, request_id=request_id)
+            if food.recipe:
+                await self._log_recipe(
+                    recipe_id=food.recipe.id, servings=food.quantity, user_id=user_id, request_id=request_id
+                )
                 entries.append(
                     {
-                        "recipe_id": recipe.id,
-                        "food_name": recipe.name,
-                        "quantity": quantity,
-                        "unit": unit,
-                        "status": recipe.status.value,
+                        "recipe_id": food.recipe.id,
+                        "food_name": food.recipe.name,
+                        "quantity": food.quantity,
+                        "unit": food.unit,
+                        "status": food.recipe.status.value,
                         "created": False,
                     }
                 )
                 continue
 
-            # Unknown dish: ask recipe agent for structure, create ingredients + recipe, then log
+            if food.plan is None:
+                continue
             try:
-                suggestion = await self._suggest_recipe(name)
-                if suggestion is None:
-                    logger.info("[nutrition] no recipe suggestion for %s", name)
-                    continue
-                created_recipe = await self._ensure_recipe_from_suggestion(
+                created_recipe = await self._create_recipe_from_plan(
                     owner_user_id=user_id,
-                    suggestion=suggestion,
+                    plan=food.plan,
                 )
                 await self._log_recipe(
                     recipe_id=created_recipe.id,
-                    servings=quantity,
+                    servings=food.quantity,
                     user_id=user_id,
                     request_id=request_id,
                 )
@@ -220,53 +312,16 @@ class NutritionAssistantAgent:
                     {
                         "recipe_id": created_recipe.id,
                         "food_name": created_recipe.name,
-                        "quantity": quantity,
-                        "unit": unit,
+                        "quantity": food.quantity,
+                        "unit": food.unit,
                         "status": created_recipe.status.value,
                         "created": True,
                     }
                 )
             except Exception as exc:  # noqa: BLE001
-                logger.exception("[nutrition] failed to create/log recipe for '%s': %s", name, exc)
+                logger.exception("[nutrition] failed to create/log recipe for '{}': {}", food.name, exc)
                 continue
-
-        await self.session.flush()
-        suggestions_repo = NutritionSuggestionsRepository(self.session)
-        await suggestions_repo.mark_stale(user_id)
-        await self.session.commit()
-        logger.info(
-            f"[nutrition] logged {len(entries)} entries for request id={request_id}"
-        )
-
-        reply = parsed.get("summary") or self._build_summary(entries)
-        if any(
-            entry["status"] == NutritionIngredientStatus.UNCONFIRMED.value
-            for entry in entries
-        ):
-            reply += "\nNote: items marked unconfirmed still need a quick review."
-
-        self.memory.add_turn(request_id, "assistant", reply)
-        logger.info(f"[nutrition] respond complete id={request_id} reply={reply}")
-        return NutritionAssistantResponse(reply=reply, logged_entries=entries)
-
-    def _build_conversation_context(
-        self, current_message: str, history: list[_ConversationTurn]
-    ) -> str:
-        """Build context-aware prompt text from conversation history."""
-        if len(history) <= 1:
-            return current_message
-        prior_turns = [
-            t for t in history
-            if not (t.role == "user" and t.content == current_message and t is history[-1])
-        ]
-        if not prior_turns:
-            return current_message
-        context_lines = ["Previous conversation:"]
-        for turn in prior_turns[:-1]:
-            prefix = "User" if turn.role == "user" else "Assistant"
-            context_lines.append(f"  {prefix}: {turn.content}")
-        context_lines.append(f"\nCurrent message: {current_message}")
-        return "\n".join(context_lines)
+        return entries
 
     async def _extract_food_mentions(self, user_text: str) -> dict[str, Any]:
         prompt = NUTRITION_FOOD_EXTRACTION_PROMPT.format(user_text=user_text)
@@ -283,10 +338,12 @@ class NutritionAssistantAgent:
     async def _find_matching_ingredient(
         self, user_id: int, name: str
     ) -> NutritionIngredient | None:
-        exact = await self.ingredients_repo.get_ingredient_by_name(user_id, name)
-        if exact is not None:
-            return exact
-        candidates = await self.ingredients_repo.search_ingredients_fuzzy(user_id, name, limit=5)
+        async with self._db_lock:
+            with self._timed("lookup"):
+                exact = await self.ingredients_repo.get_ingredient_by_name(user_id, name)
+                if exact is not None:
+                    return exact
+                candidates = await self.ingredients_repo.search_ingredients_fuzzy(user_id, name, limit=5)
         if not candidates:
             return None
         return await self._llm_rerank_match(
@@ -296,10 +353,12 @@ class NutritionAssistantAgent:
     async def _find_matching_recipe(
         self, user_id: int, name: str
     ) -> NutritionRecipe | None:
-        exact = await self.recipes_repo.get_recipe_by_name(user_id, name)
-        if exact is not None:
-            return exact
-        candidates = await self.recipes_repo.search_recipes_fuzzy(user_id, name, limit=5)
+        async with self._db_lock:
+            with self._timed("lookup"):
+                exact = await self.recipes_repo.get_recipe_by_name(user_id, name)
+                if exact is not None:
+                    return exact
+                candidates = await self.recipes_repo.search_recipes_fuzzy(user_id, name, limit=5)
         if not candidates:
             return None
         return await self._llm_rerank_match(
@@ -315,7 +374,8 @@ class NutritionAssistantAgent:
         candidate_text = "\n".join(f"- [id={cid}] {cname}" for cid, cname in candidate_pairs)
         prompt = _FUZZY_MATCH_PROMPT.format(query=query, candidates=candidate_text)
         try:
-            result = await self.client.generate_json(prompt, response_model=FuzzyMatchOutput)
+            with self._timed("rerank"):
+                result = await self.client.generate_json(prompt, response_model=FuzzyMatchOutput)
             match_id = result.data.match_id
         except Exception as exc:  # noqa: BLE001
             logger.error("[llm-fallback] nutrition_agent._llm_rerank_match failed for '{}': {}", query, exc)
@@ -328,6 +388,18 @@ class NutritionAssistantAgent:
             logger.info("[nutrition] fuzzy rerank: '{}' → id={} ({})", query, match_id, result.data.reason)
         return matched
 
+    async def _resolve_nutrient_profile(
+        self, food_name: str, unit: str
+    ) -> tuple[dict[str, float | None], bool]:
+        """Nutrients from the shared profile cache, else a web-search lookup; flags a cache hit."""
+        async with self._db_lock:
+            with self._timed("profile_cache"):
+                cached = await self.profile_cache.lookup(self.session, food_name, unit)
+        if cached is not None:
+            logger.info("[nutrition] nutrient profile cache hit food={} unit={}", food_name, unit)
+            return cached, True
+        return await self._fetch_nutrient_profile(food_name, unit), False
+
     async def _fetch_nutrient_profile(
         self, food_name: str, unit: str
     ) -> dict[str, float | None]:
@@ -341,10 +413,11 @@ class NutritionAssistantAgent:
             nutrient_list=nutrient_list,
         )
         try:
-            result = await self.client.generate_json_with_web_search(
-                prompt,
-                response_model=NutrientProfileOutput,
-            )
+            with self._timed("nutrient_profile"):
+                result = await self.client.generate_json_with_web_search(
+                    prompt,
+                    response_model=NutrientProfileOutput,
+                )
             data = result.data.model_dump()
         except Exception as exc:  # noqa: BLE001
             logger.error("[llm-fallback] nutrition_agent._fetch_nutrient_profile failed for {}: {}", food_name, exc)
@@ -363,10 +436,11 @@ class NutritionAssistantAgent:
     async def _suggest_recipe(self, description: str) -> dict[str, Any] | None:
         prompt = RECIPE_SUGGESTION_PROMPT.format(description=description)
         try:
-            result = await self.client.generate_json(
-                prompt,
-                response_model=RecipeSuggestionOutput,
-            )
+            with self._timed("suggest"):
+                result = await self.client.generate_json(
+                    prompt,
+                    response_model=RecipeSuggestionOutput,
+                )
         except Exception as exc:  # noqa: BLE001
             logger.error("[llm-fallback] nutrition_agent._suggest_recipe failed for {}: {}", description, exc)
             return None
@@ -413,19 +487,23 @@ class NutritionAssistantAgent:
             return max_per_serving * effective_servings
         return qty
 
-    async def _ensure_recipe_from_suggestion(
+    async def _plan_recipe_from_suggestion(
         self, *, owner_user_id: int, suggestion: dict[str, Any]
-    ) -> NutritionRecipe:
+    ) -> _RecipePlan:
         recipe_data = suggestion.get("recipe") or {}
         ingredient_rows = suggestion.get("ingredients") or []
 
         name = recipe_data.get("name") or "Untitled recipe"
         default_unit = recipe_data.get("default_unit") or "serving"
         servings = self._safe_float(recipe_data.get("servings")) or 1.0
+        plan = _RecipePlan(name=name, default_unit=default_unit, servings=servings, rows=[])
+
+        # The suggested name may already exist (e.g. "Coffee Roll (Dunkin)"); then
+        # there is nothing to build.
+        plan.existing_recipe = await self._find_matching_recipe(owner_user_id, name)
+        if plan.existing_recipe is not None:
+            return plan
 
-        # Phase 1: resolve existing ingredients and identify missing ones
-        parsed_rows: list[dict[str, Any]] = []
-        missing_indices: list[int] = []
         for raw in ingredient_rows:
             ing_name = (raw.get("name") or "").strip()
             if not ing_name:
@@ -433,59 +511,70 @@ class NutritionAssistantAgent:
             raw_qty = self._safe_float(raw.get("quantity")) or 1.0
             unit = (raw.get("unit") or "100g").strip()
             qty = self._clamp_per_serving_qty(raw_qty, servings, unit)
-            ingredient = await self._find_matching_ingredient(owner_user_id, ing_name)
-            entry = {"name": ing_name, "unit": unit, "qty": qty, "ingredient": ingredient}
-            parsed_rows.append(entry)
-            if ingredient is None:
-                missing_indices.append(len(parsed_rows) - 1)
-
-        # Phase 2: fetch nutrient profiles for missing ingredients in parallel
-        if missing_indices:
-            fetch_tasks = [
-                self._fetch_nutrient_profile(parsed_rows[i]["name"], parsed_rows[i]["unit"])
-                for i in missing_indices
-            ]
-            nutrient_results = await asyncio.gather(*fetch_tasks)
-
-            # Phase 3: create ingredients sequentially (DB writes aren't concurrency-safe)
-            for idx, nutrients in zip(missing_indices, nutrient_results):
-                row = parsed_rows[idx]
-                ingredient = await self.ingredients_repo.create_ingredient(
+            plan.rows.append(
+                {"name": ing_name, "unit": unit, "qty": qty, "ingredient": None, "nutrients": None, "profile_cached": False}
+            )
+
+        # Match existing ingredients, then fetch nutrient profiles for the missing ones, in parallel.
+        matches = await asyncio.gather(
+            *(self._find_matching_ingredient(owner_user_id, row["name"]) for row in plan.rows)
+        )
+        for row, ingredient in zip(plan.rows, matches):
+            row["ingredient"] = ingredient
+        missing = [row for row in plan.rows if row["ingredient"] is None]
+        if missing:
+            profiles = await asyncio.gather(
+                *(self._resolve_nutrient_profile(row["name"], row["unit"]) for row in missing)
+            )
+            for row, (nutrients, cached) in zip(missing, profiles):
+                row["nutrients"] = nutrients
+                row["profile_cached"] = cached
+        return plan
+
+    async def _create_recipe_from_plan(
+        self, *, owner_user_id: int, plan: _RecipePlan
+    ) -> NutritionRecipe:
+        if plan.existing_recipe is not None:
+            return plan.existing_recipe
+        # Another food in the same message may have created it already.
+        recipe = await self.recipes_repo.get_recipe_by_name(owner_user_id, plan.name)
+        if recipe is not None:
+            return recipe
+
+        # create_ingredient returns the existing row for a name created earlier in this batch.
+        for row in plan.rows:
+            if row["ingredient"] is None:
+                row["ingredient"] = await self.ingredients_repo.create_ingredient(
                     name=row["name"],
                     default_unit=row["unit"],
                     source="claude",
-                    nutrient_values=nutrients,
+                    nutrient_values=row["nutrients"] or {},
                     owner_user_id=owner_user_id,
                     status=NutritionIngredientStatus.UNCONFIRMED,
                 )
-                row["ingredient"] = ingredient
-                logger.info("[nutrition] created ingredient={} id={}", row["name"], ingredient.id)
+                logger.info("[nutrition] created ingredient={} id={}", row["name"], row["ingredient"].id)
+                if row["nutrients"] and not row["profile_cached"]:
+                    await self.profile_cache.store(self.session, row["name"], row["unit"], row["nutrients"])
 
         components = [
             {
                 "ingredient_id": row["ingredient"].id,
                 "quantity": row["qty"],
                 "unit": row["unit"],
-                "created": row["ingredient"] is not None,
             }
-            for row in parsed_rows
-            if row["ingredient"] is not None
+            for row in plan.rows
         ]
-
-        recipe = await self._find_matching_recipe(owner_user_id, name)
-        if recipe is None:
-            recipe = await self.recipes_repo.create_recipe(
-                name=name,
-                default_unit=default_unit,
-                servings=servings,
-                status=NutritionIngredientStatus.UNCONFIRMED,
-                owner_user_id=owner_user_id,
-                components=components,
-                source="claude",
-            )
-            logger.info("[nutrition] created recipe name={} id={}", name, recipe.id)
-            recipe = await self.recipes_repo.get_recipe(recipe.id, owner_user_id, load_components=True)
-        return recipe
+        recipe = await self.recipes_repo.create_recipe(
+            name=plan.name,
+            default_unit=plan.default_unit,
+            servings=plan.servings,
+            status=NutritionIngredientStatus.UNCONFIRMED,
+            owner_user_id=owner_user_id,
+            components=components,
+            source="claude",
+        )
+        logger.info("[nutrition] created recipe name={} id={}", plan.name, recipe.id)
+        return await self.recipes_repo.get_recipe(recipe.id, owner_user_id, load_components=True)
 
     async def _log_recipe(
         self,
@@ -495,10 +584,11 @@ class NutritionAssistantAgent:
         user_id: int,
         request_id: str,
     ) -> None:
-        recipe = await self.recipes_repo.get_recipe(recipe_id, user_id, load_components=True)
+        recipe = await self.recipes_repo.get_recipe(recipe_id, user_id, load_components=False)
         if recipe is None:
             raise NotFoundException("Recipe not found")
 
+        await materialize_recipes(self.recipes_repo, [recipe])
         expanded = expand_recipe_components(recipe, servings)
         for comp in expanded:
             normalized = self.unit_normalizer.normalize(
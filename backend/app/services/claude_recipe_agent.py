@@ -18,7 +18,7 @@ class RecipeSuggestionResult:
 
 class RecipeSuggestionAgent:
     def __init__(self) -> None:
-        self.client = OpenAIResponsesClient()
+        self.client = OpenAIResponsesClient(feature="chat")
 
     async def suggest(self, description: str) -> RecipeSuggestionResult | None:
         prompt = RECIPE_SUGGESTION_PROMPT.format(description=description)
@@ -36,7 +36,7 @@ class TodoAssistantAgent:
   def __init__(self, session: AsyncSession) -> None:
     self.session = session
     self.repo = TodoRepository(session)
-    self.client = OpenAIResponsesClient()
+    self.client = OpenAIResponsesClient(feature="chat")
 
   async def respond(
     self, user_id: int, message: str, request_id: str | None = None
@@ -0,0 +1,259 @@
+"""Conversation memory shared by the nutrition and Monet assistants.
+
+Conversations live in ``conversation_session`` so they survive restarts and
+are visible to every worker. A byte-bounded LRU in front of the table saves a
+query per chat turn. Once a conversation passes ``max_turns``, its older turns
+are folded into a rolling LLM summary and only the most recent turns are kept
+verbatim. That keeps prompt size flat however long the chat runs.
+
+Like the metrics cache, the LRU is per process, so a worker's copy can be
+behind the table. Saves are optimistic: each row carries a version, a save
+only overwrites the version it read, and on a conflict the conversation is
+re-read and the new turns are appended to the fresh copy. Idle rows are
+deleted by ``sweep_idle``, which the visit refresh job runs.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.clients.openai_client import OpenAIResponsesClient
+from app.core.config import settings
+from app.db.repositories.conversation_repository import ConversationRepository
+from app.prompts.llm_prompts import CONVERSATION_SUMMARY_PROMPT
+from app.utils.timezone import eastern_now
+
+SUMMARY_MAX_WORDS = 150
+
+# Width of ``conversation_session.session_key``; longer client ids are hashed.
+MAX_SESSION_KEY_LENGTH = 64
+
+# Attempts at an optimistic save before giving up on persisting a turn.
+MAX_SAVE_ATTEMPTS = 3
+
+# Rough per-entry bookkeeping cost (dict slots, dataclass headers) for the byte budget.
+_TURN_OVERHEAD_BYTES = 96
+
+
+@dataclass
+class ConversationTurn:
+    role: str
+    content: str
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ConversationTurn:
+        return cls(role=str(data["role"]), content=str(data["content"]), timestamp=float(data.get("timestamp", 0.0)))
+
+
+@dataclass
+class Conversation:
+    summary: str | None = None
+    turns: list[ConversationTurn] = field(default_factory=list)
+    summarized_turns: int = 0
+    # Row version this copy was read at or saved as; None until the row exists.
+    version: int | None = None
+
+    @property
+    def last_active(self) -> float:
+        return self.turns[-1].timestamp if self.turns else 0.0
+
+    def size_bytes(self) -> int:
+        size = len((self.summary or "").encode("utf-8"))
+        return size + sum(len(turn.content.encode("utf-8")) + _TURN_OVERHEAD_BYTES for turn in self.turns)
+
+    def render(self) -> list[str]:
+        """Prompt lines for the summary and turns, oldest first."""
+        lines = []
+        if self.summary:
+            lines.append(f"Summary of earlier conversation: {self.summary}")
+        for turn in self.turns:
+            prefix = "User" if turn.role == "user" else "Assistant"
+            lines.append(f"{prefix}: {turn.content}")
+        return lines
+
+
+def storage_key(session_key: str) -> str:
+    if len(session_key) <= MAX_SESSION_KEY_LENGTH:
+        return session_key
+    return hashlib.sha256(session_key.encode("utf-8")).hexdigest()
+
+
+# (previous summary, turns to fold in) -> new summary
+Summarizer = Callable[[str | None, Sequence[ConversationTurn]], Awaitable[str]]
+
+
+async def summarize_turns(previous_summary: str | None, turns: Sequence[ConversationTurn]) -> str:
+    prompt = CONVERSATION_SUMMARY_PROMPT.format(
+        max_words=SUMMARY_MAX_WORDS,
+        previous_summary=previous_summary or "(none)",
+        turns="\n".join(Conversation(turns=list(turns)).render()),
+    )
+    result = await OpenAIResponsesClient(feature="chat").generate_text(prompt, temperature=0.1)
+    return result.text
+
+
+class ConversationMemory:
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 4 * 1024 * 1024,
+        max_turns: int = 12,
+        keep_recent: int = 6,
+        ttl_seconds: int = 3600,
+        summarizer: Summarizer | None = summarize_turns,
+        repository_factory: Callable[[AsyncSession], ConversationRepository] = ConversationRepository,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_turns = max_turns
+        self.keep_recent = max(1, min(keep_recent, max_turns))
+        self.ttl_seconds = ttl_seconds
+        self.summarizer = summarizer
+        self.repository_factory = repository_factory
+        self._entries: OrderedDict[tuple[str, int, str], Conversation] = OrderedDict()
+        self._sizes: dict[tuple[str, int, str], int] = {}
+        self._total_bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    async def get(self, session: AsyncSession, namespace: str, session_key: str, *, user_id: int) -> Conversation:
+        """The user's conversation so far, or an empty one when unknown or idle past the TTL.
+
+        Session keys come from clients, so they are scoped to ``user_id``: another
+        user's chat under the same key is treated as unknown.
+        """
+        session_key = storage_key(session_key)
+        key = (namespace, user_id, session_key)
+        conversation = self._entries.get(key)
+        if conversation is None:
+            conversation = await self._load(session, namespace, session_key, user_id)
+        conversation = self._expire_if_idle(conversation)
+        self._remember(key, conversation)
+        return conversation
+
+    async def append(
+        self,
+        session: AsyncSession,
+        namespace: str,
+        session_key: str,
+        turns: Sequence[tuple[str, str]],
+        *,
+        user_id: int,
+    ) -> Conversation:
+        """Add ``(role, content)`` turns, compacting if needed, and stage the row.
+
+        The write joins the caller's transaction and is persisted by its commit.
+        """
+        session_key = storage_key(session_key)
+        key = (namespace, user_id, session_key)
+        repository = self.repository_factory(session)
+        new_turns = [ConversationTurn(role=role, content=content) for role, content in turns]
+        seen = await self.get(session, namespace, session_key, user_id=user_id)
+        for _ in range(MAX_SAVE_ATTEMPTS):
+            conversation = Conversation(
+                summary=seen.summary,
+                turns=[*seen.turns, *new_turns],
+                summarized_turns=seen.summarized_turns,
+                version=seen.version,
+            )
+            if len(conversation.turns) > self.max_turns:
+                await self._compact(conversation)
+            fields = {
+                "user_id": user_id,
+                "summary": conversation.summary,
+                "turns": [turn.to_dict() for turn in conversation.turns],
+                "summarized_turns": conversation.summarized_turns,
+            }
+            if conversation.version is None:
+                version = await repository.create(namespace, session_key, **fields)
+            else:
+                version = await repository.update(
+                    namespace, session_key, expected_version=conversation.version, **fields
+                )
+            if version is not None:
+                conversation.version = version
+                self._remember(key, conversation)
+                return conversation
+            # Another worker saved this conversation since it was read: append to its copy instead.
+            seen = self._expire_if_idle(await self._load(session, namespace, session_key, user_id))
+        logger.warning("[conversation] gave up saving {}/{} after repeated conflicts", namespace, session_key)
+        self._forget(key)
+        return conversation
+
+    async def sweep_idle(self, session: AsyncSession) -> int:
+        """Delete conversations idle past the TTL; the caller commits."""
+        cutoff = eastern_now() - timedelta(seconds=self.ttl_seconds)
+        return await self.repository_factory(session).delete_idle(cutoff)
+
+    async def _load(self, session: AsyncSession, namespace: str, session_key: str, user_id: int) -> Conversation:
+        row = await self.repository_factory(session).get(namespace, session_key, user_id=user_id)
+        if row is None:
+            return Conversation()
+        return Conversation(
+            summary=row.summary,
+            turns=[ConversationTurn.from_dict(turn) for turn in row.turns or []],
+            summarized_turns=row.summarized_turns,
+            version=row.version,
+        )
+
+    def _expire_if_idle(self, conversation: Conversation) -> Conversation:
+        if conversation.turns and time.time() - conversation.last_active > self.ttl_seconds:
+            # Keep the version so the next save replaces the stale row instead of conflicting with it.
+            return Conversation(version=conversation.version)
+        return conversation
+
+    async def _compact(self, conversation: Conversation) -> None:
+        older = conversation.turns[:-self.keep_recent]
+        summary = conversation.summary
+        if self.summarizer is not None:
+            try:
+                summary = (await self.summarizer(conversation.summary, older)).strip() or summary
+            except Exception as exc:  # noqa: BLE001
+                # Dropping the oldest turns still bounds the prompt; the summary just lags.
+                logger.warning("[conversation] summarization failed, truncating instead: {}", exc)
+        conversation.summary = summary
+        conversation.turns = conversation.turns[-self.keep_recent:]
+        conversation.summarized_turns += len(older)
+
+    def _forget(self, key: tuple[str, int, str]) -> None:
+        if self._entries.pop(key, None) is not None:
+            self._total_bytes -= self._sizes.pop(key)
+
+    def _remember(self, key: tuple[str, int, str], conversation: Conversation) -> None:
+        self._total_bytes -= self._sizes.get(key, 0)
+        self._entries[key] = conversation
+        self._entries.move_to_end(key)
+        self._sizes[key] = conversation.size_bytes()
+        self._total_bytes += self._sizes[key]
+        # The newest entry stays even if it alone exceeds the budget.
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(evicted)
+
+
+_conversation_memory: ConversationMemory | None = None
+
+
+def get_conversation_memory() -> ConversationMemory:
+    global _conversation_memory  # noqa: PLW0603
+    if _conversation_memory is None:
+        _conversation_memory = ConversationMemory(
+            max_bytes=settings.conversation_cache_max_bytes,
+            max_turns=settings.conversation_max_turns,
+            keep_recent=settings.conversation_keep_recent_turns,
+            ttl_seconds=settings.conversation_ttl_seconds,
+        )
+    return _conversation_memory
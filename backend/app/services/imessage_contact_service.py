@@ -1,18 +1,24 @@
 """Local Contacts lookup and cached identity resolution for iMessage handles."""
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import hashlib
+import json
+import os
 import sqlite3
 from pathlib import Path
 import re
-from typing import Iterable
+import threading
+from typing import Iterable, Iterator
 
 from loguru import logger
 from sqlalchemy import or_, select, update
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models.imessage import IMessageContactIdentity, IMessageParticipant
 from app.services.imessage_utils import normalize_message_text
 
@@ -21,6 +27,8 @@ CONTACTS_ROOT = Path("~/Library/Application Support/AddressBook").expanduser()
 CONTACTS_SOURCES_ROOT = CONTACTS_ROOT / "Sources"
 CONTACTS_DB_FILENAME = "AddressBook-v22.abcddb"
 CONTACTS_DB_PATH = CONTACTS_ROOT / CONTACTS_DB_FILENAME
+CONTACTS_INDEX_DIR = Path(settings.imessage_contacts_index_dir).expanduser()
+CONTACTS_INDEX_MMAP_BYTES = 64 * 1024 * 1024
 _EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 _NON_DIGIT_RE = re.compile(r"\D+")
 
@@ -81,13 +89,243 @@ def _clean_display_text(value: str | None) -> str | None:
     return cleaned or None
 
 
+class ContactsIndex:
+    """Read-only handle on a compiled contacts index file.
+
+    The file is a small SQLite database keyed by ``(kind, normalized
+    identifier)`` and opened memory-mapped, so opening it is instant and each
+    lookup is a B-tree probe over mapped pages rather than a dict build over
+    every AddressBook row.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # Lookups run on the event loop while the file is opened on a worker thread.
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {CONTACTS_INDEX_MMAP_BYTES}")
+        self.fingerprint = _stored_fingerprint(self._conn)
+
+    def lookup(self, kind: str, normalized_identifier: str) -> ResolvedContact | None:
+        row = self._conn.execute(
+            "SELECT identifier, resolved_name, source_record_id FROM contact"
+            " WHERE kind = ? AND normalized_identifier = ?",
+            (kind, normalized_identifier),
+        ).fetchone()
+        if row is None:
+            return None
+        return ResolvedContact(
+            identifier=row[0],
+            normalized_identifier=normalized_identifier,
+            identifier_kind=kind,
+            resolved_name=row[1],
+            source_record_id=row[2],
+        )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+_open_indexes: dict[Path, ContactsIndex] = {}
+_index_lock = threading.Lock()
+
+
+def contacts_source_fingerprint(db_paths: list[Path]) -> str:
+    """Paths, sizes, and mtimes of the AddressBook files, including WAL sidecars."""
+    parts = []
+    for path in db_paths:
+        for candidate in (path, path.with_name(f"{path.name}-wal")):
+            if candidate.exists():
+                stat = candidate.stat()
+                parts.append([str(candidate), stat.st_mtime_ns, stat.st_size])
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+def open_contacts_index(db_paths: list[Path], index_dir: Path) -> ContactsIndex:
+    """The compiled index for ``db_paths``, rebuilt only when a source file changed.
+
+    Blocking. The file lives in ``index_dir`` under a name derived from the
+    source paths, so the API, the sync script, and the refresh scripts all
+    reuse the same build; handles are also cached per process.
+    """
+    sources_key = hashlib.sha256("\n".join(sorted(str(path) for path in db_paths)).encode("utf-8")).hexdigest()
+    index_path = index_dir / f"imessage-contacts-{sources_key[:16]}.sqlite"
+    fingerprint = contacts_source_fingerprint(db_paths)
+    with _index_lock:
+        current = _open_indexes.get(index_path)
+        if current is not None and current.fingerprint == fingerprint:
+            return current
+        if current is not None:
+            # Stale: its file is replaced below or already was by another process.
+            del _open_indexes[index_path]
+            current.close()
+        if index_path.exists():
+            candidate = ContactsIndex(index_path)
+            if candidate.fingerprint == fingerprint:
+                _open_indexes[index_path] = candidate
+                return candidate
+            candidate.close()
+        _build_contacts_index(db_paths, index_path, fingerprint)
+        _open_indexes[index_path] = ContactsIndex(index_path)
+        return _open_indexes[index_path]
+
+
+def _stored_fingerprint(conn: sqlite3.Connection) -> str | None:
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+    except sqlite3.DatabaseError:
+        return None
+    return row[0] if row else None
+
+
+def _build_contacts_index(db_paths: list[Path], index_path: Path, fingerprint: str) -> None:
+    best: dict[tuple[str, str], tuple[int, ResolvedContact]] = {}
+    for source_path in db_paths:
+        for resolved, score in _read_address_book(source_path):
+            key = (resolved.identifier_kind, resolved.normalized_identifier)
+            current = best.get(key)
+            if current is None or score > current[0]:
+                best[key] = (score, resolved)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    # Build beside the target and swap it in, so a concurrent reader never sees a partial file.
+    staging_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    staging_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(staging_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE contact (
+                kind TEXT NOT NULL,
+                normalized_identifier TEXT NOT NULL,
+                identifier TEXT NOT NULL,
+                resolved_name TEXT NOT NULL,
+                source_record_id TEXT,
+                PRIMARY KEY (kind, normalized_identifier)
+            ) WITHOUT ROWID;
+            CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            """
+        )
+        conn.executemany(
+            "INSERT INTO contact VALUES (?, ?, ?, ?, ?)",
+            [
+                (kind, normalized, row.identifier, row.resolved_name, row.source_record_id)
+                for (kind, normalized), (_, row) in sorted(best.items())
+            ],
+        )
+        conn.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(staging_path, index_path)
+    logger.info("[imessage] rebuilt contacts index path={} entries={}", index_path, len(best))
+
+
+def _read_address_book(source_path: Path) -> Iterator[tuple[ResolvedContact, int]]:
+    conn = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    try:
+        phone_rows = _contact_rows_for_table(conn, table_name="ZABCDPHONENUMBER")
+        email_rows = _contact_rows_for_table(conn, table_name="ZABCDEMAILADDRESS")
+    finally:
+        conn.close()
+
+    for row in phone_rows:
+        name = _record_display_name(row)
+        _, normalized_phone = normalize_contact_identifier(str(row["phone_number"]))
+        if not name or not normalized_phone:
+            continue
+        yield ResolvedContact(
+            identifier=str(row["phone_number"]),
+            normalized_identifier=normalized_phone,
+            identifier_kind="phone",
+            resolved_name=name,
+            source_record_id=f"{source_path}:{row['record_id']}",
+        ), _row_score(row)
+
+    for row in email_rows:
+        name = _record_display_name(row)
+        email_value = normalize_message_text(row["email_normalized"] or row["email_address"]).lower()
+        _, normalized_email = normalize_contact_identifier(email_value)
+        if not name or not normalized_email:
+            continue
+        yield ResolvedContact(
+            identifier=str(row["email_address"]),
+            normalized_identifier=normalized_email,
+            identifier_kind="email",
+            resolved_name=name,
+            source_record_id=f"{source_path}:{row['record_id']}",
+        ), _row_score(row)
+
+
+def _record_display_name(row: sqlite3.Row) -> str | None:
+    return format_contact_display_name(
+        name=row["full_name"],
+        first_name=row["first_name"],
+        last_name=row["last_name"],
+        nickname=row["nickname"],
+        organization=row["organization"],
+    )
+
+
+def _row_score(row: sqlite3.Row) -> int:
+    return int(row["is_primary"] or 0) * 100 - int(row["ordering_index"] or 0)
+
+
+def _contact_rows_for_table(conn: sqlite3.Connection, *, table_name: str) -> list[sqlite3.Row]:
+    columns = {
+        str(row["name"])
+        for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+    }
+    if not columns:
+        return []
+    table_name_alias = "p" if table_name == "ZABCDPHONENUMBER" else "e"
+    # In modern macOS Contacts schemas, ZOWNER is the actual contact-record foreign key.
+    # Auxiliary owner columns such as Z21_OWNER/Z22_OWNER can point at unrelated records and
+    # must only be used as fallbacks when ZOWNER is absent for a given row.
+    owner_columns = [name for name in ("ZOWNER", "Z22_OWNER", "Z21_OWNER") if name in columns]
+    if not owner_columns:
+        return []
+    owner_expr = f"COALESCE({', '.join(f'{table_name_alias}.{name}' for name in owner_columns)})"
+
+    if table_name == "ZABCDPHONENUMBER":
+        value_select = "p.ZFULLNUMBER AS phone_number"
+        value_filter = "p.ZFULLNUMBER IS NOT NULL AND trim(p.ZFULLNUMBER) <> ''"
+    else:
+        value_select = "e.ZADDRESS AS email_address, e.ZADDRESSNORMALIZED AS email_normalized"
+        value_filter = "e.ZADDRESS IS NOT NULL AND trim(e.ZADDRESS) <> ''"
+
+    query = f"""
+        SELECT
+            r.Z_PK AS record_id,
+            r.ZNAME AS full_name,
+            r.ZFIRSTNAME AS first_name,
+            r.ZLASTNAME AS last_name,
+            r.ZNICKNAME AS nickname,
+            r.ZORGANIZATION AS organization,
+            {value_select},
+            {table_name_alias}.ZISPRIMARY AS is_primary,
+            {table_name_alias}.ZORDERINGINDEX AS ordering_index
+        FROM {table_name} AS {table_name_alias}
+        JOIN ZABCDRECORD AS r
+          ON r.Z_PK = {owner_expr}
+        WHERE {value_filter}
+    """
+    return conn.execute(query).fetchall()
+
+
 class IMessageContactResolver:
-    def __init__(self, session: AsyncSession, *, contacts_db_path: str | Path | None = None) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        contacts_db_path: str | Path | None = None,
+        index_dir: str | Path | None = None,
+    ) -> None:
         self.session = session
         self.contacts_db_path = Path(contacts_db_path).expanduser() if contacts_db_path else CONTACTS_DB_PATH
         self._explicit_contacts_path = contacts_db_path is not None
-        self._phone_index: dict[str, ResolvedContact] | None = None
-        self._email_index: dict[str, ResolvedContact] | None = None
+        self.index_dir = Path(index_dir).expanduser() if index_dir else CONTACTS_INDEX_DIR
+        self._index: ContactsIndex | None = None
         self._contacts_available: bool | None = None
 
     async def resolve_identifiers(self, *, user_id: int, identifiers: Iterable[str | None]) -> dict[str, str | None]:
@@ -190,124 +428,38 @@ class IMessageContactResolver:
         }
 
     async def _resolve_from_contacts(self, identifiers: list[str]) -> list[ResolvedContact]:
-        await self._ensure_contact_indexes()
+        await self._ensure_contact_index()
         rows: list[ResolvedContact] = []
         for identifier in identifiers:
             identifier_kind, normalized_identifier = normalize_contact_identifier(identifier)
-            resolved_name = None
-            source_record_id = None
-            if identifier_kind == "email" and normalized_identifier and self._email_index:
-                match = self._email_index.get(normalized_identifier)
-                if match:
-                    resolved_name = match.resolved_name
-                    source_record_id = match.source_record_id
-            elif identifier_kind == "phone" and normalized_identifier and self._phone_index:
-                match = self._phone_index.get(normalized_identifier)
-                if match:
-                    resolved_name = match.resolved_name
-                    source_record_id = match.source_record_id
+            match = None
+            if identifier_kind in {"email", "phone"} and normalized_identifier and self._index is not None:
+                match = self._index.lookup(identifier_kind, normalized_identifier)
             rows.append(
                 ResolvedContact(
                     identifier=identifier,
                     normalized_identifier=normalized_identifier or identifier,
                     identifier_kind=identifier_kind or "unknown",
-                    resolved_name=resolved_name,
-                    source_record_id=source_record_id,
+                    resolved_name=match.resolved_name if match else None,
+                    source_record_id=match.source_record_id if match else None,
                 )
             )
         return rows
 
-    async def _ensure_contact_indexes(self) -> None:
-        if self._contacts_available is False:
-            return
-        if self._phone_index is not None and self._email_index is not None:
+    async def _ensure_contact_index(self) -> None:
+        if self._contacts_available is not None:
             return
         try:
-            self._phone_index, self._email_index = await self._load_contact_indexes()
+            db_paths = self._candidate_contacts_db_paths()
+            if not db_paths:
+                raise FileNotFoundError(f"No Contacts databases found under {self.contacts_db_path}")
+            self._index = await asyncio.to_thread(open_contacts_index, db_paths, self.index_dir)
             self._contacts_available = True
         except Exception as exc:  # noqa: BLE001
             logger.warning("[imessage] contact resolution unavailable: {}", exc)
-            self._phone_index = {}
-            self._email_index = {}
+            self._index = None
             self._contacts_available = False
 
-    async def _load_contact_indexes(self) -> tuple[dict[str, ResolvedContact], dict[str, ResolvedContact]]:
-        def _load() -> tuple[dict[str, ResolvedContact], dict[str, ResolvedContact]]:
-            phone_index: dict[str, tuple[int, ResolvedContact]] = {}
-            email_index: dict[str, tuple[int, ResolvedContact]] = {}
-            db_paths = self._candidate_contacts_db_paths()
-            if not db_paths:
-                raise FileNotFoundError(f"No Contacts databases found under {self.contacts_db_path}")
-
-            for source_path in db_paths:
-                conn = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
-                conn.row_factory = sqlite3.Row
-                try:
-                    phone_rows = self._contact_rows_for_table(conn, table_name="ZABCDPHONENUMBER")
-                    email_rows = self._contact_rows_for_table(conn, table_name="ZABCDEMAILADDRESS")
-                finally:
-                    conn.close()
-
-                for row in phone_rows:
-                    name = format_contact_display_name(
-                        name=row["full_name"],
-                        first_name=row["first_name"],
-                        last_name=row["last_name"],
-                        nickname=row["nickname"],
-                        organization=row["organization"],
-                    )
-                    if not name:
-                        continue
-                    _, normalized_phone = normalize_contact_identifier(str(row["phone_number"]))
-                    if not normalized_phone:
-                        continue
-                    score = int(row["is_primary"] or 0) * 100 - int(row["ordering_index"] or 0)
-                    resolved = ResolvedContact(
-                        identifier=str(row["phone_number"]),
-                        normalized_identifier=normalized_phone,
-                        identifier_kind="phone",
-                        resolved_name=name,
-                        source_record_id=f"{source_path}:{row['record_id']}",
-                    )
-                    current = phone_index.get(normalized_phone)
-                    if current is None or score > current[0]:
-                        phone_index[normalized_phone] = (score, resolved)
-
-                for row in email_rows:
-                    name = format_contact_display_name(
-                        name=row["full_name"],
-                        first_name=row["first_name"],
-                        last_name=row["last_name"],
-                        nickname=row["nickname"],
-                        organization=row["organization"],
-                    )
-                    if not name:
-                        continue
-                    email_value = normalize_message_text(row["email_normalized"] or row["email_address"]).lower()
-                    _, normalized_email = normalize_contact_identifier(email_value)
-                    if not normalized_email:
-                        continue
-                    score = int(row["is_primary"] or 0) * 100 - int(row["ordering_index"] or 0)
-                    resolved = ResolvedContact(
-                        identifier=str(row["email_address"]),
-                        normalized_identifier=normalized_email,
-                        identifier_kind="email",
-                        resolved_name=name,
-                        source_record_id=f"{source_path}:{row['record_id']}",
-                    )
-                    current = email_index.get(normalized_email)
-                    if current is None or score > current[0]:
-                        email_index[normalized_email] = (score, resolved)
-
-            return (
-                {key: value[1] for key, value in phone_index.items()},
-                {key: value[1] for key, value in email_index.items()},
-            )
-
-        from asyncio import to_thread
-
-        return await to_thread(_load)
-
     def _candidate_contacts_db_paths(self) -> list[Path]:
         if self._explicit_contacts_path:
             path = self.contacts_db_path.expanduser()
@@ -332,47 +484,6 @@ class IMessageContactResolver:
                 seen.add(resolved)
         return deduped
 
-    def _contact_rows_for_table(self, conn: sqlite3.Connection, *, table_name: str) -> list[sqlite3.Row]:
-        columns = {
-            str(row["name"])
-            for row in conn.execute(f"PRAGMA table_info({table_name})").fetchall()
-        }
-        if not columns:
-            return []
-        table_name_alias = "p" if table_name == "ZABCDPHONENUMBER" else "e"
-        # In modern macOS Contacts schemas, ZOWNER is the actual contact-record foreign key.
-        # Auxiliary owner columns such as Z21_OWNER/Z22_OWNER can point at unrelated records and
-        # must only be used as fallbacks when ZOWNER is absent for a given row.
-        owner_columns = [name for name in ("ZOWNER", "Z22_OWNER", "Z21_OWNER") if name in columns]
-        if not owner_columns:
-            return []
-        owner_expr = f"COALESCE({', '.join(f'{table_name_alias}.{name}' for name in owner_columns)})"
-
-        if table_name == "ZABCDPHONENUMBER":
-            value_select = "p.ZFULLNUMBER AS phone_number"
-            value_filter = "p.ZFULLNUMBER IS NOT NULL AND trim(p.ZFULLNUMBER) <> ''"
-        else:
-            value_select = "e.ZADDRESS AS email_address, e.ZADDRESSNORMALIZED AS email_normalized"
-            value_filter = "e.ZADDRESS IS NOT NULL AND trim(e.ZADDRESS) <> ''"
-
-        query = f"""
-            SELECT
-                r.Z_PK AS record_id,
-                r.ZNAME AS full_name,
-                r.ZFIRSTNAME AS first_name,
-                r.ZLASTNAME AS last_name,
-                r.ZNICKNAME AS nickname,
-                r.ZORGANIZATION AS organization,
-                {value_select},
-                {table_name_alias}.ZISPRIMARY AS is_primary,
-                {table_name_alias}.ZORDERINGINDEX AS ordering_index
-            FROM {table_name} AS {table_name_alias}
-            JOIN ZABCDRECORD AS r
-              ON r.Z_PK = {owner_expr}
-            WHERE {value_filter}
-        """
-        return conn.execute(query).fetchall()
-
     async def _upsert_cache(self, *, user_id: int, rows: list[ResolvedContact]) -> None:
         if not rows:
             return
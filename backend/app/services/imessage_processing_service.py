@@ -13,7 +13,7 @@ from typing import Any
 
 from loguru import logger
 from pydantic import BaseModel
-from sqlalchemy import func, or_, select
+from sqlalchemy import and_, func, literal_column, or_, select, tuple_, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -52,6 +52,7 @@ from app.services.google_calendar_event_service import GoogleCalendarEventServic
 from app.services.imessage_utils import (
     ProjectCatalogEntry,
     ProjectGuess,
+    ProjectMatcher,
     classify_conversation_type,
     content_tokens,
     conversation_display_name,
@@ -64,6 +65,7 @@ from app.services.imessage_utils import (
     stable_fingerprint,
 )
 from app.services.journal_service import JournalService
+from app.services.monet_context_service import invalidate_context
 from app.services.todo_accomplishment_agent import TodoAccomplishmentAgent
 from app.services.workspace_service import WorkspaceService
 from app.utils.timezone import resolve_time_zone
@@ -78,7 +80,6 @@ PROJECT_ROUTER_MIN_CONFIDENCE = 0.32
 PROJECT_ROUTER_SKIP_CONFIDENCE = 0.88
 PROJECT_ROUTER_MARGIN = 0.18
 MAX_DEDUP_CANDIDATES = 8
-MODEL_RETRY_ATTEMPTS = 4
 _HANDLE_LIKE_RE = re.compile(r"@|\d{7,}")
 _NON_DIGIT_RE = re.compile(r"\D+")
 _LEADING_PRONOUN_RE = re.compile(r"^(?:i|we)\s+", re.IGNORECASE)
@@ -96,6 +97,25 @@ _JOURNAL_RECAP_RE = re.compile(
 )
 
 
+@dataclass(frozen=True, slots=True)
+class PendingCursor:
+    """Keyset position in the (sent_at_utc NULLS LAST, id) processing order."""
+    sent_at_utc: datetime | None
+    message_id: int
+
+    @classmethod
+    def after_message(cls, message: IMessageMessage) -> PendingCursor:
+        return cls(sent_at_utc=message.sent_at_utc, message_id=message.id)
+
+    def clause(self) -> Any:
+        if self.sent_at_utc is None:
+            return and_(IMessageMessage.sent_at_utc.is_(None), IMessageMessage.id > self.message_id)
+        return or_(
+            tuple_(IMessageMessage.sent_at_utc, IMessageMessage.id) > tuple_(self.sent_at_utc, self.message_id),
+            IMessageMessage.sent_at_utc.is_(None),
+        )
+
+
 @dataclass(slots=True)
 class MessageCluster:
     conversation: IMessageConversation
@@ -259,10 +279,13 @@ class IMessageProcessingService:
         self.workspace_service = WorkspaceService(session)
         self.todo_accomplishment_agent = TodoAccomplishmentAgent()
         try:
-            self.client = OpenAIResponsesClient()
+            self.client = OpenAIResponsesClient(feature="imessage")
         except Exception as exc:  # noqa: BLE001
             logger.warning("[imessage] failed to initialize genai client: {}", exc)
             self.client = None
+        self._project_matcher: tuple[tuple[ProjectCatalogEntry, ...], ProjectMatcher] | None = None
+        # End of the last pending page loaded; pass it back as ``after`` to keep draining forward.
+        self.pending_cursor: PendingCursor | None = None
 
     # ------------------------------------------------------------------
     # Contact anonymization — real names never reach the LLM
@@ -370,6 +393,7 @@ class IMessageProcessingService:
         user_id: int,
         time_zone: str = "America/New_York",
         max_messages: int = MAX_PENDING_MESSAGES,
+        after: PendingCursor | None = None,
     ) -> IMessageProcessingRun:
         run = IMessageProcessingRun(
             user_id=user_id,
@@ -382,7 +406,9 @@ class IMessageProcessingService:
         try:
             projects = await self.project_repo.list_for_user(user_id, include_archived=False)
             project_catalog = await self._build_project_catalog(user_id=user_id, projects=projects)
-            pending_messages = await self._load_pending_messages(user_id=user_id, max_messages=max_messages)
+            pending_messages = await self._load_pending_messages(
+                user_id=user_id, max_messages=max_messages, after=after
+            )
             run.messages_considered = len(pending_messages)
             if not pending_messages:
                 run.status = "completed"
@@ -410,6 +436,9 @@ class IMessageProcessingService:
             run.status = "completed"
             run.completed_at_utc = datetime.now(timezone.utc)
             await self.session.commit()
+            if run.actions_applied:
+                # Applied actions create/complete todos and write calendar, nutrition and workspace rows.
+                invalidate_context(user_id, "todos", "calendar", "nutrition", "workspace")
             return run
         except Exception as exc:  # noqa: BLE001
             logger.exception("[imessage] processing failed: {}", exc)
@@ -470,12 +499,22 @@ class IMessageProcessingService:
             "clusters": cluster_previews,
         }
 
-    async def _load_pending_messages(self, *, user_id: int, max_messages: int) -> list[IMessageMessage]:
-        return await self._load_messages(
+    async def _load_pending_messages(
+        self,
+        *,
+        user_id: int,
+        max_messages: int,
+        after: PendingCursor | None = None,
+    ) -> list[IMessageMessage]:
+        page, continuation = await self._load_message_page(
             user_id=user_id,
             max_messages=max_messages,
             message_scope="pending",
+            after=after,
         )
+        if page:
+            self.pending_cursor = PendingCursor.after_message(page[-1])
+        return self._extend_message_batch_with_conversation_tail(page, continuation)
 
     async def _load_messages(
         self,
@@ -486,105 +525,117 @@ class IMessageProcessingService:
         since_utc: datetime | None = None,
         conversation_id: int | None = None,
     ) -> list[IMessageMessage]:
-        if message_scope not in {"pending", "processed", "all"}:
-            raise ValueError(f"Unsupported message scope: {message_scope}")
-        stmt = (
-            select(IMessageMessage)
-            .options(
-                selectinload(IMessageMessage.conversation).selectinload(IMessageConversation.participants)
-            )
-            .where(IMessageMessage.user_id == user_id)
-            .order_by(IMessageMessage.sent_at_utc.asc().nullslast(), IMessageMessage.id.asc())
-        )
-        if message_scope == "pending":
-            stmt = stmt.where(IMessageMessage.processed_at_utc.is_(None))
-        elif message_scope == "processed":
-            stmt = stmt.where(IMessageMessage.processed_at_utc.is_not(None))
-        if conversation_id is not None:
-            stmt = stmt.where(IMessageMessage.conversation_id == conversation_id)
-        if since_utc is not None:
-            stmt = stmt.where(
-                or_(
-                    IMessageMessage.sent_at_utc >= since_utc,
-                    (IMessageMessage.sent_at_utc.is_(None) & (IMessageMessage.created_at >= since_utc)),
-                )
-            )
-        if max_messages > 0:
-            stmt = stmt.limit(max_messages)
-        result = await self.session.execute(stmt)
-        messages = list(result.scalars().all())
-        if not messages:
-            return messages
-        if max_messages <= 0:
-            return messages
-        return await self._extend_message_batch_with_conversation_tail(
+        page, continuation = await self._load_message_page(
             user_id=user_id,
-            messages=messages,
+            max_messages=max_messages,
             message_scope=message_scope,
             since_utc=since_utc,
             conversation_id=conversation_id,
         )
+        return self._extend_message_batch_with_conversation_tail(page, continuation)
 
-    async def _extend_message_batch_with_conversation_tail(
+    async def _load_message_page(
         self,
         *,
         user_id: int,
-        messages: list[IMessageMessage],
+        max_messages: int,
         message_scope: str,
         since_utc: datetime | None = None,
         conversation_id: int | None = None,
-    ) -> list[IMessageMessage]:
-        last_message = messages[-1]
-        if last_message.conversation_id is None or last_message.sent_at_utc is None:
-            return messages
-
-        trailing_batch = [
-            item
-            for item in messages
-            if item.conversation_id == last_message.conversation_id
-        ]
-        if not trailing_batch:
-            return messages
-
-        stmt = (
-            select(IMessageMessage)
-            .options(
-                selectinload(IMessageMessage.conversation).selectinload(IMessageConversation.participants)
-            )
-            .where(
-                IMessageMessage.user_id == user_id,
-                IMessageMessage.conversation_id == last_message.conversation_id,
-                IMessageMessage.sent_at_utc.is_not(None),
-                IMessageMessage.sent_at_utc >= last_message.sent_at_utc,
-                IMessageMessage.id != last_message.id,
-            )
-            .order_by(IMessageMessage.sent_at_utc.asc(), IMessageMessage.id.asc())
-            .limit(MAX_CLUSTER_MESSAGES)
-        )
+        after: PendingCursor | None = None,
+    ) -> tuple[list[IMessageMessage], list[IMessageMessage]]:
+        """One page in (sent_at_utc, id) order plus the continuation of the conversation it ends in.
+
+        Both come back from a single statement: the page is a keyset range (served by
+        ``ix_imessage_message_pending`` for the pending scope) and the continuation is
+        up to ``MAX_CLUSTER_MESSAGES`` later rows of the page's last conversation that
+        the page cut off. Whether they belong to the trailing cluster is left to
+        ``_extend_message_batch_with_conversation_tail``.
+        """
+        if message_scope not in {"pending", "processed", "all"}:
+            raise ValueError(f"Unsupported message scope: {message_scope}")
+        filters = [IMessageMessage.user_id == user_id]
         if message_scope == "pending":
-            stmt = stmt.where(IMessageMessage.processed_at_utc.is_(None))
+            filters.append(IMessageMessage.processed_at_utc.is_(None))
         elif message_scope == "processed":
-            stmt = stmt.where(IMessageMessage.processed_at_utc.is_not(None))
+            filters.append(IMessageMessage.processed_at_utc.is_not(None))
+        if conversation_id is not None:
+            filters.append(IMessageMessage.conversation_id == conversation_id)
         if since_utc is not None:
-            stmt = stmt.where(
+            filters.append(
                 or_(
                     IMessageMessage.sent_at_utc >= since_utc,
                     (IMessageMessage.sent_at_utc.is_(None) & (IMessageMessage.created_at >= since_utc)),
                 )
             )
-        if conversation_id is not None:
-            stmt = stmt.where(IMessageMessage.conversation_id == conversation_id)
-        result = await self.session.execute(stmt)
-        continuation = list(result.scalars().all())
-        if not continuation:
-            return messages
+        page_filters = list(filters)
+        if after is not None:
+            page_filters.append(after.clause())
+        ordering = (IMessageMessage.sent_at_utc.asc().nullslast(), IMessageMessage.id.asc())
+        load_conversation = selectinload(IMessageMessage.conversation).selectinload(
+            IMessageConversation.participants
+        )
 
-        existing_ids = {item.id for item in messages}
+        if max_messages <= 0:
+            result = await self.session.execute(
+                select(IMessageMessage).options(load_conversation).where(*page_filters).order_by(*ordering)
+            )
+            return list(result.scalars().all()), []
+
+        page = (
+            select(IMessageMessage.id, IMessageMessage.conversation_id, IMessageMessage.sent_at_utc)
+            .where(*page_filters)
+            .order_by(*ordering)
+            .limit(max_messages)
+            .cte("page")
+        )
+        boundary = (
+            select(page.c.id, page.c.conversation_id, page.c.sent_at_utc)
+            .order_by(page.c.sent_at_utc.desc().nullsfirst(), page.c.id.desc())
+            .limit(1)
+            .cte("page_boundary")
+        )
+        # A page ending on an undated message has no continuation: ``>= NULL`` matches nothing.
+        continuation = (
+            select(IMessageMessage.id)
+            .join(
+                boundary,
+                (IMessageMessage.conversation_id == boundary.c.conversation_id)
+                & (IMessageMessage.sent_at_utc >= boundary.c.sent_at_utc)
+                & (IMessageMessage.id != boundary.c.id),
+            )
+            .where(*filters, IMessageMessage.id.not_in(select(page.c.id)))
+            .order_by(IMessageMessage.sent_at_utc.asc(), IMessageMessage.id.asc())
+            .limit(MAX_CLUSTER_MESSAGES)
+            .subquery("continuation")
+        )
+        batch = union_all(
+            select(page.c.id, literal_column("0").label("segment")),
+            select(continuation.c.id, literal_column("1").label("segment")),
+        ).subquery("batch")
+        result = await self.session.execute(
+            select(IMessageMessage, batch.c.segment)
+            .join(batch, batch.c.id == IMessageMessage.id)
+            .options(load_conversation)
+            .order_by(batch.c.segment, *ordering)
+        )
+        page_messages: list[IMessageMessage] = []
+        continuation_messages: list[IMessageMessage] = []
+        for message, segment in result.all():
+            (continuation_messages if segment else page_messages).append(message)
+        return page_messages, continuation_messages
+
+    @staticmethod
+    def _extend_message_batch_with_conversation_tail(
+        messages: list[IMessageMessage],
+        continuation: list[IMessageMessage],
+    ) -> list[IMessageMessage]:
+        if not messages or not continuation:
+            return messages
+        last_message = messages[-1]
+        rolling_cluster = [item for item in messages if item.conversation_id == last_message.conversation_id]
         extended = list(messages)
-        rolling_cluster = list(trailing_batch)
         for candidate in continuation:
-            if candidate.id in existing_ids:
-                continue
             should_split, _ = should_split_message_cluster(
                 rolling_cluster,
                 candidate,
@@ -595,7 +646,6 @@ class IMessageProcessingService:
                 break
             extended.append(candidate)
             rolling_cluster.append(candidate)
-            existing_ids.add(candidate.id)
         return extended
 
     async def _build_project_catalog(
@@ -627,6 +677,13 @@ class IMessageProcessingService:
             )
         return catalog
 
+    def _matcher_for(self, project_catalog: list[ProjectCatalogEntry]) -> ProjectMatcher:
+        """The compiled matcher for this run's catalog, built on first use."""
+        key = tuple(project_catalog)
+        if self._project_matcher is None or self._project_matcher[0] != key:
+            self._project_matcher = (key, ProjectMatcher(project_catalog))
+        return self._project_matcher[1]
+
     async def _conversation_project_affinities(
         self,
         *,
@@ -1033,17 +1090,9 @@ class IMessageProcessingService:
             user_id=cluster.conversation.user_id,
             conversation_id=cluster.conversation.id,
         )
-        effective_catalog = [
-            ProjectCatalogEntry(
-                name=item.name,
-                aliases=item.aliases,
-                notes=item.notes,
-                conversation_affinity=affinities.get(item.name, 0.0),
-            )
-            for item in project_catalog
-        ]
         heuristic_guess = infer_project_match(
-            project_catalog=effective_catalog,
+            matcher=self._matcher_for(project_catalog),
+            affinities=affinities,
             conversation_name=conversation_name,
             participants=participant_handles or participant_labels,
             message_texts=message_texts,
@@ -3606,34 +3655,15 @@ class IMessageProcessingService:
         await self.session.flush()
 
     async def _call_model(self, prompt: str, response_model):
+        # Retries and 429 backoff are handled by the shared LLM gateway.
         if self.client is None:
             raise ValueError("OpenAI client is not available.")
-        last_exc: Exception | None = None
-        for attempt in range(1, MODEL_RETRY_ATTEMPTS + 1):
-            try:
-                result = await self.client.generate_json(
-                    prompt,
-                    response_model=response_model,
-                    temperature=0.0,
-                )
-                return result.data
-            except Exception as exc:  # noqa: BLE001
-                last_exc = exc
-                if not self._is_transient_model_error(exc) or attempt >= MODEL_RETRY_ATTEMPTS:
-                    raise
-                delay_seconds = 2 ** (attempt - 1)
-                logger.warning(
-                    "[imessage] transient model error schema={} attempt={}/{} delay={}s error={}",
-                    response_model.__name__,
-                    attempt,
-                    MODEL_RETRY_ATTEMPTS,
-                    delay_seconds,
-                    exc,
-                )
-                await asyncio.sleep(delay_seconds)
-        if last_exc is not None:
-            raise last_exc
-        raise RuntimeError("Model call failed without an exception.")
+        result = await self.client.generate_json(
+            prompt,
+            response_model=response_model,
+            temperature=0.0,
+        )
+        return result.data
 
     async def _invoke_model(self, prompt: str, response_model: type[BaseModel]):
         model_call = self._call_model
@@ -3667,31 +3697,3 @@ class IMessageProcessingService:
         if parsed.tzinfo is None:
             return parsed.replace(tzinfo=timezone.utc)
         return parsed.astimezone(timezone.utc)
-
-    def _is_transient_model_error(self, exc: Exception) -> bool:
-        status_code = getattr(exc, "status_code", None)
-        response = getattr(exc, "response", None)
-        if status_code is None and response is not None:
-            status_code = getattr(response, "status_code", None)
-        if isinstance(status_code, int) and status_code in {408, 409, 429, 500, 502, 503, 504}:
-            return True
-
-        message = str(exc).lower()
-        transient_markers = (
-            "rate limit",
-            "resource_exhausted",
-            "temporarily unavailable",
-            "visibility check was unavailable",
-            "service unavailable",
-            "unavailable",
-            "timeout",
-            "timed out",
-            "connection reset",
-            "connection aborted",
-            "connection refused",
-            "internal server error",
-            "bad gateway",
-            "gateway timeout",
-            "overloaded",
-        )
-        return any(marker in message for marker in transient_markers)
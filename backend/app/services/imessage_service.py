@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+import json
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -25,6 +26,9 @@ from app.schemas.imessage import (
 )
 from app.services.imessage_utils import conversation_display_name
 
+# Below this many pending rows the gauge counts exactly, so a drained backlog reads 0.
+EXACT_BACKLOG_COUNT_BELOW = 10_000
+
 
 class IMessageService:
     def __init__(self, session: AsyncSession) -> None:
@@ -40,16 +44,11 @@ class IMessageService:
         )
         last_sync = await self._latest_run(IMessageSyncRun, user_id)
         last_processing = await self._latest_run(IMessageProcessingRun, user_id)
-        unprocessed_messages = await self._scalar(
-            select(func.count(IMessageMessage.id)).where(
-                IMessageMessage.user_id == user_id,
-                IMessageMessage.processed_at_utc.is_(None),
-            )
-        )
+        unprocessed_messages = await self.estimate_unprocessed_messages(user_id)
         return IMessageStatusResponse(
             synced_conversations=synced_conversations,
             synced_messages=synced_messages,
-            unprocessed_messages=int(unprocessed_messages or 0),
+            unprocessed_messages=unprocessed_messages,
             last_message_at_utc=last_message_at,
             last_sync_completed_at_utc=last_sync.completed_at_utc if last_sync else None,
             last_processing_completed_at_utc=(
@@ -57,6 +56,28 @@ class IMessageService:
             ),
         )
 
+    async def estimate_unprocessed_messages(self, user_id: int) -> int:
+        """Approximate number of messages still awaiting processing.
+
+        On Postgres a large backlog is read from the planner's row estimate for the
+        pending partial index instead of being counted; small ones are counted exactly.
+        """
+        pending = select(IMessageMessage.id).where(
+            IMessageMessage.user_id == user_id,
+            IMessageMessage.processed_at_utc.is_(None),
+        )
+        dialect = self.session.get_bind().dialect
+        if dialect.name == "postgresql":
+            compiled = pending.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+            plan = (await self.session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))).scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+            if estimate >= EXACT_BACKLOG_COUNT_BELOW:
+                return estimate
+        value = await self._scalar(select(func.count()).select_from(pending.subquery()))
+        return int(value or 0)
+
     async def list_conversations(
         self, user_id: int, *, limit: int = 50, offset: int = 0
     ) -> list[IMessageConversationSummary]:
@@ -0,0 +1,528 @@
+"""Pipelined copy of the macOS Messages database into the Postgres cache.
+
+Shared by ``IMessageSyncService`` and ``scripts/sync_imessage.py``. A reader
+thread pulls message batches out of the read-only ``chat.db``, decodes
+``attributedBody`` blobs, and looks up chat participants. The async writer
+resolves contact names and persists each batch while the reader is already
+fetching the next one, so SQLite reads and Postgres writes overlap. The reader
+never gets more than one batch ahead, so memory stays bounded by the batch size.
+
+On Postgres, messages are streamed with ``COPY`` into a temporary staging
+table and merged with a single ``INSERT ... SELECT ... ON CONFLICT``. Other
+dialects fall back to multi-row upserts.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sqlite3
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.imessage import IMessageConversation, IMessageMessage, IMessageParticipant, IMessageSyncRun
+from app.services.imessage_contact_service import IMessageContactResolver
+from app.services.imessage_utils import (
+    APPLE_EPOCH,
+    apple_timestamp_to_datetime,
+    conversation_display_name,
+    extract_message_text,
+    normalize_message_text,
+    participant_hash,
+)
+
+STAGING_TABLE = "imessage_message_staging"
+
+# Staging rows carry the chat guid instead of ``conversation_id``; the merge
+# joins it to ``imessage_conversation``. ``raw_payload`` travels as JSON text.
+STAGING_COLUMNS = (
+    "user_id",
+    "conversation_source_guid",
+    "source_guid",
+    "source_row_id",
+    "service_name",
+    "handle_identifier",
+    "sender_label",
+    "is_from_me",
+    "text",
+    "normalized_text",
+    "has_attachments",
+    "sent_at_utc",
+    "delivered_at_utc",
+    "read_at_utc",
+    "raw_payload",
+)
+
+_CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+    user_id integer NOT NULL,
+    conversation_source_guid varchar(255) NOT NULL,
+    source_guid varchar(255) NOT NULL,
+    source_row_id bigint,
+    service_name varchar(64),
+    handle_identifier varchar(255),
+    sender_label varchar(255),
+    is_from_me boolean NOT NULL,
+    text text,
+    normalized_text text,
+    has_attachments boolean NOT NULL,
+    sent_at_utc timestamptz,
+    delivered_at_utc timestamptz,
+    read_at_utc timestamptz,
+    raw_payload text
+) ON COMMIT DELETE ROWS
+"""
+
+# A message filed under two chats appears twice in a batch; ON CONFLICT cannot
+# touch the same row twice in one statement, so keep one copy per guid.
+_MERGE_STAGING_SQL = f"""
+INSERT INTO imessage_message (
+    user_id, conversation_id, source_guid, source_row_id, service_name, handle_identifier,
+    sender_label, is_from_me, text, normalized_text, has_attachments, sent_at_utc,
+    delivered_at_utc, read_at_utc, raw_payload, created_at, updated_at
+)
+SELECT DISTINCT ON (s.source_guid)
+    s.user_id, c.id, s.source_guid, s.source_row_id, s.service_name, s.handle_identifier,
+    s.sender_label, s.is_from_me, s.text, s.normalized_text, s.has_attachments, s.sent_at_utc,
+    s.delivered_at_utc, s.read_at_utc, CAST(s.raw_payload AS json),
+    CAST(:now AS timestamptz), CAST(:now AS timestamptz)
+FROM {STAGING_TABLE} AS s
+JOIN imessage_conversation AS c
+    ON c.user_id = s.user_id AND c.source_guid = s.conversation_source_guid
+ORDER BY s.source_guid, s.source_row_id DESC
+ON CONFLICT ON CONSTRAINT uq_imessage_message_user_source_guid DO UPDATE SET
+    conversation_id = EXCLUDED.conversation_id,
+    source_row_id = EXCLUDED.source_row_id,
+    service_name = EXCLUDED.service_name,
+    handle_identifier = EXCLUDED.handle_identifier,
+    sender_label = EXCLUDED.sender_label,
+    is_from_me = EXCLUDED.is_from_me,
+    text = EXCLUDED.text,
+    normalized_text = EXCLUDED.normalized_text,
+    has_attachments = EXCLUDED.has_attachments,
+    sent_at_utc = EXCLUDED.sent_at_utc,
+    delivered_at_utc = EXCLUDED.delivered_at_utc,
+    read_at_utc = EXCLUDED.read_at_utc,
+    raw_payload = EXCLUDED.raw_payload,
+    updated_at = EXCLUDED.updated_at
+"""
+
+_MESSAGE_BATCH_SQL = """
+SELECT
+    m.ROWID AS message_row_id,
+    COALESCE(m.guid, 'msg-' || m.ROWID) AS message_guid,
+    m.text AS message_text,
+    m.attributedBody AS attributed_body,
+    COALESCE(m.service, c.service_name) AS message_service,
+    COALESCE(m.is_from_me, 0) AS is_from_me,
+    COALESCE(m.cache_has_attachments, 0) AS has_attachments,
+    COALESCE(m.associated_message_type, 0) AS associated_message_type,
+    COALESCE(m.item_type, 0) AS item_type,
+    m.associated_message_guid AS associated_message_guid,
+    m.date AS message_date,
+    m.date_read AS message_date_read,
+    m.date_delivered AS message_date_delivered,
+    h.id AS handle_identifier,
+    c.ROWID AS chat_row_id,
+    COALESCE(c.guid, 'chat-' || c.ROWID) AS chat_guid,
+    c.display_name AS chat_display_name,
+    c.chat_identifier AS chat_identifier,
+    c.service_name AS chat_service_name
+FROM message AS m
+JOIN chat_message_join AS cmj ON cmj.message_id = m.ROWID
+JOIN chat AS c ON c.ROWID = cmj.chat_id
+LEFT JOIN handle AS h ON h.ROWID = m.handle_id
+WHERE m.ROWID > ?
+  AND (
+    ? IS NULL
+    OR (
+        m.date IS NOT NULL
+        AND (
+            CASE
+                WHEN ABS(m.date) >= 10000000000000000 THEN (m.date / 1000000000.0)
+                WHEN ABS(m.date) >= 10000000000000 THEN (m.date / 1000000.0)
+                WHEN ABS(m.date) >= 10000000000 THEN (m.date / 1000.0)
+                ELSE (m.date * 1.0)
+            END
+        ) >= ?
+    )
+  )
+ORDER BY m.ROWID ASC
+LIMIT ?
+"""
+
+
+@dataclass
+class SourceMessageRow:
+    """One ``message`` x ``chat`` row from chat.db with its text already decoded."""
+    message_row_id: int
+    message_guid: str
+    chat_row_id: int
+    chat_guid: str
+    chat_service_name: str | None
+    chat_identifier: str | None
+    chat_display_name: str | None
+    service_name: str | None
+    handle_identifier: str | None
+    is_from_me: bool
+    text: str | None
+    content_source: str
+    has_attachments: bool
+    associated_message_guid: str | None
+    associated_message_type: int
+    item_type: int
+    sent_at_utc: datetime | None
+    delivered_at_utc: datetime | None
+    read_at_utc: datetime | None
+
+
+@dataclass
+class SourceBatch:
+    rows: list[SourceMessageRow]
+    participants: dict[int, list[str]]
+
+    @property
+    def last_row_id(self) -> int:
+        return max(row.message_row_id for row in self.rows)
+
+
+class ChatDbReader:
+    """Reads chat.db in ``ROWID`` order. Blocking; meant to run on the reader thread."""
+
+    def __init__(self, db_path: str | Path, *, batch_size: int = 500, cutoff_utc: datetime | None = None) -> None:
+        self.db_path = Path(db_path).expanduser()
+        self.batch_size = batch_size
+        self.cutoff_utc = cutoff_utc
+
+    def iter_batches(self, after_row_id: int) -> Iterator[SourceBatch]:
+        if not self.db_path.exists():
+            raise FileNotFoundError(f"Messages database not found at {self.db_path}")
+        cutoff = (self.cutoff_utc.astimezone(timezone.utc) - APPLE_EPOCH).total_seconds() if self.cutoff_utc else None
+        with closing(sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)) as conn:
+            conn.row_factory = sqlite3.Row
+            while True:
+                raw_rows = conn.execute(_MESSAGE_BATCH_SQL, (after_row_id, cutoff, cutoff, self.batch_size)).fetchall()
+                if not raw_rows:
+                    return
+                rows = [self._decode(row) for row in raw_rows]
+                participants = self._fetch_participants(conn, sorted({row.chat_row_id for row in rows}))
+                batch = SourceBatch(rows=rows, participants=participants)
+                after_row_id = batch.last_row_id
+                yield batch
+
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> SourceMessageRow:
+        text_value = extract_message_text(
+            row["message_text"],
+            attributed_body=row["attributed_body"],
+            associated_message_type=row["associated_message_type"],
+            item_type=row["item_type"],
+        )
+        if normalize_message_text(row["message_text"]):
+            content_source = "text"
+        else:
+            content_source = "attributedBody" if text_value else "none"
+        return SourceMessageRow(
+            message_row_id=int(row["message_row_id"]),
+            message_guid=str(row["message_guid"]),
+            chat_row_id=int(row["chat_row_id"]),
+            chat_guid=str(row["chat_guid"]),
+            chat_service_name=normalize_message_text(row["chat_service_name"]) or None,
+            chat_identifier=normalize_message_text(row["chat_identifier"]) or None,
+            chat_display_name=row["chat_display_name"],
+            service_name=normalize_message_text(row["message_service"]) or None,
+            handle_identifier=normalize_message_text(row["handle_identifier"]) or None,
+            is_from_me=bool(row["is_from_me"]),
+            text=text_value,
+            content_source=content_source,
+            has_attachments=bool(row["has_attachments"]),
+            associated_message_guid=row["associated_message_guid"],
+            associated_message_type=int(row["associated_message_type"] or 0),
+            item_type=int(row["item_type"] or 0),
+            sent_at_utc=apple_timestamp_to_datetime(row["message_date"]),
+            delivered_at_utc=apple_timestamp_to_datetime(row["message_date_delivered"]),
+            read_at_utc=apple_timestamp_to_datetime(row["message_date_read"]),
+        )
+
+    @staticmethod
+    def _fetch_participants(conn: sqlite3.Connection, chat_row_ids: list[int]) -> dict[int, list[str]]:
+        if not chat_row_ids:
+            return {}
+        placeholders = ",".join("?" for _ in chat_row_ids)
+        query = f"""
+        SELECT chj.chat_id AS chat_id, h.id AS handle_identifier
+        FROM chat_handle_join AS chj
+        JOIN handle AS h ON h.ROWID = chj.handle_id
+        WHERE chj.chat_id IN ({placeholders})
+        ORDER BY chj.chat_id ASC, h.id ASC
+        """
+        by_chat: dict[int, list[str]] = defaultdict(list)
+        for row in conn.execute(query, chat_row_ids).fetchall():
+            identifier = normalize_message_text(row["handle_identifier"])
+            # The same address can have a handle per service (iMessage and SMS).
+            if identifier and identifier not in by_chat[int(row["chat_id"])]:
+                by_chat[int(row["chat_id"])].append(identifier)
+        return by_chat
+
+
+_END = object()
+
+
+async def read_ahead(reader: ChatDbReader, after_row_id: int) -> AsyncIterator[SourceBatch]:
+    """Yield ``reader``'s batches while a thread reads the next one.
+
+    The thread blocks on a one-slot semaphore after reading a batch, and the
+    slot is freed once the consumer is done with the previous batch, so at most
+    one batch waits in memory. Close the iterator (``contextlib.aclosing``) to
+    stop the thread early.
+    """
+    loop = asyncio.get_running_loop()
+    ready: asyncio.Queue[Any] = asyncio.Queue()
+    slot = threading.Semaphore(1)
+    stopped = threading.Event()
+
+    def _produce() -> None:
+        try:
+            with closing(reader.iter_batches(after_row_id)) as batches:
+                for batch in batches:
+                    slot.acquire()
+                    if stopped.is_set():
+                        return
+                    loop.call_soon_threadsafe(ready.put_nowait, batch)
+            loop.call_soon_threadsafe(ready.put_nowait, _END)
+        except Exception as exc:  # noqa: BLE001
+            loop.call_soon_threadsafe(ready.put_nowait, exc)
+
+    thread = threading.Thread(target=_produce, name="imessage-chat-db-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = await ready.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+            slot.release()
+    finally:
+        stopped.set()
+        slot.release()
+        await asyncio.to_thread(thread.join)
+
+
+class IMessageBatchWriter:
+    """Persists one ``SourceBatch`` into the caller's transaction."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        user_id: int,
+        contact_resolver: IMessageContactResolver | None = None,
+    ) -> None:
+        self.session = session
+        self.user_id = user_id
+        self.contact_resolver = contact_resolver or IMessageContactResolver(session)
+        self.is_postgres = session.get_bind().dialect.name == "postgresql"
+
+    async def write(self, batch: SourceBatch) -> tuple[int, int]:
+        """Returns ``(conversations upserted, messages upserted)``."""
+        resolved_names = await self.contact_resolver.resolve_identifiers(
+            user_id=self.user_id,
+            identifiers=[row.handle_identifier for row in batch.rows]
+            + [identifier for identifiers in batch.participants.values() for identifier in identifiers],
+        )
+        now_utc = datetime.now(timezone.utc)
+        conversation_ids = await self._upsert_conversations(batch, resolved_names, now_utc)
+        await self._replace_participants(batch, conversation_ids, resolved_names)
+
+        messages = [self._message_values(row, resolved_names) for row in batch.rows]
+        if self.is_postgres:
+            upserted = await self._copy_messages(messages, now_utc)
+        else:
+            upserted = await self._upsert_messages(messages, conversation_ids, now_utc)
+        return len(conversation_ids), upserted
+
+    def _insert(self, model: Any) -> Any:
+        return pg_insert(model) if self.is_postgres else sqlite_insert(model)
+
+    async def _upsert_conversations(
+        self, batch: SourceBatch, resolved_names: dict[str, str | None], now_utc: datetime
+    ) -> dict[str, int]:
+        payloads: dict[str, dict[str, Any]] = {}
+        for row in batch.rows:
+            participants = batch.participants.get(row.chat_row_id, [])
+            payloads[row.chat_guid] = {
+                "user_id": self.user_id,
+                "source_guid": row.chat_guid,
+                "source_row_id": row.chat_row_id,
+                "service_name": row.chat_service_name,
+                "chat_identifier": row.chat_identifier,
+                "display_name": conversation_display_name(
+                    display_name=row.chat_display_name,
+                    chat_identifier=row.chat_identifier,
+                    participants=[resolved_names.get(identifier) or identifier for identifier in participants],
+                ),
+                "participant_hash": participant_hash(participants) if participants else None,
+                "participants_json": participants,
+                "last_message_at_utc": row.sent_at_utc,
+                "last_synced_at_utc": now_utc,
+            }
+        if not payloads:
+            return {}
+        stmt = self._insert(IMessageConversation).values(list(payloads.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "source_guid"],
+            set_={
+                "source_row_id": stmt.excluded.source_row_id,
+                "service_name": stmt.excluded.service_name,
+                "chat_identifier": stmt.excluded.chat_identifier,
+                "display_name": stmt.excluded.display_name,
+                "participant_hash": stmt.excluded.participant_hash,
+                "participants_json": stmt.excluded.participants_json,
+                "last_message_at_utc": stmt.excluded.last_message_at_utc,
+                "last_synced_at_utc": stmt.excluded.last_synced_at_utc,
+                "updated_at": now_utc,
+            },
+        ).returning(IMessageConversation.source_guid, IMessageConversation.id)
+        result = await self.session.execute(stmt)
+        return {source_guid: conversation_id for source_guid, conversation_id in result.all()}
+
+    async def _replace_participants(
+        self, batch: SourceBatch, conversation_ids: dict[str, int], resolved_names: dict[str, str | None]
+    ) -> None:
+        if not conversation_ids:
+            return
+        await self.session.execute(
+            delete(IMessageParticipant).where(
+                IMessageParticipant.user_id == self.user_id,
+                IMessageParticipant.conversation_id.in_(list(conversation_ids.values())),
+            )
+        )
+        chat_rows = {row.chat_guid: row.chat_row_id for row in batch.rows}
+        values = [
+            {
+                "user_id": self.user_id,
+                "conversation_id": conversation_ids[chat_guid],
+                "identifier": identifier,
+                "display_name": resolved_names.get(identifier) or identifier,
+                "is_self": False,
+            }
+            for chat_guid, chat_row_id in chat_rows.items()
+            if chat_guid in conversation_ids
+            for identifier in batch.participants.get(chat_row_id, [])
+        ]
+        if values:
+            await self.session.execute(self._insert(IMessageParticipant).values(values))
+
+    def _message_values(self, row: SourceMessageRow, resolved_names: dict[str, str | None]) -> dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "conversation_source_guid": row.chat_guid,
+            "source_guid": row.message_guid,
+            "source_row_id": row.message_row_id,
+            "service_name": row.service_name,
+            "handle_identifier": row.handle_identifier,
+            "sender_label": (
+                "You" if row.is_from_me else (resolved_names.get(row.handle_identifier or "") or row.handle_identifier)
+            ),
+            "is_from_me": row.is_from_me,
+            "text": row.text,
+            "normalized_text": row.text,
+            "has_attachments": row.has_attachments,
+            "sent_at_utc": row.sent_at_utc,
+            "delivered_at_utc": row.delivered_at_utc,
+            "read_at_utc": row.read_at_utc,
+            "raw_payload": {
+                "chat_guid": row.chat_guid,
+                "chat_row_id": row.chat_row_id,
+                "message_row_id": row.message_row_id,
+                "content_source": row.content_source,
+                "associated_message_guid": row.associated_message_guid,
+                "associated_message_type": row.associated_message_type,
+                "item_type": row.item_type,
+            },
+        }
+
+    async def _copy_messages(self, messages: list[dict[str, Any]], now_utc: datetime) -> int:
+        await self.session.execute(text(_CREATE_STAGING_SQL))
+        connection = await self.session.connection()
+        raw = await connection.get_raw_connection()
+        records = []
+        for message in messages:
+            encoded = {**message, "raw_payload": json.dumps(message["raw_payload"])}
+            records.append(tuple(encoded[column] for column in STAGING_COLUMNS))
+        # asyncpg's binary COPY, on the connection already inside the session's transaction.
+        await raw.driver_connection.copy_records_to_table(STAGING_TABLE, records=records, columns=STAGING_COLUMNS)
+        result = await self.session.execute(text(_MERGE_STAGING_SQL), {"now": now_utc})
+        return result.rowcount or 0
+
+    async def _upsert_messages(
+        self, messages: list[dict[str, Any]], conversation_ids: dict[str, int], now_utc: datetime
+    ) -> int:
+        by_guid: dict[str, dict[str, Any]] = {}
+        for message in messages:
+            conversation_id = conversation_ids.get(message.pop("conversation_source_guid"))
+            if conversation_id is not None:
+                by_guid[message["source_guid"]] = {**message, "conversation_id": conversation_id}
+        if not by_guid:
+            return 0
+        stmt = self._insert(IMessageMessage).values(list(by_guid.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "source_guid"],
+            set_={
+                **{column: getattr(stmt.excluded, column) for column in STAGING_COLUMNS[3:]},
+                "conversation_id": stmt.excluded.conversation_id,
+                "updated_at": now_utc,
+            },
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
+
+
+async def sync_chat_db(
+    session: AsyncSession,
+    run: IMessageSyncRun,
+    reader: ChatDbReader,
+    *,
+    after_row_id: int,
+    limit_batches: int = 0,
+    contact_resolver: IMessageContactResolver | None = None,
+    on_batch: Callable[[int, int], None] | None = None,
+) -> int:
+    """Copy ``reader``'s batches after ``after_row_id``, committing each; returns the last row id.
+
+    ``run`` counters are updated as batches land. ``on_batch(batch_number,
+    last_row_id)`` is called after each commit.
+    """
+    writer = IMessageBatchWriter(session, user_id=run.user_id, contact_resolver=contact_resolver)
+    batch_count = 0
+    last_row_id = after_row_id
+    batches = read_ahead(reader, after_row_id)
+    try:
+        async for batch in batches:
+            conversations_upserted, messages_upserted = await writer.write(batch)
+            run.messages_scanned += len(batch.rows)
+            run.conversations_scanned += len({row.chat_guid for row in batch.rows})
+            run.conversations_upserted += conversations_upserted
+            run.messages_upserted += messages_upserted
+            await session.commit()
+            batch_count += 1
+            last_row_id = batch.last_row_id
+            if on_batch is not None:
+                on_batch(batch_count, last_row_id)
+            if limit_batches and batch_count >= limit_batches:
+                break
+    finally:
+        await batches.aclose()
+    return last_row_id
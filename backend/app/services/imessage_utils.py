@@ -1,13 +1,14 @@
 """Shared helpers for iMessage sync + processing."""
 from __future__ import annotations
 
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from difflib import SequenceMatcher
 import hashlib
 import json
 import re
-from typing import Any, Sequence
+from typing import Any, Iterable, Mapping, Sequence
 
 
 APPLE_EPOCH = datetime(2001, 1, 1, tzinfo=UTC)
@@ -407,6 +408,46 @@ def infer_topic_hints(messages: Sequence[Any]) -> list[str]:
     return [t for t, _ in sorted(scores.items(), key=lambda x: -x[1])[:3]]
 
 
+@dataclass(frozen=True)
+class MessageFeatures:
+    """Text features the clustering heuristics read for a message."""
+    source_text: str | None
+    text: str
+    tokens: frozenset[str]
+    intents: frozenset[str]
+    low_signal: bool
+
+
+_FEATURES_ATTR = "_cluster_features"
+
+
+def message_features(message: Any) -> MessageFeatures:
+    """Features of ``message.text``, memoized on the message object.
+
+    Clustering asks about each message several times (as the candidate, then as
+    one of the last four in the batch), so the cached record keeps it linear.
+    The cache is keyed by the text it was built from and rebuilt if that changes.
+    """
+    source_text = getattr(message, "text", None)
+    cached = getattr(message, _FEATURES_ATTR, None)
+    if isinstance(cached, MessageFeatures) and cached.source_text == source_text:
+        return cached
+    text = normalize_message_text(source_text)
+    tokens = content_tokens(text)
+    features = MessageFeatures(
+        source_text=source_text,
+        text=text,
+        tokens=frozenset(tokens),
+        intents=frozenset(tag for tag, vocabulary in _INTENT_LEXICONS.items() if tokens & vocabulary),
+        low_signal=not text or bool(_LOW_SIGNAL_TEXT_RE.match(text)),
+    )
+    try:
+        setattr(message, _FEATURES_ATTR, features)
+    except AttributeError:
+        pass
+    return features
+
+
 def should_split_message_cluster(
     batch: Sequence[Any],
     next_message: Any,
@@ -428,30 +469,26 @@ def should_split_message_cluster(
     ):
         return True, "time_gap_exceeded"
 
-    next_text = normalize_message_text(getattr(next_message, "text", None))
-    if not next_text or _LOW_SIGNAL_TEXT_RE.match(next_text):
+    current = message_features(next_message)
+    if current.low_signal:
         return False, "low_signal_follow_up"
 
-    recent_texts = [
-        normalize_message_text(getattr(item, "text", None))
-        for item in batch[-4:]
-        if normalize_message_text(getattr(item, "text", None))
-    ]
-    if not recent_texts:
+    recent = [features for features in (message_features(item) for item in batch[-4:]) if features.text]
+    if not recent:
         return False, "no_recent_text"
 
-    current_tokens = content_tokens(next_text)
+    current_tokens = current.tokens
     if len(current_tokens) < 3:
         return False, "not_enough_content_tokens"
 
-    recent_tokens = set().union(*(content_tokens(text) for text in recent_texts))
+    recent_tokens = frozenset().union(*(features.tokens for features in recent))
     if len(recent_tokens) < 3:
         return False, "not_enough_recent_context"
 
     overlap = len(current_tokens & recent_tokens) / max(min(len(current_tokens), len(recent_tokens)), 1)
-    recent_intents = set().union(*(message_intent_tags(text) for text in recent_texts))
-    current_intents = message_intent_tags(next_text)
-    if _CLUSTER_BOUNDARY_CUE_RE.search(next_text) and overlap < 0.18:
+    recent_intents = frozenset().union(*(features.intents for features in recent))
+    current_intents = current.intents
+    if _CLUSTER_BOUNDARY_CUE_RE.search(current.text) and overlap < 0.18:
         return True, "explicit_topic_boundary"
     if overlap < 0.08 and recent_intents and current_intents and recent_intents.isdisjoint(current_intents):
         return True, "semantic_topic_shift"
@@ -465,100 +502,271 @@ def _normalize_for_fuzzy_match(text: str) -> str:
     return " ".join(t for t in tokens if t not in _CHAT_FILLER_WORDS)
 
 
-def infer_project_candidates(
-    *,
-    project_catalog: Sequence[ProjectCatalogEntry],
-    conversation_name: str | None,
-    participants: list[str] | None,
-    message_texts: list[str],
-) -> list[ProjectCandidate]:
-    conversation_text = normalize_message_text(conversation_name).lower()
-    message_blob = " ".join(normalize_message_text(text) for text in message_texts).lower()
-    participant_blob = " ".join(item.strip().lower() for item in participants or [] if item and item.strip())
-    conversation_tokens = content_tokens(conversation_name)
-    message_tokens = set().union(*(content_tokens(text) for text in message_texts))
-    participant_tokens = content_tokens(participant_blob)
-
-    candidates: list[ProjectCandidate] = []
-    for entry in project_catalog:
-        aliases = entry.aliases or derive_project_aliases(entry.name)
-        alias_tokens = set().union(*(content_tokens(alias) for alias in aliases))
-        if not alias_tokens:
-            continue
+class _AhoCorasick:
+    """Finds which of a fixed set of patterns occur in a text with one scan of the text."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (pattern,)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> set[str]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
 
-        score = 0.0
-        reasons: list[str] = []
-
-        if conversation_name:
-            norm_conv = _normalize_for_fuzzy_match(conversation_name)
-            norm_proj = _normalize_for_fuzzy_match(entry.name)
-            if norm_conv and norm_proj:
-                ratio = SequenceMatcher(None, norm_conv, norm_proj).ratio()
-                if ratio > 0.55:
-                    score = max(score, 0.90)
-                    reasons.append(
-                        f"conversation display name fuzzy-matches project '{entry.name}' (ratio={ratio:.2f})"
-                    )
-
-        normalized_affinity = max(0.0, min(1.0, entry.conversation_affinity))
-        if normalized_affinity > 0:
-            score += 0.46 * normalized_affinity
-            reasons.append("previous approved actions in this conversation mapped to the project")
-
-        for alias in aliases:
-            lowered_alias = alias.lower()
-            if len(lowered_alias) >= 4 and lowered_alias == conversation_text:
-                score += 0.62
-                reasons.append(f"conversation title exactly matches alias '{alias}'")
-                break
-            if len(lowered_alias) >= 4 and lowered_alias in conversation_text:
-                score += 0.54
-                reasons.append(f"conversation title contains alias '{alias}'")
-                break
-            if len(lowered_alias) >= 4 and lowered_alias in message_blob:
-                score += 0.32
-                reasons.append(f"messages mention alias '{alias}'")
-                break
-            if len(lowered_alias) <= 3 and lowered_alias and lowered_alias in conversation_tokens:
-                score += 0.2
-                reasons.append(f"conversation title contains shorthand alias '{alias}'")
-                break
-
-        conversation_overlap = len(alias_tokens & conversation_tokens) / max(len(alias_tokens), 1)
-        if conversation_overlap > 0:
-            score += min(0.32, 0.32 * conversation_overlap)
-            reasons.append("conversation title shares project vocabulary")
-
-        message_overlap = len(alias_tokens & message_tokens) / max(len(alias_tokens), 1)
-        if message_overlap > 0:
-            score += min(0.24, 0.24 * message_overlap)
-            reasons.append("messages share project vocabulary")
-
-        participant_overlap = len(alias_tokens & participant_tokens) / max(len(alias_tokens), 1)
-        if participant_overlap > 0:
-            score += min(0.06, 0.06 * participant_overlap)
-            reasons.append("participants overlap with project shorthand")
-
-        if entry.notes:
-            note_tokens = content_tokens(entry.notes)
-            if note_tokens:
-                note_overlap = len(note_tokens & message_tokens) / max(min(len(note_tokens), len(message_tokens) or 1), 1)
+
+@dataclass(frozen=True)
+class _CompiledProject:
+    entry: ProjectCatalogEntry
+    aliases: tuple[str, ...]
+    alias_token_count: int
+    fuzzy_name: str
+    note_token_count: int
+
+
+class ProjectMatcher:
+    """``infer_project_candidates`` with the catalog compiled once.
+
+    Alias and note tokens go into inverted indexes, alias substrings into an
+    Aho-Corasick automaton, and fuzzy name ratios are cached per conversation
+    name, so scoring a cluster touches only the projects it has signals for.
+    Build one per processing run and reuse it for every cluster.
+    """
+
+    def __init__(self, project_catalog: Sequence[ProjectCatalogEntry]) -> None:
+        self._projects: list[_CompiledProject] = []
+        self._alias_token_index: dict[str, list[int]] = defaultdict(list)
+        self._note_token_index: dict[str, list[int]] = defaultdict(list)
+        # Lowered alias -> (project index, alias position) pairs.
+        self._long_aliases: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._short_aliases: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        self._by_name: dict[str, list[int]] = defaultdict(list)
+        for entry in project_catalog:
+            aliases = entry.aliases or derive_project_aliases(entry.name)
+            alias_tokens = set().union(*(content_tokens(alias) for alias in aliases))
+            if not alias_tokens:
+                continue
+            index = len(self._projects)
+            note_tokens = content_tokens(entry.notes) if entry.notes else set()
+            self._projects.append(
+                _CompiledProject(
+                    entry=entry,
+                    aliases=tuple(aliases),
+                    alias_token_count=len(alias_tokens),
+                    fuzzy_name=_normalize_for_fuzzy_match(entry.name),
+                    note_token_count=len(note_tokens),
+                )
+            )
+            self._by_name[entry.name].append(index)
+            for token in alias_tokens:
+                self._alias_token_index[token].append(index)
+            for token in note_tokens:
+                self._note_token_index[token].append(index)
+            for position, alias in enumerate(aliases):
+                lowered = alias.lower()
+                if len(lowered) >= 4:
+                    self._long_aliases[lowered].append((index, position))
+                elif lowered:
+                    self._short_aliases[lowered].append((index, position))
+        self._automaton = _AhoCorasick(self._long_aliases)
+        self._fuzzy_cache: dict[str, dict[int, float]] = {}
+
+    def candidates(
+        self,
+        *,
+        conversation_name: str | None,
+        participants: list[str] | None,
+        message_texts: list[str],
+        affinities: Mapping[str, float] | None = None,
+    ) -> list[ProjectCandidate]:
+        """Ranked candidates; ``affinities`` overrides each entry's ``conversation_affinity``."""
+        conversation_text = normalize_message_text(conversation_name).lower()
+        message_blob = " ".join(normalize_message_text(text) for text in message_texts).lower()
+        participant_blob = " ".join(item.strip().lower() for item in participants or [] if item and item.strip())
+        conversation_tokens = content_tokens(conversation_name)
+        message_tokens = set().union(*(content_tokens(text) for text in message_texts))
+        participant_tokens = content_tokens(participant_blob)
+
+        conversation_hits = self._count_hits(self._alias_token_index, conversation_tokens)
+        message_hits = self._count_hits(self._alias_token_index, message_tokens)
+        participant_hits = self._count_hits(self._alias_token_index, participant_tokens)
+        note_hits = self._count_hits(self._note_token_index, message_tokens)
+        alias_hits = self._alias_hits(conversation_text, message_blob, conversation_tokens)
+        fuzzy = self._fuzzy_ratios(conversation_name) if conversation_name else {}
+
+        affinity_by_index: dict[int, float] = {}
+        if affinities is None:
+            for index, project in enumerate(self._projects):
+                if project.entry.conversation_affinity > 0:
+                    affinity_by_index[index] = project.entry.conversation_affinity
+        else:
+            for name, value in affinities.items():
+                for index in self._by_name.get(name, ()):
+                    affinity_by_index[index] = value
+
+        touched = (
+            conversation_hits.keys() | message_hits.keys() | participant_hits.keys() | note_hits.keys()
+            | alias_hits.keys() | fuzzy.keys() | affinity_by_index.keys()
+        )
+        candidates: list[ProjectCandidate] = []
+        for index in sorted(touched):
+            project = self._projects[index]
+            entry = project.entry
+            score = 0.0
+            reasons: list[str] = []
+
+            ratio = fuzzy.get(index)
+            if ratio is not None:
+                score = max(score, 0.90)
+                reasons.append(f"conversation display name fuzzy-matches project '{entry.name}' (ratio={ratio:.2f})")
+
+            normalized_affinity = max(0.0, min(1.0, affinity_by_index.get(index, 0.0)))
+            if normalized_affinity > 0:
+                score += 0.46 * normalized_affinity
+                reasons.append("previous approved actions in this conversation mapped to the project")
+
+            if index in alias_hits:
+                position, kind = alias_hits[index]
+                bonus, template = _ALIAS_HIT_KINDS[kind]
+                score += bonus
+                reasons.append(template.format(alias=project.aliases[position]))
+
+            conversation_overlap = conversation_hits.get(index, 0) / max(project.alias_token_count, 1)
+            if conversation_overlap > 0:
+                score += min(0.32, 0.32 * conversation_overlap)
+                reasons.append("conversation title shares project vocabulary")
+
+            message_overlap = message_hits.get(index, 0) / max(project.alias_token_count, 1)
+            if message_overlap > 0:
+                score += min(0.24, 0.24 * message_overlap)
+                reasons.append("messages share project vocabulary")
+
+            participant_overlap = participant_hits.get(index, 0) / max(project.alias_token_count, 1)
+            if participant_overlap > 0:
+                score += min(0.06, 0.06 * participant_overlap)
+                reasons.append("participants overlap with project shorthand")
+
+            if project.note_token_count:
+                note_overlap = note_hits.get(index, 0) / max(
+                    min(project.note_token_count, len(message_tokens) or 1), 1
+                )
                 if note_overlap > 0:
                     score += min(0.12, 0.12 * note_overlap)
                     reasons.append("messages overlap with project notes vocabulary")
 
-        if score <= 0:
-            continue
-        candidates.append(
-            ProjectCandidate(
-                project_name=entry.name,
-                score=min(0.98, score),
-                reasons=tuple(reasons),
-                aliases=tuple(aliases),
+            if score <= 0:
+                continue
+            candidates.append(
+                ProjectCandidate(
+                    project_name=entry.name,
+                    score=min(0.98, score),
+                    reasons=tuple(reasons),
+                    aliases=project.aliases,
+                )
             )
-        )
 
-    return sorted(candidates, key=lambda item: (-item.score, item.project_name.lower()))
+        return sorted(candidates, key=lambda item: (-item.score, item.project_name.lower()))
+
+    @staticmethod
+    def _count_hits(index: dict[str, list[int]], tokens: set[str]) -> dict[int, int]:
+        hits: dict[int, int] = defaultdict(int)
+        for token in tokens:
+            for project_index in index.get(token, ()):
+                hits[project_index] += 1
+        return hits
+
+    def _alias_hits(
+        self, conversation_text: str, message_blob: str, conversation_tokens: set[str]
+    ) -> dict[int, tuple[int, int]]:
+        """Per project, the first alias with a hit and the kind of hit (see ``_ALIAS_HIT_KINDS``)."""
+        found: list[tuple[list[tuple[int, int]], int]] = []
+        if conversation_text in self._long_aliases:
+            found.append((self._long_aliases[conversation_text], 0))
+        found.extend((self._long_aliases[alias], 1) for alias in self._automaton.find(conversation_text))
+        found.extend((self._long_aliases[alias], 2) for alias in self._automaton.find(message_blob))
+        found.extend((self._short_aliases[token], 3) for token in conversation_tokens if token in self._short_aliases)
+
+        best: dict[int, tuple[int, int]] = {}
+        for positions, kind in found:
+            for project_index, position in positions:
+                current = best.get(project_index)
+                if current is None or (position, kind) < current:
+                    best[project_index] = (position, kind)
+        return best
+
+    def _fuzzy_ratios(self, conversation_name: str) -> dict[int, float]:
+        normalized = _normalize_for_fuzzy_match(conversation_name)
+        cached = self._fuzzy_cache.get(normalized)
+        if cached is not None:
+            return cached
+        ratios: dict[int, float] = {}
+        if normalized:
+            matcher = SequenceMatcher(None, normalized)
+            for index, project in enumerate(self._projects):
+                if not project.fuzzy_name:
+                    continue
+                matcher.set_seq2(project.fuzzy_name)
+                # The quick ratios are upper bounds, so they only skip projects that cannot pass.
+                if matcher.real_quick_ratio() > 0.55 and matcher.quick_ratio() > 0.55:
+                    ratio = matcher.ratio()
+                    if ratio > 0.55:
+                        ratios[index] = ratio
+        self._fuzzy_cache[normalized] = ratios
+        return ratios
+
+
+# Alias hit kind -> (score bonus, reason); lower kinds win for the same alias.
+_ALIAS_HIT_KINDS = (
+    (0.62, "conversation title exactly matches alias '{alias}'"),
+    (0.54, "conversation title contains alias '{alias}'"),
+    (0.32, "messages mention alias '{alias}'"),
+    (0.2, "conversation title contains shorthand alias '{alias}'"),
+)
+
+
+def infer_project_candidates(
+    *,
+    project_catalog: Sequence[ProjectCatalogEntry],
+    conversation_name: str | None,
+    participants: list[str] | None,
+    message_texts: list[str],
+) -> list[ProjectCandidate]:
+    return ProjectMatcher(project_catalog).candidates(
+        conversation_name=conversation_name,
+        participants=participants,
+        message_texts=message_texts,
+    )
 
 
 def infer_project_match(
@@ -568,18 +776,22 @@ def infer_project_match(
     conversation_name: str | None,
     participants: list[str] | None,
     message_texts: list[str],
+    matcher: ProjectMatcher | None = None,
+    affinities: Mapping[str, float] | None = None,
 ) -> ProjectGuess:
-    catalog = list(project_catalog or ())
-    if not catalog:
-        catalog = [
-            ProjectCatalogEntry(name=name, aliases=derive_project_aliases(name))
-            for name in (project_names or [])
-        ]
-    candidates = infer_project_candidates(
-        project_catalog=catalog,
+    if matcher is None:
+        catalog = list(project_catalog or ())
+        if not catalog:
+            catalog = [
+                ProjectCatalogEntry(name=name, aliases=derive_project_aliases(name))
+                for name in (project_names or [])
+            ]
+        matcher = ProjectMatcher(catalog)
+    candidates = matcher.candidates(
         conversation_name=conversation_name,
         participants=participants,
         message_texts=message_texts,
+        affinities=affinities,
     )
     serialized_candidates = [
         {
@@ -2,9 +2,11 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta, timezone
+import hashlib
 import json
 
 from loguru import logger
+from pydantic import ValidationError
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -15,20 +17,29 @@ from app.db.models.entities import DailyEnergy, DailyMetric, ReadinessInsight
 from app.db.models.journal import JournalEntry
 from app.db.models.todo import TodoItem
 from app.prompts.llm_prompts import (
+    READINESS_DELTA_INSTRUCTIONS,
     READINESS_PERSONA,
     READINESS_RESPONSE_INSTRUCTIONS,
     READINESS_SCORE_GUIDANCE,
 )
 from app.schemas.llm_outputs import ReadinessInsightOutput
+from app.services.metrics_cache import get_metrics_cache
 from app.utils.timezone import eastern_today
 
+# Sections that depend only on the biometric inputs; delta refreshes keep them verbatim.
+CORE_PILLARS = ("greeting", "hrv", "rhr", "sleep", "training_load")
+DELTA_MAX_OUTPUT_TOKENS = 8000
+
 
 class InsightService:
     def __init__(self, session: AsyncSession, client: OpenAIResponsesClient | None = None) -> None:
         self.session = session
         self._client = client
+        # Set when the last refresh stored a fallback because the model call failed.
+        self.llm_failed = False
 
     async def refresh_daily_insight(self, user_id: int, metric_date: date | None = None) -> ReadinessInsight:
+        self.llm_failed = False
         metric_date = metric_date or eastern_today()
         metric = await self._fetch_metric(user_id, metric_date)
         history = await self._fetch_metric_history(user_id, metric_date, days=14)
@@ -45,17 +56,34 @@ class InsightService:
         fallback_score = existing_insight.readiness_score if existing_insight else None
 
         life_context = await self._gather_life_context(user_id, metric_date)
-        prompt = self._build_prompt(metric, history, life_context=life_context)
-        logger.debug("Readiness prompt for {}:\n{}", metric_date, prompt)
+        context_block = self._build_life_context_block(life_context) if life_context else ""
+        input_fingerprint = self._fingerprint(settings.openai_model_name, self._build_prompt(metric, history))
+        context_fingerprint = self._fingerprint(context_block)
+        previous = self._reusable_output(existing_insight, input_fingerprint)
+        if previous is not None and existing_insight.context_fingerprint == context_fingerprint:
+            logger.info("Readiness inputs unchanged for user {} @ {}; keeping stored insight", user_id, metric_date)
+            return existing_insight
+
+        # Biometrics unchanged but lifestyle context moved: ask only for the context-dependent sections.
+        delta_mode = previous is not None
+        if delta_mode:
+            prompt = self._build_delta_prompt(previous, context_block)
+        else:
+            prompt = self._build_prompt(metric, history, life_context=life_context)
+        logger.debug("Readiness prompt for {} (delta={}):\n{}", metric_date, delta_mode, prompt)
         try:
             client = await self._get_client()
             result = await client.generate_json(
                 prompt,
                 response_model=ReadinessInsightOutput,
                 temperature=0.3,
-                max_output_tokens=30000,
+                max_output_tokens=DELTA_MAX_OUTPUT_TOKENS if delta_mode else 30000,
             )
         except Exception as exc:  # noqa: BLE001
+            self.llm_failed = True
+            if delta_mode:
+                logger.error("[llm-fallback] insight_service delta refresh failed, keeping stored insight: {}", exc)
+                return existing_insight
             logger.error("[llm-fallback] insight_service.refresh_daily_insight failed: {}", exc)
             narrative = fallback_narrative or (
                 "Insight generation is temporarily unavailable. "
@@ -63,8 +91,14 @@ class InsightService:
             )
             tokens = None
             readiness_score = fallback_score if fallback_score is not None else 50
+            # Leave fingerprints empty so the next refresh retries the model.
+            input_fingerprint = context_fingerprint = None
         else:
             structured = result.data
+            if delta_mode:
+                structured = structured.model_copy(
+                    update={pillar: getattr(previous, pillar) for pillar in CORE_PILLARS}
+                )
             narrative = json.dumps(structured.model_dump(), ensure_ascii=False)
             tokens = result.total_tokens
             readiness_score = self._normalize_score(structured.overall_readiness.score_100) or self._extract_score(narrative)
@@ -92,6 +126,8 @@ class InsightService:
             insight.response_text = narrative
             insight.tokens_used = tokens
             insight.readiness_score = readiness_score
+            insight.input_fingerprint = input_fingerprint
+            insight.context_fingerprint = context_fingerprint
         else:
             insight = ReadinessInsight(
                 user_id=user_id,
@@ -101,6 +137,8 @@ class InsightService:
                 response_text=narrative,
                 tokens_used=tokens,
                 readiness_score=readiness_score,
+                input_fingerprint=input_fingerprint,
+                context_fingerprint=context_fingerprint,
             )
             self.session.add(insight)
 
@@ -120,6 +158,7 @@ class InsightService:
                     insight.readiness_score = readiness_score
             metric.readiness_label = structured_label or self._label_from_score(metric.readiness_score or readiness_score)
         await self.session.commit()
+        await get_metrics_cache().bump(user_id)
         logger.debug(
             "Post-commit metric snapshot for user %s @ %s -> readiness_score=%s, label=%s, narrative_len=%s",
             user_id,
@@ -137,9 +176,37 @@ class InsightService:
         logger.info("Stored readiness insight for {}", metric_date)
         return insight
 
+    @staticmethod
+    def _fingerprint(*parts: str) -> str:
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @staticmethod
+    def _reusable_output(insight: ReadinessInsight | None, input_fingerprint: str) -> ReadinessInsightOutput | None:
+        """Stored structured output when it was generated from the same biometric inputs."""
+        if insight is None or insight.input_fingerprint != input_fingerprint:
+            return None
+        try:
+            return ReadinessInsightOutput.model_validate_json(insight.response_text)
+        except ValidationError:
+            return None
+
+    def _build_delta_prompt(self, previous: ReadinessInsightOutput, context_block: str) -> str:
+        blocks = [
+            READINESS_PERSONA,
+            "Previous assessment:\n" + json.dumps(previous.model_dump(), ensure_ascii=False, indent=2),
+            context_block or "No lifestyle context is available anymore.",
+            READINESS_DELTA_INSTRUCTIONS.strip(),
+            READINESS_RESPONSE_INSTRUCTIONS,
+        ]
+        return "\n\n".join(blocks)
+
     async def _get_client(self) -> OpenAIResponsesClient:
         if self._client is None:
-            self._client = OpenAIResponsesClient()
+            self._client = OpenAIResponsesClient(feature="insights")
         return self._client
 
     async def _fetch_metric(self, user_id: int, metric_date: date) -> DailyMetric | None:
@@ -201,6 +268,7 @@ class InsightService:
 
                 if dirty:
                     await self.session.commit()
+                    await get_metrics_cache().bump(metric.user_id)
                     logger.info(
                         "Backfilled structured insight fields for user %s @ %s from stored narrative JSON.",
                         metric.user_id,
@@ -53,7 +53,7 @@ class JournalCompiler:
 
   def __init__(self, session: AsyncSession) -> None:
     self.session = session
-    self.client = OpenAIResponsesClient()
+    self.client = OpenAIResponsesClient(feature="journal")
 
   @property
   def model_name(self) -> str:
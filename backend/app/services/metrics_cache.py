@@ -0,0 +1,156 @@
+"""Versioned response cache for the metrics endpoints.
+
+Every user has a data version that ``MetricsService.ingest`` and insight
+refreshes bump after committing. Cache keys and ETags embed that version, so
+new data invalidates every cached response for the user at once and an
+unchanged version lets clients revalidate with ``If-None-Match`` without
+touching the database.
+
+The default backend is process-local, which is correct for the single uvicorn
+process the container runs. Set ``METRICS_CACHE_REDIS_URL`` to share versions
+and payloads between several workers or processes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class MetricsCacheBackend(Protocol):
+    # Part of every key, so versions that restart from zero never revive old ETags.
+    epoch: str
+
+    async def get(self, key: str) -> str | None: ...
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None: ...
+
+    async def incr(self, key: str) -> int: ...
+
+
+class InMemoryMetricsCacheBackend:
+    """Bounded LRU of payloads plus unbounded (one int per user) version counters."""
+
+    def __init__(self, *, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._counters: dict[str, int] = {}
+        self.epoch = f"{time.time_ns():x}"
+
+    async def get(self, key: str) -> str | None:
+        if key in self._counters:
+            return str(self._counters[key])
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisMetricsCacheBackend:
+    def __init__(self, url: str) -> None:
+        from redis import asyncio as redis_asyncio
+
+        self._client = redis_asyncio.from_url(url, decode_responses=True)
+        self.epoch = "redis"
+
+    async def get(self, key: str) -> str | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int) -> None:
+        await self._client.set(key, value, ex=ttl_seconds)
+
+    async def incr(self, key: str) -> int:
+        return int(await self._client.incr(key))
+
+
+class MetricsCache:
+    def __init__(self, backend: MetricsCacheBackend, *, ttl_seconds: int = 3600) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+
+    async def data_version(self, user_id: int) -> int | None:
+        """Current data version, or None when the backend is unreachable (callers skip caching)."""
+        try:
+            raw = await self.backend.get(self._version_key(user_id))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[metrics-cache] version lookup failed for user {}: {}", user_id, exc)
+            return None
+        try:
+            return int(raw) if raw is not None else 0
+        except ValueError:
+            return 0
+
+    async def bump(self, user_id: int) -> None:
+        """Invalidate every cached metrics response for ``user_id``."""
+        try:
+            await self.backend.incr(self._version_key(user_id))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[metrics-cache] version bump failed for user {}: {}", user_id, exc)
+
+    def response_key(self, endpoint: str, user_id: int, version: int, params: dict[str, Any]) -> str:
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return f"metrics:resp:{self.backend.epoch}:{endpoint}:{user_id}:{version}:{encoded}"
+
+    @staticmethod
+    def etag(key: str) -> str:
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest()[:24] + '"'
+
+    async def get(self, key: str) -> str | None:
+        try:
+            return await self.backend.get(key)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[metrics-cache] read failed: {}", exc)
+            return None
+
+    async def set(self, key: str, body: str) -> None:
+        try:
+            await self.backend.set(key, body, self.ttl_seconds)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[metrics-cache] write failed: {}", exc)
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f"metrics:version:{user_id}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+_metrics_cache: MetricsCache | None = None
+
+
+def get_metrics_cache() -> MetricsCache:
+    global _metrics_cache  # noqa: PLW0603
+    if _metrics_cache is None:
+        backend: MetricsCacheBackend
+        if settings.metrics_cache_redis_url:
+            backend = RedisMetricsCacheBackend(settings.metrics_cache_redis_url)
+        else:
+            backend = InMemoryMetricsCacheBackend()
+        _metrics_cache = MetricsCache(backend, ttl_seconds=settings.metrics_cache_ttl_seconds)
+    return _metrics_cache
@@ -14,6 +14,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.clients.garmin_client import GarminClient
 from app.services.garmin_connection_service import GarminConnectionService
+from app.services.metrics_cache import get_metrics_cache
+from app.services.monet_context_service import invalidate_context
 from app.db.models.entities import DailyEnergy, GarminConnection
 from app.db.repositories.activity_repository import ActivityRepository
 from app.db.repositories.metrics_repository import MetricsRepository
@@ -200,7 +202,12 @@ class MetricsService:
             if changed_fields:
                 metric_changes[metric_day].update(changed_fields)
 
+        if metric_changes:
+            await self.metrics_repo.refresh_rollups(user_id, metric_changes.keys())
         await self.session.commit()
+        if metric_changes:
+            await get_metrics_cache().bump(user_id)
+            invalidate_context(user_id, "metrics")
         return {
             "activities": ingested,
             "hrv_entries": len(hrv_payload),
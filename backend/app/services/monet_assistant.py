@@ -5,7 +5,7 @@ import json
 from datetime import date, datetime
 from dataclasses import dataclass, field
 from textwrap import dedent
-from typing import Any, Protocol
+from typing import Any, AsyncIterator, Protocol
 from uuid import uuid4
 
 from dateutil import parser as date_parser
@@ -17,14 +17,15 @@ from app.db.models.calendar import CalendarEvent, GoogleCalendar
 from app.db.repositories.project_note_repository import ProjectNoteRepository
 from app.db.repositories.project_repository import ProjectRepository
 from app.db.repositories.todo_repository import TodoRepository
-from app.clients.openai_client import OpenAIResponsesClient, get_shared_openai_client
+from app.clients.openai_client import OpenAIResponsesClient
 from app.schemas.assistant import AssistantAction, AssistantPageContext
 from app.schemas.llm_outputs import AssistantActionPlanOutput, AssistantRouterOutput
 from app.schemas.todos import TodoItemResponse
 from app.services.claude_nutrition_agent import NutritionAssistantAgent
 from app.services.claude_todo_agent import TodoAssistantAgent
+from app.services.conversation_memory import get_conversation_memory
 from app.services.google_calendar_event_service import GoogleCalendarEventService
-from app.services.monet_context_service import MonetContextBuilder
+from app.services.monet_context_service import MonetContextBuilder, invalidate_context
 
 
 def _json_fallback(value: Any) -> str:
@@ -39,6 +40,23 @@ def _json_fallback(value: Any) -> str:
     return str(value)
 
 
+# Namespace of Monet chats in the shared conversation memory.
+CONVERSATION_NAMESPACE = "assistant"
+
+_REPLY_FAILED_MESSAGE = "Something went wrong generating my reply — give it another try in a moment."
+
+# Context snapshot sources that each tool or contextual action can change.
+_ACTION_CONTEXT_SOURCES: dict[str, str] = {
+    "nutrition.log_intake": "nutrition",
+    "todos.create_items": "todos",
+    "projects.create_todo": "todos",
+    "projects.create_note": "workspace",
+    "projects.update_note": "workspace",
+    "calendar.create_event": "calendar",
+    "calendar.update_event": "calendar",
+}
+
+
 @dataclass
 class AssistantToolSpec:
     id: str
@@ -102,6 +120,19 @@ class AssistantResult:
     action_plan_id: str | None = None
 
 
+@dataclass
+class AssistantStreamEvent:
+    """One server-sent event of a streamed assistant turn.
+
+    ``data`` is JSON-serializable; the final ``done`` event also carries the
+    complete ``AssistantResult`` so callers can render it like ``respond``.
+    """
+
+    event: str
+    data: dict[str, Any] = field(default_factory=dict)
+    result: AssistantResult | None = None
+
+
 @dataclass
 class ContextualExecutionResult:
     tools_used: list[str] = field(default_factory=list)
@@ -207,9 +238,10 @@ class MonetAssistantAgent:
 
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
-        self.client = OpenAIResponsesClient(client=get_shared_openai_client())
-        self.context_builder = MonetContextBuilder(session)
+        self.client = OpenAIResponsesClient(feature="chat")
+        self.context_builder = MonetContextBuilder()
         self.tool_registry = MonetToolRegistry(session)
+        self.memory = get_conversation_memory()
 
     async def respond(
         self,
@@ -223,6 +255,8 @@ class MonetAssistantAgent:
         execution_mode: str = "auto",
         proposed_actions: list[AssistantAction] | None = None,
     ) -> AssistantResult:
+        # Only chats whose session id the caller supplies are remembered; one-off calls leave no row.
+        remember = session_id is not None
         session_key = session_id or str(uuid4())
         if page_context is not None and execution_mode in {"preview", "commit"}:
             if execution_mode == "preview":
@@ -266,6 +300,8 @@ class MonetAssistantAgent:
                 time_zone=time_zone,
                 page_context=page_context,
             )
+            if remember:
+                context = await self._with_conversation(context, user_id, session_key)
             logger.debug("[assistant] context built window=%s keys=%s", window_days, context.keys())
             decision = await self._route_message(message, context)
             logger.info(
@@ -275,6 +311,8 @@ class MonetAssistantAgent:
             )
             tool_results = await self._execute_tools(user_id, decision.tool_calls)
             reply = await self._compose_reply(message, context, decision, tool_results)
+            if remember:
+                await self._remember_exchange(user_id, session_key, message, reply)
             return AssistantResult(
                 session_id=session_key,
                 reply=reply,
@@ -293,6 +331,116 @@ class MonetAssistantAgent:
                 tools_used=[],
             )
 
+    async def respond_stream(
+        self,
+        user_id: int,
+        *,
+        message: str,
+        session_id: str | None = None,
+        window_days: int = 7,
+        time_zone: str | None = None,
+        page_context: AssistantPageContext | None = None,
+        execution_mode: str = "auto",
+        proposed_actions: list[AssistantAction] | None = None,
+    ) -> AsyncIterator[AssistantStreamEvent]:
+        """Stream a chat turn: ``router``, one ``tool_result`` per finished tool, ``reply_delta`` chunks, then ``done``.
+
+        Contextual preview/commit turns have nothing to stream and only emit ``done``.
+        """
+        # Only chats whose session id the caller supplies are remembered; one-off calls leave no row.
+        remember = session_id is not None
+        session_key = session_id or str(uuid4())
+        if page_context is not None and execution_mode in {"preview", "commit"}:
+            result = await self.respond(
+                user_id,
+                message=message,
+                session_id=session_key,
+                window_days=window_days,
+                time_zone=time_zone,
+                page_context=page_context,
+                execution_mode=execution_mode,
+                proposed_actions=proposed_actions,
+            )
+            yield AssistantStreamEvent("done", {"session_id": session_key}, result)
+            return
+
+        try:
+            context = await self.context_builder.build_context(
+                user_id,
+                window_days,
+                time_zone=time_zone,
+                page_context=page_context,
+            )
+            if remember:
+                context = await self._with_conversation(context, user_id, session_key)
+            decision = await self._route_message(message, context)
+            yield AssistantStreamEvent("router", {"session_id": session_key, **decision.to_prompt_dict()})
+
+            outcomes: list[tuple[str, dict[str, Any]] | None] = [None] * len(decision.tool_calls)
+
+            async def _indexed(index: int, call: ToolCall) -> tuple[int, str, dict[str, Any]]:
+                tool_id, output = await self._run_tool(user_id, call)
+                return index, tool_id, output
+
+            pending = [_indexed(i, call) for i, call in enumerate(decision.tool_calls)]
+            for finished in asyncio.as_completed(pending):
+                index, tool_id, output = await finished
+                outcomes[index] = (tool_id, output)
+                if not output.get("skipped"):
+                    yield AssistantStreamEvent("tool_result", self._tool_event_payload(tool_id, output))
+            tool_results = self._collect_tool_results(
+                user_id, [outcome for outcome in outcomes if outcome is not None]
+            )
+
+            reply_parts: list[str] = []
+            async for delta in self._stream_reply(message, context, decision, tool_results):
+                reply_parts.append(delta)
+                yield AssistantStreamEvent("reply_delta", {"text": delta})
+            reply = "".join(reply_parts).strip() or "I'm here whenever you're ready to continue."
+            if remember:
+                await self._remember_exchange(user_id, session_key, message, reply)
+            result = AssistantResult(
+                session_id=session_key,
+                reply=reply,
+                nutrition_entries=tool_results.nutrition_entries,
+                todo_items=tool_results.todo_items,
+                tools_used=tool_results.tools_used,
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("[assistant] streamed respond failed for user {}: {}", user_id, exc)
+            result = AssistantResult(
+                session_id=session_key,
+                reply=self._friendly_error_message(exc),
+                nutrition_entries=[],
+                todo_items=[],
+                tools_used=[],
+            )
+        yield AssistantStreamEvent("done", {"session_id": session_key}, result)
+
+    async def _with_conversation(self, context: dict[str, Any], user_id: int, session_key: str) -> dict[str, Any]:
+        """Add earlier turns of this chat (summary + recent turns) to a copy of ``context``."""
+        try:
+            conversation = await self.memory.get(self.session, CONVERSATION_NAMESPACE, session_key, user_id=user_id)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[assistant] conversation load failed for {}: {}", session_key, exc)
+            return context
+        history = conversation.render()
+        return {**context, "conversation": history} if history else context
+
+    async def _remember_exchange(self, user_id: int, session_key: str, message: str, reply: str) -> None:
+        try:
+            await self.memory.append(
+                self.session,
+                CONVERSATION_NAMESPACE,
+                session_key,
+                [("user", message), ("assistant", reply)],
+                user_id=user_id,
+            )
+            await self.session.commit()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("[assistant] conversation save failed for {}: {}", session_key, exc)
+            await self.session.rollback()
+
     @staticmethod
     def _friendly_error_message(exc: Exception) -> str:
         """Return a user-facing message based on the exception type."""
@@ -534,6 +682,9 @@ class MonetAssistantAgent:
                 logger.warning("[assistant] contextual action failed type={} err={}", action.action_type, exc)
                 result.errors.append(f"{action.action_type}: {exc}")
         await self.session.commit()
+        touched = {_ACTION_CONTEXT_SOURCES[tool] for tool in result.tools_used if tool in _ACTION_CONTEXT_SOURCES}
+        if touched:
+            invalidate_context(user_id, *touched)
         return result
 
     def _normalize_action(
@@ -642,6 +793,8 @@ class MonetAssistantAgent:
         general chat) — not the full 186K payload of metrics, nutrition history,
         calendar events, etc."""
         slim: dict[str, Any] = {}
+        if context.get("conversation"):
+            slim["conversation"] = context["conversation"]
         if "time_zone" in context:
             slim["now_local"] = context["time_zone"].get("now_local")
         if "todos" in context:
@@ -671,6 +824,8 @@ class MonetAssistantAgent:
             - Call nutrition.log_intake when the user describes food they ate or want to log.
             - When in doubt about whether the user wants a todo created, CALL THE TOOL. It is better to create a task
               the user can delete than to silently ignore their request.
+            - context.conversation (when present) holds earlier turns of this chat; use it to resolve references
+              like "the same again" or "move it to Friday", but only act on the current message.
 
             Respond strictly with JSON in the shape:
             {"reply_mode":"respond_only|respond_and_call_tools","narrative_intent":"...", "tool_calls":[{"tool_id":"...", "args_json":"{...}"}]}
@@ -699,22 +854,28 @@ class MonetAssistantAgent:
 
         return RouterDecision(reply_mode=reply_mode, narrative_intent=narrative_intent, tool_calls=calls)
 
-    async def _execute_tools(self, user_id: int, calls: list[ToolCall]) -> ToolExecutionResult:
-        results = ToolExecutionResult()
+    async def _run_tool(self, user_id: int, call: ToolCall) -> tuple[str, dict[str, Any]]:
+        tool = self.tool_registry.get(call.tool_id)
+        if not tool:
+            logger.warning("[assistant] unknown tool requested: %s", call.tool_id)
+            return call.tool_id, {"skipped": True}
+        try:
+            output = await tool.run(user_id, call.args)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("[assistant] tool %s failed: %s", call.tool_id, exc)
+            output = {"error": str(exc)}
+        return call.tool_id, output
 
-        async def _run_one(call: ToolCall) -> tuple[str, dict[str, Any]]:
-            tool = self.tool_registry.get(call.tool_id)
-            if not tool:
-                logger.warning("[assistant] unknown tool requested: %s", call.tool_id)
-                return call.tool_id, {"skipped": True}
-            try:
-                output = await tool.run(user_id, call.args)
-            except Exception as exc:  # noqa: BLE001
-                logger.exception("[assistant] tool %s failed: %s", call.tool_id, exc)
-                output = {"error": str(exc)}
-            return call.tool_id, output
+    async def _execute_tools(self, user_id: int, calls: list[ToolCall]) -> ToolExecutionResult:
+        outcomes = await asyncio.gather(*[self._run_tool(user_id, c) for c in calls])
+        return self._collect_tool_results(user_id, list(outcomes))
 
-        outcomes = await asyncio.gather(*[_run_one(c) for c in calls])
+    def _collect_tool_results(
+        self,
+        user_id: int,
+        outcomes: list[tuple[str, dict[str, Any]]],
+    ) -> ToolExecutionResult:
+        results = ToolExecutionResult()
         for tool_id, tool_output in outcomes:
             if tool_output.get("skipped"):
                 continue
@@ -730,8 +891,22 @@ class MonetAssistantAgent:
                     results.todo_items.extend(
                         [self._serialize_todo(item) for item in items]
                     )
+        touched = {_ACTION_CONTEXT_SOURCES[tool] for tool in results.tools_used if tool in _ACTION_CONTEXT_SOURCES}
+        if touched:
+            invalidate_context(user_id, *touched)
         return results
 
+    def _tool_event_payload(self, tool_id: str, output: dict[str, Any]) -> dict[str, Any]:
+        """JSON-safe summary of one tool outcome for the stream."""
+        payload: dict[str, Any] = {"tool_id": tool_id, "reply": output.get("reply")}
+        if output.get("error"):
+            payload["error"] = str(output["error"])
+        if tool_id == NutritionLogTool.spec.id:
+            payload["nutrition_entries"] = output.get("logged_entries") or []
+        elif tool_id == TodoCreateTool.spec.id:
+            payload["todo_items"] = [self._serialize_todo(item) for item in output.get("items") or []]
+        return json.loads(json.dumps(payload, default=_json_fallback))
+
     @staticmethod
     def _slim_context_for_reply(context: dict[str, Any]) -> dict[str, Any]:
         """Produce a moderate context summary for reply composition.
@@ -739,6 +914,8 @@ class MonetAssistantAgent:
         Includes enough for the LLM to answer questions about metrics/nutrition
         but strips raw data arrays, full attendee lists, and workspace bodies."""
         slim: dict[str, Any] = {}
+        if context.get("conversation"):
+            slim["conversation"] = context["conversation"]
         if "time_zone" in context:
             slim["now_local"] = context["time_zone"].get("now_local")
         # Latest metric snapshot (single day, not full history)
@@ -778,6 +955,44 @@ class MonetAssistantAgent:
         context: dict[str, Any],
         decision: RouterDecision,
         tool_results: ToolExecutionResult,
+    ) -> str:
+        prompt = self._build_reply_prompt(message, context, decision, tool_results)
+        try:
+            result = await self.client.generate_text(prompt, temperature=0.2)
+        except Exception as exc:  # noqa: BLE001
+            logger.error("[llm-fallback] monet _compose_reply failed: {}", exc)
+            return _REPLY_FAILED_MESSAGE
+        reply = result.text.strip()
+        if not reply:
+            reply = "I'm here whenever you're ready to continue."
+        return reply
+
+    async def _stream_reply(
+        self,
+        message: str,
+        context: dict[str, Any],
+        decision: RouterDecision,
+        tool_results: ToolExecutionResult,
+    ) -> AsyncIterator[str]:
+        """Streaming counterpart of ``_compose_reply``; yields text deltas."""
+        prompt = self._build_reply_prompt(message, context, decision, tool_results)
+        streamed_any = False
+        try:
+            async for delta in self.client.stream_text(prompt, temperature=0.2):
+                streamed_any = True
+                yield delta
+        except Exception as exc:  # noqa: BLE001
+            logger.error("[llm-fallback] monet _stream_reply failed: {}", exc)
+            # Text already on the user's screen stays; only fill in when nothing arrived.
+            if not streamed_any:
+                yield _REPLY_FAILED_MESSAGE
+
+    def _build_reply_prompt(
+        self,
+        message: str,
+        context: dict[str, Any],
+        decision: RouterDecision,
+        tool_results: ToolExecutionResult,
     ) -> str:
         summary = {
             "message": message,
@@ -803,6 +1018,7 @@ class MonetAssistantAgent:
 
             Only reference health metrics, sleep, readiness, or 14-day trends if the user explicitly asked for insights or a summary.
             Otherwise, do not introduce unrelated context; use context only to resolve ambiguities in the user's request.
+            context.conversation (when present) is the earlier part of this chat; stay consistent with it.
             If reply_mode is respond_and_call_tools, focus on summarizing the tool outputs.
             Never return JSON—just the natural-language reply.
             Example:
@@ -812,15 +1028,7 @@ class MonetAssistantAgent:
             {json.dumps(summary, ensure_ascii=False, default=_json_fallback)}
             """
         )
-        try:
-            result = await self.client.generate_text(prompt, temperature=0.2)
-        except Exception as exc:  # noqa: BLE001
-            logger.error("[llm-fallback] monet _compose_reply failed: {}", exc)
-            return "Something went wrong generating my reply — give it another try in a moment."
-        reply = result.text.strip()
-        if not reply:
-            reply = "I'm here whenever you're ready to continue."
-        return reply
+        return prompt
 
     def _serialize_todo(self, item: Any) -> dict[str, Any]:
         try:
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Awaitable, Callable
 from zoneinfo import ZoneInfo
 
 from loguru import logger
 from sqlalchemy import or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.db.models.entities import DailyMetric
 from app.db.models.calendar import CalendarEvent, GoogleCalendar
@@ -16,6 +18,7 @@ from app.db.models.workspace import WorkspacePage
 from app.schemas.assistant import AssistantPageContext
 from app.db.repositories.metrics_repository import MetricsRepository
 from app.db.repositories.todo_repository import TodoRepository
+from app.db.session import AsyncSessionLocal
 from app.services.nutrition_intake_service import NutritionIntakeService
 from app.services.user_profile_service import UserProfileService
 from app.services.workspace_service import WorkspaceService
@@ -23,16 +26,86 @@ from app.utils.calendar_helpers import is_declined_attendee
 from app.utils.timezone import eastern_today, local_now
 
 
+CONTEXT_SOURCES = ("metrics", "nutrition", "profile", "todos", "calendar", "workspace")
+
+_SNAPSHOT_TTL_SECONDS = 60.0
+_SNAPSHOT_MAX_USERS = 256
+
+
+class ContextSnapshotCache:
+    """Short-lived per-user snapshots of each context source.
+
+    Entries are keyed by ``(source, params)`` under a user id so a write that only
+    touches todos can drop the todo snapshot while metrics, calendar, etc. stay
+    warm. Snapshots are shared read-only; callers must not mutate them.
+    """
+
+    def __init__(self, ttl_seconds: float = _SNAPSHOT_TTL_SECONDS, max_users: int = _SNAPSHOT_MAX_USERS) -> None:
+        self._ttl = ttl_seconds
+        self._max_users = max_users
+        self._entries: OrderedDict[int, dict[tuple[str, str], tuple[float, Any]]] = OrderedDict()
+
+    def get(self, user_id: int, source: str, params_key: str) -> Any | None:
+        user_entries = self._entries.get(user_id)
+        if not user_entries:
+            return None
+        entry = user_entries.get((source, params_key))
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            user_entries.pop((source, params_key), None)
+            return None
+        return value
+
+    def put(self, user_id: int, source: str, params_key: str, value: Any) -> None:
+        user_entries = self._entries.setdefault(user_id, {})
+        self._entries.move_to_end(user_id)
+        user_entries[(source, params_key)] = (time.monotonic() + self._ttl, value)
+        while len(self._entries) > self._max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, *sources: str) -> None:
+        """Drop the given sources (all sources when none are given) for a user."""
+        user_entries = self._entries.get(user_id)
+        if not user_entries:
+            return
+        if not sources:
+            self._entries.pop(user_id, None)
+            return
+        for key in [key for key in user_entries if key[0] in sources]:
+            user_entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+context_snapshot_cache = ContextSnapshotCache()
+
+
+def invalidate_context(user_id: int, *sources: str) -> None:
+    """Invalidate cached Monet context sources after a write for ``user_id``."""
+    context_snapshot_cache.invalidate(user_id, *sources)
+
+
 class MonetContextBuilder:
-    """Aggregates per-user data so the Monet assistant can reason over it."""
+    """Aggregates per-user data so the Monet assistant can reason over it.
+
+    Each source loads on its own short-lived session so the fan-out really runs
+    in parallel instead of queueing on one connection.
+    """
 
-    def __init__(self, session: AsyncSession) -> None:
-        self.session = session
-        self.metrics_repo = MetricsRepository(session)
-        self.todo_repo = TodoRepository(session)
-        self.nutrition_service = NutritionIntakeService(session)
-        self.profile_service = UserProfileService(session)
-        self.workspace_service = WorkspaceService(session)
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal,
+        *,
+        snapshot_cache: ContextSnapshotCache | None = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self._cache = snapshot_cache if snapshot_cache is not None else context_snapshot_cache
+        # Milliseconds spent per source on the last build (0.0 for snapshot hits).
+        self.last_timings: dict[str, float] = {}
+        self.last_cache_hits: set[str] = set()
 
     async def build_context(
         self,
@@ -40,61 +113,44 @@ class MonetContextBuilder:
         window_days: int = 7,
         time_zone: str | None = None,
         page_context: AssistantPageContext | None = None,
+        *,
+        use_cache: bool = True,
     ) -> dict[str, Any]:
         today = eastern_today()
         if window_days < 1:
             window_days = 1
         start_date = today - timedelta(days=window_days - 1)
         local_time = _compute_local_time(time_zone)
+        self.last_timings = {}
+        self.last_cache_hits = set()
+        page_key = page_context.model_dump_json() if page_context else ""
 
-        # Gather data sources concurrently with individual error isolation
-        async def _safe_metrics() -> tuple[list[dict], dict | None]:
-            try:
-                metrics = await self.metrics_repo.list_metrics_since(user_id, start_date)
-                payload = [self._serialize_metric(m) for m in metrics]
-                return payload, (payload[-1] if payload else None)
-            except Exception as exc:
-                logger.warning("[context] metrics failed: {}", exc)
-                return [], None
-
-        async def _safe_nutrition() -> tuple[dict, dict]:
-            try:
-                t = await self.nutrition_service.daily_summary(user_id, today)
-                h = await self.nutrition_service.rolling_average(user_id, window_days)
-                return t, h
-            except Exception as exc:
-                logger.warning("[context] nutrition failed: {}", exc)
-                return {}, {}
-
-        async def _safe_profile() -> dict:
-            try:
-                return await self.profile_service.fetch_profile_payload(user_id)
-            except Exception as exc:
-                logger.warning("[context] profile failed: {}", exc)
-                return {}
+        async def _metrics(session: AsyncSession) -> tuple[list[dict], dict | None]:
+            metrics = await MetricsRepository(session).list_metrics_since(user_id, start_date)
+            payload = [self._serialize_metric(m) for m in metrics]
+            return payload, (payload[-1] if payload else None)
 
-        async def _safe_todos() -> list[dict]:
-            try:
-                todos = await self.todo_repo.list_for_user(user_id)
-                return [self._serialize_todo(todo) for todo in todos]
-            except Exception as exc:
-                logger.warning("[context] todos failed: {}", exc)
-                return []
+        async def _nutrition(session: AsyncSession) -> tuple[dict, dict]:
+            service = NutritionIntakeService(session)
+            t = await service.daily_summary(user_id, today)
+            h = await service.rolling_average(user_id, window_days)
+            return t, h
 
-        async def _safe_calendar() -> list[dict]:
-            try:
-                return await self._serialize_calendar_events(user_id, window_days, time_zone)
-            except Exception as exc:
-                logger.warning("[context] calendar failed: {}", exc)
-                return []
+        async def _profile(session: AsyncSession) -> dict:
+            return await UserProfileService(session).fetch_profile_payload(user_id)
 
-        async def _safe_workspace() -> dict:
-            try:
-                return await self._serialize_workspace_knowledge(user_id, page_context)
-            except Exception as exc:
-                logger.warning("[context] workspace failed: {}", exc)
-                return {}
+        async def _todos(session: AsyncSession) -> list[dict]:
+            todos = await TodoRepository(session).list_for_user(user_id)
+            return [self._serialize_todo(todo) for todo in todos]
 
+        async def _calendar(session: AsyncSession) -> list[dict]:
+            return await self._serialize_calendar_events(session, user_id, window_days, time_zone)
+
+        async def _workspace(session: AsyncSession) -> dict:
+            return await self._serialize_workspace_knowledge(session, user_id, page_context)
+
+        started = time.perf_counter()
+        # Gather data sources concurrently with individual error isolation
         (
             (metrics_payload, latest_metric),
             (nutrition_today, nutrition_history),
@@ -103,12 +159,19 @@ class MonetContextBuilder:
             calendar_payload,
             workspace_payload,
         ) = await asyncio.gather(
-            _safe_metrics(),
-            _safe_nutrition(),
-            _safe_profile(),
-            _safe_todos(),
-            _safe_calendar(),
-            _safe_workspace(),
+            self._load_source(user_id, "metrics", f"{start_date}", _metrics, ([], None), use_cache),
+            self._load_source(user_id, "nutrition", f"{today}:{window_days}", _nutrition, ({}, {}), use_cache),
+            self._load_source(user_id, "profile", "", _profile, {}, use_cache),
+            self._load_source(user_id, "todos", "", _todos, [], use_cache),
+            self._load_source(user_id, "calendar", f"{window_days}:{time_zone}", _calendar, [], use_cache),
+            self._load_source(user_id, "workspace", page_key, _workspace, {}, use_cache),
+        )
+        logger.debug(
+            "[context] user={} built in {:.0f}ms sources={} cached={}",
+            user_id,
+            (time.perf_counter() - started) * 1000,
+            {name: round(ms, 1) for name, ms in self.last_timings.items()},
+            sorted(self.last_cache_hits),
         )
 
         return {
@@ -134,6 +197,37 @@ class MonetContextBuilder:
             "workspace": workspace_payload,
         }
 
+    async def _load_source(
+        self,
+        user_id: int,
+        source: str,
+        params_key: str,
+        loader: Callable[[AsyncSession], Awaitable[Any]],
+        fallback: Any,
+        use_cache: bool,
+    ) -> Any:
+        """Load one source on its own session, serving a fresh snapshot when available.
+
+        Failures return ``fallback`` and are never cached, so the next turn retries.
+        """
+        if use_cache:
+            cached = self._cache.get(user_id, source, params_key)
+            if cached is not None:
+                self.last_timings[source] = 0.0
+                self.last_cache_hits.add(source)
+                return cached
+        started = time.perf_counter()
+        try:
+            async with self._session_factory() as session:
+                value = await loader(session)
+        except Exception as exc:
+            logger.warning("[context] {} failed: {}", source, exc)
+            return fallback
+        finally:
+            self.last_timings[source] = (time.perf_counter() - started) * 1000
+        self._cache.put(user_id, source, params_key, value)
+        return value
+
     def _serialize_metric(self, metric: DailyMetric) -> dict[str, Any]:
         payload = {
             "metric_date": metric.metric_date.isoformat(),
@@ -191,7 +285,7 @@ class MonetContextBuilder:
         }
 
     async def _serialize_calendar_events(
-        self, user_id: int, window_days: int, time_zone: str | None
+        self, session: AsyncSession, user_id: int, window_days: int, time_zone: str | None
     ) -> list[dict[str, Any]]:
         now_local = local_now(time_zone)
         window_end = now_local + timedelta(days=window_days)
@@ -212,7 +306,7 @@ class MonetContextBuilder:
             .order_by(CalendarEvent.start_time.asc())
             .limit(50)
         )
-        result = await self.session.execute(stmt)
+        result = await session.execute(stmt)
         rows = result.all()
         events = []
         for event, calendar in rows:
@@ -235,11 +329,16 @@ class MonetContextBuilder:
 
     async def _serialize_workspace_knowledge(
         self,
+        session: AsyncSession,
         user_id: int,
         page_context: AssistantPageContext | None,
     ) -> dict[str, Any]:
-        await self.workspace_service.ensure_workspace(user_id)
-        recent_pages = await self._list_recent_workspace_pages(user_id, limit=6)
+        workspace_service = WorkspaceService(session)
+        # This session is never committed, so seeding or syncing here would be redone and rolled back on
+        # every build; the workspace endpoints do that work and invalidate this snapshot afterwards.
+        if not await workspace_service.is_workspace_current(user_id):
+            return {}
+        recent_pages = await self._list_recent_workspace_pages(session, workspace_service, user_id, limit=6)
         payload: dict[str, Any] = {
             "recent_pages": recent_pages,
         }
@@ -247,19 +346,30 @@ class MonetContextBuilder:
         selected_entity = page_context.selected_entity if page_context else None
         selected_project_id = selected_entity.project_id if selected_entity else None
         if selected_project_id:
-            project_payload = await self._serialize_selected_project(user_id, selected_project_id)
+            project_payload = await self._serialize_selected_project(
+                workspace_service, user_id, selected_project_id
+            )
             if project_payload is not None:
                 payload["selected_project"] = project_payload
 
         selected_note_id = selected_entity.note_id if selected_entity else None
         if selected_note_id:
-            note_payload = await self._serialize_selected_note(user_id, selected_note_id)
+            note_payload = await self._serialize_selected_note(
+                session, workspace_service, user_id, selected_note_id
+            )
             if note_payload is not None:
                 payload["selected_note"] = note_payload
 
         return payload
 
-    async def _list_recent_workspace_pages(self, user_id: int, *, limit: int) -> list[dict[str, Any]]:
+    async def _list_recent_workspace_pages(
+        self,
+        session: AsyncSession,
+        workspace_service: WorkspaceService,
+        user_id: int,
+        *,
+        limit: int,
+    ) -> list[dict[str, Any]]:
         stmt = (
             select(WorkspacePage)
             .where(
@@ -270,25 +380,26 @@ class MonetContextBuilder:
             .order_by(WorkspacePage.updated_at.desc(), WorkspacePage.id.desc())
             .limit(limit)
         )
-        result = await self.session.execute(stmt)
+        result = await session.execute(stmt)
         pages = list(result.scalars().all())
         # NOTE: N+1 query – get_page_text_body is called per page.
         # WorkspaceService has no batch alternative yet; capped by limit param.
         serialized: list[dict[str, Any]] = []
         for page in pages[:limit]:
-            body = await self.workspace_service.get_page_text_body(user_id, page.id)
+            body = await workspace_service.get_page_text_body(user_id, page.id)
             serialized.append(self._serialize_workspace_page(page, body, max_chars=320))
         return serialized
 
     async def _serialize_selected_project(
         self,
+        workspace_service: WorkspaceService,
         user_id: int,
         project_id: int,
     ) -> dict[str, Any] | None:
-        project_page = await self.workspace_service.find_project_page(user_id, project_id)
+        project_page = await workspace_service.find_project_page(user_id, project_id)
         if project_page is None:
             return None
-        subtree = await self.workspace_service.list_page_subtree(
+        subtree = await workspace_service.list_page_subtree(
             user_id,
             project_page.id,
             include_root=True,
@@ -300,7 +411,7 @@ class MonetContextBuilder:
         )
         serialized_pages: list[dict[str, Any]] = []
         for page in ordered_pages[:8]:
-            body = await self.workspace_service.get_page_text_body(user_id, page.id)
+            body = await workspace_service.get_page_text_body(user_id, page.id)
             serialized_pages.append(self._serialize_workspace_page(page, body, max_chars=700))
         return {
             "project_id": project_id,
@@ -309,17 +420,23 @@ class MonetContextBuilder:
             "pages": serialized_pages,
         }
 
-    async def _serialize_selected_note(self, user_id: int, note_id: int) -> dict[str, Any] | None:
+    async def _serialize_selected_note(
+        self,
+        session: AsyncSession,
+        workspace_service: WorkspaceService,
+        user_id: int,
+        note_id: int,
+    ) -> dict[str, Any] | None:
         stmt = select(WorkspacePage).where(
             WorkspacePage.user_id == user_id,
             WorkspacePage.legacy_note_id == note_id,
             WorkspacePage.trashed_at.is_(None),
         )
-        result = await self.session.execute(stmt)
+        result = await session.execute(stmt)
         page = result.scalar_one_or_none()
         if page is None:
             return None
-        body = await self.workspace_service.get_page_text_body(user_id, page.id)
+        body = await workspace_service.get_page_text_body(user_id, page.id)
         return self._serialize_workspace_page(page, body, max_chars=900)
 
     def _serialize_workspace_page(
@@ -0,0 +1,395 @@
+"""Shared LLM service for news: cached, auto-batched titles, scores, annotations and summaries.
+
+Every per-item LLM output is keyed by a hash of the inputs that produced it and
+cached in two tiers: a bounded in-process LRU and the ``news_llm_cache`` table,
+so the same headline is never sent to the model twice. Cache misses from
+concurrent requests are collected for a short window and resolved with a single
+model call per task kind.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.clients.openai_client import OpenAIResponsesClient
+from app.db.repositories.news_llm_cache_repository import NewsLLMCacheRepository
+from app.db.session import AsyncSessionLocal
+
+NEWS_MODEL = "gpt-4o-mini"
+
+_BATCH_WINDOW_SECONDS = 0.05
+_MAX_BATCH_ITEMS = 40
+_MEMORY_CACHE_SIZE = 5000
+_MAX_TRACKED_PROFILES = 64
+
+KIND_SHORT_TITLE = "short_title"
+KIND_SCORE = "score"
+KIND_ANNOTATION = "annotation"
+KIND_SUMMARY = "summary"
+
+SHORTEN_PROMPT = """\
+You are a headline editor. For each title below, produce a punchy short version
+(max 50 characters) that preserves the core meaning. Return one short title per
+line, in the same order. No numbering, no quotes — just the shortened title.
+
+Titles:
+{titles}"""
+
+SCORE_PROMPT = """\
+You are a news relevance scorer for a personal dashboard. Given the user profile
+and a list of articles, rate each article's relevance to this specific user on a
+scale of 1-10 (1=irrelevant, 10=perfectly matched to their interests).
+
+User profile:
+{profile}
+
+Articles (respond with a JSON array of {{"id": "...", "score": N}} for each):
+{articles}
+
+Respond ONLY with the JSON array, no other text."""
+
+ANNOTATE_PROMPT = """\
+You are a personal news curator. For each article below, write a SHORT (max 15 words)
+annotation explaining why this specific user would care about it, based on their profile.
+
+User profile:
+{profile}
+
+Articles:
+{articles}
+
+Respond with a JSON array of {{"id": "...", "annotation": "..."}}.
+Keep annotations personal and specific — reference the user's projects, interests, or role.
+Examples: "Directly relevant to your wildfire prediction work" or "New tool for your ML pipeline"
+Respond ONLY with the JSON array."""
+
+SUMMARIZE_INSTRUCTIONS = (
+    "You are a concise technical news summarizer. For each item, write a 1-2 sentence "
+    "summary that captures the key takeaway for a software developer. Be specific about "
+    "what changed or what was announced. No hype, no filler."
+)
+
+_NUMBERED_LINE = re.compile(r"^\s*\[?(\d+)\]?[.):]?\s*(.+)", re.MULTILINE)
+
+
+def content_hash(*parts: str) -> str:
+    """Stable cache key for a tuple of prompt inputs."""
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+def parse_numbered_lines(text: str, count: int) -> dict[int, str]:
+    """Parse ``[1] ...`` / ``1. ...`` lines into a zero-based index -> text map."""
+    parsed: dict[int, str] = {}
+    for match in _NUMBERED_LINE.finditer(text):
+        idx = int(match.group(1)) - 1
+        if 0 <= idx < count:
+            value = match.group(2).strip()
+            if value:
+                parsed[idx] = value
+    return parsed
+
+
+def _parse_json_array(text: str) -> list[dict[str, Any]]:
+    raw = text.strip()
+    # Handle markdown code blocks
+    if raw.startswith("```"):
+        raw = raw.split("\n", 1)[1].rsplit("```", 1)[0].strip()
+    data = json.loads(raw)
+    if not isinstance(data, list):
+        raise TypeError("expected a JSON array")
+    return [item for item in data if isinstance(item, dict)]
+
+
+@dataclass(frozen=True, slots=True)
+class NewsArticle:
+    """Article fields that feed the scoring and annotation prompts."""
+
+    title: str
+    category: str
+    summary: str | None = None
+
+    def prompt_line(self, ref: str) -> str:
+        return f'- id: {ref} | title: "{self.title}" | category: {self.category} | summary: "{self.summary or ""}"'
+
+
+BatchRunner = Callable[[str, list[Any]], Awaitable[list[str | None]]]
+
+
+class _MicroBatcher:
+    """Coalesces concurrent lookups of one kind into a single model call per group.
+
+    Callers ``submit`` hash -> payload maps. Payloads for the same group (e.g. the
+    same profile narrative) queued within the batch window are flushed together;
+    a hash that is already queued or in flight is shared instead of re-requested.
+    """
+
+    def __init__(self, run_batch: BatchRunner, *, window_seconds: float, max_items: int) -> None:
+        self._run_batch = run_batch
+        self._window = window_seconds
+        self._max_items = max_items
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._futures: dict[tuple[str, str], asyncio.Future[str | None]] = {}
+        self._flush_tasks: dict[str, asyncio.Task[None]] = {}
+
+    async def submit(self, group: str, payloads: dict[str, Any]) -> dict[str, str | None]:
+        loop = asyncio.get_running_loop()
+        waiting: dict[str, asyncio.Future[str | None]] = {}
+        for key, payload in payloads.items():
+            future = self._futures.get((group, key))
+            if future is None:
+                future = loop.create_future()
+                self._futures[(group, key)] = future
+                self._pending.setdefault(group, {})[key] = payload
+            waiting[key] = future
+        if group in self._pending and group not in self._flush_tasks:
+            self._flush_tasks[group] = asyncio.create_task(self._flush_after_window(group))
+        results = await asyncio.gather(*waiting.values(), return_exceptions=True)
+        return {
+            key: (None if isinstance(result, BaseException) else result)
+            for key, result in zip(waiting.keys(), results)
+        }
+
+    async def _flush_after_window(self, group: str) -> None:
+        await asyncio.sleep(self._window)
+        self._flush_tasks.pop(group, None)
+        pending = self._pending.pop(group, {})
+        items = list(pending.items())
+        chunks = [items[i:i + self._max_items] for i in range(0, len(items), self._max_items)]
+        await asyncio.gather(*(self._run_chunk(group, chunk) for chunk in chunks))
+
+    async def _run_chunk(self, group: str, chunk: list[tuple[str, Any]]) -> None:
+        try:
+            values = await self._run_batch(group, [payload for _, payload in chunk])
+        except Exception as exc:  # noqa: BLE001 - every waiter gets the failure
+            logger.warning("[news-llm] batch of {} failed: {}", len(chunk), exc)
+            values = [None] * len(chunk)
+        for index, (key, _) in enumerate(chunk):
+            future = self._futures.pop((group, key), None)
+            if future is not None and not future.done():
+                future.set_result(values[index] if index < len(values) else None)
+
+
+class NewsLLMService:
+    """Cached, batched LLM operations shared by the news and AI digest features."""
+
+    def __init__(
+        self,
+        *,
+        llm: OpenAIResponsesClient | None = None,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        memory_size: int = _MEMORY_CACHE_SIZE,
+        batch_window_seconds: float = _BATCH_WINDOW_SECONDS,
+        max_batch_items: int = _MAX_BATCH_ITEMS,
+    ) -> None:
+        self._llm = llm
+        self._session_factory = session_factory
+        self._memory: OrderedDict[tuple[str, str], str] = OrderedDict()
+        self._memory_size = memory_size
+        runners: dict[str, BatchRunner] = {
+            KIND_SHORT_TITLE: self._run_shorten_batch,
+            KIND_SCORE: self._run_score_batch,
+            KIND_ANNOTATION: self._run_annotate_batch,
+            KIND_SUMMARY: self._run_summary_batch,
+        }
+        self._batchers = {
+            kind: _MicroBatcher(runner, window_seconds=batch_window_seconds, max_items=max_batch_items)
+            for kind, runner in runners.items()
+        }
+        # Profile narratives keyed by group hash so score/annotate batches can rebuild the prompt.
+        self._profiles: OrderedDict[str, str] = OrderedDict()
+
+    @property
+    def llm(self) -> OpenAIResponsesClient:
+        if self._llm is None:
+            self._llm = OpenAIResponsesClient(model_name=NEWS_MODEL, feature="news")
+        return self._llm
+
+    # ── Public operations ──────────────────────────────────────────────
+
+    async def shorten_titles(self, titles: list[str]) -> list[str]:
+        """Return a short title per input, falling back to the original on a miss."""
+        keys = [content_hash(title) for title in titles]
+        values = await self._resolve(KIND_SHORT_TITLE, "", dict(zip(keys, titles)))
+        return [values.get(key) or title for key, title in zip(keys, titles)]
+
+    async def score_articles(self, articles: list[NewsArticle], profile: str) -> list[float | None]:
+        """Return a 1-10 relevance score per article, or None when the model gave none."""
+        group = self._register_profile(profile)
+        keys = [self._article_key(group, a) for a in articles]
+        values = await self._resolve(KIND_SCORE, group, dict(zip(keys, articles)))
+        scores: list[float | None] = []
+        for key in keys:
+            raw = values.get(key)
+            scores.append(float(raw) if raw is not None else None)
+        return scores
+
+    async def annotate_articles(self, articles: list[NewsArticle], profile: str) -> list[str | None]:
+        """Return a short personal annotation per article, or None when the model gave none."""
+        group = self._register_profile(profile)
+        keys = [self._article_key(group, a) for a in articles]
+        values = await self._resolve(KIND_ANNOTATION, group, dict(zip(keys, articles)))
+        return [values.get(key) for key in keys]
+
+    async def summarize(self, items: list[tuple[str, str]]) -> list[str | None]:
+        """Summarize ``(title, snippet)`` pairs in 1-2 sentences each."""
+        keys = [content_hash(title, snippet) for title, snippet in items]
+        values = await self._resolve(KIND_SUMMARY, "", dict(zip(keys, items)))
+        return [values.get(key) for key in keys]
+
+    # ── Cache tiers ────────────────────────────────────────────────────
+
+    async def _resolve(self, kind: str, group: str, payloads: dict[str, Any]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        for key in payloads:
+            cached = self._memory.get((kind, key))
+            if cached is not None:
+                self._memory.move_to_end((kind, key))
+                found[key] = cached
+        misses = [key for key in payloads if key not in found]
+        if misses:
+            stored = await self._load_persisted(kind, misses)
+            for key, value in stored.items():
+                self._remember(kind, key, value)
+            found.update(stored)
+            misses = [key for key in misses if key not in stored]
+        if misses:
+            generated = await self._batchers[kind].submit(group, {key: payloads[key] for key in misses})
+            fresh = {key: value for key, value in generated.items() if value is not None}
+            for key, value in fresh.items():
+                self._remember(kind, key, value)
+            found.update(fresh)
+        if len(found) < len(payloads):
+            logger.debug("[news-llm] {} unresolved {} of {}", kind, len(payloads) - len(found), len(payloads))
+        return found
+
+    def _remember(self, kind: str, key: str, value: str) -> None:
+        self._memory[(kind, key)] = value
+        self._memory.move_to_end((kind, key))
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
+
+    def _register_profile(self, profile: str) -> str:
+        group = content_hash(profile)
+        self._profiles[group] = profile
+        self._profiles.move_to_end(group)
+        while len(self._profiles) > _MAX_TRACKED_PROFILES:
+            self._profiles.popitem(last=False)
+        return group
+
+    async def _load_persisted(self, kind: str, keys: list[str]) -> dict[str, str]:
+        if self._session_factory is None:
+            return {}
+        try:
+            async with self._session_factory() as session:
+                return await NewsLLMCacheRepository(session).get_many(kind, keys)
+        except Exception as exc:  # noqa: BLE001 - cache is best-effort
+            logger.warning("[news-llm] cache read failed for {}: {}", kind, exc)
+            return {}
+
+    async def _persist(self, kind: str, values: dict[str, str]) -> None:
+        if self._session_factory is None or not values:
+            return
+        try:
+            async with self._session_factory() as session:
+                await NewsLLMCacheRepository(session).upsert_many(kind, values, model_name=self.llm.model_name)
+                await session.commit()
+        except Exception as exc:  # noqa: BLE001 - cache is best-effort
+            logger.warning("[news-llm] cache write failed for {}: {}", kind, exc)
+
+    # ── Batch runners (one model call per batch) ───────────────────────
+
+    async def _run_shorten_batch(self, _group: str, titles: list[str]) -> list[str | None]:
+        prompt = SHORTEN_PROMPT.format(titles="\n".join(f"- {t}" for t in titles))
+        result = await self.llm.generate_text(prompt, temperature=0.3, max_output_tokens=1024)
+        lines = [line.strip() for line in result.text.strip().splitlines() if line.strip()]
+        if len(lines) != len(titles):
+            # Lines are matched to titles by position, so a dropped or extra line
+            # can shift every one after it; keep the originals and cache nothing.
+            logger.warning("[news-llm] shorten returned {} lines for {} titles", len(lines), len(titles))
+            return [None] * len(titles)
+        values: list[str | None] = list(lines)
+        await self._persist(KIND_SHORT_TITLE, self._keyed(titles, values, lambda t: content_hash(t)))
+        return values
+
+    async def _run_score_batch(self, group: str, articles: list[NewsArticle]) -> list[str | None]:
+        prompt = SCORE_PROMPT.format(
+            profile=self._profiles.get(group, ""),
+            articles="\n".join(a.prompt_line(str(i + 1)) for i, a in enumerate(articles)),
+        )
+        result = await self.llm.generate_text(prompt, temperature=0.2, max_output_tokens=4096)
+        values: list[str | None] = [None] * len(articles)
+        try:
+            for item in _parse_json_array(result.text):
+                idx = int(item["id"]) - 1
+                if 0 <= idx < len(articles):
+                    values[idx] = str(max(1.0, min(10.0, float(item["score"]))))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            logger.warning("[news-llm] failed to parse article scoring response")
+        await self._persist(KIND_SCORE, self._keyed(articles, values, lambda a: self._article_key(group, a)))
+        return values
+
+    async def _run_annotate_batch(self, group: str, articles: list[NewsArticle]) -> list[str | None]:
+        prompt = ANNOTATE_PROMPT.format(
+            profile=self._profiles.get(group, ""),
+            articles="\n".join(a.prompt_line(str(i + 1)) for i, a in enumerate(articles)),
+        )
+        result = await self.llm.generate_text(prompt, temperature=0.4, max_output_tokens=2048)
+        values: list[str | None] = [None] * len(articles)
+        try:
+            for item in _parse_json_array(result.text):
+                idx = int(item["id"]) - 1
+                if 0 <= idx < len(articles) and item.get("annotation"):
+                    values[idx] = str(item["annotation"])
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            logger.warning("[news-llm] failed to parse annotation response")
+        await self._persist(KIND_ANNOTATION, self._keyed(articles, values, lambda a: self._article_key(group, a)))
+        return values
+
+    async def _run_summary_batch(self, _group: str, items: list[tuple[str, str]]) -> list[str | None]:
+        lines: list[str] = []
+        for i, (title, snippet) in enumerate(items):
+            lines.append(f"[{i + 1}] {title}")
+            if snippet:
+                lines.append(f"    {snippet}")
+        prompt = (
+            "Summarize each numbered news item in 1-2 sentences. "
+            "Return ONLY numbered summaries matching the input numbers.\n\n"
+            + "\n".join(lines)
+        )
+        result = await self.llm.generate_text(
+            prompt,
+            temperature=0.2,
+            max_output_tokens=2000,
+            instructions=SUMMARIZE_INSTRUCTIONS,
+        )
+        parsed = parse_numbered_lines(result.text, len(items))
+        values = [parsed.get(i) for i in range(len(items))]
+        await self._persist(KIND_SUMMARY, self._keyed(items, values, lambda item: content_hash(*item)))
+        return values
+
+    @staticmethod
+    def _article_key(group: str, article: NewsArticle) -> str:
+        return content_hash(group, article.title, article.category, article.summary or "")
+
+    @staticmethod
+    def _keyed(payloads: list[Any], values: list[str | None], key_fn: Callable[[Any], str]) -> dict[str, str]:
+        return {key_fn(payload): value for payload, value in zip(payloads, values) if value is not None}
+
+
+_news_llm_service: NewsLLMService | None = None
+
+
+def get_news_llm_service() -> NewsLLMService:
+    """Return the process-wide news LLM service (FastAPI dependency)."""
+    global _news_llm_service  # noqa: PLW0603
+    if _news_llm_service is None:
+        _news_llm_service = NewsLLMService(session_factory=AsyncSessionLocal)
+    return _news_llm_service
@@ -0,0 +1,172 @@
+"""Shared, user-independent nutrient profiles for food names.
+
+Lookups check a small process-local LRU, then ``nutrition_reference_foods``
+(USDA import plus earlier LLM results), first by exact normalized name and
+then by trigram similarity, so "whole milk" finds "Milk, whole, 3.25%
+milkfat". Only a miss in all of them costs a web-search LLM call in
+``NutritionAssistantAgent``.
+"""
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.nutrition import NUTRIENT_DEFINITIONS, NutritionReferenceFood
+from app.db.repositories.nutrition_reference_repository import NutritionReferenceRepository
+from app.services.nutrition_units import GRAMS_PER_UNIT, ML_PER_UNIT
+
+# Unit of imported reference rows (USDA amounts are per 100 g).
+REFERENCE_UNIT = "100g"
+
+# Fuzzy matches must be closer than pg_trgm's default 0.3 threshold: a wrong
+# food is worse than the LLM lookup a miss costs.
+FUZZY_MIN_SCORE = 0.5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_food_name(name: str) -> str:
+    """Case-, punctuation- and plural-insensitive key for a food name.
+
+    "Coffee Roll (Dunkin)" and "coffee rolls dunkin" share a key; word order is
+    kept because it carries meaning ("chicken soup" is not "soup chicken").
+    """
+    tokens = _TOKEN_RE.findall(name.lower())
+    return " ".join(_singular(token) for token in tokens)
+
+
+def normalize_unit(unit: str | None) -> str:
+    return " ".join((unit or "serving").lower().split())
+
+
+def _singular(token: str) -> str:
+    if len(token) > 3 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def profile_from_row(row: NutritionReferenceFood, scale: float = 1.0) -> dict[str, float | None]:
+    """Nutrient values by slug, multiplied by ``scale``."""
+    values: dict[str, float | None] = {}
+    for definition in NUTRIENT_DEFINITIONS:
+        value = getattr(row, definition.column_name)
+        values[definition.slug] = value * scale if value is not None else None
+    return values
+
+
+def reference_row(
+    name: str,
+    unit: str,
+    nutrients: dict[str, float | None],
+    *,
+    source: str,
+    source_id: str | None = None,
+) -> dict[str, Any]:
+    """Insert payload for ``NutritionReferenceRepository.upsert_many``."""
+    return {
+        "normalized_name": normalize_food_name(name),
+        "unit": normalize_unit(unit),
+        "display_name": name[:255],
+        "source": source,
+        "source_id": source_id,
+        **{definition.column_name: nutrients.get(definition.slug) for definition in NUTRIENT_DEFINITIONS},
+    }
+
+
+def _unit_scale(target: str, source: str) -> float | None:
+    """Factor turning a per-``source`` amount into per-``target``; None if the units don't convert."""
+    if target == source:
+        return 1.0
+    for table in (GRAMS_PER_UNIT, ML_PER_UNIT):
+        if target in table and source in table:
+            return table[target] / table[source]
+    return None
+
+
+def _comparable_units(unit: str) -> set[str]:
+    units = {unit}
+    for table in (GRAMS_PER_UNIT, ML_PER_UNIT):
+        if unit in table:
+            units.update(table)
+    return units
+
+
+def _convert(rows: dict[str, NutritionReferenceFood], unit: str) -> dict[str, float | None] | None:
+    """Profile per ``unit`` from the best row: same unit, then the reference unit, then any convertible one."""
+    for row_unit in sorted(rows, key=lambda candidate: (candidate != unit, candidate != REFERENCE_UNIT, candidate)):
+        scale = _unit_scale(unit, row_unit)
+        if scale is not None:
+            return profile_from_row(rows[row_unit], scale)
+    return None
+
+
+class NutrientProfileCache:
+    def __init__(self, *, max_entries: int = 2048) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], dict[str, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def lookup(self, session: AsyncSession, name: str, unit: str) -> dict[str, float | None] | None:
+        """Nutrients for ``name`` per ``unit``, or None when nothing is known.
+
+        A row in another mass unit (or volume unit) is scaled to ``unit``, so
+        gram-based units use the per-100 g reference row. When the exact name
+        has no usable row, the most similar name with one is used instead.
+        """
+        key = (normalize_food_name(name), normalize_unit(unit))
+        if not key[0]:
+            return None
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(cached)
+
+        repo = NutritionReferenceRepository(session)
+        units = _comparable_units(key[1])
+        profile = _convert(await repo.get_by_units(key[0], units), key[1])
+        if profile is None:
+            similar = await repo.search_names(key[0], units, limit=1, min_score=FUZZY_MIN_SCORE)
+            if similar and similar[0] != key[0]:
+                profile = _convert(await repo.get_by_units(similar[0], units), key[1])
+        if profile is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(key, profile)
+        return dict(profile)
+
+    async def store(self, session: AsyncSession, name: str, unit: str, nutrients: dict[str, float | None]) -> None:
+        """Record an LLM-derived profile; existing (e.g. USDA) rows are kept.
+
+        Runs inside the caller's transaction, so it commits with the caller.
+        """
+        if all(value is None for value in nutrients.values()):
+            return
+        row = reference_row(name, unit, nutrients, source="llm")
+        if not row["normalized_name"]:
+            return
+        await NutritionReferenceRepository(session).upsert_many([row], overwrite=False)
+        self._remember((row["normalized_name"], row["unit"]), dict(nutrients))
+
+    def _remember(self, key: tuple[str, str], profile: dict[str, float | None]) -> None:
+        self._entries[key] = profile
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_nutrient_profile_cache: NutrientProfileCache | None = None
+
+
+def get_nutrient_profile_cache() -> NutrientProfileCache:
+    global _nutrient_profile_cache  # noqa: PLW0603
+    if _nutrient_profile_cache is None:
+        _nutrient_profile_cache = NutrientProfileCache()
+    return _nutrient_profile_cache
@@ -10,13 +10,17 @@ from app.db.models.nutrition import (
     NutritionIngredient,
     NutritionIngredientStatus,
 )
-from app.db.repositories.nutrition_ingredients_repository import NutritionIngredientsRepository
+from app.db.repositories.nutrition_ingredients_repository import (
+    NutritionIngredientsRepository,
+    NutritionRecipesRepository,
+)
 
 
 class NutritionIngredientsService:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self.repo = NutritionIngredientsRepository(session)
+        self.recipes_repo = NutritionRecipesRepository(session)
 
     async def list_ingredients(self, owner_user_id: int) -> list[dict[str, Any]]:
         ingredients = await self.repo.list_ingredients(owner_user_id)
@@ -58,6 +62,8 @@ class NutritionIngredientsService:
             status=status,
             nutrient_values=nutrient_values,
         )
+        # Recipes store the ingredient's name, unit and nutrients in flattened form.
+        await self.recipes_repo.invalidate_flattened(ingredient_ids=[ingredient.id])
         await self.session.commit()
         return self._serialize_ingredient(ingredient)
 
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import date, timedelta
 from typing import Any
 
@@ -14,7 +13,7 @@ from app.db.models.nutrition import (
     NutritionRecipe,
 )
 from app.core.exceptions import NotFoundException
-from app.services.nutrition_recipe_expander import expand_recipe_components
+from app.services.nutrition_recipe_expander import expand_recipe_components, materialize_recipes
 from app.db.repositories.nutrition_intake_repository import NutritionIntakeRepository
 from app.db.repositories.nutrition_ingredients_repository import (
     NutritionIngredientsRepository,
@@ -69,7 +68,7 @@ class NutritionIntakeService:
                 "unit": unit,
             }
 
-        recipe = await self.recipes_repo.get_recipe(recipe_id, user_id, load_components=True)
+        recipe = await self.recipes_repo.get_recipe(recipe_id, user_id, load_components=False)
         if recipe is None:
             raise NotFoundException("Recipe not found")
         created = await self._expand_and_log_recipe(
@@ -113,8 +112,7 @@ class NutritionIntakeService:
         await repo.mark_stale(user_id)
 
     async def daily_summary(self, user_id: int, day: date) -> dict[str, Any]:
-        intakes = await self.repo.fetch_for_date(user_id, day)
-        totals = self._accumulate(intakes)
+        totals = (await self.repo.sum_nutrients_by_day(user_id, day, day)).get(day, {})
         goals = await self.goals_service.list_goals(user_id)
         goal_map = {item["slug"]: item for item in goals}
         nutrients = []
@@ -141,19 +139,7 @@ class NutritionIntakeService:
     async def rolling_average(self, user_id: int, days: int = 14) -> dict[str, Any]:
         end = eastern_today()
         start = end - timedelta(days=days - 1)
-        intakes = await self.repo.fetch_between(user_id, start, end)
-        totals_by_day: dict[date, dict[str, float]] = defaultdict(
-            lambda: defaultdict(float)
-        )
-        for intake in intakes:
-            bucket = totals_by_day[intake.day_date]
-            profile = intake.ingredient.profile
-            for definition in NUTRIENT_DEFINITIONS:
-                value = getattr(profile, definition.column_name)
-                if value is None:
-                    continue
-                bucket[definition.slug] += value * intake.quantity
-
+        totals_by_day = await self.repo.sum_nutrients_by_day(user_id, start, end)
         days_with_data = len(totals_by_day) if totals_by_day else 0
         divisor = days_with_data if days_with_data > 0 else 1
 
@@ -185,19 +171,6 @@ class NutritionIntakeService:
             )
         return {"window_days": days, "days_with_data": days_with_data, "nutrients": avg_rows}
 
-    def _accumulate(self, intakes) -> dict[str, float]:
-        totals: dict[str, float] = {
-            definition.slug: 0.0 for definition in NUTRIENT_DEFINITIONS
-        }
-        for intake in intakes:
-            profile = intake.ingredient.profile
-            for definition in NUTRIENT_DEFINITIONS:
-                value = getattr(profile, definition.column_name)
-                if value is None:
-                    continue
-                totals[definition.slug] += value * intake.quantity
-        return totals
-
     def _serialize_entry(self, intake: NutritionIntake) -> dict[str, Any]:
         return {
             "id": intake.id,
@@ -219,6 +192,7 @@ class NutritionIntakeService:
         day: date,
         source: NutritionIntakeSource,
     ) -> dict[str, Any]:
+        await materialize_recipes(self.recipes_repo, [recipe])
         expanded = expand_recipe_components(recipe, servings)
         created_entries: list[dict[str, Any]] = []
         for comp in expanded:
@@ -1,14 +1,24 @@
-"""Shared utility for walking a recipe component tree and accumulating nutrients."""
+"""Materialized, flattened recipe trees and the nutrients they add up to.
+
+Each recipe stores its per-serving leaf ingredients (``flat_components``) and
+nutrient totals (``flat_nutrients``). ``materialize_recipes`` fills stale
+recipes from their direct components plus their children's stored values, so
+nested trees never need deep eager loading. Edits call
+``NutritionRecipesRepository.invalidate_flattened``, which clears a recipe and
+every ancestor.
+"""
 
 from __future__ import annotations
 
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from app.db.models.nutrition import NUTRIENT_DEFINITIONS
 
 if TYPE_CHECKING:
-    from app.db.models.nutrition import NutritionRecipe
+    from app.db.models.nutrition import NutritionRecipe, NutritionRecipeComponent
+    from app.db.repositories.nutrition_ingredients_repository import NutritionRecipesRepository
 
 
 @dataclass
@@ -21,70 +31,96 @@ class ExpandedComponent:
     default_unit: str
 
 
-def expand_recipe_components(
+def flatten_components(
     recipe: NutritionRecipe,
-    servings: float = 1.0,
-) -> list[ExpandedComponent]:
-    """Walk the recipe tree and return flattened leaf-ingredient components.
+    components: Sequence[NutritionRecipeComponent],
+) -> tuple[list[dict[str, Any]], dict[str, float | None]]:
+    """Per-serving leaf list and nutrient totals for ``recipe``.
 
-    Each returned component has its quantity scaled by *servings* and by
-    the per-serving ratio at every level of nesting.
+    Child recipes must already be materialized. A recipe without components
+    gets ``None`` for every nutrient.
     """
-    results: list[ExpandedComponent] = []
-
-    def _walk(target_recipe: NutritionRecipe, multiplier: float) -> None:
-        for comp in target_recipe.components:
-            per_serving = (
-                comp.quantity / target_recipe.servings
-                if target_recipe.servings
-                else comp.quantity
+    if not components:
+        return [], {definition.slug: None for definition in NUTRIENT_DEFINITIONS}
+
+    leaves: list[dict[str, Any]] = []
+    totals: dict[str, float | None] = {definition.slug: 0.0 for definition in NUTRIENT_DEFINITIONS}
+    for comp in components:
+        per_serving = comp.quantity / recipe.servings if recipe.servings else comp.quantity
+        if comp.ingredient is not None:
+            leaves.append(
+                {
+                    "ingredient_id": comp.ingredient.id,
+                    "ingredient_name": comp.ingredient.name,
+                    "quantity": per_serving,
+                    "unit": comp.unit,
+                    "default_unit": comp.ingredient.default_unit,
+                }
             )
-            effective_qty = multiplier * per_serving
-            if comp.ingredient:
-                results.append(
-                    ExpandedComponent(
-                        ingredient_id=comp.ingredient.id,
-                        ingredient_name=comp.ingredient.name,
-                        quantity=effective_qty,
-                        unit=comp.unit,
-                        default_unit=comp.ingredient.default_unit,
-                    )
-                )
-            elif comp.child_recipe:
-                _walk(comp.child_recipe, effective_qty)
-
-    _walk(recipe, servings)
-    return results
-
+            for definition in NUTRIENT_DEFINITIONS:
+                value = getattr(comp.ingredient.profile, definition.column_name)
+                if value is not None:
+                    totals[definition.slug] += value * per_serving
+        elif comp.child_recipe is not None:
+            child = comp.child_recipe
+            leaves.extend({**leaf, "quantity": leaf["quantity"] * per_serving} for leaf in child.flat_components or [])
+            for slug, value in (child.flat_nutrients or {}).items():
+                if value is not None and slug in totals:
+                    totals[slug] += value * per_serving
+    return leaves, totals
+
+
+async def materialize_recipes(repo: NutritionRecipesRepository, recipes: Iterable[NutritionRecipe]) -> int:
+    """Fill stale flattened columns, children first; returns how many were computed.
+
+    Writes go through the repository's session and commit with the caller.
+    """
+    computed = 0
+    visiting: set[int] = set()
+
+    async def _materialize(recipe: NutritionRecipe) -> None:
+        nonlocal computed
+        if recipe.flat_components is not None and recipe.flat_nutrients is not None:
+            return
+        if recipe.id in visiting:
+            raise ValueError("Recipes cannot reference each other in a cycle.")
+        visiting.add(recipe.id)
+        components = await repo.list_components(recipe.id)
+        for comp in components:
+            if comp.child_recipe is not None:
+                await _materialize(comp.child_recipe)
+        recipe.flat_components, recipe.flat_nutrients = flatten_components(recipe, components)
+        visiting.discard(recipe.id)
+        computed += 1
+
+    for recipe in recipes:
+        await _materialize(recipe)
+    return computed
 
-def derive_recipe_nutrients(recipe: NutritionRecipe) -> dict[str, float | None]:
-    """Compute aggregate nutrient totals for a recipe by walking its tree.
 
-    Returns a dict keyed by nutrient slug with rounded totals.  If the
-    recipe has no components, every value is ``None``.
-    """
-    if not recipe.components:
-        return {definition.slug: None for definition in NUTRIENT_DEFINITIONS}
+def expand_recipe_components(
+    recipe: NutritionRecipe,
+    servings: float = 1.0,
+) -> list[ExpandedComponent]:
+    """Leaf-ingredient components of a materialized recipe, scaled by *servings*."""
+    return [
+        ExpandedComponent(
+            ingredient_id=leaf["ingredient_id"],
+            ingredient_name=leaf["ingredient_name"],
+            quantity=leaf["quantity"] * servings,
+            unit=leaf["unit"],
+            default_unit=leaf["default_unit"],
+        )
+        for leaf in recipe.flat_components or []
+    ]
 
-    totals: dict[str, float] = {definition.slug: 0.0 for definition in NUTRIENT_DEFINITIONS}
 
-    def _accumulate(target_recipe: NutritionRecipe, multiplier: float) -> None:
-        for comp in target_recipe.components:
-            per_serving = (
-                comp.quantity / target_recipe.servings
-                if target_recipe.servings
-                else comp.quantity
-            )
-            effective_qty = multiplier * per_serving
-            if comp.ingredient:
-                profile = comp.ingredient.profile
-                for definition in NUTRIENT_DEFINITIONS:
-                    value = getattr(profile, definition.column_name)
-                    if value is None:
-                        continue
-                    totals[definition.slug] += value * effective_qty
-            elif comp.child_recipe:
-                _accumulate(comp.child_recipe, effective_qty)
-
-    _accumulate(recipe, 1.0)
-    return {slug: round(value, 4) for slug, value in totals.items()}
+def derive_recipe_nutrients(recipe: NutritionRecipe) -> dict[str, float | None]:
+    """Rounded per-serving nutrient totals of a materialized recipe, keyed by slug."""
+    stored = recipe.flat_nutrients or {}
+    return {
+        definition.slug: (
+            round(stored[definition.slug], 4) if stored.get(definition.slug) is not None else None
+        )
+        for definition in NUTRIENT_DEFINITIONS
+    }
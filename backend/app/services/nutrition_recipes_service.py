@@ -16,7 +16,7 @@ from app.db.repositories.nutrition_ingredients_repository import (
     NutritionIngredientsRepository,
     NutritionRecipesRepository,
 )
-from app.services.nutrition_recipe_expander import derive_recipe_nutrients
+from app.services.nutrition_recipe_expander import derive_recipe_nutrients, materialize_recipes
 
 
 class NutritionRecipesService:
@@ -27,12 +27,16 @@ class NutritionRecipesService:
 
     async def list_recipes(self, owner_user_id: int) -> list[dict[str, Any]]:
         recipes = await self.recipes_repo.list_recipes(owner_user_id)
+        if await materialize_recipes(self.recipes_repo, recipes):
+            await self.session.commit()
         return [self._serialize_recipe(recipe, include_components=False) for recipe in recipes]
 
     async def get_recipe(self, recipe_id: int, *, owner_user_id: int) -> dict[str, Any]:
         recipe = await self.recipes_repo.get_recipe(recipe_id, owner_user_id, load_components=True)
         if recipe is None:
             raise NotFoundException("Recipe not found")
+        if await materialize_recipes(self.recipes_repo, [recipe]):
+            await self.session.commit()
         return self._serialize_recipe(recipe, include_components=True)
 
     async def create_recipe(
@@ -56,6 +60,7 @@ class NutritionRecipesService:
             components=components,
             source=source,
         )
+        await materialize_recipes(self.recipes_repo, [recipe])
         await self.session.commit()
         recipe = await self.recipes_repo.get_recipe(recipe.id, owner_user_id, load_components=True)
         return self._serialize_recipe(recipe, include_components=True)  # type: ignore[arg-type]
@@ -84,6 +89,8 @@ class NutritionRecipesService:
             status=status,
             components=components,
         )
+        await self.recipes_repo.invalidate_flattened(recipe_ids=[recipe_id])
+        await materialize_recipes(self.recipes_repo, [recipe])
         await self.session.commit()
         recipe = await self.recipes_repo.get_recipe(recipe_id, owner_user_id, load_components=True)
         return self._serialize_recipe(recipe, include_components=True)  # type: ignore[arg-type]
@@ -147,7 +154,7 @@ class NutritionRecipesService:
                         "position": comp.position,
                     }
                 )
-        derived = derive_recipe_nutrients(recipe) if include_components else {}
+        derived = derive_recipe_nutrients(recipe)
         return {
             "id": recipe.id,
             "owner_user_id": recipe.owner_user_id,
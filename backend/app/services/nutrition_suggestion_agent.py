@@ -34,7 +34,7 @@ class NutritionSuggestionAgent:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
         self.repo = NutritionSuggestionsRepository(session)
-        self.client = OpenAIResponsesClient()
+        self.client = OpenAIResponsesClient(feature="nutrition_suggestions")
 
     async def get_suggestions(self, user_id: int) -> list[dict]:
         row = await self.repo.get_for_user(user_id)
@@ -12,7 +12,7 @@ class TodoAccomplishmentAgent:
   """Rewrite a completed todo into a neutral past-tense accomplishment."""
 
   def __init__(self) -> None:
-    self.client = OpenAIResponsesClient()
+    self.client = OpenAIResponsesClient(feature="todo_accomplishment")
 
   async def rewrite(self, todo_text: str) -> str:
     prompt = TODO_ACCOMPLISHMENT_PROMPT.format(todo_text=todo_text)
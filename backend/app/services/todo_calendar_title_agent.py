@@ -39,7 +39,7 @@ class TodoCalendarTitleAgent:
         """
         self.max_length = max_length
         self.max_details_length = max_details_length
-        self.client = OpenAIResponsesClient()
+        self.client = OpenAIResponsesClient(feature="calendar_titles")
 
     def normalize_text(self, text: str) -> str:
         """Normalize todo text for comparisons and hashing."""
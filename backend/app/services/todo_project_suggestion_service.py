@@ -37,7 +37,7 @@ class TodoProjectSuggestionService:
     self.project_repo = ProjectRepository(session)
     self.suggestion_repo = TodoProjectSuggestionRepository(session)
     try:
-      self.client = OpenAIResponsesClient()
+      self.client = OpenAIResponsesClient(feature="project_suggestions")
     except Exception as exc:  # noqa: BLE001
       logger.warning("[todo-project] failed to init genai client: {}", exc)
       self.client = None
@@ -0,0 +1,197 @@
+"""Bulk import of USDA FoodData Central CSV dumps into the reference-food table.
+
+Expects the directory layout of the FDC "Full Download" CSV archives
+(``food.csv`` + ``food_nutrient.csv``). Amounts are per 100 g, so every food
+is stored with unit ``100g``; gram-based lookups scale from it. When
+``food_portion.csv`` is present, household volume portions ("1 cup" = 244 g)
+add a row per volume unit, since volumes cannot be converted without a density.
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repositories.nutrition_reference_repository import NutritionReferenceRepository
+from app.services.nutrient_profile_cache import REFERENCE_UNIT, normalize_food_name, normalize_unit, reference_row
+from app.services.nutrition_units import GRAMS_PER_UNIT, ML_PER_UNIT
+
+# FDC nutrient id -> our nutrient slug. Energy has several ids depending on
+# the dataset; earlier entries win when a food reports more than one.
+FDC_NUTRIENT_IDS: dict[int, str] = {
+    1008: "calories",
+    2047: "calories",
+    2048: "calories",
+    1003: "protein",
+    1005: "carbohydrates",
+    1004: "fat",
+    1079: "fiber",
+    1106: "vitamin_a",
+    1162: "vitamin_c",
+    1110: "vitamin_d",
+    1109: "vitamin_e",
+    1185: "vitamin_k",
+    1165: "vitamin_b1",
+    1166: "vitamin_b2",
+    1167: "vitamin_b3",
+    1175: "vitamin_b6",
+    1178: "vitamin_b12",
+    1177: "folate",
+    1180: "choline",
+    1087: "calcium",
+    1089: "iron",
+    1090: "magnesium",
+    1092: "potassium",
+    1093: "sodium",
+    1095: "zinc",
+    1103: "selenium",
+}
+_NUTRIENT_PRIORITY = {nutrient_id: index for index, nutrient_id in enumerate(FDC_NUTRIENT_IDS)}
+
+# Higher-quality datasets first; a normalized name keeps its first food.
+DEFAULT_DATA_TYPES = ("foundation_food", "sr_legacy_food", "survey_fndds_food")
+
+# Qualifiers that do not change what a plain food name means, so
+# "Bananas, raw" also answers lookups for "banana".
+_GENERIC_QUALIFIERS = {"raw", "fresh", "plain"}
+
+
+@dataclass
+class FdcFood:
+    fdc_id: str
+    description: str
+    data_type: str
+    nutrients: dict[str, float] = field(default_factory=dict)
+    # Volume unit -> grams in one unit, from food_portion.csv.
+    portions: dict[str, float] = field(default_factory=dict)
+    _priorities: dict[str, int] = field(default_factory=dict)
+
+    def add(self, nutrient_id: int, amount: float) -> None:
+        slug = FDC_NUTRIENT_IDS[nutrient_id]
+        priority = _NUTRIENT_PRIORITY[nutrient_id]
+        if slug not in self._priorities or priority < self._priorities[slug]:
+            self.nutrients[slug] = amount
+            self._priorities[slug] = priority
+
+
+def parse_fdc_csv(directory: Path, data_types: Iterable[str] = DEFAULT_DATA_TYPES) -> list[FdcFood]:
+    """Read foods of ``data_types`` with their mapped nutrients (blocking; run in a thread)."""
+    wanted = list(data_types)
+    foods: dict[str, FdcFood] = {}
+    with (directory / "food.csv").open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            if row.get("data_type") in wanted and row.get("description"):
+                foods[row["fdc_id"]] = FdcFood(row["fdc_id"], row["description"].strip(), row["data_type"])
+
+    with (directory / "food_nutrient.csv").open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            food = foods.get(row.get("fdc_id", ""))
+            if food is None:
+                continue
+            try:
+                nutrient_id = int(row["nutrient_id"])
+                amount = float(row["amount"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if nutrient_id in FDC_NUTRIENT_IDS:
+                food.add(nutrient_id, amount)
+
+    _read_portions(directory, foods)
+
+    rank = {data_type: index for index, data_type in enumerate(wanted)}
+    return sorted(
+        (food for food in foods.values() if food.nutrients),
+        key=lambda food: (rank[food.data_type], food.description),
+    )
+
+
+def _read_portions(directory: Path, foods: dict[str, FdcFood]) -> None:
+    """Attach grams per volume unit from ``food_portion.csv``; the first portion per unit wins."""
+    portion_path = directory / "food_portion.csv"
+    if not portion_path.exists():
+        return
+    measure_units: dict[str, str] = {}
+    measure_path = directory / "measure_unit.csv"
+    if measure_path.exists():
+        with measure_path.open(newline="", encoding="utf-8") as handle:
+            measure_units = {row["id"]: row.get("name") or "" for row in csv.DictReader(handle)}
+
+    with portion_path.open(newline="", encoding="utf-8") as handle:
+        for row in csv.DictReader(handle):
+            food = foods.get(row.get("fdc_id", ""))
+            if food is None:
+                continue
+            unit = _portion_unit(row, measure_units)
+            try:
+                grams = float(row["gram_weight"])
+                amount = float(row.get("amount") or 1.0)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if unit is not None and grams > 0 and amount > 0 and unit not in food.portions:
+                food.portions[unit] = grams / amount
+
+
+def _portion_unit(row: dict[str, str], measure_units: dict[str, str]) -> str | None:
+    """Volume unit of a portion row, from the measure unit or, for SR Legacy, the modifier ("cup, chopped")."""
+    description = (row.get("portion_description") or "").lstrip("0123456789./ ")
+    for candidate in (measure_units.get(row.get("measure_unit_id", ""), ""), row.get("modifier") or "", description):
+        unit = normalize_unit(candidate.partition(",")[0].partition("(")[0])
+        if unit in ML_PER_UNIT:
+            return unit
+    return None
+
+
+def _food_rows(name: str, food: FdcFood) -> list[dict[str, Any]]:
+    rows = [reference_row(name, REFERENCE_UNIT, food.nutrients, source="usda", source_id=food.fdc_id)]
+    for unit, grams in food.portions.items():
+        scale = grams / GRAMS_PER_UNIT[REFERENCE_UNIT]
+        nutrients = {slug: amount * scale for slug, amount in food.nutrients.items()}
+        rows.append(reference_row(name, unit, nutrients, source="usda", source_id=food.fdc_id))
+    return rows
+
+
+def reference_rows(foods: Iterable[FdcFood]) -> list[dict[str, Any]]:
+    """Rows per normalized name (per 100 g and per portion unit), plus a bare-name alias for generic descriptions."""
+    rows: dict[str, list[dict[str, Any]]] = {}
+    aliases: list[tuple[str, FdcFood]] = []
+    for food in foods:
+        key = normalize_food_name(food.description)
+        if key and key not in rows:
+            rows[key] = _food_rows(food.description, food)
+        head, _, rest = food.description.partition(",")
+        qualifiers = {part.strip().lower() for part in rest.split(",") if part.strip()}
+        if rest and qualifiers <= _GENERIC_QUALIFIERS:
+            aliases.append((head, food))
+    # Aliases never displace a food whose full description is the bare name.
+    for head, food in aliases:
+        key = normalize_food_name(head)
+        if key and key not in rows:
+            rows[key] = _food_rows(head, food)
+    return [row for name_rows in rows.values() for row in name_rows]
+
+
+async def import_fdc_csv(
+    session: AsyncSession,
+    directory: Path,
+    *,
+    data_types: Iterable[str] = DEFAULT_DATA_TYPES,
+    batch_size: int = 1000,
+) -> int:
+    """Upsert an FDC CSV dump into ``nutrition_reference_foods``; returns rows written.
+
+    Commits once per batch so a large import does not hold one huge transaction.
+    """
+    foods = await asyncio.to_thread(parse_fdc_csv, directory, tuple(data_types))
+    rows = reference_rows(foods)
+    repo = NutritionReferenceRepository(session)
+    for start in range(0, len(rows), batch_size):
+        await repo.upsert_many(rows[start:start + batch_size], overwrite=True)
+        await session.commit()
+        logger.info("[nutrition] imported {}/{} reference foods", min(start + batch_size, len(rows)), len(rows))
+    return len(rows)
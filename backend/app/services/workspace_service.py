@@ -7,9 +7,9 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import HTTPException
-from sqlalchemy import delete, or_, select
+from sqlalchemy import delete, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
 from app.db.models.project import Project, TodoProjectSuggestion
 from app.db.models.project_note import ProjectNote
@@ -61,6 +61,8 @@ NOTES_DB_KEY = "notes"
 HOME_PAGE_KEY = "home"
 WORKSPACE_SCHEMA_VERSION = 3
 AUTOGENERATED_PROJECT_TASKS_LABEL = "Project tasks"
+# Guards the recursive breadcrumb query against a parent cycle.
+MAX_BREADCRUMB_DEPTH = 64
 PROJECT_TASKS_RELATION_FILTER = {
     "filter_property_slug": "project",
     "filter_page_id": "current_page",
@@ -117,6 +119,11 @@ class WorkspaceService:
         if sync_legacy:
             await self._sync_from_legacy(user_id)
 
+    async def is_workspace_current(self, user_id: int) -> bool:
+        """Return whether the workspace exists and needs no seed or legacy sync, without writing."""
+        home = await self._get_home_page(user_id)
+        return home is not None and self._workspace_schema_version(home) >= WORKSPACE_SCHEMA_VERSION
+
     async def get_bootstrap(self, user_id: int, *, read_only: bool = False) -> WorkspaceBootstrapResponse:
         await self.ensure_workspace(user_id)
         home = await self._require_home_page(user_id)
@@ -1879,14 +1886,29 @@ class WorkspaceService:
         recent.last_viewed_at = datetime.now(timezone.utc)
 
     async def _build_breadcrumbs(self, page: WorkspacePage) -> list[WorkspacePage]:
-        items: list[WorkspacePage] = []
-        current = page.parent_page_id
-        while current is not None:
-            ancestor = await self._require_page(page.user_id, current)
-            items.append(ancestor)
-            current = ancestor.parent_page_id
-        items.reverse()
-        return items
+        if page.parent_page_id is None:
+            return []
+        # Walk the whole ancestor chain in one recursive query instead of one query per level.
+        ancestors = (
+            select(WorkspacePage.id, WorkspacePage.parent_page_id, literal_column("1").label("depth"))
+            .where(WorkspacePage.user_id == page.user_id, WorkspacePage.id == page.parent_page_id)
+            .cte("ancestors", recursive=True)
+        )
+        parent = aliased(WorkspacePage)
+        ancestors = ancestors.union_all(
+            select(parent.id, parent.parent_page_id, ancestors.c.depth + 1).where(
+                parent.user_id == page.user_id,
+                parent.id == ancestors.c.parent_page_id,
+                ancestors.c.depth < MAX_BREADCRUMB_DEPTH,
+            )
+        )
+        stmt = (
+            select(WorkspacePage)
+            .join(ancestors, WorkspacePage.id == ancestors.c.id)
+            .order_by(ancestors.c.depth.desc())
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
 
     async def _list_backlinks(self, user_id: int, target_page_id: int) -> list[WorkspaceBacklinkResponse]:
         stmt = select(WorkspacePageLink).where(
@@ -0,0 +1,43 @@
+"""Largest-Triangle-Three-Buckets downsampling for chart series."""
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+
+def lttb_indices(points: Sequence[tuple[float, float]], threshold: int) -> list[int]:
+    """Return indices of the points LTTB keeps, in order.
+
+    ``points`` are ``(x, y)`` pairs sorted by ``x``. The first and last points
+    are always kept; when ``threshold`` is at least the number of points (or
+    below 3) every index is returned unchanged.
+    """
+    count = len(points)
+    if threshold >= count or threshold < 3:
+        return list(range(count))
+
+    kept = [0]
+    bucket_size = (count - 2) / (threshold - 2)
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        next_start = end
+        next_end = min(int((bucket + 2) * bucket_size) + 1, count)
+        if next_start >= next_end:
+            next_start, next_end = count - 1, count
+        avg_x = sum(points[i][0] for i in range(next_start, next_end)) / (next_end - next_start)
+        avg_y = sum(points[i][1] for i in range(next_start, next_end)) / (next_end - next_start)
+
+        ax, ay = points[anchor]
+        best_index = start
+        best_area = -1.0
+        for i in range(start, end):
+            x, y = points[i]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best_index = i
+        kept.append(best_index)
+        anchor = best_index
+    kept.append(count - 1)
+    return kept
@@ -0,0 +1,86 @@
+"""Weekly and monthly aggregates of daily metrics.
+
+Ingest recomputes only the periods that contain changed days; long-range
+metric views read these rows instead of every ``DailyMetric``.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from datetime import date, timedelta
+from typing import Any
+
+PERIOD_WEEK = "week"
+PERIOD_MONTH = "month"
+ROLLUP_PERIODS = (PERIOD_WEEK, PERIOD_MONTH)
+
+# Rollup metric name -> value extracted from a DailyMetric row (None = no sample).
+ROLLUP_METRICS: dict[str, Callable[[Any], float | None]] = {
+    "hrv_avg_ms": lambda m: m.hrv_avg_ms,
+    "rhr_bpm": lambda m: m.rhr_bpm,
+    "sleep_hours": lambda m: (m.sleep_seconds / 3600 if m.sleep_seconds else None),
+    "training_load": lambda m: m.training_load,
+}
+
+
+def period_start(day: date, period: str) -> date:
+    if period == PERIOD_WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == PERIOD_MONTH:
+        return day.replace(day=1)
+    raise ValueError(f"Unknown rollup period: {period}")
+
+
+def period_end(start: date, period: str) -> date:
+    """Last day (inclusive) of the period starting at ``start``."""
+    if period == PERIOD_WEEK:
+        return start + timedelta(days=6)
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def affected_periods(days: Iterable[date]) -> dict[str, set[date]]:
+    periods: dict[str, set[date]] = {period: set() for period in ROLLUP_PERIODS}
+    for day in days:
+        for period in ROLLUP_PERIODS:
+            periods[period].add(period_start(day, period))
+    return periods
+
+
+def build_rollups(user_id: int, rows: Iterable[Any], periods: dict[str, set[date]]) -> list[dict[str, Any]]:
+    """Aggregate ``rows`` into one record per (period, period_start, metric).
+
+    Only periods listed in ``periods`` are produced; every one of them gets a
+    record per metric, with ``sample_count`` 0 when no day had a value, so a
+    recomputation also clears values that disappeared.
+    """
+    samples: dict[tuple[str, date, str], list[float]] = defaultdict(list)
+    for row in rows:
+        for period, starts in periods.items():
+            start = period_start(row.metric_date, period)
+            if start not in starts:
+                continue
+            for metric, extract in ROLLUP_METRICS.items():
+                value = extract(row)
+                if value is not None:
+                    samples[(period, start, metric)].append(float(value))
+
+    records: list[dict[str, Any]] = []
+    for period, starts in periods.items():
+        for start in sorted(starts):
+            for metric in ROLLUP_METRICS:
+                values = samples.get((period, start, metric), [])
+                records.append(
+                    {
+                        "user_id": user_id,
+                        "period": period,
+                        "period_start": start,
+                        "metric": metric,
+                        "sample_count": len(values),
+                        "min_value": min(values) if values else None,
+                        "max_value": max(values) if values else None,
+                        "avg_value": sum(values) / len(values) if values else None,
+                        "sum_value": sum(values) if values else None,
+                    }
+                )
+    return records
@@ -0,0 +1,82 @@
+"""Trigram similarity matching ``pg_trgm``, plus a small in-process index.
+
+Postgres ranks fuzzy name searches with ``similarity()`` over a GIN trigram
+index. Other backends (SQLite in tests and offline scripts) use
+``TrigramIndex`` so ranking is the same everywhere.
+"""
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from collections.abc import Hashable, Iterable
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """pg_trgm's trigram set: each lowercased word padded with two leading and one trailing space."""
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(left: str, right: str) -> float:
+    a, b = trigrams(left), trigrams(right)
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+class TrigramIndex:
+    """Inverted trigram index over ``(key, text)`` pairs."""
+
+    def __init__(self, items: Iterable[tuple[Hashable, str]] = ()) -> None:
+        self._postings: dict[str, set[Hashable]] = defaultdict(set)
+        self._sizes: dict[Hashable, int] = {}
+        self._texts: dict[Hashable, str] = {}
+        for key, text in items:
+            self.add(key, text)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, key: Hashable, text: str) -> None:
+        if key in self._sizes:
+            self.remove(key)
+        grams = trigrams(text)
+        self._sizes[key] = len(grams)
+        self._texts[key] = text
+        for gram in grams:
+            self._postings[gram].add(key)
+
+    def remove(self, key: Hashable) -> None:
+        text = self._texts.pop(key, None)
+        if text is None:
+            return
+        del self._sizes[key]
+        for gram in trigrams(text):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query: str, *, limit: int = 5, min_score: float = 0.3) -> list[tuple[Hashable, float]]:
+        """Top ``limit`` keys by similarity to ``query`` (ties by text), with scores."""
+        grams = trigrams(query)
+        if not grams:
+            return []
+        shared: dict[Hashable, int] = defaultdict(int)
+        for gram in grams:
+            for key in self._postings.get(gram, ()):
+                shared[key] += 1
+        scored = [
+            (key, count / (len(grams) + self._sizes[key] - count))
+            for key, count in shared.items()
+        ]
+        scored = [(key, score) for key, score in scored if score >= min_score]
+        scored.sort(key=lambda item: (-item[1], self._texts[item[0]]))
+        return scored[:limit]
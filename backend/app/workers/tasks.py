@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from loguru import logger
 
+from app.core import query_budget, telemetry
 from app.db.session import AsyncSessionLocal
+from app.services.conversation_memory import get_conversation_memory
 from app.services.insight_service import InsightService
 from app.services.metrics_service import MetricsService
 from app.services.nutrition_goals_service import NutritionGoalsService
@@ -57,21 +60,26 @@ class VisitRefreshController:
             return self._build_status(job_started=True, message="Refresh started.")
 
     async def _run_refresh(self, *, user_id: int) -> None:
+        started = time.perf_counter()
+        failed = False
         try:
-            async with AsyncSessionLocal() as session:
-                metrics = MetricsService(session)
-                insight = InsightService(session)
-                goals = NutritionGoalsService(session)
-                summary = await metrics.ingest(user_id=user_id, lookback_days=14)
-                await goals.recompute_goals(user_id=user_id)
-                await session.commit()
-                if self._should_refresh_insight(summary):
-                    await insight.refresh_daily_insight(user_id=user_id)
+            await _sweep_idle_conversations()
+            with query_budget.budget_scope("visit_refresh"):
+                async with AsyncSessionLocal() as session:
+                    metrics = MetricsService(session)
+                    goals = NutritionGoalsService(session)
+                    summary = await metrics.ingest(user_id=user_id, lookback_days=14)
+                    await goals.recompute_goals(user_id=user_id)
+                    await session.commit()
+            if self._should_refresh_insight(summary):
+                await get_insight_refresh_controller().run(user_id=user_id)
         except Exception as exc:  # noqa: BLE001
+            failed = True
             logger.exception("Visit-triggered refresh failed: {}", exc)
             async with self._lock:
                 self._last_error = str(exc)
         finally:
+            telemetry.record_job("visit_refresh", time.perf_counter() - started, failed=failed)
             async with self._lock:
                 self._running = False
                 self._last_completed_at = eastern_now()
@@ -101,6 +109,18 @@ class VisitRefreshController:
         )
 
 
+async def _sweep_idle_conversations() -> None:
+    """Delete chat sessions idle past the conversation TTL; never fails the refresh."""
+    try:
+        async with AsyncSessionLocal() as session:
+            removed = await get_conversation_memory().sweep_idle(session)
+            await session.commit()
+        if removed:
+            logger.info("Removed {} idle conversation sessions.", removed)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Conversation session sweep failed: {}", exc)
+
+
 _visit_refresh_controller: VisitRefreshController | None = None
 
 
@@ -111,6 +131,140 @@ def get_visit_refresh_controller() -> VisitRefreshController:
     return _visit_refresh_controller
 
 
+@dataclass
+class _InsightRefreshEntry:
+    task: asyncio.Task[None] | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    next_allowed_at: datetime | None = None
+    last_error: str | None = None
+    suppressed: int = 0
+
+
+class InsightRefreshController:
+    """Single-flight registry for readiness insight refreshes, keyed by (user, date).
+
+    Callers asking for a refresh that is already running attach to it instead
+    of starting another LLM call. A finished refresh holds the key for a short
+    cooldown (longer after a failure) so a still-stale dashboard polling the
+    endpoint does not immediately trigger the next one.
+    """
+
+    def __init__(self, *, cooldown: timedelta, failure_cooldown: timedelta) -> None:
+        self._cooldown = cooldown
+        self._failure_cooldown = failure_cooldown
+        self._lock = asyncio.Lock()
+        self._entries: dict[tuple[int, date], _InsightRefreshEntry] = {}
+        self.suppressed_refreshes = 0
+
+    async def request_refresh(self, *, user_id: int, metric_date: date | None = None) -> RefreshJobStatus:
+        """Start a background refresh unless one is running or cooling down."""
+        async with self._lock:
+            entry, started = self._claim(user_id, metric_date or eastern_today())
+            if started:
+                message = "Insight refresh started."
+            elif entry.task is not None and not entry.task.done():
+                message = "Insight refresh already running."
+            else:
+                message = "Waiting for cooldown window."
+            return self._build_status(entry, job_started=started, message=message)
+
+    async def run(self, *, user_id: int, metric_date: date | None = None) -> None:
+        """Refresh now, or wait for the refresh already in flight for this key."""
+        async with self._lock:
+            entry, _started = self._claim(user_id, metric_date or eastern_today(), ignore_cooldown=True)
+            task = entry.task
+        if task is not None:
+            await asyncio.shield(task)
+
+    def is_running(self, *, user_id: int, metric_date: date | None = None) -> bool:
+        entry = self._entries.get((user_id, metric_date or eastern_today()))
+        return bool(entry and entry.task is not None and not entry.task.done())
+
+    def _claim(
+        self,
+        user_id: int,
+        metric_date: date,
+        *,
+        ignore_cooldown: bool = False,
+    ) -> tuple[_InsightRefreshEntry, bool]:
+        self._prune(eastern_today())
+        key = (user_id, metric_date)
+        entry = self._entries.setdefault(key, _InsightRefreshEntry())
+        now = eastern_now()
+        running = entry.task is not None and not entry.task.done()
+        cooling = not ignore_cooldown and entry.next_allowed_at is not None and now < entry.next_allowed_at
+        if running or cooling:
+            entry.suppressed += 1
+            self.suppressed_refreshes += 1
+            logger.debug(
+                "Suppressed duplicate insight refresh for user {} @ {} (running={}, total suppressed={})",
+                user_id,
+                metric_date,
+                running,
+                self.suppressed_refreshes,
+            )
+            return entry, False
+        entry.started_at = now
+        entry.last_error = None
+        entry.task = asyncio.get_running_loop().create_task(self._run_refresh(key, entry))
+        return entry, True
+
+    async def _run_refresh(self, key: tuple[int, date], entry: _InsightRefreshEntry) -> None:
+        user_id, metric_date = key
+        cooldown = self._cooldown
+        started = time.perf_counter()
+        try:
+            with query_budget.budget_scope("insight_refresh"):
+                async with AsyncSessionLocal() as session:
+                    service = InsightService(session)
+                    await service.refresh_daily_insight(user_id=user_id, metric_date=metric_date)
+            if service.llm_failed:
+                # The service stored a fallback instead of raising; back off as for any failure.
+                cooldown = self._failure_cooldown
+                entry.last_error = "Insight model call failed; kept fallback insight."
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Insight refresh failed for user {} @ {}: {}", user_id, metric_date, exc)
+            cooldown = self._failure_cooldown
+            entry.last_error = str(exc)
+        finally:
+            telemetry.record_job("insight_refresh", time.perf_counter() - started, failed=entry.last_error is not None)
+            entry.completed_at = eastern_now()
+            entry.next_allowed_at = entry.completed_at + cooldown
+
+    def _prune(self, today: date) -> None:
+        # Keys for past dates can never be requested by the stale check again.
+        for key in [key for key in self._entries if key[1] < today - timedelta(days=1)]:
+            entry = self._entries[key]
+            if entry.task is None or entry.task.done():
+                del self._entries[key]
+
+    def _build_status(self, entry: _InsightRefreshEntry, *, job_started: bool, message: str) -> RefreshJobStatus:
+        return RefreshJobStatus(
+            job_started=job_started,
+            running=entry.task is not None and not entry.task.done(),
+            last_started_at=entry.started_at,
+            last_completed_at=entry.completed_at,
+            next_allowed_at=entry.next_allowed_at,
+            cooldown_seconds=int(self._failure_cooldown.total_seconds() if entry.last_error else self._cooldown.total_seconds()),
+            message=message,
+            last_error=entry.last_error,
+        )
+
+
+_insight_refresh_controller: InsightRefreshController | None = None
+
+
+def get_insight_refresh_controller() -> InsightRefreshController:
+    global _insight_refresh_controller  # noqa: PLW0603
+    if _insight_refresh_controller is None:
+        _insight_refresh_controller = InsightRefreshController(
+            cooldown=timedelta(minutes=5),
+            failure_cooldown=timedelta(minutes=15),
+        )
+    return _insight_refresh_controller
+
+
 class DigestRefreshController:
     """Throttled refresh controller for the AI Digest pipeline."""
 
@@ -139,16 +293,21 @@ class DigestRefreshController:
             return self._build_status(job_started=True, message="Digest refresh started.")
 
     async def _run_pipeline(self) -> None:
+        started = time.perf_counter()
+        failed = False
         try:
-            async with AsyncSessionLocal() as session:
-                from app.services.ai_digest_service import AIDigestService
-                service = AIDigestService(session)
-                await service.run_pipeline()
+            with query_budget.budget_scope("digest_refresh"):
+                async with AsyncSessionLocal() as session:
+                    from app.services.ai_digest_service import AIDigestService
+                    service = AIDigestService(session)
+                    await service.run_pipeline()
         except Exception as exc:  # noqa: BLE001
+            failed = True
             logger.exception("Digest refresh failed: {}", exc)
             async with self._lock:
                 self._last_error = str(exc)
         finally:
+            telemetry.record_job("digest_refresh", time.perf_counter() - started, failed=failed)
             async with self._lock:
                 self._running = False
                 self._last_completed_at = eastern_now()
@@ -0,0 +1,36 @@
+"""news_llm_cache
+
+Revision ID: 20260405_news_llm_cache
+Revises: 20260402_digest_llm_summary
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260405_news_llm_cache"
+down_revision = "20260402_digest_llm_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if "news_llm_cache" not in tables:
+        op.create_table(
+            "news_llm_cache",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("kind", sa.String(32), nullable=False),
+            sa.Column("content_hash", sa.String(64), nullable=False),
+            sa.Column("value", sa.Text, nullable=False),
+            sa.Column("model_name", sa.String(64), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.UniqueConstraint("kind", "content_hash", name="uq_news_llm_cache_kind_hash"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("news_llm_cache")
@@ -0,0 +1,45 @@
+"""llm_usage_counter
+
+Revision ID: 20260408_llm_usage_counter
+Revises: 20260405_news_llm_cache
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260408_llm_usage_counter"
+down_revision = "20260405_news_llm_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if "llm_usage_counter" not in tables:
+        op.create_table(
+            "llm_usage_counter",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("usage_date", sa.Date, nullable=False),
+            sa.Column("feature", sa.String(64), nullable=False),
+            sa.Column("model_name", sa.String(64), nullable=False),
+            sa.Column("calls", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("errors", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("rate_limited", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("coalesced", sa.Integer, nullable=False, server_default="0"),
+            sa.Column("input_tokens", sa.BigInteger, nullable=False, server_default="0"),
+            sa.Column("output_tokens", sa.BigInteger, nullable=False, server_default="0"),
+            sa.Column("latency_ms_total", sa.BigInteger, nullable=False, server_default="0"),
+            sa.Column("cost_usd", sa.Float, nullable=False, server_default="0"),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.UniqueConstraint(
+                "usage_date", "feature", "model_name", name="uq_llm_usage_counter_day_feature_model"
+            ),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("llm_usage_counter")
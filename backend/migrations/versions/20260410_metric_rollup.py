@@ -0,0 +1,79 @@
+"""metric_rollup
+
+Revision ID: 20260410_metric_rollup
+Revises: 20260408_llm_usage_counter
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260410_metric_rollup"
+down_revision = "20260408_llm_usage_counter"
+branch_labels = None
+depends_on = None
+
+
+_METRIC_EXPRESSIONS = {
+    "hrv_avg_ms": "hrv_avg_ms",
+    "rhr_bpm": "rhr_bpm",
+    "sleep_hours": "NULLIF(sleep_seconds, 0) / 3600.0",
+    "training_load": "training_load",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if "metricrollup" not in tables:
+        op.create_table(
+            "metricrollup",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("user.id"), nullable=False),
+            sa.Column("period", sa.String(8), nullable=False),
+            sa.Column("period_start", sa.Date, nullable=False),
+            sa.Column("metric", sa.String(32), nullable=False),
+            sa.Column("sample_count", sa.Integer, nullable=False),
+            sa.Column("min_value", sa.Float, nullable=True),
+            sa.Column("max_value", sa.Float, nullable=True),
+            sa.Column("avg_value", sa.Float, nullable=True),
+            sa.Column("sum_value", sa.Float, nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+            sa.UniqueConstraint(
+                "user_id", "period", "period_start", "metric", name="uq_metricrollup_user_period_metric"
+            ),
+        )
+        op.create_index("ix_metricrollup_user_id", "metricrollup", ["user_id"])
+
+    # Backfill existing history; ingest keeps touched periods current afterwards.
+    for period in ("week", "month"):
+        for metric, expression in _METRIC_EXPRESSIONS.items():
+            op.execute(
+                f"""
+                INSERT INTO metricrollup (
+                    user_id, period, period_start, metric, sample_count,
+                    min_value, max_value, avg_value, sum_value, created_at, updated_at
+                )
+                SELECT
+                    user_id,
+                    '{period}',
+                    date_trunc('{period}', metric_date)::date,
+                    '{metric}',
+                    count({expression}),
+                    min({expression}),
+                    max({expression}),
+                    avg({expression}),
+                    sum({expression}),
+                    now(),
+                    now()
+                FROM dailymetric
+                GROUP BY user_id, date_trunc('{period}', metric_date)
+                ON CONFLICT ON CONSTRAINT uq_metricrollup_user_period_metric DO NOTHING
+                """
+            )
+
+
+def downgrade() -> None:
+    op.drop_table("metricrollup")
@@ -0,0 +1,37 @@
+"""readiness_insight input fingerprints
+
+Revision ID: 20260412_readiness_insight_fingerprint
+Revises: 20260410_metric_rollup
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260412_readiness_insight_fingerprint"
+down_revision = "20260410_metric_rollup"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "readiness_insight" not in set(inspector.get_table_names()):
+        return
+    columns = {col["name"] for col in inspector.get_columns("readiness_insight")}
+    if "input_fingerprint" not in columns:
+        op.add_column("readiness_insight", sa.Column("input_fingerprint", sa.String(length=64), nullable=True))
+    if "context_fingerprint" not in columns:
+        op.add_column("readiness_insight", sa.Column("context_fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "readiness_insight" not in set(inspector.get_table_names()):
+        return
+    columns = {col["name"] for col in inspector.get_columns("readiness_insight")}
+    if "context_fingerprint" in columns:
+        op.drop_column("readiness_insight", "context_fingerprint")
+    if "input_fingerprint" in columns:
+        op.drop_column("readiness_insight", "input_fingerprint")
@@ -0,0 +1,73 @@
+"""nutrition_reference_foods
+
+Revision ID: 20260414_nutrition_reference_foods
+Revises: 20260412_readiness_insight_fingerprint
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260414_nutrition_reference_foods"
+down_revision = "20260412_readiness_insight_fingerprint"
+branch_labels = None
+depends_on = None
+
+
+# Mirrors NUTRIENT_DEFINITIONS column names at the time of this revision.
+_NUTRIENT_COLUMNS = (
+    "calories_kcal",
+    "protein_g",
+    "carbohydrates_g",
+    "fat_g",
+    "fiber_g",
+    "vitamin_a_ug",
+    "vitamin_c_mg",
+    "vitamin_d_iu",
+    "vitamin_e_mg",
+    "vitamin_k_ug",
+    "vitamin_b1_mg",
+    "vitamin_b2_mg",
+    "vitamin_b3_mg",
+    "vitamin_b6_mg",
+    "vitamin_b12_ug",
+    "folate_ug",
+    "choline_mg",
+    "calcium_mg",
+    "iron_mg",
+    "magnesium_mg",
+    "potassium_mg",
+    "sodium_mg",
+    "zinc_mg",
+    "selenium_ug",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    if "nutrition_reference_foods" not in tables:
+        op.create_table(
+            "nutrition_reference_foods",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("normalized_name", sa.String(255), nullable=False),
+            sa.Column("unit", sa.String(64), nullable=False),
+            sa.Column("display_name", sa.String(255), nullable=False),
+            sa.Column("source", sa.String(32), nullable=False),
+            sa.Column("source_id", sa.String(64), nullable=True),
+            *(sa.Column(column, sa.Float, nullable=True) for column in _NUTRIENT_COLUMNS),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+            sa.UniqueConstraint("normalized_name", "unit", name="uq_nutrition_reference_food_name_unit"),
+        )
+        op.create_index(
+            "ix_nutrition_reference_foods_normalized_name",
+            "nutrition_reference_foods",
+            ["normalized_name"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_nutrition_reference_foods_normalized_name", table_name="nutrition_reference_foods")
+    op.drop_table("nutrition_reference_foods")
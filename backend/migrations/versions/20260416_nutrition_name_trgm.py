@@ -0,0 +1,43 @@
+"""pg_trgm GIN indexes for fuzzy ingredient and recipe name search
+
+Revision ID: 20260416_nutrition_name_trgm
+Revises: 20260414_nutrition_reference_foods
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260416_nutrition_name_trgm"
+down_revision = "20260414_nutrition_reference_foods"
+branch_labels = None
+depends_on = None
+
+
+_INDEXES = {
+    "ix_nutrition_foods_name_trgm": "nutrition_foods",
+    "ix_nutrition_recipes_name_trgm": "nutrition_recipes",
+}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table in _INDEXES.items():
+        if table in tables:
+            # Expression index on lower(name) to match the repository's similarity queries.
+            op.execute(
+                f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin (lower(name) gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    for index_name in _INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
@@ -0,0 +1,38 @@
+"""nutrition_recipes materialized flattened components and nutrients
+
+Revision ID: 20260418_recipe_flattened_nutrients
+Revises: 20260416_nutrition_name_trgm
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260418_recipe_flattened_nutrients"
+down_revision = "20260416_nutrition_name_trgm"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Columns start NULL (stale); recipes are materialized on first read or log.
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "nutrition_recipes" not in set(inspector.get_table_names()):
+        return
+    columns = {col["name"] for col in inspector.get_columns("nutrition_recipes")}
+    if "flat_components" not in columns:
+        op.add_column("nutrition_recipes", sa.Column("flat_components", sa.JSON(), nullable=True))
+    if "flat_nutrients" not in columns:
+        op.add_column("nutrition_recipes", sa.Column("flat_nutrients", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "nutrition_recipes" not in set(inspector.get_table_names()):
+        return
+    columns = {col["name"] for col in inspector.get_columns("nutrition_recipes")}
+    if "flat_nutrients" in columns:
+        op.drop_column("nutrition_recipes", "flat_nutrients")
+    if "flat_components" in columns:
+        op.drop_column("nutrition_recipes", "flat_components")
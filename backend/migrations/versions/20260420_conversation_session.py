@@ -0,0 +1,39 @@
+"""conversation_session
+
+Revision ID: 20260420_conversation_session
+Revises: 20260418_recipe_flattened_nutrients
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260420_conversation_session"
+down_revision = "20260418_recipe_flattened_nutrients"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "conversation_session" in set(inspector.get_table_names()):
+        return
+    op.create_table(
+        "conversation_session",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("namespace", sa.String(32), nullable=False),
+        sa.Column("session_key", sa.String(64), nullable=False),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("user.id"), nullable=True),
+        sa.Column("summary", sa.Text, nullable=True),
+        sa.Column("turns", sa.JSON, nullable=False),
+        sa.Column("summarized_turns", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.UniqueConstraint("namespace", "session_key", name="uq_conversation_session_namespace_key"),
+    )
+    op.create_index("ix_conversation_session_updated_at", "conversation_session", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_conversation_session_updated_at", table_name="conversation_session")
+    op.drop_table("conversation_session")
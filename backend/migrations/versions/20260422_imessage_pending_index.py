@@ -0,0 +1,36 @@
+"""Partial index over pending imessage_message rows
+
+Revision ID: 20260422_imessage_pending_index
+Revises: 20260420_conversation_session
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260422_imessage_pending_index"
+down_revision = "20260420_conversation_session"
+branch_labels = None
+depends_on = None
+
+
+_INDEX = "ix_imessage_message_pending"
+_PENDING = sa.text("processed_at_utc IS NULL")
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "imessage_message" not in set(inspector.get_table_names()):
+        return
+    if _INDEX in {index["name"] for index in inspector.get_indexes("imessage_message")}:
+        return
+    op.create_index(
+        _INDEX,
+        "imessage_message",
+        ["user_id", "sent_at_utc", "id"],
+        postgresql_where=_PENDING,
+        sqlite_where=_PENDING,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(_INDEX, table_name="imessage_message")
@@ -0,0 +1,28 @@
+"""conversation_session version counter
+
+Revision ID: 20260424_conversation_session_version
+Revises: 20260422_imessage_pending_index
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260424_conversation_session_version"
+down_revision = "20260422_imessage_pending_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    columns = {column["name"] for column in sa.inspect(bind).get_columns("conversation_session")}
+    if "version" in columns:
+        return
+    op.add_column(
+        "conversation_session",
+        sa.Column("version", sa.Integer, nullable=False, server_default="1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("conversation_session", "version")
@@ -0,0 +1,38 @@
+"""conversation_session keyed by user
+
+Revision ID: 20260426_conversation_session_user_key
+Revises: 20260424_conversation_session_version
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260426_conversation_session_user_key"
+down_revision = "20260424_conversation_session_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    constraints = {item["name"] for item in sa.inspect(bind).get_unique_constraints("conversation_session")}
+    if "uq_conversation_session_namespace_user_key" in constraints:
+        return
+    # Chats are per user now; rows without an owner can never be read again.
+    op.execute(sa.text("DELETE FROM conversation_session WHERE user_id IS NULL"))
+    if "uq_conversation_session_namespace_key" in constraints:
+        op.drop_constraint("uq_conversation_session_namespace_key", "conversation_session", type_="unique")
+    op.create_unique_constraint(
+        "uq_conversation_session_namespace_user_key",
+        "conversation_session",
+        ["namespace", "user_id", "session_key"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_conversation_session_namespace_user_key", "conversation_session", type_="unique")
+    op.create_unique_constraint(
+        "uq_conversation_session_namespace_key",
+        "conversation_session",
+        ["namespace", "session_key"],
+    )
@@ -0,0 +1,39 @@
+"""pg_trgm GIN index for fuzzy reference-food name lookups
+
+Revision ID: 20260428_nutrition_reference_name_trgm
+Revises: 20260426_conversation_session_user_key
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20260428_nutrition_reference_name_trgm"
+down_revision = "20260426_conversation_session_user_key"
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = "ix_nutrition_reference_foods_name_trgm"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    if "nutrition_reference_foods" not in set(inspector.get_table_names()):
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # normalized_name is already lowercase, so the index is on the plain column.
+    op.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON nutrition_reference_foods "
+        "USING gin (normalized_name gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    op.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
@@ -3,6 +3,8 @@
 This conftest provides:
 - Centralized environment defaults so individual test files don't need to repeat them.
 - sys.path setup so ``app`` imports work when running from the repo root.
+- ``count_queries`` for asserting how many SQL statements a block runs.
+- ``sqlite_session`` for tests that need real tables in an in-memory SQLite database.
 
 Environment values use ``setdefault`` intentionally: test files that need non-standard
 values (e.g. a specific DATABASE_URL or GARMIN_PASSWORD_ENCRYPTION_KEY) can still set
@@ -15,10 +17,13 @@ Note on FakeSession:
 """
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 from pathlib import Path
 
+import pytest
+
 # ---------------------------------------------------------------------------
 # sys.path: ensure the backend package root is importable
 # ---------------------------------------------------------------------------
@@ -41,3 +46,72 @@ _ENV_DEFAULTS: dict[str, str] = {
 
 for key, value in _ENV_DEFAULTS.items():
     os.environ.setdefault(key, value)
+
+
+# ---------------------------------------------------------------------------
+# Query counting
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def count_queries():
+    """Count the statements run against an engine or session inside a block.
+
+    Usage::
+
+        with count_queries(session) as queries:
+            asyncio.run(service.do_work())
+        assert queries.statements == 2
+        assert queries.repeated() == []
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.query_budget import instrument_engine, track_queries
+
+    def _count(bind, **budget):
+        engine = bind.bind if isinstance(bind, AsyncSession) else bind
+        instrument_engine(engine)
+        return track_queries("test", **budget)
+
+    return _count
+
+
+# ---------------------------------------------------------------------------
+# In-memory SQLite sessions
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def sqlite_session():
+    """Create an ``AsyncSession`` on a fresh in-memory SQLite database with the given models' tables.
+
+    Usage::
+
+        @pytest.fixture
+        def session(sqlite_session):
+            return sqlite_session(NutritionIngredient, NutritionRecipe)
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db.models.base import Base
+
+    opened = []
+
+    def _create(*models):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        tables = [model.__table__ for model in models]
+
+        async def _setup() -> AsyncSession:
+            async with engine.begin() as conn:
+                await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+            return AsyncSession(engine, expire_on_commit=False)
+
+        db = asyncio.run(_setup())
+        opened.append((engine, db))
+        return db
+
+    yield _create
+
+    async def _teardown() -> None:
+        for engine, db in opened:
+            await db.close()
+            # aiosqlite connections run on threads that keep the process alive until disposed.
+            await engine.dispose()
+
+    asyncio.run(_teardown())
@@ -95,3 +95,94 @@ def test_classify_topic_developer_tools():
 def test_classify_topic_fallback():
     from app.services.ai_digest_service import classify_topic
     assert classify_topic("Tech industry sees record funding", "TLDR AI") == "industry"
+
+
+def _pairwise_dedupe(items: list[dict]) -> list[dict]:
+    """Reference O(n²) implementation the indexed dedupe must match."""
+    from app.services.ai_digest_service import (
+        JACCARD_THRESHOLD,
+        _SOURCE_QUALITY,
+        jaccard_title_similarity,
+    )
+    kept: list[dict] = []
+    for item in items:
+        for i, existing in enumerate(kept):
+            if jaccard_title_similarity(item["title"], existing["title"]) >= JACCARD_THRESHOLD:
+                if _SOURCE_QUALITY.get(item["source_name"], 0) > _SOURCE_QUALITY.get(existing["source_name"], 0):
+                    kept[i] = item
+                break
+        else:
+            kept.append(item)
+    return kept
+
+
+def test_indexed_dedup_matches_pairwise_scan():
+    import random
+
+    from app.services.ai_digest_service import deduplicate_by_title
+    rng = random.Random(7)
+    vocab = ["claude", "model", "release", "gemini", "agents", "coding", "launch", "benchmark", "copilot", "vision"]
+    sources = ["Claude Code Releases", "TLDR AI", "OpenAI Blog", "Import AI", "Unknown Feed"]
+    items = [
+        {
+            "title": " ".join(rng.sample(vocab, rng.randint(1, 5))),
+            "source_name": rng.choice(sources),
+            "normalized_url": f"https://example.com/{n}",
+        }
+        for n in range(400)
+    ]
+    assert deduplicate_by_title(items) == _pairwise_dedupe(items)
+
+
+def test_run_pipeline_inserts_batch_in_one_statement(monkeypatch):
+    import asyncio
+
+    from sqlalchemy.dialects import postgresql
+
+    from app.services import ai_digest_service
+
+    async def fake_fetch(client, source):
+        return [{
+            "url": f"{source['url']}/post",
+            "normalized_url": f"{source['url']}/post",
+            "title": f"{source['name']} unique headline",
+            "summary": None,
+            "source_name": source["name"],
+            "source_feed_url": source["url"],
+            "category": source["category"],
+            "published_at": None,
+            "content_hash": "abc",
+        }]
+
+    class FakeResult:
+        def __init__(self, ids):
+            self._ids = ids
+
+        def scalars(self):
+            return self
+
+        def all(self):
+            return self._ids
+
+    class FakeSession:
+        def __init__(self):
+            self.statements = []
+            self.commits = 0
+
+        async def execute(self, stmt):
+            self.statements.append(stmt)
+            return FakeResult([1, 2, 3])
+
+        async def commit(self):
+            self.commits += 1
+
+    monkeypatch.setattr(ai_digest_service, "fetch_single_feed", fake_fetch)
+    session = FakeSession()
+    new_count = asyncio.run(ai_digest_service.AIDigestService(session).run_pipeline())
+
+    assert len(session.statements) == 1
+    assert new_count == 3
+    assert session.commits == 1
+    compiled = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (normalized_url) DO NOTHING" in compiled
+    assert "RETURNING digest_item.id" in compiled
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Sequence
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.conversation import ConversationSession
+from app.services.conversation_memory import ConversationMemory, ConversationTurn
+from app.utils.timezone import eastern_now
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(ConversationSession)
+
+
+def test_conversation_survives_a_new_process(session: AsyncSession) -> None:
+    async def _run():
+        first = ConversationMemory(summarizer=None)
+        await first.append(
+            session, "nutrition", "chat-1", [("user", "two eggs"), ("assistant", "Logged 2 eggs.")], user_id=1
+        )
+        await session.commit()
+        # A fresh instance has an empty LRU, as after a restart or on another worker.
+        return await ConversationMemory(summarizer=None).get(session, "nutrition", "chat-1", user_id=1)
+
+    conversation = asyncio.run(_run())
+
+    assert conversation.render() == ["User: two eggs", "Assistant: Logged 2 eggs."]
+
+
+def test_long_history_is_compacted_into_a_summary(session: AsyncSession) -> None:
+    calls: list[tuple[str | None, list[str]]] = []
+
+    async def summarizer(previous: str | None, turns: Sequence[ConversationTurn]) -> str:
+        calls.append((previous, [turn.content for turn in turns]))
+        return f"summary {len(calls)}"
+
+    memory = ConversationMemory(max_turns=4, keep_recent=2, summarizer=summarizer)
+
+    async def _run():
+        for index in range(5):
+            await memory.append(
+                session, "assistant", "chat-2", [("user", f"q{index}"), ("assistant", f"a{index}")], user_id=1
+            )
+        await session.commit()
+        return await ConversationMemory(summarizer=None).get(session, "assistant", "chat-2", user_id=1)
+
+    reloaded = asyncio.run(_run())
+
+    assert calls == [(None, ["q0", "a0", "q1", "a1"]), ("summary 1", ["q2", "a2", "q3", "a3"])]
+    assert reloaded.summary == "summary 2"
+    assert [turn.content for turn in reloaded.turns] == ["q4", "a4"]
+    assert reloaded.summarized_turns == 8
+
+
+def test_failed_summarization_falls_back_to_truncation(session: AsyncSession) -> None:
+    async def summarizer(previous: str | None, turns: Sequence[ConversationTurn]) -> str:
+        raise RuntimeError("llm down")
+
+    memory = ConversationMemory(max_turns=2, keep_recent=2, summarizer=summarizer)
+
+    async def _run():
+        await memory.append(session, "assistant", "chat-3", [("user", "q0"), ("assistant", "a0")], user_id=1)
+        return await memory.append(session, "assistant", "chat-3", [("user", "q1"), ("assistant", "a1")], user_id=1)
+
+    conversation = asyncio.run(_run())
+
+    assert conversation.summary is None
+    assert [turn.content for turn in conversation.turns] == ["q1", "a1"]
+
+
+def test_lru_is_bounded_by_bytes_and_idle_chats_expire(session: AsyncSession) -> None:
+    memory = ConversationMemory(max_bytes=600, summarizer=None, ttl_seconds=60)
+
+    async def _run():
+        for index in range(4):
+            await memory.append(session, "nutrition", f"chat-{index}", [("user", "x" * 150)], user_id=1)
+        await session.commit()
+        stale = await memory.get(session, "nutrition", "chat-3", user_id=1)
+        stale.turns[-1].timestamp -= 120
+        return await memory.get(session, "nutrition", "chat-3", user_id=1)
+
+    expired = asyncio.run(_run())
+
+    assert memory.total_bytes <= 600
+    assert list(memory._entries) == [("nutrition", 1, "chat-2"), ("nutrition", 1, "chat-3")]
+    assert expired.turns == []
+
+
+def test_stale_cached_copy_does_not_erase_another_workers_turns(session: AsyncSession) -> None:
+    first = ConversationMemory(summarizer=None)
+    second = ConversationMemory(summarizer=None)
+
+    async def _run():
+        await first.append(session, "assistant", "chat-4", [("user", "q0"), ("assistant", "a0")], user_id=1)
+        await session.commit()
+        # Both workers now cache version 1; the second saves first.
+        await second.get(session, "assistant", "chat-4", user_id=1)
+        await second.append(session, "assistant", "chat-4", [("user", "q1"), ("assistant", "a1")], user_id=1)
+        await session.commit()
+        await first.append(session, "assistant", "chat-4", [("user", "q2"), ("assistant", "a2")], user_id=1)
+        await session.commit()
+        return await ConversationMemory(summarizer=None).get(session, "assistant", "chat-4", user_id=1)
+
+    conversation = asyncio.run(_run())
+
+    assert [turn.content for turn in conversation.turns] == ["q0", "a0", "q1", "a1", "q2", "a2"]
+    assert conversation.version == 3
+
+
+def test_sweep_deletes_only_idle_rows(session: AsyncSession) -> None:
+    memory = ConversationMemory(summarizer=None, ttl_seconds=60)
+
+    async def _run():
+        await memory.append(session, "nutrition", "idle", [("user", "old")], user_id=1)
+        await memory.append(session, "nutrition", "active", [("user", "new")], user_id=1)
+        await session.commit()
+        await session.execute(
+            update(ConversationSession)
+            .where(ConversationSession.session_key == "idle")
+            .values(updated_at=eastern_now() - timedelta(hours=2))
+        )
+        removed = await memory.sweep_idle(session)
+        await session.commit()
+        keys = (await session.execute(select(ConversationSession.session_key))).scalars().all()
+        return removed, keys
+
+    removed, keys = asyncio.run(_run())
+
+    assert removed == 1
+    assert keys == ["active"]
+
+
+def test_another_users_session_id_does_not_reach_their_history(session: AsyncSession) -> None:
+    async def _run():
+        await ConversationMemory(summarizer=None).append(
+            session, "assistant", "shared-id", [("user", "my bank pin hint")], user_id=1
+        )
+        await session.commit()
+        intruder = ConversationMemory(summarizer=None)
+        seen = await intruder.get(session, "assistant", "shared-id", user_id=2)
+        await intruder.append(session, "assistant", "shared-id", [("user", "hello")], user_id=2)
+        await session.commit()
+        owner = await ConversationMemory(summarizer=None).get(session, "assistant", "shared-id", user_id=1)
+        return seen, owner
+
+    seen, owner = asyncio.run(_run())
+
+    assert seen.turns == []
+    assert [turn.content for turn in owner.turns] == ["my bank pin hint"]
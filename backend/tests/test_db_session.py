@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import session as db_session
+from app.db.session import InstrumentedAsyncQueuePool, PoolProfile, resolve_pool_profile
+
+
+def test_pool_profile_is_selected_by_name_and_overridable(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db_session.settings, "database_pool_profile", "script")
+    monkeypatch.setattr(db_session.settings, "database_pool_size", None)
+    monkeypatch.setattr(db_session.settings, "database_max_overflow", 0)
+
+    assert resolve_pool_profile() == PoolProfile(pool_size=2, max_overflow=0, pool_timeout=60)
+
+    monkeypatch.setattr(db_session.settings, "database_pool_profile", "batch")
+    with pytest.raises(ValueError, match="DATABASE_POOL_PROFILE"):
+        resolve_pool_profile()
+
+
+def test_pgbouncer_mode_disables_prepared_statement_caching(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(db_session.settings, "database_pgbouncer", True)
+
+    args = db_session._connect_args("postgresql+asyncpg://db/app")
+
+    assert (args["statement_cache_size"], args["prepared_statement_cache_size"]) == (0, 0)
+    assert "server_settings" not in args
+    assert args["prepared_statement_name_func"]() != args["prepared_statement_name_func"]()
+
+
+def test_pool_records_checkouts_and_waits(tmp_path) -> None:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=5,
+    )
+
+    async def _connect():
+        return await engine.connect()
+
+    async def _run():
+        try:
+            held = await engine.connect()
+            waiter = asyncio.create_task(_connect())
+            await asyncio.sleep(0.1)
+            in_use = engine.pool.checkedout()
+            await held.close()
+            second = await waiter
+            await second.execute(text("SELECT 1"))
+            await second.close()
+            return in_use, engine.pool.stats
+        finally:
+            await engine.dispose()
+
+    in_use, stats = asyncio.run(_run())
+
+    assert in_use == 1
+    assert (stats.checkouts, stats.waits) == (2, 1)
+    assert stats.checkout_seconds_max >= 0.1
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import os
 import sqlite3
 from pathlib import Path
 
 import pytest
 
+from app.services import imessage_contact_service
 from app.services.imessage_contact_service import (
     IMessageContactResolver,
     format_contact_display_name,
@@ -17,6 +19,14 @@ def run(coro):
     return asyncio.run(coro)
 
 
+@pytest.fixture(autouse=True)
+def contacts_index_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    index_dir = tmp_path / "index"
+    monkeypatch.setattr(imessage_contact_service, "CONTACTS_INDEX_DIR", index_dir)
+    monkeypatch.setattr(imessage_contact_service, "_open_indexes", {})
+    return index_dir
+
+
 class DummySession:
     async def execute(self, *args, **kwargs):  # pragma: no cover - not used in these tests
         raise AssertionError("DummySession.execute should not be called in contact DB tests")
@@ -411,3 +421,73 @@ def test_contact_resolver_uses_nickname_or_organization_when_name_missing(tmp_pa
     by_identifier = {row.identifier: row for row in rows}
     assert by_identifier["+1 410 555 0101"].resolved_name == "Coach Mike"
     assert by_identifier["support@clubwptgold.com"].resolved_name == "ClubWPT Gold"
+
+
+def test_contacts_index_is_reused_without_reading_address_book(
+    tmp_path: Path, contacts_index_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "AddressBook-v22.abcddb"
+    _build_contacts_db(db_path)
+    run(IMessageContactResolver(DummySession(), contacts_db_path=db_path)._resolve_from_contacts(["owen@example.com"]))
+
+    def _fail(source_path: Path):
+        raise AssertionError("AddressBook should not be re-read while its mtime is unchanged")
+
+    monkeypatch.setattr(imessage_contact_service, "_read_address_book", _fail)
+    # A new process has no open handles and must find the compiled file on disk.
+    monkeypatch.setattr(imessage_contact_service, "_open_indexes", {})
+    rows = run(
+        IMessageContactResolver(DummySession(), contacts_db_path=db_path)._resolve_from_contacts(
+            ["owen@example.com", "301-555-1111"]
+        )
+    )
+
+    assert [row.resolved_name for row in rows] == ["Owen Lee", "Madelyn Smith"]
+    assert len(list(contacts_index_dir.glob("*.sqlite"))) == 1
+
+
+def test_contacts_index_rebuilds_when_address_book_changes(tmp_path: Path) -> None:
+    db_path = tmp_path / "AddressBook-v22.abcddb"
+    _build_contacts_db(db_path)
+    run(IMessageContactResolver(DummySession(), contacts_db_path=db_path)._resolve_from_contacts(["owen@example.com"]))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE ZABCDRECORD SET ZNAME = 'Owen Lee-Park' WHERE Z_PK = 2")
+    conn.commit()
+    conn.close()
+    stat = db_path.stat()
+    os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    rows = run(
+        IMessageContactResolver(DummySession(), contacts_db_path=db_path)._resolve_from_contacts(["owen@example.com"])
+    )
+
+    assert rows[0].resolved_name == "Owen Lee-Park"
+
+
+def test_stale_contacts_index_handles_are_closed(
+    tmp_path: Path, contacts_index_dir: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db_path = tmp_path / "AddressBook-v22.abcddb"
+    _build_contacts_db(db_path)
+    first = imessage_contact_service.open_contacts_index([db_path], contacts_index_dir)
+    stat = db_path.stat()
+    os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    opened: list[imessage_contact_service.ContactsIndex] = []
+    original = imessage_contact_service.ContactsIndex
+
+    class TrackingIndex(original):
+        def __init__(self, path: Path) -> None:
+            super().__init__(path)
+            opened.append(self)
+
+    monkeypatch.setattr(imessage_contact_service, "ContactsIndex", TrackingIndex)
+    second = imessage_contact_service.open_contacts_index([db_path], contacts_index_dir)
+
+    # The superseded handle and the rejected on-disk candidate are both closed.
+    rejected, rebuilt = opened
+    assert rebuilt is second
+    for stale in (first, rejected):
+        with pytest.raises(sqlite3.ProgrammingError):
+            stale.lookup("email", "owen@example.com")
+    assert second.lookup("email", "owen@example.com") is not None
@@ -10,6 +10,9 @@ from typing import Any
 import pytest
 from pydantic import BaseModel
 
+from app.clients import llm_gateway
+from app.clients.openai_client import OpenAIResponsesClient
+
 from app.services.imessage_processing_service import (
     DuplicateDecision,
     IMessageProcessingService,
@@ -2184,36 +2187,49 @@ class _RetryOutput(BaseModel):
 
 
 class _TransientModelError(Exception):
-    def __init__(self, status_code: int = 503, message: str = "503 UNAVAILABLE") -> None:
+    def __init__(self, status_code: int | None = 503, message: str = "503 UNAVAILABLE") -> None:
         super().__init__(message)
         self.status_code = status_code
 
 
 def test_call_model_retries_transient_errors(monkeypatch: pytest.MonkeyPatch) -> None:
     service = IMessageProcessingService(SimpleNamespace())
-    sleep_calls: list[int] = []
+    sleep_calls: list[float] = []
 
-    async def fake_sleep(delay: int) -> None:
+    async def fake_sleep(delay: float) -> None:
         sleep_calls.append(delay)
 
-    class FakeClient:
+    # Untyped failures the SDK surfaces: a bare status code, then message-only errors.
+    failures = [
+        _TransientModelError(),
+        _TransientModelError(status_code=None, message="Request timed out."),
+        _TransientModelError(status_code=None, message="Upstream model is overloaded"),
+    ]
+
+    class FakeResponses:
         def __init__(self) -> None:
             self.calls = 0
 
-        async def generate_json(self, prompt: str, *, response_model, temperature: float):
+        async def parse(self, **kwargs):
             self.calls += 1
-            if self.calls < 3:
-                raise _TransientModelError()
-            return SimpleNamespace(data=_RetryOutput(value="ok"))
+            if failures:
+                raise failures.pop(0)
+            return SimpleNamespace(output_parsed=_RetryOutput(value="ok"), output_text="", usage=None)
 
-    service.client = FakeClient()
-    monkeypatch.setattr("app.services.imessage_processing_service.asyncio.sleep", fake_sleep)
+    responses = FakeResponses()
+    service.client = OpenAIResponsesClient(
+        client=SimpleNamespace(responses=responses),
+        model_name="gpt-5-mini",
+        feature="imessage",
+    )
+    monkeypatch.setattr(llm_gateway, "_gateway", llm_gateway.LLMGateway(flush_interval_seconds=0))
+    monkeypatch.setattr("app.clients.llm_gateway.asyncio.sleep", fake_sleep)
 
     result = run(service._call_model("prompt", _RetryOutput))
 
     assert result.value == "ok"
-    assert service.client.calls == 3
-    assert sleep_calls == [1, 2]
+    assert responses.calls == 4
+    assert sleep_calls == [2.0, 4.0, 8.0]
 
 
 def test_call_model_does_not_retry_non_transient_errors(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -2625,3 +2641,73 @@ def test_extract_actions_sends_anonymized_payload_to_llm() -> None:
         assert "Bartholomew" not in prompt, "Real name 'Bartholomew' leaked to LLM prompt"
         assert "Fitzwilliam" not in prompt, "Real name 'Fitzwilliam' leaked to LLM prompt"
         assert "Contact" in prompt, "Expected anonymized Contact labels in LLM prompt"
+
+
+def test_pending_loader_pages_by_keyset_and_completes_the_trailing_conversation(count_queries) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db.models.base import Base
+    from app.db.models.imessage import IMessageConversation, IMessageMessage, IMessageParticipant
+    from app.services.imessage_processing_service import PendingCursor
+    from app.services.imessage_service import IMessageService
+
+    start = datetime(2026, 3, 2, 15, 0, tzinfo=timezone.utc)
+    texts = {
+        1: [(0, "Did you send the permit packet to the county?"), (1, "Sending the permit packet after lunch.")],
+        2: [
+            (2, "Dinner Friday at the taco place?"),
+            (3, "Friday dinner works, the taco place at seven."),
+            (4, "I'll book the taco place for Friday dinner."),
+            (5, "Booked dinner Friday at seven at the taco place."),
+        ],
+    }
+
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        tables = [IMessageConversation.__table__, IMessageParticipant.__table__, IMessageMessage.__table__]
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                for conversation_id in texts:
+                    session.add(
+                        IMessageConversation(id=conversation_id, user_id=1, source_guid=f"chat-{conversation_id}")
+                    )
+                for conversation_id, items in texts.items():
+                    for minute, text in items:
+                        session.add(
+                            IMessageMessage(
+                                id=minute + 1,
+                                user_id=1,
+                                conversation_id=conversation_id,
+                                source_guid=f"msg-{minute}",
+                                text=text,
+                                sent_at_utc=start + timedelta(minutes=minute),
+                                processed_at_utc=start if minute == 0 else None,
+                            )
+                        )
+                await session.commit()
+
+                service = IMessageProcessingService(session)
+                before = await IMessageService(session).estimate_unprocessed_messages(1)
+                with count_queries(engine) as queries:
+                    first = await service._load_pending_messages(user_id=1, max_messages=2)
+                first_cursor = service.pending_cursor
+                second = await service._load_pending_messages(user_id=1, max_messages=2, after=first_cursor)
+        finally:
+            await engine.dispose()
+        return before, first, first_cursor, second, queries
+
+    before, first, first_cursor, second, queries = run(_run())
+
+    assert before == 5
+    # The page is minutes 1-2 and ends in conversation 2, whose minutes 3-5 continue the cluster.
+    assert [message.id for message in first] == [2, 3, 4, 5, 6]
+    assert first_cursor == PendingCursor(sent_at_utc=first[1].sent_at_utc, message_id=3)
+    # Nothing was marked processed, so the next page starts after the cursor rather than re-reading.
+    assert [message.id for message in second] == [4, 5, 6]
+    assert all(message.conversation is not None for message in first + second)
+    # One statement for the page and its continuation, then one eager load each for
+    # conversations and participants, however many conversations the page spans.
+    assert queries.statements == 3
+    assert queries.repeated() == []
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+import sqlite3
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.imessage import IMessageConversation, IMessageMessage, IMessageParticipant, IMessageSyncRun
+from app.services.imessage_sync_engine import ChatDbReader, SourceBatch, read_ahead, sync_chat_db
+
+ATTRIBUTED_BLOB = (
+    b"streamtypedNSMutableAttributedStringNSString+CHello from attributed body"
+    b"NSDictionary__kIMMessagePartAttributeNameNSNumberNSValue"
+)
+
+
+class FakeContactResolver:
+    async def resolve_identifiers(self, *, user_id: int, identifiers) -> dict[str, str | None]:
+        return {"+15555550123": "Alice"}
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(IMessageConversation, IMessageParticipant, IMessageMessage, IMessageSyncRun)
+
+
+def _chat_db(path: Path, messages: list[tuple]) -> Path:
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE chat (ROWID INTEGER PRIMARY KEY, guid TEXT, chat_identifier TEXT, display_name TEXT, service_name TEXT);
+            CREATE TABLE handle (ROWID INTEGER PRIMARY KEY, id TEXT, service TEXT);
+            CREATE TABLE message (
+              ROWID INTEGER PRIMARY KEY, guid TEXT, service TEXT, handle_id INTEGER, is_from_me INTEGER,
+              text TEXT, attributedBody BLOB, cache_has_attachments INTEGER, associated_message_guid TEXT,
+              associated_message_type INTEGER, item_type INTEGER, date INTEGER, date_delivered INTEGER, date_read INTEGER
+            );
+            CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+            CREATE TABLE chat_handle_join (chat_id INTEGER, handle_id INTEGER);
+            INSERT INTO chat VALUES (1, 'chat-1', '+15555550123', NULL, 'iMessage');
+            INSERT INTO chat VALUES (2, 'chat-2', 'forest-fire', 'Forest Fire', 'iMessage');
+            INSERT INTO handle VALUES (1, '+15555550123', 'iMessage');
+            INSERT INTO handle VALUES (2, '+15555550123', 'SMS');
+            INSERT INTO handle VALUES (3, 'bob@example.com', 'iMessage');
+            INSERT INTO chat_handle_join VALUES (1, 1);
+            INSERT INTO chat_handle_join VALUES (2, 1);
+            INSERT INTO chat_handle_join VALUES (2, 2);
+            INSERT INTO chat_handle_join VALUES (2, 3);
+            """
+        )
+        for row_id, chat_id, text, blob in messages:
+            conn.execute(
+                "INSERT INTO message VALUES (?, ?, 'iMessage', 1, 0, ?, ?, 0, NULL, 0, 0, ?, NULL, NULL)",
+                (row_id, f"msg-{row_id}", text, blob, 788_918_400 + row_id),
+            )
+            conn.execute("INSERT INTO chat_message_join VALUES (?, ?)", (chat_id, row_id))
+        conn.commit()
+    finally:
+        conn.close()
+    return path
+
+
+def _run_record() -> IMessageSyncRun:
+    return IMessageSyncRun(user_id=1, status="running", started_at_utc=datetime.now(timezone.utc))
+
+
+def test_sync_copies_batches_and_resumes_from_last_row(session: AsyncSession, tmp_path: Path) -> None:
+    db_path = _chat_db(
+        tmp_path / "chat.db",
+        [(1, 1, "hey", None), (2, 2, None, ATTRIBUTED_BLOB), (3, 2, "dinner?", None), (4, 1, "ok", None)],
+    )
+
+    async def _run():
+        run = _run_record()
+        session.add(run)
+        last_row_id = await sync_chat_db(
+            session, run, ChatDbReader(db_path, batch_size=3), after_row_id=0, contact_resolver=FakeContactResolver()
+        )
+        resumed = _run_record()
+        session.add(resumed)
+        await sync_chat_db(
+            session, resumed, ChatDbReader(db_path, batch_size=3),
+            after_row_id=last_row_id, contact_resolver=FakeContactResolver(),
+        )
+        messages = (await session.execute(select(IMessageMessage).order_by(IMessageMessage.source_row_id))).scalars()
+        participants = (
+            await session.execute(select(IMessageParticipant.identifier).order_by(IMessageParticipant.identifier))
+        ).scalars()
+        conversations = (await session.execute(select(IMessageConversation.display_name))).scalars()
+        return run, resumed, last_row_id, list(messages), list(participants), sorted(conversations)
+
+    run, resumed, last_row_id, messages, participants, conversations = asyncio.run(_run())
+
+    assert last_row_id == 4
+    assert (run.messages_scanned, run.messages_upserted, run.conversations_upserted) == (4, 4, 3)
+    assert resumed.messages_scanned == 0
+    assert [message.text for message in messages] == ["hey", "Hello from attributed body", "dinner?", "ok"]
+    assert messages[1].raw_payload["content_source"] == "attributedBody"
+    assert messages[0].sender_label == "Alice"
+    # The SMS and iMessage handles for the same number collapse into one participant.
+    assert participants == ["+15555550123", "+15555550123", "bob@example.com"]
+    assert conversations == ["+15555550123", "Forest Fire"]
+
+
+def test_reader_stays_one_batch_ahead_of_the_writer() -> None:
+    reads: list[int] = []
+
+    class RecordingReader:
+        def iter_batches(self, after_row_id: int) -> Iterator[SourceBatch]:
+            for index in range(5):
+                reads.append(index)
+                yield SourceBatch(rows=[], participants={})
+
+    async def _run() -> list[int]:
+        in_flight = []
+        position = 0
+        async for _ in read_ahead(RecordingReader(), 0):
+            await asyncio.sleep(0.05)
+            in_flight.append(len(reads) - position)
+            position += 1
+        return in_flight
+
+    in_flight = asyncio.run(_run())
+
+    # While batch N is written, N + 1 has been read and nothing beyond it.
+    assert in_flight == [2, 2, 2, 2, 1]
+
+
+def test_reader_errors_surface_in_the_writer(session: AsyncSession, tmp_path: Path) -> None:
+    async def _run():
+        run = _run_record()
+        session.add(run)
+        await sync_chat_db(
+            session, run, ChatDbReader(tmp_path / "missing.db"), after_row_id=0, contact_resolver=FakeContactResolver()
+        )
+
+    with pytest.raises(FileNotFoundError):
+        asyncio.run(_run())
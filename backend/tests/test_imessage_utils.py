@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from datetime import UTC, timedelta
-import importlib.util
 from pathlib import Path
 import sqlite3
-import sys
+from types import SimpleNamespace
 
+import pytest
+
+from app.services import imessage_utils
+from app.services.imessage_sync_engine import ChatDbReader
 from app.services.imessage_utils import (
     ProjectCatalogEntry,
     apple_timestamp_to_datetime,
@@ -15,6 +18,7 @@ from app.services.imessage_utils import (
     extract_message_text,
     infer_project_match,
     looks_like_completion,
+    message_features,
     should_split_message_cluster,
 )
 
@@ -206,6 +210,35 @@ def test_should_split_message_cluster_keeps_same_topic_follow_up_together() -> N
     assert reason == "same_topic"
 
 
+def test_clustering_tokenizes_each_message_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+    original = imessage_utils.content_tokens
+
+    def counting_content_tokens(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(imessage_utils, "content_tokens", counting_content_tokens)
+    start = apple_timestamp_to_datetime(788_918_400)
+    messages = [
+        SimpleNamespace(sent_at_utc=start + timedelta(minutes=index), text=f"permit packet revision {index} for the county")
+        for index in range(30)
+    ]
+
+    batch: list[SimpleNamespace] = []
+    for message in messages:
+        should_split, _ = should_split_message_cluster(
+            batch, message, max_cluster_messages=50, max_cluster_gap=timedelta(hours=6)
+        )
+        batch = [message] if should_split else [*batch, message]
+
+    assert len(calls) == len(messages)
+
+    messages[0].text = "Switching gears, dinner on Friday?"
+    assert message_features(messages[0]).text == "Switching gears, dinner on Friday?"
+    assert len(calls) == len(messages) + 1
+
+
 def test_extract_attributed_body_text_recovers_human_message_content() -> None:
     blob = (
         b"streamtypedNSMutableAttributedStringNSString"
@@ -236,17 +269,7 @@ def test_extract_message_text_skips_reaction_style_rows() -> None:
     assert extracted is None
 
 
-def test_fetch_message_batch_reads_minimal_messages_schema(tmp_path: Path) -> None:
-    repo_root = Path(__file__).resolve().parents[2]
-    script_path = repo_root / "scripts" / "sync_imessage.py"
-    if str(repo_root / "backend") not in sys.path:
-        sys.path.insert(0, str(repo_root / "backend"))
-    spec = importlib.util.spec_from_file_location("sync_imessage", script_path)
-    assert spec and spec.loader
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["sync_imessage"] = module
-    spec.loader.exec_module(module)
-
+def test_chat_db_reader_reads_minimal_messages_schema(tmp_path: Path) -> None:
     db_path = tmp_path / "chat.db"
     conn = sqlite3.connect(db_path)
     try:
@@ -271,6 +294,7 @@ def test_fetch_message_batch_reads_minimal_messages_schema(tmp_path: Path) -> No
               date_read INTEGER
             );
             CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+            CREATE TABLE chat_handle_join (chat_id INTEGER, handle_id INTEGER);
             """
         )
         conn.execute(
@@ -304,19 +328,10 @@ def test_fetch_message_batch_reads_minimal_messages_schema(tmp_path: Path) -> No
     finally:
         conn.close()
 
-    source_conn = module.open_source_db(str(db_path))
-    try:
-        batch = module.fetch_message_batch(
-            source_conn,
-            after_row_id=0,
-            batch_size=10,
-            cutoff_utc=None,
-        )
-    finally:
-        source_conn.close()
+    batch = next(ChatDbReader(db_path, batch_size=10).iter_batches(0))
 
-    assert len(batch) == 1
-    row = batch[0]
+    assert len(batch.rows) == 1
+    row = batch.rows[0]
     assert row.chat_guid == "chat-1"
     assert row.message_guid == "msg-10"
     assert row.text == "Need to update the architecture doc."
@@ -325,17 +340,7 @@ def test_fetch_message_batch_reads_minimal_messages_schema(tmp_path: Path) -> No
     assert row.sent_at_utc.year == 2026
 
 
-def test_fetch_message_batch_extracts_attributed_body_when_text_is_missing(tmp_path: Path) -> None:
-    repo_root = Path(__file__).resolve().parents[2]
-    script_path = repo_root / "scripts" / "sync_imessage.py"
-    if str(repo_root / "backend") not in sys.path:
-        sys.path.insert(0, str(repo_root / "backend"))
-    spec = importlib.util.spec_from_file_location("sync_imessage", script_path)
-    assert spec and spec.loader
-    module = importlib.util.module_from_spec(spec)
-    sys.modules["sync_imessage"] = module
-    spec.loader.exec_module(module)
-
+def test_chat_db_reader_extracts_attributed_body_when_text_is_missing(tmp_path: Path) -> None:
     db_path = tmp_path / "chat.db"
     conn = sqlite3.connect(db_path)
     try:
@@ -360,6 +365,7 @@ def test_fetch_message_batch_extracts_attributed_body_when_text_is_missing(tmp_p
               date_read INTEGER
             );
             CREATE TABLE chat_message_join (chat_id INTEGER, message_id INTEGER);
+            CREATE TABLE chat_handle_join (chat_id INTEGER, handle_id INTEGER);
             """
         )
         conn.execute(
@@ -393,19 +399,10 @@ def test_fetch_message_batch_extracts_attributed_body_when_text_is_missing(tmp_p
     finally:
         conn.close()
 
-    source_conn = module.open_source_db(str(db_path))
-    try:
-        batch = module.fetch_message_batch(
-            source_conn,
-            after_row_id=0,
-            batch_size=10,
-            cutoff_utc=None,
-        )
-    finally:
-        source_conn.close()
+    batch = next(ChatDbReader(db_path, batch_size=10).iter_batches(0))
 
-    assert len(batch) == 1
-    row = batch[0]
+    assert len(batch.rows) == 1
+    row = batch.rows[0]
     assert row.text == "Hello from attributed body"
     assert row.content_source == "attributedBody"
 
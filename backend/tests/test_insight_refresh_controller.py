@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+
+from app.workers import tasks
+from app.utils.timezone import eastern_today
+from app.workers.tasks import InsightRefreshController
+
+
+class _FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+
+def _install_fake_service(
+    monkeypatch, *, fail: bool = False, fallback: bool = False, delay: float = 0.02
+) -> list[tuple[int, date]]:
+    calls: list[tuple[int, date]] = []
+
+    class FakeInsightService:
+        def __init__(self, session) -> None:
+            self.session = session
+            self.llm_failed = False
+
+        async def refresh_daily_insight(self, user_id: int, metric_date: date | None = None):
+            calls.append((user_id, metric_date))
+            await asyncio.sleep(delay)
+            if fail:
+                raise RuntimeError("llm down")
+            self.llm_failed = fallback
+
+    monkeypatch.setattr(tasks, "AsyncSessionLocal", _FakeSession)
+    monkeypatch.setattr(tasks, "InsightService", FakeInsightService)
+    return calls
+
+
+def _controller(**kwargs) -> InsightRefreshController:
+    kwargs.setdefault("cooldown", timedelta(minutes=5))
+    kwargs.setdefault("failure_cooldown", timedelta(minutes=15))
+    return InsightRefreshController(**kwargs)
+
+
+def test_concurrent_requests_share_one_refresh(monkeypatch) -> None:
+    calls = _install_fake_service(monkeypatch)
+    controller = _controller()
+    day = eastern_today()
+
+    async def _run():
+        statuses = await asyncio.gather(
+            *[controller.request_refresh(user_id=1, metric_date=day) for _ in range(5)]
+        )
+        await controller.run(user_id=1, metric_date=day)
+        return statuses
+
+    statuses = asyncio.run(_run())
+
+    assert calls == [(1, day)]
+    assert sum(status.job_started for status in statuses) == 1
+    assert all(status.running for status in statuses)
+    # Four duplicate requests plus ``run`` attaching to the in-flight refresh.
+    assert controller.suppressed_refreshes == 5
+
+
+def test_keys_are_per_user_and_date(monkeypatch) -> None:
+    calls = _install_fake_service(monkeypatch)
+    controller = _controller()
+    day = eastern_today()
+
+    async def _run():
+        await controller.request_refresh(user_id=1, metric_date=day)
+        await controller.request_refresh(user_id=2, metric_date=day)
+        await asyncio.gather(
+            controller.run(user_id=1, metric_date=day),
+            controller.run(user_id=2, metric_date=day),
+        )
+
+    asyncio.run(_run())
+
+    assert sorted(calls) == [(1, day), (2, day)]
+
+
+def test_failure_starts_cooldown(monkeypatch) -> None:
+    calls = _install_fake_service(monkeypatch, fail=True, delay=0)
+    controller = _controller()
+    day = eastern_today()
+
+    async def _run():
+        await controller.request_refresh(user_id=1, metric_date=day)
+        await controller.run(user_id=1, metric_date=day)
+        return await controller.request_refresh(user_id=1, metric_date=day)
+
+    status = asyncio.run(_run())
+
+    assert len(calls) == 1
+    assert status.job_started is False
+    assert status.running is False
+    assert status.last_error == "llm down"
+    assert status.cooldown_seconds == 15 * 60
+    assert status.message == "Waiting for cooldown window."
+
+
+def test_stored_fallback_starts_failure_cooldown(monkeypatch) -> None:
+    calls = _install_fake_service(monkeypatch, fallback=True, delay=0)
+    controller = _controller()
+    day = eastern_today()
+
+    async def _run():
+        await controller.run(user_id=1, metric_date=day)
+        return await controller.request_refresh(user_id=1, metric_date=day)
+
+    status = asyncio.run(_run())
+
+    assert len(calls) == 1
+    assert status.job_started is False
+    assert status.last_error is not None
+    assert status.cooldown_seconds == 15 * 60
+    assert status.next_allowed_at - status.last_completed_at == timedelta(minutes=15)
+
+
+def test_run_ignores_cooldown_after_new_data(monkeypatch) -> None:
+    calls = _install_fake_service(monkeypatch, delay=0)
+    controller = _controller()
+    day = eastern_today()
+
+    async def _run():
+        await controller.run(user_id=1, metric_date=day)
+        await controller.run(user_id=1, metric_date=day)
+
+    asyncio.run(_run())
+
+    assert len(calls) == 2
+
+
+def test_past_dates_are_pruned(monkeypatch) -> None:
+    _install_fake_service(monkeypatch, delay=0)
+    controller = _controller()
+    old_day = eastern_today() - timedelta(days=3)
+
+    async def _run():
+        await controller.run(user_id=1, metric_date=old_day)
+        await controller.request_refresh(user_id=1)
+
+    asyncio.run(_run())
+
+    assert (1, old_day) not in controller._entries
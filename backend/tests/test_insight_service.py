@@ -589,6 +589,8 @@ class TestRefreshDailyInsight:
             prompt="old prompt",
             tokens_used=100,
             updated_at=None,
+            input_fingerprint=None,
+            context_fingerprint=None,
         )
 
         class FakeSession:
@@ -619,6 +621,7 @@ class TestRefreshDailyInsight:
         result = run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
         assert result.response_text == '{"greeting": "Existing"}'
         assert result.readiness_score == 70
+        assert svc.llm_failed is True
 
     def test_updates_existing_insight(self):
         svc = make_service()
@@ -633,6 +636,8 @@ class TestRefreshDailyInsight:
             prompt="old",
             tokens_used=100,
             updated_at=None,
+            input_fingerprint=None,
+            context_fingerprint=None,
         )
 
         added = []
@@ -704,6 +709,114 @@ class TestRefreshDailyInsight:
         assert insight_added[0].readiness_score == 74
 
 
+class TestInsightFingerprint:
+    def _service(self, metric, existing_insight, life_context, responses):
+        svc = make_service()
+        prompts: list[tuple[str, int]] = []
+        commits: list[bool] = []
+
+        class FakeSession:
+            async def execute(self, stmt):
+                return SimpleNamespace(
+                    scalar_one_or_none=lambda: metric,
+                    scalars=lambda: SimpleNamespace(all=lambda: [metric]),
+                )
+
+            def add(self, obj):
+                pass
+
+            async def commit(self):
+                commits.append(True)
+
+        class FakeClient:
+            async def generate_json(self, prompt, response_model=None, temperature=None, max_output_tokens=None):
+                prompts.append((prompt, max_output_tokens))
+                return SimpleNamespace(data=responses.pop(0), total_tokens=100)
+
+        async def fake_fetch_insight(user_id, metric_date):
+            return existing_insight
+
+        async def fake_life_context(user_id, metric_date):
+            return life_context
+
+        svc.session = FakeSession()
+        svc._client = FakeClient()
+        svc._fetch_insight = fake_fetch_insight
+        svc._gather_life_context = fake_life_context
+        return svc, prompts, commits
+
+    def _existing(self):
+        return SimpleNamespace(
+            id=7,
+            response_text="",
+            readiness_score=None,
+            model_name=None,
+            prompt=None,
+            tokens_used=None,
+            updated_at=None,
+            input_fingerprint=None,
+            context_fingerprint=None,
+        )
+
+    def test_unchanged_inputs_skip_the_model(self):
+        metric = make_metric()
+        existing = self._existing()
+        context = {"todos": {"total_active": 3, "completed": 1, "overdue": 0}}
+        first = ReadinessInsightOutput.model_validate(SAMPLE_STRUCTURED)
+        svc, prompts, commits = self._service(metric, existing, context, [first])
+
+        run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+        result = run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+
+        assert result is existing
+        assert len(prompts) == 1
+        assert len(commits) == 1
+        assert existing.input_fingerprint is not None
+
+    def test_context_change_uses_delta_prompt_and_keeps_core_pillars(self):
+        metric = make_metric()
+        existing = self._existing()
+        context = {"todos": {"total_active": 3, "completed": 1, "overdue": 0}}
+        first = ReadinessInsightOutput.model_validate(SAMPLE_STRUCTURED)
+        delta = ReadinessInsightOutput.model_validate(
+            {
+                **SAMPLE_STRUCTURED,
+                "hrv": {"score": 1.0, "insight": "rewritten"},
+                "productivity": {"score": 3.0, "insight": "Backlog is piling up."},
+                "overall_readiness": {"score_100": 65, "label": "Ready with Caution", "insight": "Busy day."},
+            }
+        )
+        svc, prompts, commits = self._service(metric, existing, context, [first, delta])
+
+        run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+        context["todos"] = {"total_active": 12, "completed": 1, "overdue": 8}
+        run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+
+        delta_prompt, delta_budget = prompts[1]
+        assert "Previous assessment" in delta_prompt
+        assert "HRV_MS_SERIES" not in delta_prompt
+        assert delta_budget < prompts[0][1]
+        stored = json.loads(existing.response_text)
+        assert stored["hrv"] == SAMPLE_STRUCTURED["hrv"]
+        assert stored["productivity"]["score"] == 3.0
+        assert existing.readiness_score == 65
+        assert len(commits) == 2
+
+    def test_metric_change_regenerates_in_full(self):
+        metric = make_metric()
+        existing = self._existing()
+        first = ReadinessInsightOutput.model_validate(SAMPLE_STRUCTURED)
+        second = ReadinessInsightOutput.model_validate(SAMPLE_STRUCTURED)
+        svc, prompts, _ = self._service(metric, existing, {}, [first, second])
+
+        run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+        metric.hrv_avg_ms = 40.0
+        run(svc.refresh_daily_insight(1, date(2026, 3, 18)))
+
+        assert len(prompts) == 2
+        assert "HRV_MS_SERIES" in prompts[1][0]
+
+
 # ---------------------------------------------------------------------------
 # Tests: fetch_latest_completed_metric (backfill)
 # ---------------------------------------------------------------------------
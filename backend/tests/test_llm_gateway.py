@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from openai import RateLimitError
+
+from app.clients import llm_gateway
+from app.clients.llm_gateway import FeaturePolicy, LLMGateway, estimate_cost
+
+
+def _usage_response(text: str = "ok", input_tokens: int = 100, output_tokens: int = 20):
+    return SimpleNamespace(
+        output_text=text,
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens, total_tokens=input_tokens + output_tokens),
+    )
+
+
+def _rate_limit_error() -> RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+    response = httpx.Response(429, request=request, headers={"retry-after": "0"})
+    return RateLimitError("rate limited", response=response, body=None)
+
+
+def _gateway(**kwargs) -> LLMGateway:
+    kwargs.setdefault("flush_interval_seconds", 0)
+    return LLMGateway(**kwargs)
+
+
+def test_identical_inflight_calls_share_one_request() -> None:
+    gateway = _gateway(max_concurrency=4, interactive_reserved=0)
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _usage_response()
+
+    async def _run():
+        return await asyncio.gather(
+            *[gateway.call(create, feature="news", model="gpt-4o-mini", input="same") for _ in range(5)]
+        )
+
+    results = asyncio.run(_run())
+
+    assert calls == 1
+    assert all(result is results[0] for result in results)
+    totals = gateway.snapshot()["news:gpt-4o-mini"]
+    assert totals["calls"] == 1
+    assert totals["coalesced"] == 4
+
+
+def test_coalescing_can_be_disabled() -> None:
+    gateway = _gateway()
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return _usage_response()
+
+    async def _run():
+        await asyncio.gather(
+            *[gateway.call(create, model="m", input="same", coalesce=False) for _ in range(3)]
+        )
+
+    asyncio.run(_run())
+    assert calls == 3
+
+
+def test_cancelled_leader_does_not_cancel_coalesced_followers() -> None:
+    gateway = _gateway()
+    calls = 0
+
+    async def create(**kwargs):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return _usage_response(text=f"call {calls}")
+
+    async def _run():
+        leader = asyncio.create_task(gateway.call(create, model="m", input="same"))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(gateway.call(create, model="m", input="same")) for _ in range(2)]
+        await asyncio.sleep(0.005)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return results
+
+    results = asyncio.run(_run())
+
+    # The first follower re-issued the call and the second shared it.
+    assert [result.output_text for result in results] == ["call 2", "call 2"]
+    assert calls == 2
+
+
+def test_background_features_cannot_take_reserved_slots() -> None:
+    gateway = _gateway(
+        max_concurrency=3,
+        interactive_reserved=1,
+        policies={
+            "chat": FeaturePolicy(max_concurrency=3, interactive=True),
+            "imessage": FeaturePolicy(max_concurrency=5),
+        },
+    )
+    running = {"imessage": 0, "chat": 0}
+    peak = {"imessage": 0, "chat": 0}
+
+    def _make(feature: str):
+        async def create(**kwargs):
+            running[feature] += 1
+            peak[feature] = max(peak[feature], running[feature])
+            await asyncio.sleep(0.02)
+            running[feature] -= 1
+            return _usage_response()
+
+        return create
+
+    async def _run():
+        background = [
+            gateway.call(_make("imessage"), feature="imessage", model="m", input=str(i)) for i in range(6)
+        ]
+        chat = [gateway.call(_make("chat"), feature="chat", model="m", input=str(i)) for i in range(2)]
+        await asyncio.gather(*background, *chat)
+
+    asyncio.run(_run())
+
+    assert peak["imessage"] == 2
+    assert peak["chat"] >= 1
+
+
+def test_stream_holds_its_slot_until_the_block_exits() -> None:
+    gateway = _gateway(policies={"chat": FeaturePolicy(max_concurrency=1, interactive=True)})
+    opened: list[str] = []
+
+    async def create(**kwargs):
+        opened.append(kwargs["input"])
+
+        async def _events():
+            yield "delta"
+
+        return _events()
+
+    async def _run():
+        async with gateway.stream(create, feature="chat", model="m", input="first") as stream:
+            second = asyncio.create_task(_open_second())
+            await asyncio.sleep(0.01)
+            # The first stream is still being read, so the second cannot open yet.
+            assert opened == ["first"]
+            assert [event async for event in stream] == ["delta"]
+        await second
+
+    async def _open_second():
+        async with gateway.stream(create, feature="chat", model="m", input="second"):
+            pass
+
+    asyncio.run(_run())
+    assert opened == ["first", "second"]
+
+
+def test_stream_is_closed_when_the_consumer_stops_early() -> None:
+    gateway = _gateway()
+
+    class FakeStream:
+        closed = False
+
+        def __aiter__(self):
+            return self
+
+        async def __anext__(self):
+            return "delta"
+
+        async def close(self) -> None:
+            self.closed = True
+
+    stream = FakeStream()
+
+    async def create(**kwargs):
+        return stream
+
+    async def _run():
+        async with gateway.stream(create, model="m", input="x") as opened:
+            async for _event in opened:
+                break
+
+    asyncio.run(_run())
+    assert stream.closed
+
+
+def test_rate_limit_backs_off_and_retries(monkeypatch) -> None:
+    gateway = _gateway()
+    sleeps: list[float] = []
+    real_sleep = asyncio.sleep
+
+    async def _fake_sleep(delay):
+        sleeps.append(delay)
+        await real_sleep(0)
+
+    monkeypatch.setattr(llm_gateway.asyncio, "sleep", _fake_sleep)
+    attempts = 0
+
+    async def create(**kwargs):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise _rate_limit_error()
+        return _usage_response()
+
+    result = asyncio.run(gateway.call(create, feature="journal", model="gpt-5-mini", input="x"))
+
+    assert result.output_text == "ok"
+    assert attempts == 2
+    assert sleeps and sleeps[0] > 0
+    totals = gateway.snapshot()["journal:gpt-5-mini"]
+    assert totals["rate_limited"] == 1
+    assert totals["errors"] == 1
+    assert totals["calls"] == 2
+
+
+def test_non_retryable_errors_propagate_to_every_waiter() -> None:
+    gateway = _gateway()
+
+    async def create(**kwargs):
+        await asyncio.sleep(0.01)
+        raise ValueError("bad request")
+
+    async def _run():
+        return await asyncio.gather(
+            *[gateway.call(create, model="m", input="same") for _ in range(2)],
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(_run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_usage_counts_tokens_and_cost() -> None:
+    gateway = _gateway()
+
+    async def create(**kwargs):
+        return _usage_response(input_tokens=1_000_000, output_tokens=1_000_000)
+
+    asyncio.run(gateway.call(create, feature="insights", model="gpt-4o-mini", input="x"))
+
+    totals = gateway.snapshot()["insights:gpt-4o-mini"]
+    assert totals["input_tokens"] == 1_000_000
+    assert totals["output_tokens"] == 1_000_000
+    assert totals["cost_usd"] == pytest.approx(0.75)
+    assert estimate_cost("unknown-model", 10, 10) == 0.0
+    # Longest prefix wins: gpt-5-mini is not priced as gpt-5.
+    assert estimate_cost("gpt-5-mini-2025", 1_000_000, 0) == pytest.approx(0.25)
+
+
+class _FakeSession:
+    def __init__(self, fail: bool = False) -> None:
+        self.fail = fail
+        self.statements: list = []
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def execute(self, stmt):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.statements.append(stmt)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_flush_writes_pending_rows_once() -> None:
+    session = _FakeSession()
+    gateway = _gateway(session_factory=lambda: session)
+
+    async def create(**kwargs):
+        return _usage_response()
+
+    async def _run():
+        await gateway.call(create, feature="chat", model="gpt-5-mini", input="a")
+        await gateway.call(create, feature="chat", model="gpt-5-mini", input="b")
+        first = await gateway.flush()
+        second = await gateway.flush()
+        return first, second
+
+    first, second = asyncio.run(_run())
+
+    assert (first, second) == (1, 0)
+    assert len(session.statements) == 1
+    assert session.commits == 1
+
+
+def test_failed_flush_keeps_rows_for_next_attempt() -> None:
+    session = _FakeSession(fail=True)
+    gateway = _gateway(session_factory=lambda: session)
+
+    async def create(**kwargs):
+        return _usage_response()
+
+    async def _run():
+        await gateway.call(create, feature="chat", model="gpt-5-mini", input="a")
+        failed = await gateway.flush()
+        session.fail = False
+        retried = await gateway.flush()
+        return failed, retried
+
+    assert asyncio.run(_run()) == (0, 1)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.db.models.base import Base
+from app.db.models.entities import DailyMetric, MetricRollup, ReadinessInsight
+from app.db.repositories.metrics_repository import MetricsRepository
+from app.utils.downsampling import lttb_indices
+from app.utils.metric_rollups import (
+    PERIOD_MONTH,
+    PERIOD_WEEK,
+    affected_periods,
+    build_rollups,
+    period_end,
+    period_start,
+)
+
+
+def _row(day: date, *, hrv: float | None = 60.0, sleep_seconds: int | None = 8 * 3600):
+    return SimpleNamespace(
+        metric_date=day,
+        hrv_avg_ms=hrv,
+        rhr_bpm=50.0,
+        sleep_seconds=sleep_seconds,
+        training_load=None,
+    )
+
+
+def test_period_boundaries() -> None:
+    wednesday = date(2026, 2, 4)
+
+    assert period_start(wednesday, PERIOD_WEEK) == date(2026, 2, 2)
+    assert period_end(date(2026, 2, 2), PERIOD_WEEK) == date(2026, 2, 8)
+    assert period_start(wednesday, PERIOD_MONTH) == date(2026, 2, 1)
+    assert period_end(date(2026, 2, 1), PERIOD_MONTH) == date(2026, 2, 28)
+    assert period_end(date(2026, 12, 1), PERIOD_MONTH) == date(2026, 12, 31)
+
+
+def test_affected_periods_cover_week_and_month_of_each_day() -> None:
+    periods = affected_periods([date(2026, 3, 31), date(2026, 4, 1)])
+
+    assert periods[PERIOD_WEEK] == {date(2026, 3, 30)}
+    assert periods[PERIOD_MONTH] == {date(2026, 3, 1), date(2026, 4, 1)}
+
+
+def test_build_rollups_aggregates_only_requested_periods() -> None:
+    week = date(2026, 2, 2)
+    rows = [
+        _row(week, hrv=50.0),
+        _row(week + timedelta(days=1), hrv=70.0, sleep_seconds=None),
+        _row(week + timedelta(days=7), hrv=90.0),
+    ]
+
+    records = build_rollups(1, rows, {PERIOD_WEEK: {week}})
+    by_metric = {record["metric"]: record for record in records}
+
+    assert {record["period_start"] for record in records} == {week}
+    assert by_metric["hrv_avg_ms"]["sample_count"] == 2
+    assert by_metric["hrv_avg_ms"]["avg_value"] == 60.0
+    assert by_metric["hrv_avg_ms"]["min_value"] == 50.0
+    assert by_metric["hrv_avg_ms"]["max_value"] == 70.0
+    assert by_metric["sleep_hours"]["sample_count"] == 1
+    assert by_metric["sleep_hours"]["sum_value"] == 8.0
+    # Metrics without samples still get a row so stale values are cleared.
+    assert by_metric["training_load"]["sample_count"] == 0
+    assert by_metric["training_load"]["avg_value"] is None
+
+
+def test_refresh_rollups_upserts_on_sqlite() -> None:
+    week = date(2026, 2, 2)
+
+    async def _run() -> dict[str, MetricRollup]:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        try:
+            async with engine.begin() as conn:
+                tables = [ReadinessInsight.__table__, DailyMetric.__table__, MetricRollup.__table__]
+                await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                repo = MetricsRepository(session)
+                session.add(DailyMetric(user_id=1, metric_date=week, hrv_avg_ms=50.0))
+                await session.flush()
+                await repo.refresh_rollups(1, [week])
+                session.add(DailyMetric(user_id=1, metric_date=week + timedelta(days=1), hrv_avg_ms=70.0))
+                await session.flush()
+                await repo.refresh_rollups(1, [week + timedelta(days=1)])
+                rows = (
+                    await session.execute(select(MetricRollup).where(MetricRollup.metric == "hrv_avg_ms"))
+                ).scalars()
+                return {row.period: row for row in rows}
+        finally:
+            await engine.dispose()
+
+    rollups = asyncio.run(_run())
+
+    assert set(rollups) == {PERIOD_WEEK, PERIOD_MONTH}
+    assert rollups[PERIOD_WEEK].sample_count == 2
+    assert rollups[PERIOD_WEEK].avg_value == 60.0
+
+
+def test_lttb_keeps_endpoints_and_extremes() -> None:
+    points = [(float(i), 0.0) for i in range(100)]
+    points[40] = (40.0, 100.0)
+
+    keep = lttb_indices(points, 10)
+
+    assert len(keep) == 10
+    assert keep[0] == 0 and keep[-1] == 99
+    assert 40 in keep
+    assert keep == sorted(keep)
+
+
+def test_lttb_returns_everything_under_threshold() -> None:
+    points = [(float(i), float(i)) for i in range(5)]
+
+    assert lttb_indices(points, 10) == [0, 1, 2, 3, 4]
+    assert lttb_indices(points, 2) == [0, 1, 2, 3, 4]
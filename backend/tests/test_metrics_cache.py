@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import pytest
+
+from app.core.auth import get_current_user
+from app.db.session import get_session
+from app.routers import metrics as metrics_router
+from app.services import metrics_cache
+from app.services.metrics_cache import InMemoryMetricsCacheBackend, MetricsCache, etag_matches
+from app.utils.timezone import eastern_today
+
+
+def _metric(days_ago: int, hrv: float = 60.0):
+    return SimpleNamespace(
+        metric_date=eastern_today() - timedelta(days=days_ago),
+        hrv_avg_ms=hrv,
+        rhr_bpm=50.0,
+        sleep_seconds=8 * 3600,
+        training_load=40.0,
+        training_volume_seconds=3600,
+        readiness_score=70,
+        readiness_label="Ready",
+        readiness_narrative=None,
+    )
+
+
+class FakeMetricsRepository:
+    records: list = []
+    calls = 0
+
+    def __init__(self, session) -> None:  # noqa: ANN001
+        self.session = session
+
+    async def list_metrics_since(self, user_id: int, cutoff):  # noqa: ANN001
+        FakeMetricsRepository.calls += 1
+        return [r for r in self.records if r.metric_date >= cutoff]
+
+    async def list_metrics_between(self, user_id: int, start, end):  # noqa: ANN001
+        FakeMetricsRepository.calls += 1
+        return [r for r in self.records if start <= r.metric_date <= end]
+
+    async def get_latest_metric(self, user_id: int):
+        FakeMetricsRepository.calls += 1
+        return max(self.records, key=lambda r: r.metric_date) if self.records else None
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> MetricsCache:
+    instance = MetricsCache(InMemoryMetricsCacheBackend())
+    monkeypatch.setattr(metrics_cache, "_metrics_cache", instance)
+    monkeypatch.setattr(metrics_router, "MetricsRepository", FakeMetricsRepository)
+    FakeMetricsRepository.records = [_metric(1), _metric(0, hrv=65.0)]
+    FakeMetricsRepository.calls = 0
+    return instance
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(metrics_router.router, prefix="/api")
+
+    async def override_get_session():
+        yield SimpleNamespace()
+
+    async def override_get_current_user():
+        return SimpleNamespace(id=1)
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_current_user] = override_get_current_user
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["/api/metrics/overview", "/api/metrics/daily", "/api/metrics/readiness-summary"],
+)
+def test_endpoints_are_cached_until_version_bump(cache: MetricsCache, client: TestClient, path: str) -> None:
+    first = client.get(path)
+    calls_after_first = FakeMetricsRepository.calls
+    second = client.get(path)
+
+    assert first.status_code == 200
+    assert second.json() == first.json()
+    assert FakeMetricsRepository.calls == calls_after_first
+    assert first.headers["etag"] == second.headers["etag"]
+
+    asyncio.run(cache.bump(1))
+    third = client.get(path)
+
+    assert FakeMetricsRepository.calls > calls_after_first
+    assert third.headers["etag"] != first.headers["etag"]
+
+
+def test_if_none_match_returns_304_without_querying(cache: MetricsCache, client: TestClient) -> None:
+    first = client.get("/api/metrics/daily", params={"range_days": 7})
+    calls = FakeMetricsRepository.calls
+
+    revalidated = client.get(
+        "/api/metrics/daily",
+        params={"range_days": 7},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert FakeMetricsRepository.calls == calls
+
+
+def test_query_params_are_part_of_the_key(cache: MetricsCache, client: TestClient) -> None:
+    short = client.get("/api/metrics/daily", params={"range_days": 1})
+    long = client.get("/api/metrics/daily", params={"range_days": 7})
+
+    assert len(short.json()) == 1
+    assert len(long.json()) == 2
+    assert short.headers["etag"] != long.headers["etag"]
+
+
+def test_missing_metrics_still_404(cache: MetricsCache, client: TestClient) -> None:
+    FakeMetricsRepository.records = []
+    response = client.get("/api/metrics/readiness-summary")
+    assert response.status_code == 404
+
+
+def test_in_memory_backend_expires_and_evicts() -> None:
+    backend = InMemoryMetricsCacheBackend(max_entries=2)
+
+    async def _run():
+        await backend.set("a", "1", ttl_seconds=60)
+        await backend.set("b", "2", ttl_seconds=60)
+        await backend.get("a")
+        await backend.set("c", "3", ttl_seconds=60)
+        evicted = [await backend.get(key) for key in ("a", "b", "c")]
+        await backend.set("d", "4", ttl_seconds=0)
+        return evicted, await backend.get("d")
+
+    evicted, expired = asyncio.run(_run())
+    assert evicted == ["1", None, "3"]
+    assert expired is None
+
+
+def test_etag_matching_handles_lists_and_weak_tags() -> None:
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"xyz"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_long_overview_reads_weekly_rollups(
+    cache: MetricsCache, client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    week = eastern_today() - timedelta(days=eastern_today().weekday())
+    rollups = [
+        SimpleNamespace(period_start=week - timedelta(days=7 * i), metric=metric, avg_value=float(i))
+        for i in range(20)
+        for metric in ("hrv_avg_ms", "rhr_bpm", "sleep_hours", "training_load")
+    ]
+    rollups.sort(key=lambda r: r.period_start)
+
+    async def list_rollups(self, user_id: int, period: str, start):  # noqa: ANN001
+        assert period == "week"
+        return [r for r in rollups if r.period_start >= start - timedelta(days=6)]
+
+    async def summarize_range(self, user_id: int, start):  # noqa: ANN001
+        return 100, 360_000, 4_000.0
+
+    async def fail_list(self, user_id: int, cutoff):  # noqa: ANN001
+        raise AssertionError("long ranges must not load daily rows")
+
+    monkeypatch.setattr(FakeMetricsRepository, "list_rollups", list_rollups, raising=False)
+    monkeypatch.setattr(FakeMetricsRepository, "summarize_range", summarize_range, raising=False)
+    monkeypatch.setattr(FakeMetricsRepository, "list_metrics_since", fail_list)
+
+    body = client.get("/api/metrics/overview", params={"range_days": 120, "max_points": 5}).json()
+
+    assert body["training_volume_hours"] == 100.0
+    assert body["training_load_avg"] == 40.0
+    assert len(body["hrv_trend_ms"]) == 5
+    assert body["hrv_trend_ms"][-1]["value"] == 0.0
+
+
+def test_daily_max_points_returns_rollup_rows(
+    cache: MetricsCache, client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    periods: list[str] = []
+
+    async def list_rollups(self, user_id: int, period: str, start):  # noqa: ANN001
+        periods.append(period)
+        return [
+            SimpleNamespace(period_start=start, metric="hrv_avg_ms", avg_value=61.0),
+            SimpleNamespace(period_start=start, metric="rhr_bpm", avg_value=49.0),
+        ]
+
+    monkeypatch.setattr(FakeMetricsRepository, "list_rollups", list_rollups, raising=False)
+
+    weekly = client.get("/api/metrics/daily", params={"range_days": 90, "max_points": 20}).json()
+    monthly = client.get("/api/metrics/daily", params={"range_days": 365, "max_points": 20}).json()
+
+    assert periods == ["week", "month"]
+    assert weekly[0]["hrv_avg_ms"] == 61.0
+    assert weekly[0]["readiness_score"] is None
+    assert len(monthly) == 1
+
+
+def test_daily_max_points_caps_monthly_rows(
+    cache: MetricsCache, client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def list_rollups(self, user_id: int, period: str, start):  # noqa: ANN001
+        assert period == "month"
+        return [
+            SimpleNamespace(period_start=start + timedelta(days=31 * i), metric="hrv_avg_ms", avg_value=float(i))
+            for i in range(13)
+        ]
+
+    monkeypatch.setattr(FakeMetricsRepository, "list_rollups", list_rollups, raising=False)
+
+    rows = client.get("/api/metrics/daily", params={"range_days": 365, "max_points": 5}).json()
+
+    assert [row["hrv_avg_ms"] for row in rows] == [0.0, 3.0, 6.0, 9.0, 12.0]
@@ -17,6 +17,7 @@ from app.schemas.llm_outputs import (
     AssistantRouterOutput,
     AssistantToolCallOutput,
 )
+from app.services.conversation_memory import ConversationMemory
 from app.services.monet_assistant import (
     MonetAssistantAgent,
     MonetToolRegistry,
@@ -35,6 +36,17 @@ def _run(coro):
 
 # ── Fixtures ──────────────────────────────────────────────────────────────
 
+class FakeConversationRepository:
+    async def get(self, namespace: str, session_key: str, *, user_id: int):
+        return None
+
+    async def create(self, namespace: str, session_key: str, **fields: Any) -> int:
+        return 1
+
+    async def update(self, namespace: str, session_key: str, *, expected_version: int, **fields: Any) -> int:
+        return expected_version + 1
+
+
 @pytest.fixture
 def mock_session():
     session = AsyncMock()
@@ -47,12 +59,12 @@ def mock_session():
 def agent(mock_session, monkeypatch):
     mock_client = MagicMock()
     mock_context_builder = MagicMock()
-    monkeypatch.setattr("app.services.monet_assistant.get_shared_openai_client", lambda: MagicMock())
     monkeypatch.setattr("app.services.monet_assistant.OpenAIResponsesClient", lambda **kwargs: mock_client)
-    monkeypatch.setattr("app.services.monet_assistant.MonetContextBuilder", lambda session: mock_context_builder)
+    monkeypatch.setattr("app.services.monet_assistant.MonetContextBuilder", lambda *args, **kwargs: mock_context_builder)
     a = MonetAssistantAgent(mock_session)
     a.client = mock_client
     a.context_builder = mock_context_builder
+    a.memory = ConversationMemory(summarizer=None, repository_factory=lambda session: FakeConversationRepository())
     return a
 
 
@@ -359,6 +371,23 @@ class TestRespondFullFlow:
         result = _run(agent.respond(user_id=1, message="hi", session_id="my-session-123"))
         assert result.session_id == "my-session-123"
 
+    def test_follow_up_turn_sees_earlier_conversation(self, agent):
+        agent.context_builder.build_context = AsyncMock(return_value={})
+        agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
+            data=AssistantRouterOutput(reply_mode="respond_only", narrative_intent=".", tool_calls=[])
+        ))
+        agent.client.generate_text = AsyncMock(return_value=SimpleNamespace(text="Call the bank at 3pm."))
+        _run(agent.respond(user_id=1, message="When should I call the bank?", session_id="chat-1"))
+
+        _run(agent.respond(user_id=1, message="And after that?", session_id="chat-1"))
+
+        router_payload = json.loads(agent.client.generate_json.call_args.args[0])
+        assert router_payload["context"]["conversation"] == [
+            "User: When should I call the bank?",
+            "Assistant: Call the bank at 3pm.",
+        ]
+        assert "When should I call the bank?" in agent.client.generate_text.call_args.args[0]
+
     def test_generates_session_id_if_none(self, agent):
         agent.context_builder.build_context = AsyncMock(return_value={})
         agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
@@ -370,6 +399,118 @@ class TestRespondFullFlow:
         assert len(result.session_id) > 10
 
 
+# ── MonetAssistantAgent.respond_stream ────────────────────────────────────
+
+def _collect_stream(agent, **kwargs):
+    async def _collect():
+        return [event async for event in agent.respond_stream(**kwargs)]
+
+    return _run(_collect())
+
+
+def _fake_stream(*chunks, fail_after: bool = False):
+    async def _stream(prompt, **kwargs):
+        for chunk in chunks:
+            yield chunk
+        if fail_after:
+            raise RuntimeError("stream dropped")
+
+    return _stream
+
+
+class TestRespondStream:
+    def test_emits_router_tool_deltas_and_done_in_order(self, agent):
+        agent.context_builder.build_context = AsyncMock(return_value={})
+        agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
+            data=AssistantRouterOutput(
+                reply_mode="respond_and_call_tools",
+                narrative_intent="Log food.",
+                tool_calls=[AssistantToolCallOutput(tool_id="nutrition.log_intake", args_json=json.dumps({"message": "ate eggs"}))],
+            )
+        ))
+        mock_tool = AsyncMock()
+        mock_tool.run = AsyncMock(return_value={
+            "reply": "Logged eggs.",
+            "logged_entries": [{"food_name": "eggs", "quantity": 2, "unit": "large", "status": "logged"}],
+        })
+        agent.tool_registry._tools["nutrition.log_intake"] = mock_tool
+        agent.client.stream_text = _fake_stream("Got it", " — logged eggs.")
+
+        events = _collect_stream(agent, user_id=1, message="I ate 2 eggs", session_id="s-1")
+
+        assert [e.event for e in events] == ["router", "tool_result", "reply_delta", "reply_delta", "done"]
+        assert events[0].data["reply_mode"] == "respond_and_call_tools"
+        assert events[1].data["tool_id"] == "nutrition.log_intake"
+        assert events[1].data["nutrition_entries"][0]["food_name"] == "eggs"
+        result = events[-1].result
+        assert result.reply == "Got it — logged eggs."
+        assert result.session_id == "s-1"
+        assert result.tools_used == ["nutrition.log_intake"]
+        assert len(result.nutrition_entries) == 1
+
+    def test_tool_results_stream_in_completion_order(self, agent):
+        agent.context_builder.build_context = AsyncMock(return_value={})
+        agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
+            data=AssistantRouterOutput(
+                reply_mode="respond_and_call_tools",
+                narrative_intent="Both.",
+                tool_calls=[
+                    AssistantToolCallOutput(tool_id="nutrition.log_intake", args_json="{}"),
+                    AssistantToolCallOutput(tool_id="todos.create_items", args_json="{}"),
+                ],
+            )
+        ))
+
+        async def _slow(user_id, args):
+            await asyncio.sleep(0.05)
+            return {"reply": "slow", "logged_entries": []}
+
+        async def _fast(user_id, args):
+            return {"reply": "fast", "items": []}
+
+        agent.tool_registry._tools["nutrition.log_intake"].run = _slow
+        agent.tool_registry._tools["todos.create_items"].run = _fast
+        agent.client.stream_text = _fake_stream("Done.")
+
+        events = _collect_stream(agent, user_id=1, message="eggs and call bank")
+
+        tool_events = [e.data["tool_id"] for e in events if e.event == "tool_result"]
+        assert tool_events == ["todos.create_items", "nutrition.log_intake"]
+        # Aggregated result keeps the router's call order.
+        assert events[-1].result.tools_used == ["nutrition.log_intake", "todos.create_items"]
+
+    def test_falls_back_when_stream_fails_before_any_text(self, agent):
+        agent.context_builder.build_context = AsyncMock(return_value={})
+        agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
+            data=AssistantRouterOutput(reply_mode="respond_only", narrative_intent=".", tool_calls=[])
+        ))
+        agent.client.stream_text = _fake_stream(fail_after=True)
+
+        events = _collect_stream(agent, user_id=1, message="hi")
+
+        assert events[-1].event == "done"
+        assert "went wrong" in events[-1].result.reply.lower()
+
+    def test_keeps_partial_reply_when_stream_drops(self, agent):
+        agent.context_builder.build_context = AsyncMock(return_value={})
+        agent.client.generate_json = AsyncMock(return_value=SimpleNamespace(
+            data=AssistantRouterOutput(reply_mode="respond_only", narrative_intent=".", tool_calls=[])
+        ))
+        agent.client.stream_text = _fake_stream("Hello there", fail_after=True)
+
+        events = _collect_stream(agent, user_id=1, message="hi")
+
+        assert events[-1].result.reply == "Hello there"
+
+    def test_context_failure_yields_only_done(self, agent):
+        agent.context_builder.build_context = AsyncMock(side_effect=RuntimeError("db down"))
+
+        events = _collect_stream(agent, user_id=1, message="hi")
+
+        assert [e.event for e in events] == ["done"]
+        assert events[0].result.tools_used == []
+
+
 # ── Contextual actions (preview/commit) ───────────────────────────────────
 
 class TestContextualActions:
@@ -0,0 +1,209 @@
+"""Tests for MonetContextBuilder per-source sessions and snapshot caching."""
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from app.services import monet_context_service
+from app.services.monet_context_service import ContextSnapshotCache, MonetContextBuilder
+
+
+class FakeSession:
+    pass
+
+
+class FakeSessionFactory:
+    def __init__(self) -> None:
+        self.opened: list[FakeSession] = []
+
+    def __call__(self) -> "FakeSessionFactory":
+        return self
+
+    async def __aenter__(self) -> FakeSession:
+        session = FakeSession()
+        self.opened.append(session)
+        return session
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+@pytest.fixture
+def loaders(monkeypatch):
+    calls: dict[str, list[FakeSession]] = {}
+
+    def _record(name: str, session: FakeSession) -> None:
+        calls.setdefault(name, []).append(session)
+
+    class FakeMetricsRepository:
+        def __init__(self, session):
+            self.session = session
+
+        async def list_metrics_since(self, user_id, start_date):
+            _record("metrics", self.session)
+            return []
+
+    class FakeNutritionService:
+        def __init__(self, session):
+            self.session = session
+
+        async def daily_summary(self, user_id, day):
+            _record("nutrition", self.session)
+            return {"calories": 1800}
+
+        async def rolling_average(self, user_id, window_days):
+            return {}
+
+    class FakeProfileService:
+        def __init__(self, session):
+            self.session = session
+
+        async def fetch_profile_payload(self, user_id):
+            _record("profile", self.session)
+            return {"name": "Test"}
+
+    class FakeTodoRepository:
+        def __init__(self, session):
+            self.session = session
+
+        async def list_for_user(self, user_id):
+            _record("todos", self.session)
+            return []
+
+    async def fake_calendar(self, session, user_id, window_days, time_zone):
+        _record("calendar", session)
+        return []
+
+    async def fake_workspace(self, session, user_id, page_context):
+        _record("workspace", session)
+        return {"recent_pages": []}
+
+    monkeypatch.setattr(monet_context_service, "MetricsRepository", FakeMetricsRepository)
+    monkeypatch.setattr(monet_context_service, "NutritionIntakeService", FakeNutritionService)
+    monkeypatch.setattr(monet_context_service, "UserProfileService", FakeProfileService)
+    monkeypatch.setattr(monet_context_service, "TodoRepository", FakeTodoRepository)
+    monkeypatch.setattr(MonetContextBuilder, "_serialize_calendar_events", fake_calendar)
+    monkeypatch.setattr(MonetContextBuilder, "_serialize_workspace_knowledge", fake_workspace)
+    return calls
+
+
+def test_each_source_gets_its_own_session(loaders):
+    factory = FakeSessionFactory()
+    builder = MonetContextBuilder(factory, snapshot_cache=ContextSnapshotCache())
+
+    context = asyncio.run(builder.build_context(1, 7))
+
+    assert len(factory.opened) == 6
+    sessions = [session for name in monet_context_service.CONTEXT_SOURCES for session in loaders[name]]
+    assert len({id(session) for session in sessions}) == 6
+    assert context["nutrition"]["today_summary"] == {"calories": 1800}
+    assert set(builder.last_timings) == set(monet_context_service.CONTEXT_SOURCES)
+
+
+def test_snapshots_are_reused_until_invalidated(loaders):
+    factory = FakeSessionFactory()
+    cache = ContextSnapshotCache()
+    builder = MonetContextBuilder(factory, snapshot_cache=cache)
+
+    asyncio.run(builder.build_context(1, 7))
+    asyncio.run(builder.build_context(1, 7))
+    assert len(factory.opened) == 6
+    assert builder.last_cache_hits == set(monet_context_service.CONTEXT_SOURCES)
+
+    cache.invalidate(1, "todos")
+    asyncio.run(builder.build_context(1, 7))
+    assert len(factory.opened) == 7
+    assert len(loaders["todos"]) == 2
+    assert len(loaders["metrics"]) == 1
+
+
+def test_snapshots_expire_after_ttl(loaders):
+    factory = FakeSessionFactory()
+    builder = MonetContextBuilder(factory, snapshot_cache=ContextSnapshotCache(ttl_seconds=0))
+
+    asyncio.run(builder.build_context(1, 7))
+    asyncio.run(builder.build_context(1, 7))
+
+    assert len(factory.opened) == 12
+
+
+def test_failed_source_falls_back_and_is_not_cached(loaders, monkeypatch):
+    attempts = {"count": 0}
+
+    async def failing_calendar(self, session, user_id, window_days, time_zone):
+        attempts["count"] += 1
+        raise RuntimeError("calendar down")
+
+    monkeypatch.setattr(MonetContextBuilder, "_serialize_calendar_events", failing_calendar)
+    builder = MonetContextBuilder(FakeSessionFactory(), snapshot_cache=ContextSnapshotCache())
+
+    first = asyncio.run(builder.build_context(1, 7))
+    asyncio.run(builder.build_context(1, 7))
+
+    assert first["calendar_events"] == []
+    assert attempts["count"] == 2
+
+
+def test_workspace_writes_invalidate_the_workspace_snapshot(monkeypatch):
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from app.core.auth import get_current_user
+    from app.db.session import get_session
+    from app.routers import workspace
+    from app.schemas.workspace import WorkspaceSearchResponse
+
+    class FakeWorkspaceService:
+        def __init__(self, session):
+            self.session = session
+
+        async def delete_page(self, user_id, page_id):
+            return None
+
+        async def search(self, user_id, query):
+            return WorkspaceSearchResponse(results=[])
+
+    async def fake_session():
+        yield None
+
+    monkeypatch.setattr(workspace, "WorkspaceService", FakeWorkspaceService)
+    cache = ContextSnapshotCache()
+    monkeypatch.setattr(monet_context_service, "context_snapshot_cache", cache)
+    app = FastAPI()
+    app.include_router(workspace.router)
+    app.dependency_overrides[get_current_user] = lambda: type("FakeUser", (), {"id": 1})()
+    app.dependency_overrides[get_session] = fake_session
+
+    async def _run() -> tuple[bool, bool]:
+        cache.put(1, "workspace", "", {"recent_pages": []})
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/workspace/search", params={"q": "x"})).status_code == 200
+            kept = cache.get(1, "workspace", "") is not None
+            assert (await client.delete("/workspace/pages/5")).status_code == 204
+            return kept, cache.get(1, "workspace", "") is not None
+
+    assert asyncio.run(_run()) == (True, False)
+
+
+def test_workspace_source_does_not_seed_a_missing_workspace(monkeypatch):
+    calls: list[str] = []
+
+    class FakeWorkspaceService:
+        def __init__(self, session):
+            self.session = session
+
+        async def is_workspace_current(self, user_id):
+            calls.append("is_workspace_current")
+            return False
+
+        async def ensure_workspace(self, user_id, *, sync_legacy=False):
+            calls.append("ensure_workspace")
+
+    monkeypatch.setattr(monet_context_service, "WorkspaceService", FakeWorkspaceService)
+    builder = MonetContextBuilder(FakeSessionFactory(), snapshot_cache=ContextSnapshotCache())
+
+    payload = asyncio.run(builder._serialize_workspace_knowledge(FakeSession(), 1, None))
+
+    assert payload == {}
+    assert calls == ["is_workspace_current"]
@@ -237,13 +237,12 @@ class TestStage7ContextBuilder:
         from app.db.session import AsyncSessionLocal
         from app.services.monet_context_service import MonetContextBuilder
 
-        async with AsyncSessionLocal() as session:
-            builder = MonetContextBuilder(session)
-            try:
-                context = await builder.build_context(user_id=1, window_days=7)
-                logger.info(f"[stage7] context keys: {list(context.keys())}")
-                assert isinstance(context, dict), f"Expected dict, got {type(context)}"
-            except Exception as exc:
-                logger.error(f"[stage7] context builder FAILED: {exc}")
-                traceback.print_exc()
-                raise
+        builder = MonetContextBuilder(AsyncSessionLocal)
+        try:
+            context = await builder.build_context(user_id=1, window_days=7, use_cache=False)
+            logger.info(f"[stage7] context keys: {list(context.keys())} timings={builder.last_timings}")
+            assert isinstance(context, dict), f"Expected dict, got {type(context)}"
+        except Exception as exc:
+            logger.error(f"[stage7] context builder FAILED: {exc}")
+            traceback.print_exc()
+            raise
@@ -1,9 +1,10 @@
 """Tests for the news title shortening endpoint."""
 from __future__ import annotations
 
+import asyncio
 import os
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 from fastapi import FastAPI
@@ -14,12 +15,13 @@ get_settings.cache_clear()
 
 from app.core.auth import get_current_user
 from app.routers import news
+from app.services.news_llm_service import NewsArticle, NewsLLMService, get_news_llm_service
 
 
 # ── Fixtures ──
 
 
-def _make_client() -> TestClient:
+def _make_client(service: NewsLLMService | None = None) -> TestClient:
     app = FastAPI()
     app.include_router(news.router, prefix="/api")
 
@@ -27,9 +29,19 @@ def _make_client() -> TestClient:
         return SimpleNamespace(id=1)
 
     app.dependency_overrides[get_current_user] = override_user
+    if service is not None:
+        app.dependency_overrides[get_news_llm_service] = lambda: service
     return TestClient(app)
 
 
+def _mock_service(text: str) -> tuple[NewsLLMService, AsyncMock]:
+    mock_llm = AsyncMock()
+    mock_llm.model_name = "gpt-4o-mini"
+    mock_llm.generate_text.return_value = SimpleNamespace(text=text, total_tokens=None)
+    service = NewsLLMService(llm=mock_llm, session_factory=None, batch_window_seconds=0.01)
+    return service, mock_llm
+
+
 # ── Unit Tests (mocked LLM) ──
 
 
@@ -42,15 +54,10 @@ class TestShortenTitlesMocked:
         assert resp.status_code == 200
         assert resp.json() == {"short_titles": []}
 
-    @patch("app.routers.news.OpenAIResponsesClient")
-    def test_returns_shortened_titles(self, MockClient):
-        mock_llm = AsyncMock()
-        mock_llm.generate_text.return_value = AsyncMock(
-            text="AI Reshapes Healthcare\nBitcoin Hits Record High"
-        )
-        MockClient.return_value = mock_llm
+    def test_returns_shortened_titles(self):
+        service, _ = _mock_service("AI Reshapes Healthcare\nBitcoin Hits Record High")
 
-        client = _make_client()
+        client = _make_client(service)
         resp = client.post("/api/news/shorten-titles", json={
             "titles": [
                 "How Artificial Intelligence Is Reshaping the Future of Healthcare Delivery",
@@ -63,20 +70,66 @@ class TestShortenTitlesMocked:
         assert data["short_titles"][0] == "AI Reshapes Healthcare"
         assert data["short_titles"][1] == "Bitcoin Hits Record High"
 
-    @patch("app.routers.news.OpenAIResponsesClient")
-    def test_pads_missing_responses_with_originals(self, MockClient):
-        """If LLM returns fewer lines than titles, fall back to originals."""
-        mock_llm = AsyncMock()
-        mock_llm.generate_text.return_value = AsyncMock(text="Short Title One")
-        MockClient.return_value = mock_llm
-
-        client = _make_client()
-        resp = client.post("/api/news/shorten-titles", json={
-            "titles": ["Original Title One", "Original Title Two"]
+    def test_line_count_mismatch_falls_back_to_originals(self):
+        """If the LLM returns fewer lines than titles, none can be trusted or cached."""
+        service, mock_llm = _mock_service("Short Title One")
+
+        client = _make_client(service)
+        titles = ["Original Title One", "Original Title Two"]
+        first = client.post("/api/news/shorten-titles", json={"titles": titles}).json()
+        second = client.post("/api/news/shorten-titles", json={"titles": titles}).json()
+
+        assert first == second == {"short_titles": titles}
+        assert mock_llm.generate_text.await_count == 2
+
+    def test_repeat_titles_are_served_from_cache(self):
+        service, mock_llm = _mock_service("Short One\nShort Two")
+        client = _make_client(service)
+        titles = ["Original Title One", "Original Title Two"]
+
+        first = client.post("/api/news/shorten-titles", json={"titles": titles}).json()
+        second = client.post("/api/news/shorten-titles", json={"titles": titles}).json()
+
+        assert first == second == {"short_titles": ["Short One", "Short Two"]}
+        assert mock_llm.generate_text.await_count == 1
+
+    def test_concurrent_requests_share_one_model_call(self):
+        service, mock_llm = _mock_service("Short A\nShort B")
+
+        async def run():
+            return await asyncio.gather(
+                service.shorten_titles(["Title A"]),
+                service.shorten_titles(["Title B", "Title A"]),
+            )
+
+        first, second = asyncio.run(run())
+        assert first == ["Short A"]
+        assert second == ["Short B", "Short A"]
+        assert mock_llm.generate_text.await_count == 1
+
+    def test_scores_map_back_to_request_ids(self):
+        service, _ = _mock_service('[{"id": "2", "score": 14}, {"id": "1", "score": 3}]')
+        client = _make_client(service)
+        resp = client.post("/api/news/score", json={
+            "profile_narrative": "Builds ML pipelines.",
+            "articles": [
+                {"id": "a-1", "title": "Celebrity news", "category": "industry"},
+                {"id": "b-2", "title": "New vector DB release", "category": "developer-tools"},
+            ],
         })
-        data = resp.json()
-        assert data["short_titles"][0] == "Short Title One"
-        assert data["short_titles"][1] == "Original Title Two"  # fallback
+        assert resp.json() == {"scores": [{"id": "a-1", "score": 3.0}, {"id": "b-2", "score": 10.0}]}
+
+    def test_scores_are_cached_per_profile(self):
+        service, mock_llm = _mock_service('[{"id": "1", "score": 7}]')
+        article = NewsArticle(title="Agents ship", category="developer-tools")
+
+        async def run():
+            await service.score_articles([article], "profile one")
+            await service.score_articles([article], "profile one")
+            await service.score_articles([article], "profile two")
+
+        asyncio.run(run())
+        assert mock_llm.generate_text.await_count == 2
 
 
 # ── Live LLM Tests ──
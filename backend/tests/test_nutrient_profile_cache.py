@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.db.models.nutrition import NUTRIENT_DEFINITIONS, NutritionReferenceFood
+from app.db.repositories.nutrition_reference_repository import NutritionReferenceRepository
+from app.services import nutrient_profile_cache as cache_module
+from app.services.nutrient_profile_cache import NutrientProfileCache, normalize_food_name
+from app.services.usda_food_import import parse_fdc_csv, reference_rows
+
+
+def _reference(**values):
+    row = {definition.column_name: None for definition in NUTRIENT_DEFINITIONS}
+    row.update(values)
+    return SimpleNamespace(**row)
+
+
+class FakeReferenceRepository:
+    rows: dict[tuple[str, str], SimpleNamespace] = {}
+    queries = 0
+    upserts: list = []
+
+    def __init__(self, session) -> None:  # noqa: ANN001
+        self.session = session
+
+    async def get_by_units(self, normalized_name: str, units):
+        FakeReferenceRepository.queries += 1
+        return {unit: self.rows[(normalized_name, unit)] for unit in units if (normalized_name, unit) in self.rows}
+
+    async def search_names(self, normalized_name: str, units, *, limit: int, min_score: float):
+        return []
+
+    async def upsert_many(self, rows, *, overwrite: bool) -> None:
+        FakeReferenceRepository.upserts.append((rows, overwrite))
+
+
+@pytest.fixture(autouse=True)
+def fake_repo(monkeypatch: pytest.MonkeyPatch):
+    FakeReferenceRepository.rows = {}
+    FakeReferenceRepository.queries = 0
+    FakeReferenceRepository.upserts = []
+    monkeypatch.setattr(cache_module, "NutritionReferenceRepository", FakeReferenceRepository)
+
+
+def test_normalize_food_name_ignores_case_punctuation_and_plurals() -> None:
+    assert normalize_food_name("Coffee Roll (Dunkin)") == normalize_food_name("coffee rolls, dunkin")
+    assert normalize_food_name("Blueberries") == "blueberry"
+    assert normalize_food_name("Hummus") == "hummus"
+
+
+def test_gram_units_scale_from_reference_row() -> None:
+    FakeReferenceRepository.rows[("banana", "100g")] = _reference(calories_kcal=89.0, protein_g=1.1)
+    cache = NutrientProfileCache()
+
+    profile = asyncio.run(cache.lookup(None, "Bananas", "g"))
+    again = asyncio.run(cache.lookup(None, "banana", "G"))
+
+    assert profile["calories"] == pytest.approx(0.89)
+    assert profile["fiber"] is None
+    assert again == profile
+    assert FakeReferenceRepository.queries == 1
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_unknown_unit_does_not_use_reference_row() -> None:
+    FakeReferenceRepository.rows[("banana", "100g")] = _reference(calories_kcal=89.0)
+    cache = NutrientProfileCache()
+
+    assert asyncio.run(cache.lookup(None, "banana", "piece")) is None
+    assert cache.misses == 1
+
+
+def test_volume_units_scale_from_another_volume_row() -> None:
+    FakeReferenceRepository.rows[("oat milk", "cup")] = _reference(calories_kcal=120.0)
+    cache = NutrientProfileCache()
+
+    assert asyncio.run(cache.lookup(None, "oat milk", "tbsp"))["calories"] == pytest.approx(7.5)
+
+
+def test_store_skips_empty_profiles_and_keeps_existing_rows() -> None:
+    cache = NutrientProfileCache()
+
+    asyncio.run(cache.store(None, "Mystery", "serving", {"calories": None}))
+    asyncio.run(cache.store(None, "Oat Latte", "cup", {"calories": 120.0}))
+
+    assert len(FakeReferenceRepository.upserts) == 1
+    rows, overwrite = FakeReferenceRepository.upserts[0]
+    assert overwrite is False
+    assert rows[0]["normalized_name"] == "oat latte"
+    assert rows[0]["calories_kcal"] == 120.0
+    assert asyncio.run(cache.lookup(None, "oat lattes", "cup")) == {"calories": 120.0}
+
+
+def test_fdc_csv_import_maps_nutrients_and_aliases(tmp_path) -> None:
+    (tmp_path / "food.csv").write_text(
+        "fdc_id,data_type,description\n"
+        "1,sr_legacy_food,\"Bananas, raw\"\n"
+        "2,foundation_food,\"Bananas, overripe, raw\"\n"
+        "3,branded_food,Banana Chips\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "food_nutrient.csv").write_text(
+        "id,fdc_id,nutrient_id,amount\n"
+        "10,1,1008,89\n"
+        "11,1,1003,1.09\n"
+        "12,2,2047,95\n"
+        "13,2,1008,93\n"
+        "14,3,1008,519\n",
+        encoding="utf-8",
+    )
+
+    foods = parse_fdc_csv(tmp_path)
+    rows = {row["normalized_name"]: row for row in reference_rows(foods)}
+
+    assert [food.fdc_id for food in foods] == ["2", "1"]
+    assert foods[0].nutrients["calories"] == 93
+    assert set(rows) == {"banana overripe raw", "banana raw", "banana"}
+    assert rows["banana"]["source_id"] == "1"
+    assert rows["banana"]["unit"] == "100g"
+    assert rows["banana raw"]["protein_g"] == 1.09
+
+
+def test_common_name_resolves_to_imported_fdc_description(tmp_path, sqlite_session, monkeypatch) -> None:
+    (tmp_path / "food.csv").write_text(
+        "fdc_id,data_type,description\n"
+        "171265,sr_legacy_food,\"Milk, whole, 3.25% milkfat, with added vitamin D\"\n"
+        "746782,foundation_food,\"Milk, whole, 3.25% milkfat\"\n"
+        "746778,foundation_food,\"Milk, reduced fat, fluid, 2% milkfat, with added vitamin A and vitamin D\"\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "food_nutrient.csv").write_text(
+        "id,fdc_id,nutrient_id,amount\n"
+        "1,171265,1008,61\n"
+        "2,746782,1008,60\n"
+        "3,746782,1003,3.27\n"
+        "4,746778,1008,50\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "measure_unit.csv").write_text("id,name\n1000,cup\n9999,undetermined\n", encoding="utf-8")
+    # Foundation foods name the measure unit; SR Legacy keeps it in the modifier.
+    (tmp_path / "food_portion.csv").write_text(
+        "id,fdc_id,seq_num,amount,measure_unit_id,portion_description,modifier,gram_weight\n"
+        "1,746782,1,1,1000,,,244\n"
+        "2,171265,1,1,9999,,cup,244\n"
+        "3,171265,2,1,9999,,\"quart\",976\n",
+        encoding="utf-8",
+    )
+    session = sqlite_session(NutritionReferenceFood)
+    session.add_all(NutritionReferenceFood(**row) for row in reference_rows(parse_fdc_csv(tmp_path)))
+    asyncio.run(session.commit())
+    monkeypatch.setattr(cache_module, "NutritionReferenceRepository", NutritionReferenceRepository)
+    cache = NutrientProfileCache()
+
+    per_cup = asyncio.run(cache.lookup(session, "whole milk", "cup"))
+    per_tbsp = asyncio.run(cache.lookup(session, "Whole Milk", "tablespoons"))
+    per_gram = asyncio.run(cache.lookup(session, "whole milk", "g"))
+
+    assert per_cup["calories"] == pytest.approx(60 * 2.44)
+    assert per_cup["protein"] == pytest.approx(3.27 * 2.44)
+    assert per_tbsp["calories"] == pytest.approx(60 * 2.44 / 16)
+    assert per_gram["calories"] == pytest.approx(0.6)
+    assert asyncio.run(cache.lookup(session, "orange juice", "cup")) is None
+    assert asyncio.run(cache.lookup(session, "whole milk", "piece")) is None
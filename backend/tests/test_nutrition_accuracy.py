@@ -1,7 +1,7 @@
 """
 Full nutrition accuracy test suite.
 
-Layer 1: Nutrient math (deterministic) — tests _accumulate and daily_summary
+Layer 1: Nutrient math (deterministic) — tests SQL day totals and daily_summary
 Layer 2: AI extraction accuracy (requires LLM) — food parsing from natural language
 Layer 3: End-to-end calorie pipeline (requires LLM) — recipe → nutrients → totals
 
@@ -12,7 +12,7 @@ from __future__ import annotations
 import asyncio
 import os
 from datetime import date
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -25,12 +25,14 @@ from app.core.config import get_settings
 get_settings.cache_clear()
 
 from app.db.models.nutrition import (  # noqa: E402
-    NUTRIENT_DEFINITIONS,
     NutritionIngredient,
     NutritionIngredientProfile,
     NutritionIntake,
     NutritionIntakeSource,
+    NutritionRecipe,
 )
+from app.db.repositories.nutrition_ingredients_repository import NutritionIngredientsRepository  # noqa: E402
+from app.db.repositories.nutrition_intake_repository import NutritionIntakeRepository  # noqa: E402
 from app.services.nutrition_intake_service import NutritionIntakeService  # noqa: E402
 from app.clients.openai_client import OpenAIResponsesClient  # noqa: E402
 from app.prompts import NUTRITION_FOOD_EXTRACTION_PROMPT  # noqa: E402
@@ -38,91 +40,99 @@ from app.schemas.llm_outputs import NutritionFoodExtractionOutput  # noqa: E402
 from app.services.claude_nutrition_agent import NutritionAssistantAgent  # noqa: E402
 
 
+DAY = date(2026, 3, 19)
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(NutritionIngredientProfile, NutritionIngredient, NutritionRecipe, NutritionIntake)
+
+
 # ── Helpers ──
 
-def _make_intake(ingredient_name: str, quantity: float, unit: str, calories: float, protein: float = 0, carbs: float = 0, fat: float = 0) -> MagicMock:
-    """Build a mock NutritionIntake with an attached profile containing known nutrient values."""
-    profile = MagicMock(spec=NutritionIngredientProfile)
-    # Set all nutrient columns to 0 by default
-    for defn in NUTRIENT_DEFINITIONS:
-        setattr(profile, defn.column_name, 0.0)
-    # Override the ones we care about (use actual column names from NUTRIENT_DEFINITIONS)
-    profile.calories_kcal = calories
-    profile.protein_g = protein
-    profile.carbohydrates_g = carbs
-    profile.fat_g = fat
-
-    ingredient = MagicMock(spec=NutritionIngredient)
-    ingredient.name = ingredient_name
-    ingredient.profile = profile
-
-    intake = MagicMock(spec=NutritionIntake)
-    intake.ingredient = ingredient
-    intake.quantity = quantity
-    intake.unit = unit
-    return intake
+def _log_intakes(session, entries: list[tuple[str, float, str, dict[str, float]]]) -> None:
+    """Create each ingredient with its per-unit nutrients and log ``quantity`` of it for user 1 on ``DAY``."""
+    ingredients = NutritionIngredientsRepository(session)
+    intakes = NutritionIntakeRepository(session)
+
+    async def _seed():
+        for name, quantity, unit, nutrients in entries:
+            food = await ingredients.create_ingredient(
+                name=name, default_unit=unit, source=None, nutrient_values=nutrients, owner_user_id=1,
+            )
+            await intakes.log_intake(
+                user_id=1, food_id=food.id, quantity=quantity, unit=unit,
+                day=DAY, source=NutritionIntakeSource.MANUAL,
+            )
+        await session.commit()
+
+    _run(_seed())
+
+
+def _day_totals(session) -> dict[str, float]:
+    return _run(NutritionIntakeRepository(session).sum_nutrients_by_day(1, DAY, DAY)).get(DAY, {})
 
 
 # ── Layer 1: Nutrient Math ──
 
 
 class TestNutrientMath:
-    """Verify _accumulate computes correct calorie/macro totals from intake records."""
+    """Verify sum_nutrients_by_day computes correct calorie/macro totals from logged intakes."""
 
-    def test_single_ingredient_calories(self):
+    def test_single_ingredient_calories(self, session):
         """2 eggs at 72 kcal/piece = 144 kcal total."""
-        service = NutritionIntakeService.__new__(NutritionIntakeService)
-        intakes = [_make_intake("Egg", quantity=2.0, unit="piece", calories=72.0, protein=6.0, fat=5.0)]
-        totals = service._accumulate(intakes)
+        _log_intakes(session, [("Egg", 2.0, "piece", {"calories": 72.0, "protein": 6.0, "fat": 5.0})])
+        totals = _day_totals(session)
         assert totals["calories"] == pytest.approx(144.0)
         assert totals["protein"] == pytest.approx(12.0)
         assert totals["fat"] == pytest.approx(10.0)
 
-    def test_multiple_ingredients_sum(self):
+    def test_multiple_ingredients_sum(self, session):
         """2 eggs (72 each) + 1 toast (80) = 224 kcal."""
-        service = NutritionIntakeService.__new__(NutritionIntakeService)
-        intakes = [
-            _make_intake("Egg", quantity=2.0, unit="piece", calories=72.0),
-            _make_intake("Toast", quantity=1.0, unit="slice", calories=80.0),
-        ]
-        totals = service._accumulate(intakes)
-        assert totals["calories"] == pytest.approx(224.0)
-
-    def test_fractional_quantity(self):
+        _log_intakes(session, [
+            ("Egg", 2.0, "piece", {"calories": 72.0}),
+            ("Toast", 1.0, "slice", {"calories": 80.0}),
+        ])
+        assert _day_totals(session)["calories"] == pytest.approx(224.0)
+
+    def test_fractional_quantity(self, session):
         """0.5 cups of yogurt at 150 kcal/cup = 75 kcal."""
-        service = NutritionIntakeService.__new__(NutritionIntakeService)
-        intakes = [_make_intake("Greek yogurt", quantity=0.5, unit="cup", calories=150.0, protein=15.0)]
-        totals = service._accumulate(intakes)
+        _log_intakes(session, [("Greek yogurt", 0.5, "cup", {"calories": 150.0, "protein": 15.0})])
+        totals = _day_totals(session)
         assert totals["calories"] == pytest.approx(75.0)
         assert totals["protein"] == pytest.approx(7.5)
 
-    def test_zero_quantity_yields_zero(self):
+    def test_zero_quantity_yields_zero(self, session):
         """Edge case: 0 quantity should yield 0 calories."""
-        service = NutritionIntakeService.__new__(NutritionIntakeService)
-        intakes = [_make_intake("Egg", quantity=0.0, unit="piece", calories=72.0)]
-        totals = service._accumulate(intakes)
-        assert totals["calories"] == pytest.approx(0.0)
-
-    def test_empty_intakes(self):
-        """No intakes should yield all-zero totals."""
-        service = NutritionIntakeService.__new__(NutritionIntakeService)
-        totals = service._accumulate([])
-        assert totals["calories"] == pytest.approx(0.0)
-
-    def test_daily_summary_calorie_total(self):
-        """daily_summary should return correct calorie amount and percent_of_goal."""
-        session = AsyncMock()
+        _log_intakes(session, [("Egg", 0.0, "piece", {"calories": 72.0})])
+        assert _day_totals(session)["calories"] == pytest.approx(0.0)
+
+    def test_missing_nutrient_value_is_skipped(self, session):
+        """Toast has no protein value: the egg's protein still counts."""
+        _log_intakes(session, [
+            ("Egg", 2.0, "piece", {"calories": 72.0, "protein": 6.0}),
+            ("Toast", 1.0, "slice", {"calories": 80.0}),
+        ])
+        assert _day_totals(session)["protein"] == pytest.approx(12.0)
+
+    def test_empty_intakes(self, session):
+        """No intakes should yield all-zero totals in the daily summary."""
         service = NutritionIntakeService(session)
+        service.goals_service.list_goals = AsyncMock(return_value=[])
+
+        summary = _run(service.daily_summary(user_id=1, day=DAY))
+        assert _day_totals(session) == {}
+        assert all(n["amount"] == 0.0 for n in summary["nutrients"])
 
-        intakes = [
-            _make_intake("Egg", quantity=3.0, unit="piece", calories=72.0),
-        ]
-        service.repo.fetch_for_date = AsyncMock(return_value=intakes)
+    def test_daily_summary_calorie_total(self, session):
+        """daily_summary should return correct calorie amount and percent_of_goal."""
+        _log_intakes(session, [("Egg", 3.0, "piece", {"calories": 72.0})])
+        service = NutritionIntakeService(session)
         service.goals_service.list_goals = AsyncMock(return_value=[
             {"slug": "calories", "goal": 2000.0, "display_name": "Calories", "unit": "kcal"},
         ])
 
-        summary = _run(service.daily_summary(user_id=1, day=date(2026, 3, 19)))
+        summary = _run(service.daily_summary(user_id=1, day=DAY))
         cal_entry = next(n for n in summary["nutrients"] if n["slug"] == "calories")
         assert cal_entry["amount"] == pytest.approx(216.0)  # 3 * 72
         assert cal_entry["percent_of_goal"] == pytest.approx(10.8)  # 216/2000*100
@@ -224,57 +234,46 @@ class TestAIExtraction:
 
 
 # ── Layer 3: End-to-End Calorie Pipeline ──
-# Combines mocked extraction (for determinism) with real _accumulate + daily_summary.
+# Combines mocked extraction (for determinism) with real SQL totals + daily_summary.
 
 class TestEndToEndCalories:
     """Verify extraction -> logging -> daily_summary produces correct calorie totals."""
 
-    def test_known_ingredient_through_daily_summary(self):
+    def test_known_ingredient_through_daily_summary(self, session):
         """
         Mock extraction to return 3 eggs.
-        Build intake records with known calorie profiles.
+        Log intake records with known calorie profiles.
         Run daily_summary and assert calories = 216.
         """
-        session = AsyncMock()
+        _log_intakes(session, [("Egg", 3.0, "piece", {"calories": 72.0, "protein": 6.0, "fat": 5.0})])
         service = NutritionIntakeService(session)
-
-        # Build realistic intake objects with proper nutrient profiles
-        egg_intakes = [
-            _make_intake("Egg", quantity=3.0, unit="piece", calories=72.0, protein=6.0, fat=5.0),
-        ]
-
-        service.repo.fetch_for_date = AsyncMock(return_value=egg_intakes)
         service.goals_service.list_goals = AsyncMock(return_value=[
             {"slug": "calories", "goal": 2000.0, "display_name": "Calories", "unit": "kcal"},
             {"slug": "protein", "goal": 160.0, "display_name": "Protein", "unit": "g"},
         ])
 
-        summary = _run(service.daily_summary(user_id=1, day=date(2026, 3, 19)))
+        summary = _run(service.daily_summary(user_id=1, day=DAY))
         cal = next(n for n in summary["nutrients"] if n["slug"] == "calories")
         protein = next(n for n in summary["nutrients"] if n["slug"] == "protein")
 
         assert cal["amount"] == pytest.approx(216.0)  # 3 * 72
         assert protein["amount"] == pytest.approx(18.0)  # 3 * 6
 
-    def test_mixed_meal_calorie_total(self):
+    def test_mixed_meal_calorie_total(self, session):
         """
         2 eggs (72 each) + 1 toast (80) + 1 cup yogurt (150) = 374 kcal.
         """
-        session = AsyncMock()
+        _log_intakes(session, [
+            ("Egg", 2.0, "piece", {"calories": 72.0}),
+            ("Toast", 1.0, "slice", {"calories": 80.0}),
+            ("Greek yogurt", 1.0, "cup", {"calories": 150.0}),
+        ])
         service = NutritionIntakeService(session)
-
-        intakes = [
-            _make_intake("Egg", quantity=2.0, unit="piece", calories=72.0),
-            _make_intake("Toast", quantity=1.0, unit="slice", calories=80.0),
-            _make_intake("Greek yogurt", quantity=1.0, unit="cup", calories=150.0),
-        ]
-
-        service.repo.fetch_for_date = AsyncMock(return_value=intakes)
         service.goals_service.list_goals = AsyncMock(return_value=[
             {"slug": "calories", "goal": 2000.0, "display_name": "Calories", "unit": "kcal"},
         ])
 
-        summary = _run(service.daily_summary(user_id=1, day=date(2026, 3, 19)))
+        summary = _run(service.daily_summary(user_id=1, day=DAY))
         cal = next(n for n in summary["nutrients"] if n["slug"] == "calories")
         assert cal["amount"] == pytest.approx(374.0)
         assert cal["percent_of_goal"] == pytest.approx(18.7)  # 374/2000*100
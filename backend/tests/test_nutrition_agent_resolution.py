@@ -0,0 +1,245 @@
+"""NutritionAssistantAgent: concurrent food resolution and single-transaction logging."""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from app.db.models.nutrition import NutritionIngredientStatus
+from app.services.claude_nutrition_agent import NutritionAssistantAgent
+from app.services.conversation_memory import ConversationMemory
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+class FakeSession:
+    def __init__(self) -> None:
+        self.commits = 0
+        self.flushes = 0
+
+    async def flush(self) -> None:
+        self.flushes += 1
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+class FakeConversationRepository:
+    def __init__(self) -> None:
+        self.saved: dict[tuple[str, str], dict[str, Any]] = {}
+
+    async def get(self, namespace: str, session_key: str, *, user_id: int):
+        return None
+
+    async def create(self, namespace: str, session_key: str, **fields: Any) -> int:
+        self.saved[(namespace, session_key)] = fields
+        return 1
+
+    async def update(self, namespace: str, session_key: str, *, expected_version: int, **fields: Any) -> int:
+        self.saved[(namespace, session_key)] = fields
+        return expected_version + 1
+
+
+def _ingredient(ingredient_id: int, name: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=ingredient_id,
+        name=name,
+        default_unit="serving",
+        status=NutritionIngredientStatus.CONFIRMED,
+    )
+
+
+def _agent(monkeypatch, foods: list[dict[str, Any]], known: dict[str, SimpleNamespace]):
+    session = FakeSession()
+    agent = NutritionAssistantAgent(session)
+    conversations = FakeConversationRepository()
+    agent.memory = ConversationMemory(summarizer=None, repository_factory=lambda session: conversations)
+    active = {"now": 0, "peak": 0}
+    logged: list[tuple[int, float]] = []
+
+    async def extract(text: str) -> dict[str, Any]:
+        return {"foods": foods, "summary": None}
+
+    async def get_ingredient_by_name(user_id: int, name: str):
+        return known.get(name)
+
+    async def search_empty(user_id: int, name: str, limit: int = 5):
+        return []
+
+    async def get_recipe_by_name(user_id: int, name: str):
+        return None
+
+    async def suggest(description: str):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.02)
+        active["now"] -= 1
+        return None
+
+    async def log_intake(**kwargs):
+        logged.append((kwargs["food_id"], kwargs["quantity"]))
+
+    async def mark_stale(user_id: int) -> None:
+        return None
+
+    monkeypatch.setattr(agent, "_extract_food_mentions", extract)
+    monkeypatch.setattr(agent, "_suggest_recipe", suggest)
+    agent.ingredients_repo = SimpleNamespace(
+        get_ingredient_by_name=get_ingredient_by_name,
+        search_ingredients_fuzzy=search_empty,
+    )
+    agent.recipes_repo = SimpleNamespace(
+        get_recipe_by_name=get_recipe_by_name,
+        search_recipes_fuzzy=search_empty,
+    )
+    agent.intake_repo = SimpleNamespace(log_intake=log_intake)
+    monkeypatch.setattr(
+        "app.services.claude_nutrition_agent.NutritionSuggestionsRepository",
+        lambda session: SimpleNamespace(mark_stale=mark_stale),
+    )
+    return agent, session, active, logged
+
+
+def test_unknown_foods_resolve_concurrently_under_the_bound(monkeypatch) -> None:
+    monkeypatch.setattr("app.services.claude_nutrition_agent.settings.nutrition_resolve_concurrency", 3)
+    foods = [{"name": f"mystery dish {i}", "quantity": 1} for i in range(6)]
+    agent, session, active, _ = _agent(monkeypatch, foods, known={})
+
+    _run(agent.respond(1, "six things", request_id="req-1"))
+
+    assert active["peak"] == 3
+    assert session.commits == 1
+    assert {"extract", "resolve", "persist", "lookup"} <= set(agent.last_timings)
+
+
+def test_entries_are_logged_in_message_order_in_one_commit(monkeypatch) -> None:
+    known = {"eggs": _ingredient(1, "eggs"), "banana": _ingredient(2, "banana")}
+    foods = [
+        {"name": "banana", "quantity": 1},
+        {"name": "unknown", "quantity": 1},
+        {"name": "eggs", "quantity": 2},
+    ]
+    agent, session, _, logged = _agent(monkeypatch, foods, known)
+
+    response = _run(agent.respond(1, "banana, something, two eggs", request_id="req-2"))
+
+    assert [entry["food_name"] for entry in response.logged_entries] == ["banana", "eggs"]
+    assert logged == [(2, 1.0), (1, 2.0)]
+    assert session.commits == 1
+
+
+def test_suggested_recipe_is_planned_then_created_at_persist(monkeypatch) -> None:
+    agent, session, _, logged = _agent(monkeypatch, [{"name": "latte", "quantity": 1}], known={})
+    milk = _ingredient(5, "milk")
+    created: list[str] = []
+    fetched: list[str] = []
+
+    async def suggest(description: str):
+        return {
+            "recipe": {"name": "Latte", "servings": 1},
+            "ingredients": [
+                {"name": "milk", "quantity": 1, "unit": "cup"},
+                {"name": "espresso", "quantity": 2, "unit": "shot"},
+                {"name": "steamed milk", "quantity": 1, "unit": "cup"},
+            ],
+        }
+
+    async def get_ingredient_by_name(user_id: int, name: str):
+        return milk if name == "milk" else None
+
+    async def fetch_profile(food_name: str, unit: str):
+        fetched.append(food_name)
+        return {"energy_kcal": 1.0}
+
+    async def create_ingredient(**kwargs):
+        created.append(kwargs["name"])
+        return _ingredient(9, kwargs["name"])
+
+    recipe = SimpleNamespace(id=30, name="Latte", status=NutritionIngredientStatus.UNCONFIRMED)
+
+    async def create_recipe(**kwargs):
+        assert [c["ingredient_id"] for c in kwargs["components"]] == [5, 9, 9]
+        assert session.commits == 0
+        return recipe
+
+    async def get_recipe(recipe_id: int, user_id: int, load_components: bool = False):
+        return recipe
+
+    async def log_recipe(**kwargs):
+        logged.append((kwargs["recipe_id"], kwargs["servings"]))
+
+    stored: list[str] = []
+
+    async def cache_lookup(session, name: str, unit: str):
+        return {"calories": 100.0} if name == "steamed milk" else None
+
+    async def cache_store(session, name: str, unit: str, nutrients):
+        stored.append(name)
+
+    monkeypatch.setattr(agent, "_suggest_recipe", suggest)
+    monkeypatch.setattr(agent, "_fetch_nutrient_profile", fetch_profile)
+    agent.profile_cache = SimpleNamespace(lookup=cache_lookup, store=cache_store)
+    monkeypatch.setattr(agent, "_log_recipe", log_recipe)
+    agent.ingredients_repo.get_ingredient_by_name = get_ingredient_by_name
+    agent.ingredients_repo.create_ingredient = create_ingredient
+    agent.recipes_repo.create_recipe = create_recipe
+    agent.recipes_repo.get_recipe = get_recipe
+
+    response = _run(agent.respond(1, "a latte", request_id="req-3"))
+
+    # "steamed milk" came from the shared profile cache: no web search, no re-store.
+    assert fetched == ["espresso"]
+    assert created == ["espresso", "steamed milk"]
+    assert stored == ["espresso"]
+    assert logged == [(30, 1.0)]
+    assert response.logged_entries[0]["created"] is True
+    assert session.commits == 1
+
+
+def test_follow_up_message_sees_the_previous_exchange(monkeypatch) -> None:
+    agent, _, _, _ = _agent(monkeypatch, [], known={})
+    prompts: list[str] = []
+
+    async def extract(text: str) -> dict[str, Any]:
+        prompts.append(text)
+        return {"foods": [], "summary": None}
+
+    monkeypatch.setattr(agent, "_extract_food_mentions", extract)
+
+    _run(agent.respond(1, "a bowl of pho", request_id="chat-9"))
+    _run(agent.respond(1, "make that two", request_id="chat-9"))
+    _run(agent.respond(1, "unrelated"))
+
+    assert prompts[0] == "a bowl of pho"
+    assert "User: a bowl of pho" in prompts[1]
+    assert prompts[1].endswith("Current message: make that two")
+    # One-off calls (no session id) start fresh.
+    assert prompts[2] == "unrelated"
+
+
+def test_router_remembers_the_session_id_it_returns(monkeypatch) -> None:
+    from app.routers import nutrition as nutrition_router
+    from app.schemas.nutrition import NutritionAssistantMessageRequest
+
+    seen: list[str | None] = []
+
+    class FakeAgent:
+        def __init__(self, session) -> None:
+            pass
+
+        async def respond(self, user_id: int, message: str, request_id: str | None = None):
+            seen.append(request_id)
+            return SimpleNamespace(reply="ok", logged_entries=[])
+
+    monkeypatch.setattr(nutrition_router, "NutritionAssistantAgent", FakeAgent)
+
+    response = _run(
+        nutrition_router._assistant_message(
+            NutritionAssistantMessageRequest(message="two eggs"), SimpleNamespace(id=1), FakeSession()
+        )
+    )
+
+    # A first message without an id is stored under the id the client is told to send back.
+    assert seen == [response.session_id]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.nutrition import (
+    NUTRIENT_DEFINITIONS,
+    NutritionIngredient,
+    NutritionIngredientProfile,
+    NutritionIntake,
+    NutritionIntakeSource,
+    NutritionRecipe,
+)
+from app.db.repositories.nutrition_ingredients_repository import NutritionIngredientsRepository
+from app.db.repositories.nutrition_intake_repository import NutritionIntakeRepository
+
+
+def _accumulate(intakes) -> dict[str, float]:
+    """Totals computed in Python from loaded intakes, as the oracle for the SQL sums."""
+    totals = {definition.slug: 0.0 for definition in NUTRIENT_DEFINITIONS}
+    for intake in intakes:
+        for definition in NUTRIENT_DEFINITIONS:
+            value = getattr(intake.ingredient.profile, definition.column_name)
+            if value is not None:
+                totals[definition.slug] += value * intake.quantity
+    return totals
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(NutritionIngredientProfile, NutritionIngredient, NutritionRecipe, NutritionIntake)
+
+
+def test_sql_totals_match_in_memory_accumulation(session: AsyncSession) -> None:
+    ingredients = NutritionIngredientsRepository(session)
+    intakes = NutritionIntakeRepository(session)
+    start = date(2026, 3, 1)
+
+    async def _run():
+        egg = await ingredients.create_ingredient(
+            name="Egg", default_unit="piece", source=None,
+            nutrient_values={"calories": 72.0, "protein": 6.0, "fat": 5.0}, owner_user_id=1,
+        )
+        # No protein value: must be skipped, not treated as an error.
+        toast = await ingredients.create_ingredient(
+            name="Toast", default_unit="slice", source=None,
+            nutrient_values={"calories": 80.0}, owner_user_id=1,
+        )
+        for offset, food, quantity, user_id in [
+            (0, egg, 2.0, 1), (0, toast, 1.5, 1), (1, egg, 3.0, 1), (0, egg, 10.0, 2), (9, egg, 1.0, 1),
+        ]:
+            await intakes.log_intake(
+                user_id=user_id, food_id=food.id, quantity=quantity, unit="serving",
+                day=start + timedelta(days=offset), source=NutritionIntakeSource.MANUAL,
+            )
+        await session.commit()
+        loaded = await intakes.fetch_between(1, start, start + timedelta(days=1))
+        sums = await intakes.sum_nutrients_by_day(1, start, start + timedelta(days=1))
+        return loaded, sums
+
+    loaded, sums = asyncio.run(_run())
+
+    assert set(sums) == {start, start + timedelta(days=1)}
+    for day, totals in sums.items():
+        expected = _accumulate([intake for intake in loaded if intake.day_date == day])
+        assert totals == pytest.approx(expected)
+    assert sums[start]["calories"] == pytest.approx(2 * 72 + 1.5 * 80)
+    assert sums[start]["protein"] == pytest.approx(12.0)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.nutrition import (
+    NutritionIngredient,
+    NutritionIngredientProfile,
+    NutritionIngredientStatus,
+    NutritionRecipe,
+    NutritionRecipeComponent,
+)
+from app.db.repositories.nutrition_ingredients_repository import (
+    NutritionIngredientsRepository,
+    NutritionRecipesRepository,
+)
+from app.utils.trigram import TrigramIndex, similarity, trigrams
+
+
+def test_trigrams_match_pg_trgm() -> None:
+    # SELECT show_trgm('Cat!') -> {"  c"," ca","at ",cat}
+    assert trigrams("Cat!") == {"  c", " ca", "cat", "at "}
+    assert similarity("coffee roll", "Coffee Roll") == 1.0
+    assert similarity("", "anything") == 0.0
+
+
+def test_index_ranks_and_limits() -> None:
+    index = TrigramIndex([(1, "Banana"), (2, "Banana Bread"), (3, "Bread"), (4, "Greek Yogurt")])
+
+    ranked = index.search("banana", limit=2, min_score=0.3)
+
+    assert [key for key, _ in ranked] == [1, 2]
+    assert ranked[0][1] == 1.0
+    assert index.search("zzz") == []
+
+
+def test_index_remove_and_replace() -> None:
+    index = TrigramIndex([(1, "Oat Milk")])
+    index.add(1, "Almond Milk")
+    index.add(2, "Oat Latte")
+    index.remove(2)
+
+    assert len(index) == 1
+    assert [key for key, _ in index.search("almond milk")] == [1]
+    assert index.search("oat latte", min_score=0.5) == []
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(NutritionIngredientProfile, NutritionIngredient, NutritionRecipe, NutritionRecipeComponent)
+
+
+def test_repository_fuzzy_search_returns_ranked_top_k(session: AsyncSession) -> None:
+    repo = NutritionIngredientsRepository(session)
+
+    async def _run():
+        for owner, name in [(1, "Egg"), (1, "Egg Whites"), (1, "Eggplant"), (1, "Bagel"), (2, "Eggs")]:
+            await repo.create_ingredient(
+                name=name, default_unit="serving", source=None, nutrient_values={}, owner_user_id=owner
+            )
+        await session.commit()
+        return (
+            await repo.search_ingredients_fuzzy(1, "eggs"),
+            await repo.search_ingredients_fuzzy(1, "eggs", limit=2, min_score=0.2),
+        )
+
+    default, loose = asyncio.run(_run())
+
+    # Owner 2's exact "Eggs" is never visible to owner 1.
+    assert [ingredient.name for ingredient in default] == ["Egg"]
+    assert [ingredient.name for ingredient in loose] == ["Egg", "Eggplant"]
+    assert default[0].profile is not None
+
+
+def test_recipe_fuzzy_search_matches_reordered_names(session: AsyncSession) -> None:
+    repo = NutritionRecipesRepository(session)
+
+    async def _run():
+        for name in ["Coffee Roll (Dunkin)", "Cinnamon Roll"]:
+            await repo.create_recipe(
+                name=name,
+                default_unit="serving",
+                servings=1,
+                status=NutritionIngredientStatus.UNCONFIRMED,
+                owner_user_id=1,
+                components=[],
+                source=None,
+            )
+        await session.commit()
+        return await repo.search_recipes_fuzzy(1, "coffee roll from dunkin")
+
+    results = asyncio.run(_run())
+
+    assert results[0].name == "Coffee Roll (Dunkin)"
@@ -66,3 +66,39 @@ def test_non_gpt5_requests_preserve_temperature() -> None:
 
     assert fake_client.responses.create_calls[0]["temperature"] == 0.6
     assert fake_client.responses.parse_calls[0]["temperature"] == 0.1
+
+
+class FakeStreamingResponsesAPI:
+    def __init__(self, events: list[SimpleNamespace]) -> None:
+        self.events = events
+        self.create_calls: list[dict[str, object]] = []
+
+    async def create(self, **kwargs):
+        self.create_calls.append(kwargs)
+        events = self.events
+
+        async def _iterate():
+            for event in events:
+                yield event
+
+        return _iterate()
+
+
+def test_stream_text_yields_output_deltas() -> None:
+    fake_client = FakeOpenAIClient()
+    fake_client.responses = FakeStreamingResponsesAPI(
+        [
+            SimpleNamespace(type="response.created"),
+            SimpleNamespace(type="response.output_text.delta", delta="Hel"),
+            SimpleNamespace(type="response.output_text.delta", delta="lo"),
+            SimpleNamespace(type="response.completed"),
+        ]
+    )
+    client = OpenAIResponsesClient(client=fake_client, model_name="gpt-4.1-mini")
+
+    async def _collect() -> list[str]:
+        return [delta async for delta in client.stream_text("hello", temperature=0.4)]
+
+    assert asyncio.run(_collect()) == ["Hel", "lo"]
+    assert fake_client.responses.create_calls[0]["stream"] is True
+    assert fake_client.responses.create_calls[0]["temperature"] == 0.4
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import replace
+
 from app.services.imessage_utils import (
     ProjectCatalogEntry,
+    ProjectMatcher,
     _EMOJI_RE,
     _normalize_for_fuzzy_match,
     infer_project_match,
@@ -63,3 +66,53 @@ def test_common_word_stripping_removes_filler_words() -> None:
 def test_normalize_for_fuzzy_match_is_case_insensitive() -> None:
     assert _normalize_for_fuzzy_match("FOREST FIRE") == _normalize_for_fuzzy_match("forest fire")
     assert _normalize_for_fuzzy_match("Comic CV PROJECT") == _normalize_for_fuzzy_match("comic cv project")
+
+
+def test_reused_matcher_agrees_with_per_call_scoring() -> None:
+    matcher = ProjectMatcher(SAMPLE_CATALOG)
+    cases = [
+        ("Comic CV Project \U0001F680", ["Let's sync on the layout."]),
+        ("\U0001F525FOREST FIRES\U0001F525", ["Any update on the permit?"]),
+        ("random group chat", ["Hey what's up"]),
+        ("IM crew", ["Ironman training block starts Monday", "forest fire permit is in"]),
+        (None, ["personal ops backlog"]),
+    ]
+    for conversation_name, message_texts in cases + cases:
+        expected = infer_project_match(
+            project_catalog=SAMPLE_CATALOG,
+            conversation_name=conversation_name,
+            participants=["alice@example.com"],
+            message_texts=message_texts,
+        )
+        reused = infer_project_match(
+            matcher=matcher,
+            conversation_name=conversation_name,
+            participants=["alice@example.com"],
+            message_texts=message_texts,
+        )
+        assert reused == expected
+
+
+def test_matcher_affinities_match_catalog_affinities() -> None:
+    matcher = ProjectMatcher(SAMPLE_CATALOG)
+    boosted_catalog = [
+        replace(entry, conversation_affinity=0.8) if entry.name == "Personal Ops" else entry
+        for entry in SAMPLE_CATALOG
+    ]
+
+    via_affinities = infer_project_match(
+        matcher=matcher,
+        affinities={"Personal Ops": 0.8},
+        conversation_name="random group chat",
+        participants=[],
+        message_texts=["Hey what's up"],
+    )
+    via_catalog = infer_project_match(
+        project_catalog=boosted_catalog,
+        conversation_name="random group chat",
+        participants=[],
+        message_texts=["Hey what's up"],
+    )
+
+    assert via_affinities == via_catalog
+    assert via_affinities.project_name == "Personal Ops"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import query_budget
+
+
+def test_fingerprint_collapses_literals_parameters_and_in_lists() -> None:
+    shapes = {
+        query_budget.fingerprint("SELECT * FROM todo WHERE id = $1 AND title = 'a''b'"),
+        query_budget.fingerprint("SELECT *  FROM todo\n WHERE id = 42 AND title = ?"),
+        query_budget.fingerprint("SELECT * FROM todo WHERE id = %(id_1)s AND title = :title"),
+    }
+
+    assert shapes == {"SELECT * FROM todo WHERE id = ? AND title = ?"}
+    assert query_budget.fingerprint("SELECT anon_1.x FROM t WHERE t.id IN (?, ?, ?)") == (
+        "SELECT anon_1.x FROM t WHERE t.id IN (?...)"
+    )
+
+
+def test_repeated_statement_raises_at_the_offending_query(count_queries) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async def _run() -> None:
+        try:
+            async with engine.connect() as conn:
+                for value in range(4):
+                    await conn.execute(text("SELECT :value"), {"value": value})
+        finally:
+            await engine.dispose()
+
+    with count_queries(engine, max_repeats=3, raise_on_exceed=True) as queries:
+        with pytest.raises(query_budget.QueryBudgetExceeded, match="likely N\\+1"):
+            asyncio.run(_run())
+
+    assert queries.repeated() == [("SELECT ?", 4)]
+    assert queries.over_budget
+
+
+def test_budget_scope_logs_over_budget_jobs(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    query_budget.instrument_engine(engine)
+    monkeypatch.setattr(query_budget.settings, "query_budget_enabled", True)
+    monkeypatch.setattr(query_budget.settings, "query_budget_max_statements", 2)
+    warnings: list[tuple] = []
+    monkeypatch.setattr(query_budget.logger, "warning", lambda message, *args: warnings.append(args))
+
+    async def _run() -> None:
+        try:
+            with query_budget.budget_scope("demo_job"):
+                async with engine.connect() as conn:
+                    for _ in range(3):
+                        await conn.execute(text("SELECT 1"))
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+    assert len(warnings) == 1
+    assert warnings[0][:2] == ("demo_job", 3)
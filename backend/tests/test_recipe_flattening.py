@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.nutrition import (
+    NutritionIngredient,
+    NutritionIngredientProfile,
+    NutritionIngredientStatus,
+    NutritionRecipe,
+    NutritionRecipeComponent,
+)
+from app.services.nutrition_ingredients_service import NutritionIngredientsService
+from app.services.nutrition_recipe_expander import expand_recipe_components, materialize_recipes
+from app.services.nutrition_recipes_service import NutritionRecipesService
+
+
+@pytest.fixture
+def session(sqlite_session):
+    return sqlite_session(NutritionIngredientProfile, NutritionIngredient, NutritionRecipe, NutritionRecipeComponent)
+
+
+async def _seed(session: AsyncSession) -> dict[str, int]:
+    ingredients = NutritionIngredientsService(session)
+    recipes = NutritionRecipesService(session)
+    espresso = await ingredients.create_ingredient(
+        name="Espresso", default_unit="shot", source=None, nutrient_values={"calories": 5.0}, owner_user_id=1
+    )
+    milk = await ingredients.create_ingredient(
+        name="Milk", default_unit="cup", source=None,
+        nutrient_values={"calories": 100.0, "protein": 8.0}, owner_user_id=1,
+    )
+    toast = await ingredients.create_ingredient(
+        name="Toast", default_unit="slice", source=None, nutrient_values={"calories": 80.0}, owner_user_id=1
+    )
+    # Two lattes per batch: 2 shots + 1 cup milk.
+    latte = await recipes.create_recipe(
+        name="Latte", default_unit="serving", servings=2, status=NutritionIngredientStatus.CONFIRMED,
+        owner_user_id=1,
+        components=[
+            {"ingredient_id": espresso["id"], "quantity": 2, "unit": "shot"},
+            {"ingredient_id": milk["id"], "quantity": 1, "unit": "cup"},
+        ],
+    )
+    breakfast = await recipes.create_recipe(
+        name="Breakfast", default_unit="serving", servings=1, status=NutritionIngredientStatus.CONFIRMED,
+        owner_user_id=1,
+        components=[
+            {"child_recipe_id": latte["id"], "quantity": 2, "unit": "serving"},
+            {"ingredient_id": toast["id"], "quantity": 1, "unit": "slice"},
+        ],
+    )
+    return {"milk": milk["id"], "latte": latte["id"], "breakfast": breakfast["id"]}
+
+
+def test_nested_recipe_is_flattened_per_serving(session: AsyncSession) -> None:
+    async def _run():
+        ids = await _seed(session)
+        service = NutritionRecipesService(session)
+        listed = {item["name"]: item for item in await service.list_recipes(1)}
+        recipe = await service.recipes_repo.get_recipe(ids["breakfast"], 1, load_components=False)
+        return listed, expand_recipe_components(recipe, servings=2)
+
+    listed, expanded = asyncio.run(_run())
+
+    # Latte per serving: 1 shot + 0.5 cup milk = 5 + 50 kcal.
+    assert listed["Latte"]["derived_nutrients"]["calories"] == pytest.approx(55.0)
+    # Breakfast: 2 lattes + 1 toast = 110 + 80 kcal.
+    assert listed["Breakfast"]["derived_nutrients"]["calories"] == pytest.approx(190.0)
+    assert listed["Breakfast"]["derived_nutrients"]["protein"] == pytest.approx(8.0)
+    assert [(item.ingredient_name, item.quantity, item.unit) for item in expanded] == [
+        ("Espresso", 4.0, "shot"),
+        ("Milk", 2.0, "cup"),
+        ("Toast", 2.0, "slice"),
+    ]
+
+
+def test_ingredient_update_invalidates_ancestors_transitively(session: AsyncSession) -> None:
+    async def _run():
+        ids = await _seed(session)
+        service = NutritionRecipesService(session)
+        await service.list_recipes(1)
+        await NutritionIngredientsService(session).update_ingredient(
+            ids["milk"], owner_user_id=1, nutrient_values={"calories": 60.0}
+        )
+        breakfast = await service.recipes_repo.get_recipe(ids["breakfast"], 1, load_components=False)
+        stale = breakfast.flat_nutrients is None
+        listed = {item["name"]: item for item in await service.list_recipes(1)}
+        recomputed = await materialize_recipes(service.recipes_repo, [breakfast])
+        return stale, listed, recomputed
+
+    stale, listed, recomputed = asyncio.run(_run())
+
+    assert stale
+    assert listed["Latte"]["derived_nutrients"]["calories"] == pytest.approx(35.0)
+    assert listed["Breakfast"]["derived_nutrients"]["calories"] == pytest.approx(150.0)
+    # Listing re-materialized everything, so the lookup is now flat.
+    assert recomputed == 0
+
+
+def test_recipe_without_components_has_no_nutrients(session: AsyncSession) -> None:
+    async def _run():
+        return await NutritionRecipesService(session).create_recipe(
+            name="Empty", default_unit="serving", servings=1, status=NutritionIngredientStatus.UNCONFIRMED,
+            owner_user_id=1, components=[],
+        )
+
+    created = asyncio.run(_run())
+
+    assert set(created["derived_nutrients"].values()) == {None}
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core import auth
+from app.core.session_cache import SessionCache
+from app.db.models.base import Base
+from app.db.models.entities import User, UserSession
+from app.utils.timezone import eastern_now
+
+
+@pytest.fixture
+def login(monkeypatch: pytest.MonkeyPatch):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    loads: list[str] = []
+
+    async def load_session(session, token, *, required):
+        loads.append(token)
+        stmt = (
+            select(UserSession)
+            .options(selectinload(UserSession.user))
+            .where(UserSession.token_hash == auth._hash_token(token))
+        )
+        row = (await session.execute(stmt)).scalar_one_or_none()
+        if row is None or row.revoked_at is not None:
+            raise HTTPException(status_code=401, detail="Session expired")
+        # SQLite drops the offset that the Postgres column keeps.
+        set_committed_value(row, "expires_at", row.expires_at.replace(tzinfo=eastern_now().tzinfo))
+        return row
+
+    async def _setup() -> str:
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[User.__table__, UserSession.__table__])
+            )
+        async with factory() as session:
+            user = User(email="owner@example.com", display_name="Owner")
+            session.add(user)
+            await session.flush()
+            return await auth.create_user_session(session, user=user, remember_me=False)
+
+    token = asyncio.run(_setup())
+    cache = SessionCache(ttl_seconds=60)
+    monkeypatch.setattr(auth, "AsyncSessionLocal", factory)
+    monkeypatch.setattr(auth, "_load_session_from_token", load_session)
+    monkeypatch.setattr(auth, "get_session_cache", lambda: cache)
+    yield token, factory, loads, cache
+    asyncio.run(engine.dispose())
+
+
+def test_repeat_requests_are_served_from_the_cache(login) -> None:
+    token, _, loads, cache = login
+
+    first = asyncio.run(auth._resolve_session(token, required=True))
+    second = asyncio.run(auth._resolve_session(token, required=True))
+
+    assert len(loads) == 1
+    assert second is not first
+    assert (second.id, second.user.email) == (first.id, "owner@example.com")
+    assert inspect(second).detached and inspect(second.user).detached
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5}
+
+
+def test_revoked_session_is_rejected_on_the_next_request(login) -> None:
+    token, factory, loads, cache = login
+    asyncio.run(auth._resolve_session(token, required=True))
+
+    async def _logout() -> None:
+        async with factory() as session:
+            row = await session.get(UserSession, 1)
+            row.revoked_at = eastern_now()
+            await session.commit()
+        cache.revoke(auth._hash_token(token))
+
+    asyncio.run(_logout())
+
+    with pytest.raises(HTTPException):
+        asyncio.run(auth._resolve_session(token, required=True))
+    assert len(loads) == 2
+
+
+def test_cached_entry_never_outlives_the_session(login) -> None:
+    token, _, loads, cache = login
+    asyncio.run(auth._resolve_session(token, required=True))
+    snapshot, _ = cache._entries[auth._hash_token(token)]
+    snapshot.session_values["expires_at"] = eastern_now() - timedelta(seconds=1)
+
+    asyncio.run(auth._resolve_session(token, required=True))
+
+    assert len(loads) == 2
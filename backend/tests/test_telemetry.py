@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core import telemetry
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = telemetry.Registry()
+    histogram = registry.histogram("demo_seconds", "Demo.", ("route",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(3, route="/a")
+    registry.register_collector(lambda: [("demo_entries", "gauge", "Entries.", {"pool": "main"}, 4)])
+
+    lines = registry.render().splitlines()
+
+    assert lines[:2] == ["# HELP demo_seconds Demo.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_sum{route="/a"} 3.55' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+    assert lines[-3:] == ["# HELP demo_entries Entries.", "# TYPE demo_entries gauge", 'demo_entries{pool="main"} 4']
+
+
+def test_middleware_records_route_template_and_sql_per_request() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    telemetry.instrument_engine(engine)
+    telemetry.instrument_engine(engine)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def get_db():
+        async with session_factory() as session:
+            yield session
+
+    app = FastAPI()
+    app.add_middleware(telemetry.TelemetryMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int, db: AsyncSession = Depends(get_db)) -> dict[str, int]:
+        for _ in range(3):
+            await db.execute(text("SELECT 1"))
+        return {"id": item_id}
+
+    route = "/items/{item_id}"
+    before_requests = telemetry.HTTP_REQUEST_SECONDS.count(method="GET", route=route, status=200)
+    before_queries = telemetry.HTTP_REQUEST_DB_QUERIES.total(route=route)
+    before_missing = telemetry.HTTP_REQUEST_SECONDS.count(method="GET", route="unmatched", status=404)
+
+    async def _run() -> None:
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                assert (await client.get("/items/1")).status_code == 200
+                assert (await client.get("/items/2")).status_code == 200
+                assert (await client.get("/nope")).status_code == 404
+        finally:
+            await engine.dispose()
+
+    asyncio.run(_run())
+
+    assert telemetry.HTTP_REQUEST_SECONDS.count(method="GET", route=route, status=200) == before_requests + 2
+    # Each listener is installed once, so every statement is counted once.
+    assert telemetry.HTTP_REQUEST_DB_QUERIES.total(route=route) == before_queries + 6
+    assert telemetry.HTTP_REQUEST_SECONDS.count(method="GET", route="unmatched", status=404) == before_missing + 1
+    assert 'http_request_duration_seconds_count{method="GET",route="/items/{item_id}",status="200"}' in telemetry.render()
+
+
+def test_llm_and_job_recorders() -> None:
+    telemetry.record_llm_call("telemetry_test", "gpt-test", 1.5, failed=False)
+    telemetry.record_llm_call("telemetry_test", "gpt-test", 0.2, failed=True)
+    telemetry.record_llm_tokens("telemetry_test", "gpt-test", 120, 30)
+    telemetry.record_job("telemetry_test_job", 2.0, failed=False)
+
+    assert telemetry.LLM_CALL_SECONDS.count(feature="telemetry_test", model="gpt-test", outcome="ok") == 1
+    assert telemetry.LLM_CALL_SECONDS.count(feature="telemetry_test", model="gpt-test", outcome="error") == 1
+    assert telemetry.LLM_TOKENS.value(feature="telemetry_test", model="gpt-test", direction="input") == 120
+    assert telemetry.LLM_TOKENS.value(feature="telemetry_test", model="gpt-test", direction="output") == 30
+    assert telemetry.JOB_SECONDS.total(job="telemetry_test_job", outcome="ok") == 2.0
@@ -24,7 +24,7 @@ def test_build_title_formats_prompt_without_key_error(monkeypatch: pytest.Monkey
 
     monkeypatch.setattr(
         "app.services.todo_calendar_title_agent.OpenAIResponsesClient",
-        lambda: FakeClient(),
+        lambda **kwargs: FakeClient(),
     )
 
     agent = TodoCalendarTitleAgent(max_length=12, max_details_length=40)
@@ -74,3 +74,39 @@ def test_is_autogenerated_project_tasks_block_payload_preserves_user_created_tas
         },
         tasks_database_id=3002,
     ) is False
+
+
+def test_build_breadcrumbs_walks_ancestors_in_one_query(count_queries) -> None:
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db.models.base import Base
+    from app.db.models.workspace import WorkspacePage
+
+    async def _run():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=[WorkspacePage.__table__]))
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                parent_id = None
+                for page_id, title in enumerate(["Home", "Projects", "Launch", "Brief"], start=1):
+                    session.add(WorkspacePage(id=page_id, user_id=1, parent_page_id=parent_id, title=title))
+                    parent_id = page_id
+                session.add(WorkspacePage(id=9, user_id=2, parent_page_id=None, title="Someone else"))
+                await session.commit()
+                leaf = await session.get(WorkspacePage, 4)
+                service = WorkspaceService(session)
+                with count_queries(engine) as queries:
+                    breadcrumbs = await service._build_breadcrumbs(leaf)
+                    root_breadcrumbs = await service._build_breadcrumbs(await session.get(WorkspacePage, 1))
+        finally:
+            await engine.dispose()
+        return breadcrumbs, root_breadcrumbs, queries
+
+    breadcrumbs, root_breadcrumbs, queries = asyncio.run(_run())
+
+    assert [page.title for page in breadcrumbs] == ["Home", "Projects", "Launch"]
+    assert root_breadcrumbs == []
+    assert queries.statements == 1
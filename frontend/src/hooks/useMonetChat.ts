@@ -275,11 +275,13 @@ export function useMonetChat() {
         { id: crypto.randomUUID(), role: 'user' as const, text: trimmed },
         { id: pendingId, role: 'assistant' as const, text: '', status: 'pending' as const }
       ].slice(-MAX_HISTORY);
+      // The server only remembers chats whose session id the client supplies.
+      const nextSessionId = baseState.sessionId ?? crypto.randomUUID();
       activeDayKeyRef.current = currentDayKey;
       setDayKey(currentDayKey);
-      setSessionId(baseState.sessionId);
+      setSessionId(nextSessionId);
       setHistory(nextHistory);
-      await mutation.mutateAsync({ message: trimmed, pendingId, sessionIdOverride: baseState.sessionId });
+      await mutation.mutateAsync({ message: trimmed, pendingId, sessionIdOverride: nextSessionId });
       return;
     }
 
@@ -291,7 +293,9 @@ export function useMonetChat() {
       ];
       return next.slice(-MAX_HISTORY);
     });
-    await mutation.mutateAsync({ message: trimmed, pendingId, sessionIdOverride: sessionId });
+    const activeSessionId = sessionId ?? crypto.randomUUID();
+    setSessionId(activeSessionId);
+    await mutation.mutateAsync({ message: trimmed, pendingId, sessionIdOverride: activeSessionId });
   };
 
   return {
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark per-day nutrient totals: ORM load + Python loop vs SQL GROUP BY.
+
+Seeds a year of synthetic intake logs into an in-memory SQLite database, so it
+never touches real data.
+
+Usage:
+    python scripts/benchmark_nutrient_aggregation.py
+    python scripts/benchmark_nutrient_aggregation.py --days 365 --per-day 12 --foods 200 --iterations 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+import random
+import sys
+import time
+
+from dotenv import load_dotenv
+
+
+ROOT = Path(__file__).resolve().parents[1]
+load_dotenv(ROOT / ".env")
+
+sys.path.append(str(ROOT / "backend"))
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+
+from app.db.models.base import Base  # type: ignore  # noqa: E402
+from app.db.models.nutrition import (  # type: ignore  # noqa: E402
+    NUTRIENT_DEFINITIONS,
+    NutritionIngredient,
+    NutritionIngredientProfile,
+    NutritionIntake,
+    NutritionIntakeSource,
+    NutritionRecipe,
+)
+from app.db.repositories.nutrition_intake_repository import NutritionIntakeRepository  # type: ignore  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare Python-loop and SQL nutrient aggregation.")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--per-day", type=int, default=12, help="Intake entries logged per day.")
+    parser.add_argument("--foods", type=int, default=200)
+    parser.add_argument("--iterations", type=int, default=5)
+    return parser.parse_args()
+
+
+async def seed(session: AsyncSession, *, days: int, per_day: int, foods: int, start: date) -> None:
+    rng = random.Random(7)
+    ingredients = []
+    for index in range(foods):
+        values = {
+            definition.column_name: (rng.uniform(0, 50) if rng.random() > 0.2 else None)
+            for definition in NUTRIENT_DEFINITIONS
+        }
+        ingredient = NutritionIngredient(
+            name=f"Food {index}", default_unit="serving", owner_user_id=1,
+            profile=NutritionIngredientProfile(**values),
+        )
+        session.add(ingredient)
+        ingredients.append(ingredient)
+    await session.flush()
+    for offset in range(days):
+        for _ in range(per_day):
+            session.add(
+                NutritionIntake(
+                    user_id=1,
+                    ingredient_id=rng.choice(ingredients).id,
+                    quantity=rng.uniform(0.5, 3),
+                    unit="serving",
+                    day_date=start + timedelta(days=offset),
+                    source=NutritionIntakeSource.MANUAL,
+                )
+            )
+    await session.commit()
+
+
+async def loop_totals(repo: NutritionIntakeRepository, start: date, end: date) -> dict[date, dict[str, float]]:
+    """The previous implementation: load every intake with its profile and sum in Python."""
+    totals: dict[date, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    for intake in await repo.fetch_between(1, start, end):
+        bucket = totals[intake.day_date]
+        profile = intake.ingredient.profile
+        for definition in NUTRIENT_DEFINITIONS:
+            value = getattr(profile, definition.column_name)
+            if value is not None:
+                bucket[definition.slug] += value * intake.quantity
+    return totals
+
+
+async def timed(label: str, iterations: int, make_call) -> float:
+    await make_call()  # warm up
+    began = time.perf_counter()
+    for _ in range(iterations):
+        await make_call()
+    avg_ms = (time.perf_counter() - began) / iterations * 1000
+    print(f"  {label:<28} {avg_ms:8.2f} ms")
+    return avg_ms
+
+
+async def main() -> None:
+    args = parse_args()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    tables = [
+        NutritionIngredientProfile.__table__,
+        NutritionIngredient.__table__,
+        NutritionRecipe.__table__,
+        NutritionIntake.__table__,
+    ]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=tables))
+
+    end = date.today()
+    start = end - timedelta(days=args.days - 1)
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        await seed(session, days=args.days, per_day=args.per_day, foods=args.foods, start=start)
+        repo = NutritionIntakeRepository(session)
+        print(f"{args.days * args.per_day} intakes over {args.days} days, {len(NUTRIENT_DEFINITIONS)} nutrients")
+
+        for window in (1, 14, args.days):
+            window_start = end - timedelta(days=window - 1)
+            print(f"\nWindow: {window} day(s)")
+
+            async def _loop():
+                session.expunge_all()
+                return await loop_totals(repo, window_start, end)
+
+            async def _sql():
+                return await repo.sum_nutrients_by_day(1, window_start, end)
+
+            loop_ms = await timed("ORM load + Python loop", args.iterations, _loop)
+            sql_ms = await timed("SQL GROUP BY day_date", args.iterations, _sql)
+            print(f"  speedup: {loop_ms / sql_ms:.1f}x" if sql_ms else "")
+
+            loop_result, sql_result = await _loop(), await _sql()
+            drift = max(
+                (abs(loop_result[day][slug] - sql_result[day][slug]) for day in sql_result for slug in sql_result[day]),
+                default=0.0,
+            )
+            print(f"  max abs difference: {drift:.2e}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,95 +1,247 @@
 #!/usr/bin/env python3
-"""Benchmark the speed improvements."""
-
+"""Reproducible backend benchmark suite.
+
+Seeds a deterministic synthetic dataset into a throwaway database and times
+the hot paths end to end:
+
+- Garmin ingest
+- workspace bootstrap, rows, search and legacy sync
+- iMessage backlog loading and processing
+- nutrition summaries
+- calendar listing
+- todo and metric listing
+
+Garmin and OpenAI are replaced by in-process stubs with a fixed latency per
+call. Each scenario reports wall-clock statistics and the number of SQL
+statements per round. Results can be written as JSON and compared against an
+earlier run, so numbers are comparable across commits.
+
+By default the suite runs on a temporary SQLite file. Pass ``--database-url``
+with a local Postgres database whose name contains ``bench``. That database
+is dropped and recreated on every run, so never point it at real data.
+``.env`` is not read.
+
+Usage:
+    python scripts/benchmark_speed.py
+    python scripts/benchmark_speed.py --scale 0.1 --rounds 3
+    python scripts/benchmark_speed.py --json bench/main.json
+    python scripts/benchmark_speed.py --json bench/branch.json --compare bench/main.json
+    python scripts/benchmark_speed.py --database-url postgresql+asyncpg://postgres@localhost/life_bench --filter workspace
+"""
+from __future__ import annotations
+
+import argparse
 import asyncio
-import time
+import json
 import os
+import platform
+import statistics
+import subprocess
 import sys
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from app.db.session import AsyncSessionLocal, engine
-from app.db.repositories.todo_repository import TodoRepository
-from app.db.repositories.metrics_repository import MetricsRepository
-from datetime import datetime, timedelta, timezone
-
-async def benchmark_todo_query():
-    """Benchmark todo list query with eager loading."""
-    async with AsyncSessionLocal() as session:
-        repo = TodoRepository(session)
-
-        # Warm up
-        await repo.list_for_user(1)
-
-        # Benchmark
-        iterations = 10
-        start = time.time()
-        for _ in range(iterations):
-            todos = await repo.list_for_user(1)
-            # Access related data to ensure eager loading works
-            for todo in todos[:10]:
-                _ = todo.project
-
-        elapsed = time.time() - start
-        avg_time = (elapsed / iterations) * 1000  # ms
-
-        print(f"✓ Todo list query (with eager loading):")
-        print(f"  Average time: {avg_time:.2f}ms per request")
-        print(f"  Todos returned: {len(todos)}")
-
-        return avg_time
-
-async def benchmark_metrics_query():
-    """Benchmark metrics query with caching."""
-    async with AsyncSessionLocal() as session:
-        repo = MetricsRepository(session)
-        cutoff = datetime.now(timezone.utc) - timedelta(days=14)
-
-        # First call (cold cache)
-        start = time.time()
-        await repo.list_metrics_since(1, cutoff)
-        cold_time = (time.time() - start) * 1000
-
-        # Second call (warm cache - simulated since we're not using the router)
-        start = time.time()
-        await repo.list_metrics_since(1, cutoff)
-        warm_time = (time.time() - start) * 1000
-
-        print(f"\n✓ Metrics query:")
-        print(f"  Cold cache: {cold_time:.2f}ms")
-        print(f"  Warm cache: {warm_time:.2f}ms")
-        print(f"  Speed improvement: {((cold_time - warm_time) / cold_time * 100):.1f}%")
-
-        return cold_time, warm_time
-
-async def main():
-    print("=" * 60)
-    print("PERFORMANCE BENCHMARK RESULTS")
-    print("=" * 60)
-    print()
-
-    todo_time = await benchmark_todo_query()
-    metrics_cold, metrics_warm = await benchmark_metrics_query()
-
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
-
-    # Performance expectations for a personal app
-    if todo_time < 100:  # Under 100ms is excellent
-        print("✅ Todo queries are FAST (<100ms)")
-    elif todo_time < 200:  # Under 200ms is good
-        print("✅ Todo queries are good (<200ms)")
-    else:
-        print("⚠️ Todo queries might need optimization (>200ms)")
-
-    if metrics_warm < metrics_cold * 0.5:  # 50% improvement with cache
-        print("✅ Caching is providing significant speedup")
-    else:
-        print("⚠️ Caching improvement is minimal")
-
-    print(f"\n🚀 Overall performance is optimized for personal use!")
-
-    await engine.dispose()
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+SCHEMA_VERSION = 1
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Throwaway database (name must contain 'bench'); default: temp SQLite.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every dataset size by this factor.")
+    parser.add_argument("--seed", type=int, default=None, help="Dataset and stub seed.")
+    parser.add_argument("--rounds", type=int, default=10, help="Timed rounds per scenario.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed rounds per scenario.")
+    parser.add_argument("--filter", default="", help="Only run scenarios whose name contains this text.")
+    parser.add_argument("--llm-latency-ms", type=float, default=50.0, help="Stubbed latency per LLM call.")
+    parser.add_argument("--garmin-latency-ms", type=float, default=20.0, help="Stubbed latency per Garmin call.")
+    parser.add_argument("--json", type=Path, help="Write results to this file.")
+    parser.add_argument("--compare", type=Path, help="Earlier --json results to diff against.")
+    return parser.parse_args()
+
+
+def configure_environment(database_url: str) -> None:
+    """Point the app at the benchmark database; must run before any ``app`` import."""
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["DATABASE_REPLICA_URL"] = ""
+    os.environ["DATABASE_POOL_PROFILE"] = "script"
+    os.environ["QUERY_BUDGET_ENABLED"] = "false"
+    for name, value in {
+        "ADMIN_EMAIL": "benchmark@example.com",
+        "FRONTEND_URL": "http://localhost:5173",
+        "GARMIN_PASSWORD_ENCRYPTION_KEY": "benchmark",
+        "OPENAI_API_KEY": "benchmark",
+    }.items():
+        os.environ.setdefault(name, value)
+    sys.path.append(str(ROOT / "backend"))
+    sys.path.append(str(ROOT / "scripts"))
+
+
+def check_database_url(database_url: str) -> None:
+    if database_url.startswith("sqlite"):
+        return
+    database_name = urlsplit(database_url).path.rsplit("/", 1)[-1]
+    if "bench" not in database_name:
+        raise SystemExit(
+            f"Refusing to benchmark against {database_name!r}: the suite drops every table. "
+            "Use a throwaway database whose name contains 'bench'."
+        )
+
+
+def redact(database_url: str) -> str:
+    parts = urlsplit(database_url)
+    if parts.password:
+        return database_url.replace(f":{parts.password}@", ":***@", 1)
+    return database_url
+
+
+def git_revision() -> dict[str, Any]:
+    def _git(*args: str) -> str:
+        result = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=False)
+        return result.stdout.strip()
+
+    return {"commit": _git("rev-parse", "HEAD") or None, "dirty": bool(_git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+    p95_index = min(len(ordered) - 1, max(0, round(0.95 * len(ordered)) - 1))
+    return {
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "median_ms": statistics.median(ordered) * 1000,
+        "stddev_ms": (statistics.stdev(ordered) if len(ordered) > 1 else 0.0) * 1000,
+        "p95_ms": ordered[p95_index] * 1000,
+    }
+
+
+async def time_scenarios(args: argparse.Namespace, suite: Any, ctx: Any, query_budget: Any) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    print(HEADER)
+    for item in suite.SCENARIOS:
+        if args.filter and args.filter not in item.name:
+            continue
+        rounds = min(args.rounds, item.max_rounds or args.rounds)
+        for _ in range(args.warmup):
+            await item.run(ctx)
+        samples: list[float] = []
+        statements: list[int] = []
+        for _ in range(rounds):
+            with query_budget.track_queries(item.name) as queries:
+                started = time.perf_counter()
+                await item.run(ctx)
+                samples.append(time.perf_counter() - started)
+            statements.append(queries.statements)
+        result = {
+            "name": item.name,
+            "group": item.group,
+            "rounds": rounds,
+            **summarize(samples),
+            "statements": statistics.median(statements),
+        }
+        results.append(result)
+        print(format_row(result), flush=True)
+    return results
+
+
+async def run_scenarios(args: argparse.Namespace, database_url: str) -> dict[str, Any]:
+    from loguru import logger
+
+    import benchmark_suite as suite
+    from app.core import query_budget
+    from app.db.session import engine
+
+    # Request and ingest logging would dominate the terminal and the timings.
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+    query_budget.instrument_engine(engine)
+
+    spec = suite.DatasetSpec() if args.seed is None else suite.DatasetSpec(seed=args.seed)
+    spec = spec.scaled(args.scale)
+    latency = suite.StubLatency(llm_seconds=args.llm_latency_ms / 1000, garmin_seconds=args.garmin_latency_ms / 1000)
+
+    try:
+        print(f"Seeding {engine.dialect.name} dataset (scale {args.scale:g}, seed {spec.seed})...", flush=True)
+        started = time.perf_counter()
+        ctx, counts = await suite.prepare(spec, latency)
+        seed_seconds = time.perf_counter() - started
+        print(f"Seeded in {seed_seconds:.1f}s: " + ", ".join(f"{k}={v}" for k, v in counts.items() if k != "user_id"))
+        try:
+            results = await time_scenarios(args, suite, ctx, query_budget)
+        finally:
+            await suite.close(ctx)
+    finally:
+        # aiosqlite connections run on threads that keep the process alive until disposed.
+        await engine.dispose()
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git_revision(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "database": {"dialect": engine.dialect.name, "url": redact(database_url)},
+        "dataset": {**suite.describe(spec, latency), "counts": counts},
+        "config": {"rounds": args.rounds, "warmup": args.warmup, "filter": args.filter or None},
+        "seed_seconds": round(seed_seconds, 3),
+        "benchmarks": results,
+    }
+
+
+HEADER = f"{'scenario':<32} {'rounds':>6} {'median':>10} {'mean':>10} {'p95':>10} {'stddev':>9} {'SQL':>6}"
+
+
+def format_row(result: dict[str, Any]) -> str:
+    return (
+        f"{result['name']:<32} {result['rounds']:>6} {result['median_ms']:>8.2f}ms {result['mean_ms']:>8.2f}ms "
+        f"{result['p95_ms']:>8.2f}ms {result['stddev_ms']:>7.2f}ms {result['statements']:>6g}"
+    )
+
+
+def print_comparison(current: dict[str, Any], baseline: dict[str, Any]) -> None:
+    previous = {item["name"]: item for item in baseline.get("benchmarks", [])}
+    base_commit = (baseline.get("git") or {}).get("commit") or "unknown"
+    print(f"\nCompared with {base_commit[:12]} ({baseline.get('created_at', 'unknown date')}):")
+    baseline_dataset = baseline.get("dataset", {})
+    if any(baseline_dataset.get(key) != current["dataset"][key] for key in ("spec", "stub_latency")):
+        print("  warning: the baseline used a different dataset or stub latency; deltas are not comparable.")
+    print(f"{'scenario':<32} {'median':>10} {'baseline':>10} {'change':>8} {'SQL':>6} {'baseline':>8}")
+    for item in current["benchmarks"]:
+        before = previous.get(item["name"])
+        if before is None:
+            print(f"{item['name']:<32} {item['median_ms']:>8.2f}ms {'new':>10}")
+            continue
+        change = (item["median_ms"] - before["median_ms"]) / before["median_ms"] * 100 if before["median_ms"] else 0.0
+        print(
+            f"{item['name']:<32} {item['median_ms']:>8.2f}ms {before['median_ms']:>8.2f}ms {change:>+7.1f}% "
+            f"{item['statements']:>6g} {before['statements']:>8g}"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    with tempfile.TemporaryDirectory(prefix="life-dashboard-bench-") as scratch:
+        database_url = args.database_url or f"sqlite+aiosqlite:///{Path(scratch) / 'benchmark.db'}"
+        check_database_url(database_url)
+        configure_environment(database_url)
+        report = asyncio.run(run_scenarios(args, database_url))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nWrote {args.json}")
+    if baseline is not None:
+        print_comparison(report, baseline)
+
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
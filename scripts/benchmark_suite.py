@@ -0,0 +1,677 @@
+"""Dataset, stubs and scenarios for ``benchmark_speed.py``.
+
+Imported by ``benchmark_speed.py`` once it has pointed ``DATABASE_URL`` at the
+benchmark database, so the app's engine, sessions and routers all run against
+the synthetic data. Do not import it directly.
+
+Everything is derived from ``DatasetSpec.seed`` and ``DatasetSpec.anchor``:
+two runs with the same spec seed the same rows and issue the same stubbed
+Garmin and LLM responses whatever day they run on, so timings and statement
+counts are comparable across commits. The app's Eastern clock is pinned to the
+anchor date for the run; code that reads ``datetime.now`` directly (run
+timestamps, the todo overdue bucket) still sees the real clock.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+
+import app.db.models  # noqa: F401  # registers every table on Base.metadata
+from app.clients import llm_gateway, openai_client
+from app.core.auth import get_current_user
+from app.db.models.base import Base
+from app.db.models.calendar import CalendarEvent, GoogleCalendar
+from app.db.models.entities import Activity, DailyMetric, User
+from app.db.models.imessage import IMessageConversation, IMessageMessage, IMessageParticipant
+from app.db.models.nutrition import (
+    NUTRIENT_DEFINITIONS,
+    NutritionIngredient,
+    NutritionIngredientProfile,
+    NutritionIntake,
+    NutritionIntakeSource,
+)
+from app.db.models.project import Project
+from app.db.models.todo import TodoItem
+from app.db.models.workspace import WorkspacePage
+from app.db.repositories.metrics_repository import MetricsRepository
+from app.db.repositories.todo_repository import TodoRepository
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.services.imessage_processing_service import IMessageProcessingService, PendingCursor
+from app.services.metrics_service import MetricsService
+from app.services.workspace_service import TASKS_DB_KEY, WorkspaceService
+from app.utils import timezone as app_timezone
+
+BENCH_USER_EMAIL = "benchmark@example.com"
+
+
+# The SQLite stand-in stores the few Postgres-only column types as JSON.
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_for_sqlite(type_: Any, compiler: Any, **kw: Any) -> str:
+    return "JSON"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_for_sqlite(type_: Any, compiler: Any, **kw: Any) -> str:
+    return "JSON"
+
+
+# Shape parameters keep their value when the dataset is scaled.
+_UNSCALED = {"seed", "anchor", "intakes_per_day", "calendars"}
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    seed: int = 20260101
+    # The dataset's "today": rows are seeded relative to it and the app clock is pinned to it.
+    anchor: date = date(2026, 1, 1)
+    metric_days: int = 3 * 365
+    projects: int = 40
+    todos: int = 2000
+    conversations: int = 150
+    messages: int = 20_000
+    foods: int = 300
+    intake_days: int = 2 * 365
+    intakes_per_day: int = 10
+    calendars: int = 3
+    events: int = 6000
+
+    def scaled(self, factor: float) -> DatasetSpec:
+        if factor == 1:
+            return self
+        sizes = {
+            item.name: max(1, round(getattr(self, item.name) * factor))
+            for item in fields(self)
+            if item.name not in _UNSCALED
+        }
+        return replace(self, **sizes)
+
+
+@dataclass(frozen=True)
+class StubLatency:
+    llm_seconds: float = 0.05
+    garmin_seconds: float = 0.02
+
+
+# ---------------------------------------------------------------------------
+# Deterministic values
+# ---------------------------------------------------------------------------
+def _day_rng(seed: int, day: date, salt: int = 0) -> random.Random:
+    return random.Random(seed * 1_000_003 + day.toordinal() * 31 + salt)
+
+
+def _daily_values(seed: int, day: date) -> dict[str, float | int]:
+    rng = _day_rng(seed, day)
+    return {
+        "hrv": round(rng.gauss(62, 9), 1),
+        "rhr": round(rng.gauss(52, 3), 1),
+        "sleep_seconds": int(rng.gauss(7.4, 0.8) * 3600),
+        "load": round(max(0.0, rng.gauss(85, 35)), 1),
+        "active_kcal": round(max(0.0, rng.gauss(650, 200))),
+        "bmr_kcal": 1750,
+    }
+
+
+def _activities_on(seed: int, day: date) -> list[dict[str, Any]]:
+    rng = _day_rng(seed, day, salt=1)
+    if rng.random() < 0.35:
+        return []
+    duration = round(rng.uniform(1200, 5400))
+    return [
+        {
+            "activityId": day.toordinal() * 10,
+            "activityName": rng.choice(["Morning Run", "Lunch Ride", "Evening Lift", "Trail Run"]),
+            "activityType": {"typeKey": rng.choice(["running", "cycling", "strength_training"])},
+            "startTimeLocal": f"{day.isoformat()}T07:{rng.randint(0, 59):02d}:00",
+            "duration": duration,
+            "distance": round(duration * rng.uniform(2.2, 4.5), 1),
+            "calories": round(duration / 6),
+            "activityTrainingLoad": round(rng.uniform(30, 180), 1),
+        }
+    ]
+
+
+_SUBJECTS = [
+    "permit packet", "quarterly report", "launch brief", "tax documents", "grocery order", "dentist appointment",
+    "flight to Denver", "kitchen remodel quote", "Forest Fire roadmap", "Splitwise settlement", "birthday dinner",
+    "insurance claim", "conference talk", "car registration", "lease renewal", "team offsite",
+]
+_MESSAGE_TEMPLATES = [
+    "Can you send the {subject} by {weekday}?",
+    "I'll take care of the {subject} tomorrow.",
+    "Done with the {subject}, just sent it over.",
+    "Dinner {weekday} at seven? We can talk about the {subject}.",
+    "Any update on the {subject}?",
+    "Reminder: the {subject} is due {weekday}.",
+    "lol yes",
+    "Sounds good, thanks!",
+    "Booked it for {weekday} at 3pm.",
+    "Let's move the {subject} to next week.",
+]
+_WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+_FIRST_NAMES = ["Alice", "Bob", "Carmen", "Dev", "Elena", "Farid", "Grace", "Hiro", "Ines", "Jonah", "Kai", "Lena"]
+
+
+# ---------------------------------------------------------------------------
+# Stubs
+# ---------------------------------------------------------------------------
+class StubGarminClient:
+    """Garmin client returning deterministic payloads after a fixed delay per call."""
+
+    def __init__(self, seed: int, latency: float, anchor: date) -> None:
+        self.seed = seed
+        self.latency = latency
+        self.anchor = anchor
+
+    def _days(self, start_date: date, end_date: date) -> list[date]:
+        time.sleep(self.latency)
+        return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+    def fetch_recent_activities(self, cutoff: datetime) -> list[dict[str, Any]]:
+        return [item for day in self._days(cutoff.date(), self.anchor) for item in _activities_on(self.seed, day)]
+
+    def fetch_daily_hrv(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        return [
+            {"calendarDate": day.isoformat(), "lastNightAvg": _daily_values(self.seed, day)["hrv"]}
+            for day in self._days(start_date, end_date)
+        ]
+
+    def fetch_daily_rhr(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        return [
+            {"calendarDate": day.isoformat(), "restingHeartRate": _daily_values(self.seed, day)["rhr"]}
+            for day in self._days(start_date, end_date)
+        ]
+
+    def fetch_sleep(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        return [
+            {"calendarDate": day.isoformat(), "sleepTimeSeconds": _daily_values(self.seed, day)["sleep_seconds"]}
+            for day in self._days(start_date, end_date)
+        ]
+
+    def fetch_training_loads(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        return [
+            {"calendarDate": day.isoformat(), "trainingLoad": _daily_values(self.seed, day)["load"]}
+            for day in self._days(start_date, end_date)
+        ]
+
+    def fetch_daily_energy(self, start_date: date, end_date: date) -> list[dict[str, Any]]:
+        payload = []
+        for day in self._days(start_date, end_date):
+            values = _daily_values(self.seed, day)
+            payload.append(
+                {
+                    "calendarDate": day.isoformat(),
+                    "activeKilocalories": values["active_kcal"],
+                    "bmrKilocalories": values["bmr_kcal"],
+                    "totalKilocalories": values["active_kcal"] + values["bmr_kcal"],
+                }
+            )
+        return payload
+
+
+# Smallest valid structured output per schema; the pipeline then takes its
+# no-op path, so every run does the same database work.
+_CANNED_OUTPUTS: dict[str, dict[str, Any]] = {
+    "IMessageProjectInferenceOutput": {"reason": "benchmark stub"},
+    "IMessageActionJudgeOutput": {"project_inference": {"approved": False, "reason": "benchmark stub"}},
+    "IMessageDedupDecisionOutput": {"is_duplicate": False, "reason": "benchmark stub"},
+    "IMessagePageSelectionOutput": {"mode": "skip", "reason": "benchmark stub"},
+}
+
+
+class _StubResponses:
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def parse(self, *, text_format: Any, input: Any = None, **kwargs: Any) -> Any:  # noqa: A002
+        await asyncio.sleep(self.latency)
+        parsed = text_format.model_validate(_CANNED_OUTPUTS.get(text_format.__name__, {}))
+        return SimpleNamespace(output_parsed=parsed, output_text="", usage=self._usage(input))
+
+    async def create(self, *, input: Any = None, **kwargs: Any) -> Any:  # noqa: A002
+        await asyncio.sleep(self.latency)
+        return SimpleNamespace(output_text="Benchmark stub response.", usage=self._usage(input))
+
+    @staticmethod
+    def _usage(prompt: Any) -> Any:
+        return SimpleNamespace(input_tokens=len(str(prompt)) // 4, output_tokens=40, total_tokens=len(str(prompt)) // 4 + 40)
+
+
+def install_llm_stub(latency: float) -> None:
+    """Route every OpenAI call in the process to a canned client with ``latency`` per call."""
+    openai_client._shared_client = SimpleNamespace(responses=_StubResponses(latency))  # type: ignore[assignment]
+    # No usage flushes: they would write LLM counters into the benchmark database mid-run.
+    llm_gateway._gateway = llm_gateway.LLMGateway(flush_interval_seconds=0)
+
+
+def pin_clock(anchor: date) -> None:
+    """Make ``eastern_now`` and ``eastern_today`` report ``anchor``, keeping the real time of day."""
+    shift = anchor - app_timezone.eastern_today()
+
+    class _AnchoredDatetime(datetime):
+        @classmethod
+        def now(cls, tz: Any = None) -> datetime:  # type: ignore[override]
+            return datetime.now(tz) + shift
+
+    app_timezone.datetime = _AnchoredDatetime  # type: ignore[misc]
+
+
+# ---------------------------------------------------------------------------
+# Schema and dataset
+# ---------------------------------------------------------------------------
+async def reset_schema() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _insert_returning_ids(session: AsyncSession, model: Any, rows: list[dict[str, Any]]) -> list[int]:
+    result = await session.execute(insert(model).returning(model.id, sort_by_parameter_order=True), rows)
+    return list(result.scalars().all())
+
+
+async def seed_dataset(spec: DatasetSpec) -> dict[str, int]:
+    anchor = spec.anchor
+    rng = random.Random(spec.seed)
+    counts: dict[str, int] = {}
+    async with AsyncSessionLocal() as session:
+        [user_id] = await _insert_returning_ids(
+            session, User, [{"email": BENCH_USER_EMAIL, "display_name": "Benchmark", "email_verified": True}]
+        )
+        counts.update(await _seed_metrics(session, spec, user_id, anchor))
+        counts.update(await _seed_todos(session, spec, rng, user_id, anchor))
+        counts.update(await _seed_imessages(session, spec, rng, user_id, anchor))
+        counts.update(await _seed_nutrition(session, spec, rng, user_id, anchor))
+        counts.update(await _seed_calendar(session, spec, rng, user_id, anchor))
+        await session.commit()
+    # The workspace is built from the legacy projects and todos by the app itself.
+    async with AsyncSessionLocal() as session:
+        await WorkspaceService(session).ensure_workspace(user_id)
+        await session.commit()
+        counts["workspace_pages"] = await session.scalar(
+            select(func.count()).select_from(WorkspacePage).where(WorkspacePage.user_id == user_id)
+        )
+    counts["user_id"] = user_id
+    return counts
+
+
+async def _seed_metrics(session: AsyncSession, spec: DatasetSpec, user_id: int, anchor: date) -> dict[str, int]:
+    metric_rows: list[dict[str, Any]] = []
+    activity_rows: list[dict[str, Any]] = []
+    for offset in range(spec.metric_days, 0, -1):
+        day = anchor - timedelta(days=offset)
+        values = _daily_values(spec.seed, day)
+        metric_rows.append(
+            {
+                "user_id": user_id,
+                # Core inserts take the column attribute, not the ``metric_date`` synonym.
+                "id": day,
+                "hrv_avg_ms": values["hrv"],
+                "rhr_bpm": values["rhr"],
+                "sleep_seconds": values["sleep_seconds"],
+                "training_load": values["load"],
+            }
+        )
+        for activity in _activities_on(spec.seed, day):
+            activity_rows.append(
+                {
+                    "user_id": user_id,
+                    "garmin_id": activity["activityId"],
+                    "name": activity["activityName"],
+                    "type": activity["activityType"]["typeKey"],
+                    "start_time": datetime.fromisoformat(activity["startTimeLocal"]),
+                    "duration_sec": activity["duration"],
+                    "distance_m": activity["distance"],
+                    "calories": activity["calories"],
+                    "raw_payload": activity,
+                }
+            )
+    await session.execute(insert(DailyMetric), metric_rows)
+    if activity_rows:
+        await session.execute(insert(Activity), activity_rows)
+    await session.flush()
+    await MetricsRepository(session).refresh_rollups(user_id, [row["id"] for row in metric_rows])
+    return {"daily_metrics": len(metric_rows), "activities": len(activity_rows)}
+
+
+async def _seed_todos(
+    session: AsyncSession, spec: DatasetSpec, rng: random.Random, user_id: int, anchor: date
+) -> dict[str, int]:
+    project_ids = await _insert_returning_ids(
+        session,
+        Project,
+        [
+            {
+                "user_id": user_id,
+                "name": f"{_SUBJECTS[index % len(_SUBJECTS)].title()} {index}",
+                "notes": f"Everything about the {_SUBJECTS[index % len(_SUBJECTS)]}.",
+                "archived": index % 10 == 9,
+                "sort_order": index,
+            }
+            for index in range(spec.projects)
+        ],
+    )
+    now = datetime.combine(anchor, datetime.min.time(), tzinfo=timezone.utc)
+    todo_rows = []
+    for index in range(spec.todos):
+        created = now - timedelta(hours=rng.randint(1, 24 * 365))
+        completed = rng.random() < 0.6
+        completed_at = created + timedelta(hours=rng.randint(1, 72)) if completed else None
+        todo_rows.append(
+            {
+                "user_id": user_id,
+                "project_id": project_ids[index % len(project_ids)],
+                "text": rng.choice(_MESSAGE_TEMPLATES).format(
+                    subject=rng.choice(_SUBJECTS), weekday=rng.choice(_WEEKDAYS)
+                )[:500],
+                "completed": completed,
+                "completed_at_utc": completed_at,
+                "completed_local_date": completed_at.date() if completed_at else None,
+                "deadline_utc": created + timedelta(days=rng.randint(1, 30)) if rng.random() < 0.4 else None,
+                "time_horizon": rng.choice(["this_week", "this_month", "this_year"]),
+                "created_at": created,
+            }
+        )
+    await session.execute(insert(TodoItem), todo_rows)
+    return {"projects": len(project_ids), "todos": len(todo_rows)}
+
+
+async def _seed_imessages(
+    session: AsyncSession, spec: DatasetSpec, rng: random.Random, user_id: int, anchor: date
+) -> dict[str, int]:
+    start = datetime.combine(anchor - timedelta(days=60), datetime.min.time(), tzinfo=timezone.utc)
+    conversation_rows = []
+    participants_by_conversation: list[list[tuple[str, str]]] = []
+    for index in range(spec.conversations):
+        people = rng.sample(_FIRST_NAMES, k=1 if index % 3 else 3)
+        handles = [(f"+1555{(index * 7 + offset) % 10_000_000:07d}", name) for offset, name in enumerate(people)]
+        participants_by_conversation.append(handles)
+        conversation_rows.append(
+            {
+                "user_id": user_id,
+                "source_guid": f"bench-chat-{index}",
+                "service_name": "iMessage",
+                "chat_identifier": handles[0][0],
+                "display_name": " & ".join(people) if len(people) > 1 else None,
+                "participants_json": [handle for handle, _ in handles],
+            }
+        )
+    conversation_ids = await _insert_returning_ids(session, IMessageConversation, conversation_rows)
+    await session.execute(
+        insert(IMessageParticipant),
+        [
+            {"user_id": user_id, "conversation_id": conversation_id, "identifier": handle, "display_name": name}
+            for conversation_id, handles in zip(conversation_ids, participants_by_conversation)
+            for handle, name in handles
+        ],
+    )
+    message_rows = []
+    sent_at = start
+    for index in range(spec.messages):
+        conversation_index = rng.randrange(len(conversation_ids))
+        sent_at += timedelta(seconds=rng.randint(5, 600))
+        is_from_me = rng.random() < 0.45
+        handle, name = rng.choice(participants_by_conversation[conversation_index])
+        message_rows.append(
+            {
+                "user_id": user_id,
+                "conversation_id": conversation_ids[conversation_index],
+                "source_guid": f"bench-msg-{index}",
+                "source_row_id": index + 1,
+                "service_name": "iMessage",
+                "handle_identifier": None if is_from_me else handle,
+                "sender_label": "Me" if is_from_me else name,
+                "is_from_me": is_from_me,
+                "text": rng.choice(_MESSAGE_TEMPLATES).format(
+                    subject=rng.choice(_SUBJECTS), weekday=rng.choice(_WEEKDAYS)
+                ),
+                "sent_at_utc": sent_at,
+            }
+        )
+    await session.execute(insert(IMessageMessage), message_rows)
+    return {"imessage_conversations": len(conversation_ids), "imessage_messages": len(message_rows)}
+
+
+async def _seed_nutrition(
+    session: AsyncSession, spec: DatasetSpec, rng: random.Random, user_id: int, anchor: date
+) -> dict[str, int]:
+    profile_ids = await _insert_returning_ids(
+        session,
+        NutritionIngredientProfile,
+        [
+            {
+                definition.column_name: (round(rng.uniform(0, 50), 3) if rng.random() > 0.2 else None)
+                for definition in NUTRIENT_DEFINITIONS
+            }
+            for _ in range(spec.foods)
+        ],
+    )
+    food_ids = await _insert_returning_ids(
+        session,
+        NutritionIngredient,
+        [
+            {"name": f"Food {index}", "default_unit": "serving", "owner_user_id": user_id, "profile_id": profile_id}
+            for index, profile_id in enumerate(profile_ids)
+        ],
+    )
+    intake_rows = [
+        {
+            "user_id": user_id,
+            "ingredient_id": rng.choice(food_ids),
+            "quantity": round(rng.uniform(0.5, 3), 2),
+            "unit": "serving",
+            "day_date": anchor - timedelta(days=offset),
+            "source": NutritionIntakeSource.MANUAL,
+        }
+        for offset in range(spec.intake_days)
+        for _ in range(spec.intakes_per_day)
+    ]
+    await session.execute(insert(NutritionIntake), intake_rows)
+    return {"nutrition_foods": len(food_ids), "nutrition_intakes": len(intake_rows)}
+
+
+async def _seed_calendar(
+    session: AsyncSession, spec: DatasetSpec, rng: random.Random, user_id: int, anchor: date
+) -> dict[str, int]:
+    calendar_ids = await _insert_returning_ids(
+        session,
+        GoogleCalendar,
+        [
+            {
+                "user_id": user_id,
+                "google_id": f"bench-calendar-{index}@group.calendar.google.com",
+                "summary": f"Calendar {index}",
+                "primary": index == 0,
+                "selected": index < max(1, spec.calendars - 1),
+            }
+            for index in range(spec.calendars)
+        ],
+    )
+    origin = datetime.combine(anchor, datetime.min.time(), tzinfo=timezone.utc)
+    event_rows = []
+    for index in range(spec.events):
+        # Two and a half years back, half a year ahead.
+        start = origin + timedelta(hours=rng.randint(-24 * 912, 24 * 182))
+        event_rows.append(
+            {
+                "user_id": user_id,
+                "calendar_id": calendar_ids[index % len(calendar_ids)],
+                "google_event_id": f"bench-event-{index}",
+                "ical_uid": f"bench-event-{index}@google.com",
+                "summary": f"{rng.choice(_SUBJECTS).title()} sync",
+                "start_time": start,
+                "end_time": start + timedelta(minutes=rng.choice([30, 45, 60, 90])),
+                "status": "cancelled" if rng.random() < 0.03 else "confirmed",
+                "attendees": [{"email": f"{rng.choice(_FIRST_NAMES).lower()}@example.com", "responseStatus": "accepted"}],
+            }
+        )
+    await session.execute(insert(CalendarEvent), event_rows)
+    return {"calendars": len(calendar_ids), "calendar_events": len(event_rows)}
+
+
+# ---------------------------------------------------------------------------
+# Scenarios
+# ---------------------------------------------------------------------------
+@dataclass
+class SuiteContext:
+    spec: DatasetSpec
+    latency: StubLatency
+    user_id: int
+    client: AsyncClient
+    tasks_database_id: int
+    pending_cursor: PendingCursor | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    group: str
+    run: Callable[[SuiteContext], Awaitable[Any]]
+    # Slow end-to-end jobs run fewer rounds than the per-request scenarios.
+    max_rounds: int | None = None
+
+
+SCENARIOS: list[Scenario] = []
+
+
+def scenario(name: str, group: str, *, max_rounds: int | None = None) -> Callable:
+    def _register(fn: Callable[[SuiteContext], Awaitable[Any]]) -> Callable[[SuiteContext], Awaitable[Any]]:
+        SCENARIOS.append(Scenario(name=name, group=group, run=fn, max_rounds=max_rounds))
+        return fn
+
+    return _register
+
+
+async def _get(ctx: SuiteContext, path: str, **params: Any) -> Any:
+    response = await ctx.client.get(path, params=params)
+    response.raise_for_status()
+    return response
+
+
+@scenario("ingest.garmin_14d", "ingest", max_rounds=5)
+async def _ingest_two_weeks(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        garmin = StubGarminClient(ctx.spec.seed, ctx.latency.garmin_seconds, ctx.spec.anchor)
+        await MetricsService(session, garmin=garmin).ingest(user_id=ctx.user_id, lookback_days=14)
+
+
+@scenario("metrics.daily_365d", "metrics")
+async def _metrics_year(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await MetricsRepository(session).list_metrics_since(ctx.user_id, ctx.spec.anchor - timedelta(days=365))
+
+
+@scenario("todos.list", "todos")
+async def _todos_list(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await TodoRepository(session).list_for_user(ctx.user_id, limit=200)
+
+
+# The workspace router is not mounted on ``app.main``, so these call the
+# service methods its endpoints wrap.
+@scenario("workspace.bootstrap", "workspace")
+async def _workspace_bootstrap(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await WorkspaceService(session).get_bootstrap(ctx.user_id)
+
+
+@scenario("workspace.task_rows", "workspace")
+async def _workspace_task_rows(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await WorkspaceService(session).get_database_rows(ctx.user_id, ctx.tasks_database_id, limit=100)
+
+
+@scenario("workspace.search", "workspace")
+async def _workspace_search(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await WorkspaceService(session).search(ctx.user_id, "report")
+
+
+@scenario("workspace.legacy_sync", "workspace", max_rounds=3)
+async def _workspace_legacy_sync(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await WorkspaceService(session).ensure_workspace(ctx.user_id, sync_legacy=True)
+        await session.commit()
+
+
+@scenario("imessage.load_pending_page", "imessage")
+async def _imessage_load_page(ctx: SuiteContext) -> None:
+    async with AsyncSessionLocal() as session:
+        await IMessageProcessingService(session)._load_pending_messages(user_id=ctx.user_id, max_messages=200)
+
+
+@scenario("imessage.process_batch", "imessage", max_rounds=5)
+async def _imessage_process_batch(ctx: SuiteContext) -> None:
+    # Each round drains the next 50 messages of the backlog, so rounds see different
+    # (but, for a given seed, always the same) clusters.
+    async with AsyncSessionLocal() as session:
+        service = IMessageProcessingService(session)
+        await service.process_pending_messages(user_id=ctx.user_id, max_messages=50, after=ctx.pending_cursor)
+        ctx.pending_cursor = service.pending_cursor
+
+
+@scenario("nutrition.daily_summary", "nutrition")
+async def _nutrition_daily(ctx: SuiteContext) -> None:
+    await _get(ctx, "/api/nutrition/intake/daily", day=(ctx.spec.anchor - timedelta(days=1)).isoformat())
+
+
+@scenario("nutrition.history_90d", "nutrition")
+async def _nutrition_history(ctx: SuiteContext) -> None:
+    await _get(ctx, "/api/nutrition/intake/history", days=90)
+
+
+@scenario("calendar.events_week", "calendar")
+async def _calendar_week(ctx: SuiteContext) -> None:
+    start = datetime.combine(ctx.spec.anchor, datetime.min.time(), tzinfo=timezone.utc)
+    await _get(ctx, "/api/calendar/events", start=start.isoformat(), end=(start + timedelta(days=7)).isoformat())
+
+
+@scenario("calendar.events_month", "calendar")
+async def _calendar_month(ctx: SuiteContext) -> None:
+    start = datetime.combine(ctx.spec.anchor - timedelta(days=14), datetime.min.time(), tzinfo=timezone.utc)
+    await _get(ctx, "/api/calendar/events", start=start.isoformat(), end=(start + timedelta(days=31)).isoformat())
+
+
+async def prepare(spec: DatasetSpec, latency: StubLatency) -> tuple[SuiteContext, dict[str, int]]:
+    """Recreate the schema, seed the dataset and return the context scenarios run in."""
+    install_llm_stub(latency.llm_seconds)
+    pin_clock(spec.anchor)
+    await reset_schema()
+    counts = await seed_dataset(spec)
+    user_id = counts["user_id"]
+    async with AsyncSessionLocal() as session:
+        user = await session.get(User, user_id)
+        tasks_db = await WorkspaceService(session)._get_seeded_database(user_id, TASKS_DB_KEY)
+        tasks_database_id = tasks_db.id
+    app.dependency_overrides[get_current_user] = lambda: user
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://benchmark")
+    ctx = SuiteContext(
+        spec=spec,
+        latency=latency,
+        user_id=user_id,
+        client=client,
+        tasks_database_id=tasks_database_id,
+    )
+    return ctx, counts
+
+
+async def close(ctx: SuiteContext) -> None:
+    await ctx.client.aclose()
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def describe(spec: DatasetSpec, latency: StubLatency) -> dict[str, Any]:
+    return {"spec": {**asdict(spec), "anchor": spec.anchor.isoformat()}, "stub_latency": asdict(latency)}
+
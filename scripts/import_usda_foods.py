@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Import a USDA FoodData Central CSV dump into the shared nutrient-profile table.
+
+Usage:
+    python scripts/import_usda_foods.py /path/to/FoodData_Central_csv_2024-10-31
+    python scripts/import_usda_foods.py ./fdc --data-type sr_legacy_food --data-type foundation_food
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import sys
+
+from dotenv import load_dotenv
+
+
+ROOT = Path(__file__).resolve().parents[1]
+load_dotenv(ROOT / ".env")
+
+host_db_url = os.getenv("DATABASE_URL_HOST")
+database_url = os.getenv("DATABASE_URL")
+if not database_url and host_db_url:
+    async_database_url = host_db_url
+    if async_database_url.startswith("postgresql://"):
+        async_database_url = async_database_url.replace(
+            "postgresql://",
+            "postgresql+asyncpg://",
+            1,
+        )
+    os.environ["DATABASE_URL"] = async_database_url
+
+# One-shot CLI runs use the small "script" pool unless told otherwise.
+os.environ.setdefault("DATABASE_POOL_PROFILE", "script")
+
+sys.path.append(str(ROOT / "backend"))
+
+from app.db.session import AsyncSessionLocal  # type: ignore  # noqa: E402
+from app.services.usda_food_import import DEFAULT_DATA_TYPES, import_fdc_csv  # type: ignore  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import USDA FoodData Central CSVs as reference nutrient profiles.")
+    parser.add_argument("directory", type=Path, help="Directory containing food.csv and food_nutrient.csv.")
+    parser.add_argument(
+        "--data-type",
+        action="append",
+        dest="data_types",
+        help=f"FDC data_type to import, highest priority first (default: {', '.join(DEFAULT_DATA_TYPES)}).",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    async with AsyncSessionLocal() as session:
+        count = await import_fdc_csv(
+            session,
+            args.directory,
+            data_types=args.data_types or DEFAULT_DATA_TYPES,
+            batch_size=args.batch_size,
+        )
+    print(f"Imported {count} reference food(s).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -28,6 +28,9 @@ host_db_url = os.getenv("DATABASE_URL_HOST")
 if host_db_url:
     os.environ["DATABASE_URL"] = host_db_url
 
+# One-shot CLI runs use the small "script" pool unless told otherwise.
+os.environ.setdefault("DATABASE_POOL_PROFILE", "script")
+
 sys.path.append(str(ROOT / "backend"))
 
 from sqlalchemy import text
@@ -11,7 +11,6 @@ import signal
 import sys
 
 from dotenv import load_dotenv
-from sqlalchemy import func, select
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -29,11 +28,14 @@ if not database_url and host_db_url:
         )
     os.environ["DATABASE_URL"] = async_database_url
 
+# One-shot CLI runs use the small "script" pool unless told otherwise.
+os.environ.setdefault("DATABASE_POOL_PROFILE", "script")
+
 sys.path.append(str(ROOT / "backend"))
 
-from app.db.models.imessage import IMessageMessage  # type: ignore  # noqa: E402
 from app.db.session import AsyncSessionLocal  # type: ignore  # noqa: E402
-from app.services.imessage_processing_service import IMessageProcessingService  # type: ignore  # noqa: E402
+from app.services.imessage_processing_service import IMessageProcessingService, PendingCursor  # type: ignore  # noqa: E402
+from app.services.imessage_service import IMessageService  # type: ignore  # noqa: E402
 
 
 _stop_requested = False
@@ -58,17 +60,9 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-async def _pending_count(user_id: int) -> int:
+async def _pending_estimate(user_id: int) -> int:
     async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            select(func.count())
-            .select_from(IMessageMessage)
-            .where(
-                IMessageMessage.user_id == user_id,
-                IMessageMessage.processed_at_utc.is_(None),
-            )
-        )
-        return int(result.scalar_one() or 0)
+        return await IMessageService(session).estimate_unprocessed_messages(user_id)
 
 
 async def main() -> None:
@@ -86,6 +80,13 @@ async def main() -> None:
     signal.signal(signal.SIGTERM, _request_stop)
     signal.signal(signal.SIGINT, _request_stop)
 
+    # Each run resumes after the last page loaded, so rows a failed run left
+    # pending are not retried until the next invocation.
+    cursor: PendingCursor | None = None
+    print(
+        f"{datetime.now(timezone.utc).isoformat()} backlog start "
+        f"user_id={args.user_id} pending_estimate={await _pending_estimate(args.user_id)}"
+    )
     while True:
         if _stop_requested:
             print(
@@ -93,27 +94,23 @@ async def main() -> None:
                 f"user_id={args.user_id} runs={run_index}"
             )
             return
-        pending_before = await _pending_count(args.user_id)
-        if pending_before == 0:
-            print(
-                f"{datetime.now(timezone.utc).isoformat()} backlog drained "
-                f"user_id={args.user_id}"
-            )
-            return
 
         if args.max_runs and run_index >= args.max_runs:
             print(
                 f"{datetime.now(timezone.utc).isoformat()} stopping early "
-                f"user_id={args.user_id} runs={run_index} pending={pending_before}"
+                f"user_id={args.user_id} runs={run_index} "
+                f"pending_estimate={await _pending_estimate(args.user_id)}"
             )
             return
 
         run_index += 1
         async with AsyncSessionLocal() as session:
-            run = await IMessageProcessingService(session).process_pending_messages(
+            processor = IMessageProcessingService(session)
+            run = await processor.process_pending_messages(
                 user_id=args.user_id,
                 time_zone=args.time_zone,
                 max_messages=args.batch_size,
+                after=cursor,
             )
             print(
                 f"{datetime.now(timezone.utc).isoformat()} run={run_index} "
@@ -124,23 +121,24 @@ async def main() -> None:
                 f"error={run.error_message or ''}"
             )
 
-        pending_after = await _pending_count(args.user_id)
+        if run.status == "completed" and run.messages_considered == 0:
+            print(
+                f"{datetime.now(timezone.utc).isoformat()} backlog drained "
+                f"user_id={args.user_id} runs={run_index - 1}"
+            )
+            return
+        cursor = processor.pending_cursor or cursor
+
+        pending_after = await _pending_estimate(args.user_id)
         print(
             f"{datetime.now(timezone.utc).isoformat()} run={run_index} "
-            f"pending_before={pending_before} pending_after={pending_after}"
+            f"pending_estimate={pending_after}"
         )
 
         if _stop_requested:
             print(
                 f"{datetime.now(timezone.utc).isoformat()} stopping_after_run "
-                f"user_id={args.user_id} run={run_index} pending={pending_after}"
-            )
-            return
-
-        if pending_after == 0:
-            print(
-                f"{datetime.now(timezone.utc).isoformat()} backlog drained "
-                f"user_id={args.user_id}"
+                f"user_id={args.user_id} run={run_index} pending_estimate={pending_after}"
             )
             return
 